@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+应用路径 - 提供应用数据、缓存等目录的位置
+"""
+
+import os
+
+
+# 用户目录下的应用数据目录名称
+APP_DIR_NAME = '.lovelyhashcat'
+
+
+def get_data_dir():
+    """
+    获取应用数据目录，不存在时自动创建
+
+    Returns:
+        str: 应用数据目录
+    """
+    data_dir = os.path.join(os.path.expanduser('~'), APP_DIR_NAME)
+    os.makedirs(data_dir, exist_ok=True)
+    return data_dir
+
+
+def get_cache_dir():
+    """
+    获取缓存目录，不存在时自动创建
+
+    Returns:
+        str: 缓存目录
+    """
+    cache_dir = os.path.join(get_data_dir(), 'cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
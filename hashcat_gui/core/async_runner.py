@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+异步执行引擎 - 基于 asyncio.create_subprocess_exec 的执行引擎，一个事件循环可以同时管理多个进程
+
+事件与 HashcatEngine 相同（见 engine.py），回调在事件循环所在的线程中调用，不需要为每个进程创建线程或QProcess。
+启动前建立potfile索引、运行期间读取新结果和结束时读取potfile会读写磁盘，这些步骤在线程池中执行，不阻塞事件循环。
+在图形界面中使用时通过 gui/async_bridge.py 把事件循环接入Qt（设置中启用“使用asyncio执行引擎”）。
+"""
+
+import os
+import codecs
+import asyncio
+
+from hashcat_gui.core.engine import HashcatEngine, EVENT_OUTPUT, EVENT_ERROR, POLL_INTERVAL, READ_CHUNK_SIZE, kill_process
+
+
+def _get_running_loop():
+    """
+    获取当前线程中正在运行的事件循环
+
+    Returns:
+        asyncio.AbstractEventLoop: 事件循环，当前线程没有运行事件循环时返回None
+    """
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+async def read_stream(stream, handler):
+    """
+    读取进程的输出，按UTF-8解码后交给处理函数
+
+    Args:
+        stream (asyncio.StreamReader): 进程的标准输出或标准错误
+        handler (callable): 处理解码后文本的函数
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    while True:
+        data = await stream.read(READ_CHUNK_SIZE)
+        if not data:
+            break
+        text = decoder.decode(data)
+        if text:
+            handler(text)
+    text = decoder.decode(b'', final=True)
+    if text:
+        handler(text)
+
+
+class AsyncHashcatEngine(HashcatEngine):
+    """基于asyncio的执行引擎类，start/resume/wait/run 是协程，其余接口与 HashcatEngine 相同"""
+
+    def __init__(self, hashcat_path, john_pot_path=None, apply_tuning=True, jobs_dir=None, sync_john=False):
+        """
+        初始化异步执行引擎
+
+        Args:
+            hashcat_path (str): hashcat可执行文件路径
+            john_pot_path (str, optional): John pot文件路径，启动前同时从中取出已有的破解结果
+            apply_tuning (bool): 参数中没有指定调优项时是否使用保存的调优结果
+            jobs_dir (str, optional): 任务目录，默认为应用数据目录下的jobs
+            sync_john (bool): 启动前是否把只在John pot文件中的结果追加到hashcat potfile
+        """
+        super().__init__(hashcat_path, john_pot_path, apply_tuning, jobs_dir, sync_john)
+        self._monitor_task = None
+        self._loop = None
+
+    async def start(self, params):
+        """
+        开始破解过程
+
+        Args:
+            params (dict): 破解参数字典
+
+        Returns:
+            bool: 是否成功启动破解
+        """
+        # 启动前读取已有的破解结果时可能需要建立potfile索引，在线程池中执行
+        self._loop = asyncio.get_running_loop()
+        prepared = await self._loop.run_in_executor(None, self._prepare_start, params)
+        if prepared is None:
+            return False
+        if not await self._launch_async(prepared[0]):
+            # 没有运行起来的任务不保留任务目录
+            self.workspace.remove()
+            return False
+
+        self._session = self.session_manager.begin(self.workspace, prepared[1], self._temp_hash_file_path)
+        return True
+
+    async def resume(self, job_id):
+        """
+        从检查点恢复中断的任务
+
+        Args:
+            job_id (str): 任务ID
+
+        Returns:
+            bool: 是否成功启动恢复
+        """
+        self._loop = asyncio.get_running_loop()
+        record = await self._loop.run_in_executor(None, self._prepare_resume, job_id)
+        if record is None or not await self._launch_async([self.hashcat_path] + record.restore_args()):
+            return False
+
+        self.session_manager.resume(record)
+        self._session = record
+        return True
+
+    async def wait(self, timeout=None):
+        """
+        等待任务结束
+
+        Args:
+            timeout (float, optional): 最长等待时间（秒）
+
+        Returns:
+            int: 退出代码，超时时返回None
+        """
+        if self._monitor_task is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._monitor_task), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self.exit_code
+
+    async def run(self, params):
+        """
+        运行破解任务并等待结束
+
+        Args:
+            params (dict): 破解参数字典
+
+        Returns:
+            int: 退出代码，启动失败时返回None
+        """
+        if not await self.start(params):
+            return None
+        return await self.wait()
+
+    def _emit(self, event, *args):
+        """调用事件的所有回调，在线程池中发出的事件转到事件循环所在的线程后再调用"""
+        loop = self._loop
+        if loop is not None and not loop.is_closed() and _get_running_loop() is not loop:
+            loop.call_soon_threadsafe(super()._emit, event, *args)
+            return
+        super()._emit(event, *args)
+
+    def _process_alive(self):
+        """hashcat进程是否仍在运行"""
+        return self.process is not None and self.process.returncode is None
+
+    def _write_stdin(self, data):
+        """向hashcat进程的标准输入写入数据，由事件循环负责发送"""
+        self.process.stdin.write(data)
+
+    async def _launch_async(self, cmd_args):
+        """
+        启动hashcat进程和监视进程的任务
+
+        Args:
+            cmd_args (list): 命令行参数，第一个元素是hashcat路径
+
+        Returns:
+            bool: 是否成功启动
+        """
+        self._emit(EVENT_OUTPUT, f"运行命令: {' '.join(cmd_args)}")
+        try:
+            # 设置工作目录为hashcat所在的目录
+            process = await asyncio.create_subprocess_exec(
+                *cmd_args, cwd=os.path.dirname(self.hashcat_path) or None, stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        except OSError as e:
+            self._emit(EVENT_ERROR, f"启动Hashcat进程失败: {str(e)}")
+            return False
+
+        self._on_launched(process)
+        self._monitor_task = asyncio.ensure_future(self._monitor_async(process))
+        return True
+
+    async def _poll_async(self, process, stopped):
+        """
+        定时在线程池中读取新的破解结果，并检查超时
+
+        Args:
+            process (asyncio.subprocess.Process): hashcat进程
+            stopped (asyncio.Event): 进程结束后设置，停止轮询
+        """
+        loop = asyncio.get_running_loop()
+        while not stopped.is_set():
+            try:
+                await asyncio.wait_for(stopped.wait(), POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                await loop.run_in_executor(None, self._poll_results)
+                self._check_deadlines(process)
+
+    async def _monitor_async(self, process):
+        """
+        读取进程的输出直到进程结束，然后在线程池中读取结果
+
+        Args:
+            process (asyncio.subprocess.Process): hashcat进程
+        """
+        loop = asyncio.get_running_loop()
+        stopped = asyncio.Event()
+        poller = asyncio.ensure_future(self._poll_async(process, stopped))
+        exit_code = None
+        try:
+            await asyncio.gather(read_stream(process.stdout, self._handle_stdout),
+                                 read_stream(process.stderr, self._handle_stderr))
+        except Exception as e:
+            # 不再读取输出后hashcat可能因为管道写满而阻塞，直接终止
+            self._emit(EVENT_ERROR, f"处理Hashcat输出时出错: {str(e)}")
+            kill_process(process)
+        finally:
+            # 无论如何都要等待进程结束并处理结束，否则会话不会结束，任务一直处于运行状态
+            try:
+                exit_code = await process.wait()
+            finally:
+                # 等待线程池中正在进行的读取结束，避免与结束处理同时读取输出文件
+                stopped.set()
+                await asyncio.gather(poller, return_exceptions=True)
+                await loop.run_in_executor(None, self._handle_finished, exit_code)
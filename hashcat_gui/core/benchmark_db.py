@@ -0,0 +1,401 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基准测试数据库 - 运行 hashcat -b 并把每个设备、每个哈希模式的速度保存到SQLite，用于估算速度和发现性能下降，不依赖Qt
+
+用法:
+    python -m hashcat_gui.core.benchmark_db --hashcat <hashcat路径> -m 0,100,1000
+    python -m hashcat_gui.core.benchmark_db --regressions
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import subprocess
+
+from hashcat_gui.core.app_paths import get_data_dir
+
+
+# 数据库文件名称
+BENCHMARK_DB_NAME = 'benchmarks.db'
+
+# 速度比之前的最好结果低多少时视为性能下降
+REGRESSION_THRESHOLD = 0.1
+
+
+def get_hashcat_version(hashcat_path, timeout=30):
+    """
+    获取hashcat版本
+
+    Args:
+        hashcat_path (str): hashcat可执行文件路径
+        timeout (int): 超时时间（秒）
+
+    Returns:
+        str: 版本，例如 v6.2.6，获取失败时返回空字符串
+    """
+    try:
+        result = subprocess.run(
+            [hashcat_path, '--version'],
+            cwd=os.path.dirname(hashcat_path) or None,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"获取hashcat版本失败: {e}")
+        return ''
+    return result.stdout.strip().splitlines()[0] if result.stdout.strip() else ''
+
+
+def parse_benchmark_output(text):
+    """
+    解析 hashcat -b --machine-readable 的输出
+
+    每行格式为 设备ID:哈希模式:核心频率:显存频率:执行时间:速度(H/s)
+
+    Args:
+        text (str): 基准测试输出
+
+    Returns:
+        dict: 键为 (设备ID, 哈希模式)，值为每秒哈希数
+    """
+    speeds = {}
+    for line in text.splitlines():
+        fields = line.strip().split(':')
+        if len(fields) < 6:
+            continue
+        try:
+            device, hash_mode, speed = int(fields[0]), int(fields[1]), float(fields[-1])
+        except ValueError:
+            continue
+        speeds[(device, hash_mode)] = speed
+    return speeds
+
+
+def probe_speed(hashcat_path, hash_mode, devices=None, timeout=300, extra_args=None):
+    """
+    运行 hashcat -b 测试哈希模式的速度
+
+    Args:
+        hashcat_path (str): hashcat可执行文件路径
+        hash_mode (int): 哈希模式
+        devices (list, optional): 设备ID列表
+        timeout (int): 超时时间（秒）
+        extra_args (list, optional): 额外的参数，例如 -w 3
+
+    Returns:
+        dict: 键为设备ID，值为每秒哈希数，测试失败时返回空字典
+    """
+    cmd_args = [hashcat_path, '-b', '-m', str(hash_mode), '--machine-readable', '--quiet']
+    if devices:
+        cmd_args.extend(['-d', ','.join(str(device) for device in devices)])
+    cmd_args.extend(extra_args or [])
+
+    try:
+        result = subprocess.run(
+            cmd_args,
+            cwd=os.path.dirname(hashcat_path) or None,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"基准测试失败: {e}")
+        return {}
+
+    return {device: speed for (device, mode), speed in parse_benchmark_output(result.stdout).items()
+            if mode == int(hash_mode)}
+
+
+class BenchmarkDB:
+    """基准测试数据库类，保存每次测试的结果，同一个设备和哈希模式可以有多条历史记录"""
+
+    def __init__(self, path=None):
+        """
+        初始化基准测试数据库
+
+        Args:
+            path (str, optional): 数据库路径，默认为应用数据目录下的 benchmarks.db
+        """
+        self.path = path or os.path.join(get_data_dir(), BENCHMARK_DB_NAME)
+        self._conn = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def open(self):
+        """打开（必要时创建）数据库"""
+        if self._conn is not None:
+            return
+
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS benchmarks ("
+            "id INTEGER PRIMARY KEY, hash_mode INTEGER NOT NULL, device INTEGER NOT NULL, "
+            "speed REAL NOT NULL, hashcat_version TEXT NOT NULL DEFAULT '', timestamp REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS benchmarks_mode_device ON benchmarks (hash_mode, device, timestamp)"
+        )
+        # 每个哈希模式和设备组的最佳调优参数
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tunings ("
+            "hash_mode INTEGER NOT NULL, device_group TEXT NOT NULL, settings TEXT NOT NULL, "
+            "speed REAL NOT NULL, hashcat_version TEXT NOT NULL DEFAULT '', timestamp REAL NOT NULL, "
+            "PRIMARY KEY (hash_mode, device_group))"
+        )
+        self._conn.commit()
+
+    def close(self):
+        """关闭数据库"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def record(self, hash_mode, speeds, hashcat_version='', timestamp=None):
+        """
+        保存一次测试的结果
+
+        Args:
+            hash_mode (int): 哈希模式
+            speeds (dict): 键为设备ID，值为每秒哈希数
+            hashcat_version (str): hashcat版本
+            timestamp (float, optional): 测试时间，默认为当前时间
+        """
+        self.open()
+        timestamp = timestamp if timestamp is not None else time.time()
+        self._conn.executemany(
+            "INSERT INTO benchmarks (hash_mode, device, speed, hashcat_version, timestamp) VALUES (?, ?, ?, ?, ?)",
+            [(int(hash_mode), int(device), float(speed), hashcat_version, timestamp)
+             for device, speed in speeds.items()]
+        )
+        self._conn.commit()
+
+    def latest(self, hash_mode=None, max_age=None):
+        """
+        获取每个设备和哈希模式最近一次的测试结果
+
+        Args:
+            hash_mode (int, optional): 只返回该哈希模式的结果
+            max_age (float, optional): 只返回最近多少秒内的结果
+
+        Returns:
+            list: 结果列表，每个元素是包含 hash_mode、device、speed、hashcat_version、timestamp 的字典
+        """
+        self.open()
+        sql = ("SELECT b.hash_mode, b.device, b.speed, b.hashcat_version, b.timestamp FROM benchmarks b "
+               "WHERE b.id = (SELECT id FROM benchmarks WHERE hash_mode = b.hash_mode AND device = b.device "
+               "ORDER BY timestamp DESC, id DESC LIMIT 1)")
+        args = []
+        if hash_mode is not None:
+            sql += " AND b.hash_mode = ?"
+            args.append(int(hash_mode))
+        if max_age is not None:
+            sql += " AND b.timestamp >= ?"
+            args.append(time.time() - max_age)
+        sql += " ORDER BY b.hash_mode, b.device"
+
+        keys = ('hash_mode', 'device', 'speed', 'hashcat_version', 'timestamp')
+        return [dict(zip(keys, row)) for row in self._conn.execute(sql, args)]
+
+    def expected_speed(self, hash_mode, devices=None, max_age=None):
+        """
+        根据最近的测试结果计算预计速度
+
+        Args:
+            hash_mode (int): 哈希模式
+            devices (list, optional): 使用的设备ID列表，默认为测试过的所有设备
+            max_age (float, optional): 只使用最近多少秒内的结果
+
+        Returns:
+            float: 所有设备的总速度（H/s），有设备没有测试结果时返回None
+        """
+        speeds = {row['device']: row['speed'] for row in self.latest(hash_mode, max_age)}
+        if not speeds:
+            return None
+        if not devices:
+            return sum(speeds.values())
+
+        devices = [int(device) for device in devices]
+        if any(device not in speeds for device in devices):
+            return None
+        return sum(speeds[device] for device in devices)
+
+    def history(self, hash_mode, device):
+        """
+        获取设备和哈希模式的历史测试结果
+
+        Args:
+            hash_mode (int): 哈希模式
+            device (int): 设备ID
+
+        Returns:
+            list: 按时间排序的 (speed, hashcat_version, timestamp) 列表
+        """
+        self.open()
+        return self._conn.execute(
+            "SELECT speed, hashcat_version, timestamp FROM benchmarks WHERE hash_mode = ? AND device = ? "
+            "ORDER BY timestamp, id",
+            (int(hash_mode), int(device))
+        ).fetchall()
+
+    def save_tuning(self, hash_mode, device_group, settings, speed, hashcat_version='', timestamp=None):
+        """
+        保存调优结果，同一个哈希模式和设备组只保留最近一次的结果
+
+        Args:
+            hash_mode (int): 哈希模式
+            device_group (str): 设备组
+            settings (dict): 调优参数
+            speed (float): 使用调优参数时的速度（H/s）
+            hashcat_version (str): hashcat版本
+            timestamp (float, optional): 调优时间，默认为当前时间
+        """
+        self.open()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO tunings (hash_mode, device_group, settings, speed, hashcat_version, timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (int(hash_mode), device_group, json.dumps(settings), float(speed), hashcat_version,
+             timestamp if timestamp is not None else time.time())
+        )
+        self._conn.commit()
+
+    def get_tuning(self, hash_mode, device_group):
+        """
+        获取调优结果
+
+        Args:
+            hash_mode (int): 哈希模式
+            device_group (str): 设备组
+
+        Returns:
+            dict: 调优参数，没有调优过时返回None
+        """
+        self.open()
+        row = self._conn.execute(
+            "SELECT settings FROM tunings WHERE hash_mode = ? AND device_group = ?", (int(hash_mode), device_group)
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return None
+
+    def find_regressions(self, threshold=REGRESSION_THRESHOLD):
+        """
+        查找性能下降：最近一次的速度比之前的最好结果低超过threshold
+
+        Args:
+            threshold (float): 下降比例
+
+        Returns:
+            list: 每个元素是包含 hash_mode、device、speed、hashcat_version、best_speed、best_version、change 的字典
+        """
+        regressions = []
+        for row in self.latest():
+            history = self.history(row['hash_mode'], row['device'])[:-1]
+            if not history:
+                continue
+            best_speed, best_version, _ = max(history, key=lambda item: item[0])
+            if best_speed > 0 and row['speed'] < best_speed * (1 - threshold):
+                regression = dict(row)
+                regression.update({
+                    'best_speed': best_speed,
+                    'best_version': best_version,
+                    'change': row['speed'] / best_speed - 1,
+                })
+                regressions.append(regression)
+        return regressions
+
+
+def run_benchmark(hashcat_path, hash_modes, devices=None, db=None, callback=None):
+    """
+    对多个哈希模式运行基准测试，并保存结果
+
+    Args:
+        hashcat_path (str): hashcat可执行文件路径
+        hash_modes (list): 哈希模式列表
+        devices (list, optional): 设备ID列表
+        db (BenchmarkDB, optional): 基准测试数据库
+        callback (callable, optional): 每个哈希模式测试完成后调用 callback(hash_mode, speeds)，
+            返回True时停止测试
+
+    Returns:
+        dict: 键为哈希模式，值为 {设备ID: 每秒哈希数}，测试失败的模式值为空字典
+    """
+    db = db or BenchmarkDB()
+    version = get_hashcat_version(hashcat_path)
+    results = {}
+    for hash_mode in hash_modes:
+        speeds = probe_speed(hashcat_path, hash_mode, devices)
+        if speeds:
+            db.record(hash_mode, speeds, version)
+        results[hash_mode] = speeds
+        if callback is not None and callback(hash_mode, speeds):
+            break
+    return results
+
+
+def parse_hash_modes(text):
+    """
+    解析用逗号分隔的哈希模式列表
+
+    Args:
+        text (str): 例如 0,100,1000
+
+    Returns:
+        list: 哈希模式列表，无法解析的部分会被忽略
+    """
+    modes = []
+    for part in (text or '').split(','):
+        part = part.strip()
+        if part.isdigit() and int(part) not in modes:
+            modes.append(int(part))
+    return modes
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="运行hashcat基准测试并保存结果，或查看性能下降")
+    parser.add_argument('--hashcat', help="hashcat可执行文件路径")
+    parser.add_argument('-m', '--hash-modes', help="哈希模式，用逗号分隔，例如 0,100,1000")
+    parser.add_argument('-d', '--devices', help="设备，例如 1,2")
+    parser.add_argument('--db', help="数据库路径")
+    parser.add_argument('--regressions', action='store_true', help="列出性能下降的设备和哈希模式")
+    args = parser.parse_args(argv)
+
+    with BenchmarkDB(args.db) as db:
+        if args.hashcat and args.hash_modes:
+            devices = [device.strip() for device in args.devices.split(',')] if args.devices else None
+
+            def report(hash_mode, speeds):
+                if not speeds:
+                    print(f"-m {hash_mode}: 测试失败")
+                for device, speed in sorted(speeds.items()):
+                    print(f"-m {hash_mode} 设备 #{device}: {speed:.0f} H/s")
+
+            run_benchmark(args.hashcat, parse_hash_modes(args.hash_modes), devices, db, report)
+
+        if args.regressions:
+            regressions = db.find_regressions()
+            if not regressions:
+                print("没有发现性能下降")
+            for item in regressions:
+                print(f"-m {item['hash_mode']} 设备 #{item['device']}: {item['speed']:.0f} H/s ({item['hashcat_version']})，"
+                      f"之前最好 {item['best_speed']:.0f} H/s ({item['best_version']})，变化 {item['change']:.1%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
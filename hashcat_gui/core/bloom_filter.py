@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+布隆过滤器 - 紧凑的位数组集合，用于快速排除不在哈希列表中的条目
+"""
+
+import math
+import struct
+import hashlib
+
+
+# 序列化格式：魔数、版本、位数、哈希函数个数、元素个数、标签长度
+HEADER_FORMAT = '<4sBQIQI'
+HEADER_MAGIC = b'LHBF'
+HEADER_VERSION = 1
+
+
+class BloomFilter:
+    """布隆过滤器类，判断结果为不存在时一定不存在，为存在时有一定的误判率"""
+
+    def __init__(self, capacity, error_rate=0.001, num_bits=None, num_hashes=None):
+        """
+        初始化布隆过滤器
+
+        Args:
+            capacity (int): 预计存放的元素个数
+            error_rate (float): 期望的误判率
+            num_bits (int, optional): 位数组大小，默认根据容量和误判率计算
+            num_hashes (int, optional): 哈希函数个数，默认根据容量和误判率计算
+        """
+        capacity = max(int(capacity), 1)
+        if num_bits is None:
+            num_bits = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        if num_hashes is None:
+            num_hashes = int(round(num_bits / capacity * math.log(2)))
+
+        self.num_bits = max(num_bits, 8)
+        self.num_hashes = max(num_hashes, 1)
+        self.count = 0
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def __len__(self):
+        return self.count
+
+    def _positions(self, item):
+        """
+        计算元素对应的位位置（双重哈希）
+
+        Args:
+            item (str): 元素
+
+        Returns:
+            generator: 位位置
+        """
+        digest = hashlib.blake2b(item.encode('utf-8', errors='ignore'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item):
+        """
+        添加元素
+
+        Args:
+            item (str): 元素
+        """
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, items):
+        """
+        批量添加元素
+
+        Args:
+            items (iterable): 元素
+        """
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item):
+        bits = self.bits
+        for pos in self._positions(item):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def to_bytes(self, tag=''):
+        """
+        序列化布隆过滤器
+
+        Args:
+            tag (str): 附加的标签，用于校验过滤器是否对应当前的数据
+
+        Returns:
+            bytes: 序列化后的数据
+        """
+        tag_bytes = tag.encode('utf-8')
+        header = struct.pack(HEADER_FORMAT, HEADER_MAGIC, HEADER_VERSION,
+                             self.num_bits, self.num_hashes, self.count, len(tag_bytes))
+        return header + tag_bytes + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        反序列化布隆过滤器
+
+        Args:
+            data (bytes): 序列化后的数据
+
+        Returns:
+            tuple: (BloomFilter, tag)，数据无效时返回 (None, None)
+        """
+        header_size = struct.calcsize(HEADER_FORMAT)
+        if len(data) < header_size:
+            return None, None
+
+        magic, version, num_bits, num_hashes, count, tag_length = struct.unpack_from(HEADER_FORMAT, data)
+        if magic != HEADER_MAGIC or version != HEADER_VERSION:
+            return None, None
+
+        tag = data[header_size:header_size + tag_length].decode('utf-8', errors='ignore')
+        bits = data[header_size + tag_length:]
+        if len(bits) != (num_bits + 7) // 8:
+            return None, None
+
+        bloom = cls(count, num_bits=num_bits, num_hashes=num_hashes)
+        bloom.bits = bytearray(bits)
+        bloom.count = count
+        return bloom, tag
+
+    def save(self, path, tag=''):
+        """
+        保存布隆过滤器到文件
+
+        Args:
+            path (str): 文件路径
+            tag (str): 附加的标签
+        """
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes(tag))
+
+    @classmethod
+    def load(cls, path):
+        """
+        从文件加载布隆过滤器
+
+        Args:
+            path (str): 文件路径
+
+        Returns:
+            tuple: (BloomFilter, tag)，文件无效时返回 (None, None)
+        """
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
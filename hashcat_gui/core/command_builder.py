@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+命令构建 - 根据破解参数构建Hashcat命令行参数，不依赖Qt
+"""
+
+import re
+
+
+# 速度单位对应的倍数
+SPEED_MULTIPLIERS = {
+    'H/s': 1,
+    'kH/s': 1000,
+    'MH/s': 1000 ** 2,
+    'GH/s': 1000 ** 3,
+    'TH/s': 1000 ** 4,
+    'PH/s': 1000 ** 5,
+}
+
+SPEED_REGEX = re.compile(r'([\d.]+)\s*([kMGTP]?H/s)')
+
+# 调优参数对应的命令行选项
+TUNING_OPTIONS = (
+    ('workload_profile', '-w'),
+    ('kernel_accel', '-n'),
+    ('kernel_loops', '-u'),
+    ('kernel_threads', '-T'),
+)
+
+
+def build_attack_args(params):
+    """
+    构建哈希文件、哈希模式、攻击模式以及攻击模式相关的参数
+
+    Args:
+        params (dict): 破解参数字典
+
+    Returns:
+        list: 命令行参数（不含hashcat路径）
+    """
+    args = []
+
+    if params.get('hash_file'):
+        args.append(params['hash_file'])
+
+    # 特别处理哈希模式，需要处理哈希模式为0的情况
+    if params.get('hash_mode') is not None:
+        args.extend(['-m', str(params['hash_mode'])])
+
+    args.extend(build_attack_mode_args(params))
+    return args
+
+
+def build_attack_mode_args(params):
+    """
+    构建攻击模式以及字典、掩码等攻击模式相关的参数
+
+    Args:
+        params (dict): 破解参数字典
+
+    Returns:
+        list: 命令行参数
+    """
+    args = []
+    attack_mode = params.get('attack_mode')
+    if attack_mode is not None:
+        args.extend(['-a', str(attack_mode)])
+
+    if attack_mode == 0:  # 字典攻击
+        if params.get('dict_file'):
+            args.append(params['dict_file'])
+        if params.get('rule_file'):
+            args.extend(['-r', params['rule_file']])
+
+    elif attack_mode == 1:  # 组合攻击
+        if params.get('dict_file1') and params.get('dict_file2'):
+            args.append(params['dict_file1'])
+            args.append(params['dict_file2'])
+
+    elif attack_mode == 3:  # 暴力攻击
+        if params.get('mask'):
+            args.append(params['mask'])
+
+    elif attack_mode == 6:  # 混合攻击(字典+掩码)
+        if params.get('dict_file') and params.get('mask'):
+            args.append(params['dict_file'])
+            args.append(params['mask'])
+
+    elif attack_mode == 7:  # 混合攻击(掩码+字典)
+        if params.get('mask') and params.get('dict_file'):
+            args.append(params['mask'])
+            args.append(params['dict_file'])
+
+    # 自定义字符集
+    for index in range(1, 5):
+        charset = params.get(f'custom_charset{index}')
+        if charset and attack_mode in (3, 6, 7):
+            args.extend([f'-{index}', charset])
+
+    return args
+
+
+def build_keyspace_args(params):
+    """
+    构建查询密钥空间（--keyspace）的参数，--skip/--limit 使用的就是这个密钥空间
+
+    Args:
+        params (dict): 破解参数字典
+
+    Returns:
+        list: 命令行参数（不含hashcat路径）
+    """
+    args = []
+    if params.get('hash_mode') is not None:
+        args.extend(['-m', str(params['hash_mode'])])
+    args.extend(build_attack_mode_args(params))
+    args.append('--keyspace')
+    return args
+
+
+def build_slice_args(params):
+    """
+    构建密钥空间分片（--skip/--limit）参数
+
+    Args:
+        params (dict): 破解参数字典
+
+    Returns:
+        list: 命令行参数
+    """
+    args = []
+    if params.get('skip'):
+        args.extend(['-s', str(params['skip'])])
+    if params.get('limit'):
+        args.extend(['-l', str(params['limit'])])
+    return args
+
+
+def build_crack_args(params, session_args=None, tuning=None, output_file=None, default_potfile=None):
+    """
+    构建破解命令的全部参数
+
+    Args:
+        params (dict): 破解参数字典
+        session_args (list, optional): 会话和检查点参数
+        tuning (dict, optional): 工作负载和内核调优参数
+        output_file (str, optional): 破解结果输出文件，为空时不添加输出文件参数
+        default_potfile (str, optional): 参数中没有指定potfile时使用的potfile路径
+
+    Returns:
+        list: 命令行参数（不含hashcat路径）
+    """
+    # 添加哈希文件、哈希模式和攻击模式相关参数
+    args = build_attack_args(params)
+
+    # 添加密钥空间分片参数
+    args.extend(build_slice_args(params))
+
+    # 添加会话参数，检查点保存在任务目录中，中断后可以通过 --restore 继续
+    args.extend(session_args or [])
+
+    # 哈希文件中带有用户名前缀
+    if params.get('username'):
+        args.append('--username')
+
+    # 添加设备参数
+    if params.get('devices'):
+        args.extend(['-d', ','.join(params['devices'])])
+
+    # 添加工作负载和内核调优参数
+    args.extend(build_tuning_args(tuning or {}))
+
+    # 添加其他参数
+    if params.get('force'):
+        args.append('--force')
+
+    if params.get('remove'):
+        args.append('--remove')
+
+    # 时间预算根据状态输出中的速度和进度做决策
+    if params.get('status') or params.get('time_budget'):
+        args.append('--status')
+
+    if params.get('status_json'):
+        args.append('--status-json')
+
+    if params.get('status_timer'):
+        args.extend(['--status-timer', str(params['status_timer'])])
+
+    if params.get('hwmon_temp_abort') is not None:
+        args.extend(['--hwmon-temp-abort', str(params['hwmon_temp_abort'])])
+
+    # 添加参数确保处理所有哈希值
+    args.append('--keep-guessing')            # 在发现一个匹配后继续处理剩余哈希
+    args.append('--outfile-autohex-disable')   # 禁用自动跳过
+
+    # 添加输出文件参数，破解结果写入输出文件后立即读取
+    if output_file:
+        args.extend(['-o', output_file])
+        args.append('--outfile-format=1,2')   # 使用格式1,2: hash[:salt]:password
+
+    # 没有禁用potfile时利用它来记录破解结果
+    if params.get('potfile_disable'):
+        args.append('--potfile-disable')
+    else:
+        potfile_path = params.get('potfile_path') or default_potfile
+        if potfile_path:
+            args.extend(['--potfile-path', potfile_path])
+
+    return args
+
+
+def build_tuning_args(settings):
+    """
+    构建工作负载和内核调优（-w/-n/-u/-T）参数
+
+    Args:
+        settings (dict): workload_profile、kernel_accel、kernel_loops、kernel_threads，没有的项使用hashcat默认值
+
+    Returns:
+        list: 命令行参数
+    """
+    args = []
+    for key, option in TUNING_OPTIONS:
+        if settings.get(key):
+            args.extend([option, str(settings[key])])
+    return args
+
+
+def parse_speed(text):
+    """
+    把hashcat的速度文本转换为每秒哈希数
+
+    Args:
+        text (str): 速度文本，例如 1234.5 kH/s
+
+    Returns:
+        float: 每秒哈希数，无法解析时返回0
+    """
+    match = SPEED_REGEX.search(text or '')
+    if not match:
+        return 0.0
+    return float(match.group(1)) * SPEED_MULTIPLIERS[match.group(2)]
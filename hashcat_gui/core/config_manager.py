@@ -3,19 +3,102 @@
 
 """
 配置管理器 - 用于管理应用程序设置
+
+有Qt时设置保存在QSettings中，没有Qt时（例如无界面的守护进程）保存在应用数据目录的JSON文件中
 """
 
 import os
 import json
-from PySide6.QtCore import QSettings
+
+from hashcat_gui.core.app_paths import get_data_dir
+
+
+# 没有Qt时使用的设置文件
+SETTINGS_FILE_NAME = 'settings.json'
+
+
+class JsonSettings:
+    """JSON文件设置类，提供与QSettings相同的 value/setValue 接口"""
+    
+    def __init__(self, path=None):
+        """
+        初始化JSON文件设置
+        
+        Args:
+            path (str, optional): 设置文件路径，默认为应用数据目录下的 settings.json
+        """
+        self.path = path or os.path.join(get_data_dir(), SETTINGS_FILE_NAME)
+        self._values = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._values = data
+        except (OSError, ValueError):
+            pass
+    
+    def value(self, key, default=None, type=None):
+        """
+        读取设置
+        
+        Args:
+            key (str): 设置名称
+            default: 没有该设置时的默认值
+            type (type, optional): 转换的类型，与QSettings一样把 "true"/"false" 转换为布尔值
+            
+        Returns:
+            设置值
+        """
+        value = self._values.get(key, default)
+        if type is bool and isinstance(value, str):
+            return value.lower() in ('true', '1')
+        if type is not None and value is not None:
+            return type(value)
+        return value
+    
+    def setValue(self, key, value):
+        """
+        保存设置并立即写入文件，先写入临时文件再替换，避免写入中断时损坏设置文件
+        
+        Args:
+            key (str): 设置名称
+            value: 设置值
+        """
+        self._values[key] = value
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._values, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+        except (OSError, TypeError) as e:
+            print(f"保存设置失败: {e}")
+
+
+def create_settings():
+    """
+    创建设置存储，有Qt时使用QSettings，否则使用JSON文件
+    
+    Returns:
+        QSettings | JsonSettings: 设置存储
+    """
+    try:
+        from PySide6.QtCore import QSettings
+    except ImportError:
+        return JsonSettings()
+    return QSettings("LovelyHashcat", "LovelyHashcat")
 
 
 class ConfigManager:
     """配置管理器类，用于管理应用程序设置"""
     
-    def __init__(self):
-        """初始化配置管理器"""
-        self.settings = QSettings("LovelyHashcat", "LovelyHashcat")
+    def __init__(self, settings=None):
+        """
+        初始化配置管理器
+        
+        Args:
+            settings (QSettings | JsonSettings, optional): 设置存储，默认由 create_settings 创建
+        """
+        self.settings = settings if settings is not None else create_settings()
         self.default_config = {
             # Hashcat 相关设置
             "hashcat_path": "",
@@ -28,12 +111,26 @@ class ConfigManager:
             "john_pot_path": "",           # John pot 文件路径
             "john_wordlist_path": "",      # John 默认字典路径
             "john_rules_path": "",         # John 规则文件路径
+            "sync_john_to_potfile": False, # 启动前把只在John pot文件中的结果追加到hashcat potfile
             
             # 界面相关设置
             "interface_theme": "default",
             "font_size": 10,
             "save_output": True,
-            "output_dir": ""
+            "output_dir": "",
+            "ui_refresh_fps": 10,          # 输出、状态和破解结果每秒刷新到界面的次数
+            
+            # 任务队列相关设置
+            "scheduler_default_limit": 1,  # 每个设备组默认同时运行的任务数
+            "scheduler_group_limits": "{}", # 单独设置的设备组并发数（JSON）
+            
+            # 攻击估算相关设置
+            "estimate_before_start": True, # 启动攻击前估算所需时间
+            "eta_warning_hours": 24,       # 预计时间超过该小时数时需要确认
+            
+            # 性能调优相关设置
+            "apply_tuning": True,          # 自动使用调优结果（-w/-n/-u/-T）
+            "use_async_runner": False      # 使用asyncio执行引擎（需要qasync，重启后生效）
         }
     
     def get_hashcat_path(self):
@@ -217,6 +314,24 @@ class ConfigManager:
         """
         self.settings.setValue("john_rules_path", path)
     
+    def get_sync_john_to_potfile(self):
+        """
+        获取启动前是否把John pot文件中的结果同步到hashcat potfile
+        
+        Returns:
+            bool: 是否同步
+        """
+        return self.settings.value("sync_john_to_potfile", False, bool)
+    
+    def set_sync_john_to_potfile(self, enabled):
+        """
+        设置启动前是否把John pot文件中的结果同步到hashcat potfile
+        
+        Args:
+            enabled (bool): 是否同步
+        """
+        self.settings.setValue("sync_john_to_potfile", enabled)
+    
     def get_theme(self):
         """
         获取界面主题
@@ -292,6 +407,136 @@ class ConfigManager:
         """
         self.settings.setValue("output_dir", path)
     
+    def get_scheduler_default_limit(self):
+        """
+        获取每个设备组默认同时运行的任务数
+        
+        Returns:
+            int: 任务数
+        """
+        return max(1, int(self.settings.value("scheduler_default_limit", 1)))
+    
+    def set_scheduler_default_limit(self, limit):
+        """
+        设置每个设备组默认同时运行的任务数
+        
+        Args:
+            limit (int): 任务数
+        """
+        self.settings.setValue("scheduler_default_limit", limit)
+    
+    def get_scheduler_group_limits(self):
+        """
+        获取单独设置的设备组并发数
+        
+        Returns:
+            dict: 设备组到任务数的映射
+        """
+        try:
+            limits = json.loads(self.settings.value("scheduler_group_limits", "{}") or "{}")
+            return {str(group): max(1, int(limit)) for group, limit in limits.items()}
+        except (ValueError, TypeError, AttributeError):
+            return {}
+    
+    def set_scheduler_group_limits(self, limits):
+        """
+        设置单独设置的设备组并发数
+        
+        Args:
+            limits (dict): 设备组到任务数的映射
+        """
+        self.settings.setValue("scheduler_group_limits", json.dumps(limits))
+    
+    def get_estimate_before_start(self):
+        """
+        获取启动攻击前是否估算所需时间
+        
+        Returns:
+            bool: 是否估算
+        """
+        return self.settings.value("estimate_before_start", True, bool)
+    
+    def set_estimate_before_start(self, enabled):
+        """
+        设置启动攻击前是否估算所需时间
+        
+        Args:
+            enabled (bool): 是否估算
+        """
+        self.settings.setValue("estimate_before_start", enabled)
+    
+    def get_eta_warning_hours(self):
+        """
+        获取需要确认的预计时间
+        
+        Returns:
+            int: 小时数，预计时间超过该值时需要确认
+        """
+        return max(1, int(self.settings.value("eta_warning_hours", 24)))
+    
+    def set_eta_warning_hours(self, hours):
+        """
+        设置需要确认的预计时间
+        
+        Args:
+            hours (int): 小时数
+        """
+        self.settings.setValue("eta_warning_hours", hours)
+    
+    def get_apply_tuning(self):
+        """
+        获取是否自动使用调优结果
+        
+        Returns:
+            bool: 是否自动使用
+        """
+        return self.settings.value("apply_tuning", True, bool)
+    
+    def set_apply_tuning(self, enabled):
+        """
+        设置是否自动使用调优结果
+        
+        Args:
+            enabled (bool): 是否自动使用
+        """
+        self.settings.setValue("apply_tuning", enabled)
+    
+    def get_use_async_runner(self):
+        """
+        获取是否使用asyncio执行引擎
+        
+        Returns:
+            bool: 是否使用
+        """
+        return self.settings.value("use_async_runner", False, bool)
+    
+    def set_use_async_runner(self, enabled):
+        """
+        设置是否使用asyncio执行引擎，重启后生效
+        
+        Args:
+            enabled (bool): 是否使用
+        """
+        self.settings.setValue("use_async_runner", enabled)
+    
+    def get_ui_refresh_fps(self):
+        """
+        获取界面刷新频率
+        
+        Returns:
+            int: 每秒刷新次数
+        """
+        return int(self.settings.value("ui_refresh_fps", 10))
+    
+    def set_ui_refresh_fps(self, fps):
+        """
+        设置界面刷新频率
+        
+        Args:
+            fps (int): 每秒刷新次数
+        """
+        self.settings.setValue("ui_refresh_fps", fps)
+    
     def load_settings(self):
         """
         加载所有设置
@@ -301,9 +546,10 @@ class ConfigManager:
         """
         config = {}
         for key in self.default_config.keys():
-            if key in ["save_output"]:
+            if key in ["save_output", "sync_john_to_potfile", "estimate_before_start", "apply_tuning",
+                       "use_async_runner"]:
                 config[key] = self.settings.value(key, self.default_config[key], bool)
-            elif key in ["font_size"]:
+            elif key in ["font_size", "ui_refresh_fps", "scheduler_default_limit", "eta_warning_hours"]:
                 config[key] = int(self.settings.value(key, self.default_config[key]))
             else:
                 config[key] = self.settings.value(key, self.default_config[key])
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+破解结果库 - 把hashcat的potfile和John的pot文件统一索引，按hashcat格式查询已破解结果
+"""
+
+import os
+import re
+import binascii
+
+from hashcat_gui.core.potfile_index import PotfileIndex
+
+
+# John对部分格式使用带标签的哈希，标签后面就是hashcat使用的哈希值
+JOHN_PLAIN_TAGS = ('$NT$', '$LM$', '$SHA256$', '$SHA512$')
+
+# John的dynamic格式: $dynamic_N$hash[$salt]，盐值中有特殊字符时写作 HEX$十六进制
+JOHN_DYNAMIC_REGEX = re.compile(r'^\$dynamic_\d+\$([0-9a-fA-F]+)(?:\$(.*))?$')
+
+# 哈希过长时John只在pot文件中保存哈希的摘要，无法还原
+JOHN_SOURCE_HASH_TAG = '$SOURCE_HASH$'
+
+
+def convert_john_hash(hash_text):
+    """
+    把John pot文件中的哈希转换为hashcat格式
+
+    Args:
+        hash_text (str): John格式的哈希
+
+    Returns:
+        str: hashcat格式的哈希，无法转换时返回None
+    """
+    if hash_text.startswith(JOHN_SOURCE_HASH_TAG):
+        return None
+
+    for tag in JOHN_PLAIN_TAGS:
+        if hash_text.startswith(tag):
+            return hash_text[len(tag):]
+
+    match = JOHN_DYNAMIC_REGEX.match(hash_text)
+    if match:
+        hash_val, salt = match.groups()
+        if salt is None:
+            return hash_val
+        if salt.startswith('HEX$'):
+            try:
+                salt = binascii.unhexlify(salt[4:]).decode('utf-8')
+            except (binascii.Error, UnicodeDecodeError):
+                return None
+        return f"{hash_val}:{salt}"
+
+    if hash_text.startswith('$dynamic_'):
+        return None
+
+    # 其他格式（如$pkzip2$、$krb5tgs$、bcrypt）两边相同
+    return hash_text
+
+
+def convert_john_line(line):
+    """
+    把John pot文件中的一行转换为hashcat potfile格式
+
+    Args:
+        line (str): John pot文件中的一行
+
+    Returns:
+        str: hashcat格式的行 hash:password，无法转换时返回None
+    """
+    if not line or ':' not in line:
+        return None
+
+    # 带标签的哈希中不含冒号，第一个冒号之后都是密码
+    if line.startswith('$'):
+        hash_text, password = line.split(':', 1)
+        converted = convert_john_hash(hash_text)
+        if converted is None:
+            return None
+        return f"{converted}:{password}"
+
+    return line
+
+
+class CrackedStore:
+    """破解结果库类，同时查询hashcat potfile和John pot文件中的破解结果"""
+
+    # 结果来源名称
+    SOURCE_HASHCAT = 'hashcat'
+    SOURCE_JOHN = 'john'
+
+    def __init__(self, potfile_path, john_pot_path=None):
+        """
+        初始化破解结果库
+
+        Args:
+            potfile_path (str): hashcat potfile路径
+            john_pot_path (str, optional): John pot文件路径
+        """
+        self.potfile_path = potfile_path
+        self.john_pot_path = john_pot_path
+        # 只为存在的pot文件打开索引，避免在pot文件旁创建空的索引文件
+        self.indexes = {}
+        if os.path.exists(potfile_path):
+            self.indexes[self.SOURCE_HASHCAT] = PotfileIndex(potfile_path)
+        if (john_pot_path and os.path.exists(john_pot_path)
+                and os.path.abspath(john_pot_path) != os.path.abspath(potfile_path)):
+            self.indexes[self.SOURCE_JOHN] = PotfileIndex(
+                john_pot_path, source_format=self.SOURCE_JOHN, line_converter=convert_john_line
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """关闭所有索引"""
+        for index in self.indexes.values():
+            index.close()
+
+    def update(self):
+        """
+        把所有pot文件中新追加的内容同步到索引中
+
+        Returns:
+            int: 本次新读取的行数
+        """
+        return sum(index.update() for index in self.indexes.values())
+
+    def lookup(self, matcher):
+        """
+        在所有pot文件中查询目标哈希的破解结果，同一个哈希优先使用hashcat potfile中的结果
+
+        Args:
+            matcher (HashMatcher): 哈希匹配器
+
+        Returns:
+            list: 匹配结果列表，每个元素是 (规范键, hashcat格式的哈希, 密码, 来源)
+        """
+        results = []
+        seen = set()
+        for source, index in self.indexes.items():
+            for key, hash_val, password in index.lookup(matcher):
+                if key not in seen:
+                    seen.add(key)
+                    results.append((key, hash_val, password, source))
+        return results
+
+    def sync_to_potfile(self, matches):
+        """
+        把只存在于John pot文件中的破解结果追加到hashcat potfile，hashcat启动时会跳过这些哈希
+
+        Args:
+            matches (list): lookup返回的匹配结果
+
+        Returns:
+            int: 追加的结果数量
+        """
+        lines = [f"{hash_val}:{password}\n" for _, hash_val, password, source in matches
+                 if source != self.SOURCE_HASHCAT]
+        if not lines:
+            return 0
+
+        # potfile最后一行可能没有换行符
+        needs_newline = False
+        if os.path.exists(self.potfile_path) and os.path.getsize(self.potfile_path) > 0:
+            with open(self.potfile_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b'\n'
+
+        with open(self.potfile_path, 'a', encoding='utf-8', newline='') as f:
+            if needs_newline:
+                f.write('\n')
+            f.writelines(lines)
+        return len(lines)
@@ -0,0 +1,915 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Hashcat执行引擎 - 不依赖Qt的hashcat进程运行器，通过回调报告输出、状态和破解结果
+
+引擎使用 subprocess 和后台线程，可以在没有显示器的服务器上运行（例如守护进程）；
+图形界面中的 HashcatRunner 是引擎的Qt适配，把回调转换为信号。回调在引擎的后台线程中调用。
+"""
+
+import os
+import re
+import time
+import codecs
+import threading
+import subprocess
+
+from hashcat_gui.core.hash_keys import HashMatcher, canonical_key
+from hashcat_gui.core.command_builder import build_crack_args
+from hashcat_gui.core.cracked_store import CrackedStore
+from hashcat_gui.core.job_workspace import JobWorkspace
+from hashcat_gui.core.potfile_tailer import PotfileTailer, parse_potfile_line
+from hashcat_gui.core.session_manager import SessionManager, build_session_args
+from hashcat_gui.core.workload_tuner import get_tuning_for
+from hashcat_gui.core.runtime_budget import (RuntimeBudget, DECISION_CONTINUE, DECISION_CHECKPOINT,
+                                             OVERRUN_TOLERANCE)
+from hashcat_gui.core.status_parser import (StatusParser, StatusJsonParser, HashcatStatus,
+                                            EVENT_STATUS as PARSER_EVENT_STATUS)
+
+
+# 引擎事件及回调参数
+EVENT_OUTPUT = 'output'        # 输出文本 (text)
+EVENT_ERROR = 'error'          # 错误文本 (text)
+EVENT_STATUS = 'status'        # 状态信息 (status_info)
+EVENT_STATUS_JSON = 'status_json'  # JSON状态 (HashcatStatus)，仅在 --status-json 模式下发出
+EVENT_CRACKED = 'cracked'      # 破解结果 (hash, password)
+EVENT_FINISHED = 'finished'    # 进程结束 (exit_code)
+
+ENGINE_EVENTS = (EVENT_OUTPUT, EVENT_ERROR, EVENT_STATUS, EVENT_STATUS_JSON, EVENT_CRACKED, EVENT_FINISHED)
+
+# 读取输出文件和检查超时的间隔（秒）
+POLL_INTERVAL = 0.5
+
+# 停止进程后等待进程退出的时间（秒），超时后强制终止
+STOP_GRACE_SECONDS = 2
+
+# 发送检查点命令后等待hashcat停止的时间（秒），超时后直接停止
+CHECKPOINT_GRACE_SECONDS = 60
+
+# 每次从管道读取的最大字节数
+READ_CHUNK_SIZE = 65536
+
+# 任务目录中交给hashcat的哈希列表，去掉了只在John pot文件中破解的哈希
+LEFT_HASH_FILE_NAME = 'left.hash'
+
+# 特殊格式的破解结果（例如pkzip）
+PKZIP_REGEX = re.compile(r'(\$pkzip2\$[^:]+):\s+(\S+)')
+
+
+def kill_process(process):
+    """
+    强制终止进程，进程已经退出时不做任何事
+
+    Args:
+        process: subprocess.Popen 或 asyncio.subprocess.Process
+    """
+    if process.returncode is not None:
+        return
+    try:
+        process.kill()
+    except ProcessLookupError:
+        pass
+
+
+class HashcatEngine:
+    """Hashcat执行引擎类，一个引擎同时只运行一个hashcat进程"""
+
+    def __init__(self, hashcat_path, john_pot_path=None, apply_tuning=True, jobs_dir=None, sync_john=False):
+        """
+        初始化执行引擎
+
+        Args:
+            hashcat_path (str): hashcat可执行文件路径
+            john_pot_path (str, optional): John pot文件路径，启动前同时从中取出已有的破解结果
+            apply_tuning (bool): 参数中没有指定调优项时是否使用保存的调优结果
+            jobs_dir (str, optional): 任务目录，默认为应用数据目录下的jobs
+            sync_john (bool): 启动前是否把只在John pot文件中的结果追加到hashcat potfile
+        """
+        self.hashcat_path = hashcat_path
+        self.john_pot_path = john_pot_path
+        self.apply_tuning = apply_tuning
+        self.sync_john = sync_john
+        self.session_manager = SessionManager(jobs_dir)
+        self.process = None
+        self.params = None
+        self.workspace = None
+        self.start_time = None
+        self.exit_code = None
+        self.last_session = None               # 上一个结束的任务的会话记录
+        self.budget_decision = None            # 时间预算做出的停止决策，没有停止时为None
+        self.processed_hashes = set()          # 已发送的破解结果的规范键，避免重复
+
+        self._listeners = {event: [] for event in ENGINE_EVENTS}
+        self._lock = threading.RLock()
+        self._finished = threading.Event()
+        self._finished.set()
+        self._session = None
+        self._status_parser = StatusParser()
+        self._budget = RuntimeBudget()
+        self._outfile_tailer = None
+        self._potfile_tailer = None
+        self._target_hashes = None
+        self._temp_hash_file_path = None
+        self._john_only_keys = set()           # 只在John pot文件中破解的目标哈希的规范键
+        self._budget_deadline = None
+        self._checkpoint_deadline = None
+        self._kill_deadline = None
+
+    @classmethod
+    def from_config(cls, config_manager):
+        """
+        根据配置创建执行引擎
+
+        Args:
+            config_manager: 配置管理器实例
+
+        Returns:
+            HashcatEngine: 执行引擎
+        """
+        return cls(config_manager.get_hashcat_path(), config_manager.get_john_pot_path() or None,
+                   config_manager.get_apply_tuning(), sync_john=config_manager.get_sync_john_to_potfile())
+
+    def add_listener(self, event, callback):
+        """
+        注册事件回调
+
+        Args:
+            event (str): 事件名称，见 ENGINE_EVENTS
+            callback (callable): 回调函数，参数见事件定义
+        """
+        self._listeners[event].append(callback)
+
+    def remove_listener(self, event, callback):
+        """
+        取消注册事件回调
+
+        Args:
+            event (str): 事件名称
+            callback (callable): 回调函数
+        """
+        if callback in self._listeners[event]:
+            self._listeners[event].remove(callback)
+
+    def _emit(self, event, *args):
+        """调用事件的所有回调，回调出错不影响引擎运行"""
+        for callback in list(self._listeners[event]):
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"引擎事件 {event} 的回调出错: {e}")
+
+    def is_running(self):
+        """
+        是否有任务正在运行（包括进程结束后读取结果的过程）
+
+        Returns:
+            bool: 是否正在运行
+        """
+        return not self._finished.is_set()
+
+    def wait(self, timeout=None):
+        """
+        等待任务结束
+
+        Args:
+            timeout (float, optional): 最长等待时间（秒）
+
+        Returns:
+            int: 退出代码，超时时返回None
+        """
+        if not self._finished.wait(timeout):
+            return None
+        return self.exit_code
+
+    def run(self, params):
+        """
+        运行破解任务并等待结束
+
+        Args:
+            params (dict): 破解参数字典
+
+        Returns:
+            int: 退出代码，启动失败时返回None
+        """
+        if not self.start(params):
+            return None
+        return self.wait()
+
+    def start(self, params):
+        """
+        开始破解过程
+
+        Args:
+            params (dict): 破解参数字典
+
+        Returns:
+            bool: 是否成功启动破解
+        """
+        prepared = self._prepare_start(params)
+        if prepared is None:
+            return False
+        if not self._launch(prepared[0]):
+            # 没有运行起来的任务不保留任务目录
+            self.workspace.remove()
+            return False
+
+        self._session = self.session_manager.begin(self.workspace, prepared[1], self._temp_hash_file_path)
+        return True
+
+    def resume(self, job_id):
+        """
+        从检查点恢复中断的任务，hashcat使用检查点中保存的原始命令行继续运行
+
+        Args:
+            job_id (str): 任务ID
+
+        Returns:
+            bool: 是否成功启动恢复
+        """
+        record = self._prepare_resume(job_id)
+        if record is None or not self._launch([self.hashcat_path] + record.restore_args()):
+            return False
+
+        self.session_manager.resume(record)
+        self._session = record
+        return True
+
+    def _prepare_start(self, params):
+        """
+        准备新任务：重置状态、创建任务目录并构建命令行
+
+        Args:
+            params (dict): 破解参数字典
+
+        Returns:
+            tuple: (命令行参数, 会话名称)，无法启动时返回None
+        """
+        params = dict(params)
+        if not self._prepare_run(params):
+            return None
+
+        # 每个任务使用独立的工作目录，输出文件和检查点不会被其他任务覆盖
+        self.workspace = JobWorkspace(params.get('job_id'), self.session_manager.jobs_dir)
+        self.workspace.save_params(params)
+        session = params.get('session') or f"job_{self.workspace.job_id}"
+
+        # 指定了输出文件时使用指定的文件，否则使用任务目录中的输出文件
+        output_file = None
+        if not params.get('skip_output'):
+            output_file = params.get('output_file') or self.workspace.outfile_path
+            self._outfile_tailer = PotfileTailer(output_file)
+            self._outfile_tailer.seek_to_end()
+
+        # John已经破解的哈希不交给hashcat，避免重复破解
+        crack_params = params
+        if params.get('hash_file') and self._john_only_keys:
+            crack_params = dict(params, hash_file=self._write_left_hash_file(params['hash_file']))
+
+        tuning = get_tuning_for(params, use_saved=self.apply_tuning)
+        cmd_args = [self.hashcat_path] + build_crack_args(
+            crack_params, build_session_args(self.workspace, session), tuning, output_file,
+            self._default_potfile_path())
+        return cmd_args, session
+
+    def _prepare_resume(self, job_id):
+        """
+        准备从检查点恢复任务
+
+        Args:
+            job_id (str): 任务ID
+
+        Returns:
+            SessionRecord: 任务的会话记录，无法恢复时返回None
+        """
+        record = self.session_manager.get(job_id)
+        if record is None or not record.is_resumable:
+            self._emit(EVENT_ERROR, f"任务 {job_id} 没有可以恢复的检查点")
+            return None
+
+        params = self.session_manager.load_params(record)
+        if record.temp_hash_file:
+            params['_temp_hash_file'] = True
+        if not self._prepare_run(params):
+            return None
+
+        self.workspace = JobWorkspace(job_id, self.session_manager.jobs_dir)
+        if not params.get('skip_output'):
+            # 恢复后hashcat继续写入原来的输出文件
+            self._outfile_tailer = PotfileTailer(params.get('output_file') or self.workspace.outfile_path)
+            self._outfile_tailer.seek_to_end()
+
+        self._emit(EVENT_OUTPUT, f"正在从检查点恢复任务 {job_id}...")
+        return record
+
+    def stop(self):
+        """
+        停止破解进程，进程没有及时退出时强制终止
+
+        Returns:
+            bool: 是否有进程需要停止
+        """
+        if not self._process_alive():
+            return False
+        try:
+            self.process.terminate()
+        except ProcessLookupError:
+            # 检查之后进程刚好退出
+            return False
+        with self._lock:
+            self._kill_deadline = time.time() + STOP_GRACE_SECONDS
+        return True
+
+    def checkpoint_and_stop(self):
+        """
+        让hashcat在下一个检查点停止，停止后可以通过 --restore 从检查点继续
+
+        Returns:
+            bool: 是否发送了检查点命令
+        """
+        if not self._process_alive():
+            return False
+        # 相当于在hashcat中按下 c 键
+        try:
+            self._write_stdin(b'c')
+        except OSError as e:
+            self._emit(EVENT_ERROR, f"发送检查点命令失败: {str(e)}")
+            return False
+        with self._lock:
+            self._checkpoint_deadline = time.time() + CHECKPOINT_GRACE_SECONDS
+        return True
+
+    def _process_alive(self):
+        """hashcat进程是否仍在运行"""
+        return self.process is not None and self.process.poll() is None
+
+    def _write_stdin(self, data):
+        """
+        向hashcat进程的标准输入写入数据
+
+        Args:
+            data (bytes): 写入的数据
+        """
+        self.process.stdin.write(data)
+        self.process.stdin.flush()
+
+    def read_results(self):
+        """通过potfile索引读取上一个任务（或正在运行的任务）的全部破解结果，没有任务时不做任何事"""
+        if self.params:
+            self._read_results_from_potfile()
+
+    def scan_output(self, text):
+        """
+        检测其他命令（例如 --show）的输出中的破解结果
+
+        Args:
+            text (str): 命令的输出
+        """
+        for line in text.splitlines():
+            self._handle_output_line(line)
+
+    def _default_potfile_path(self):
+        """hashcat所在目录下的默认potfile"""
+        return os.path.join(os.path.dirname(self.hashcat_path), "hashcat.potfile")
+
+    def _get_current_potfile_path(self):
+        """
+        获取当前任务使用的potfile路径
+
+        Returns:
+            str: potfile路径，没有当前任务时返回None
+        """
+        if not self.params:
+            return None
+        return self.params.get('potfile_path') or self._default_potfile_path()
+
+    def _prepare_run(self, params):
+        """
+        启动hashcat前重置任务状态，并取出已有的破解结果
+
+        Args:
+            params (dict): 破解参数字典
+
+        Returns:
+            bool: 是否可以启动
+        """
+        if self.is_running():
+            self._emit(EVENT_ERROR, "已有任务正在运行")
+            return False
+
+        # 检查Hashcat路径是否存在
+        if not self.hashcat_path or not os.path.exists(self.hashcat_path):
+            self._emit(EVENT_ERROR, "Hashcat可执行文件路径无效，请在设置中配置")
+            return False
+
+        self.params = params
+        self.exit_code = None
+        self._target_hashes = None
+        self._outfile_tailer = None
+        self._potfile_tailer = None
+        # --status-json 模式下解析JSON状态记录，否则解析文本状态块
+        self._status_parser = StatusJsonParser() if params.get('status_json') else StatusParser()
+        # 每次运行（包括从检查点恢复）使用新的时间预算
+        self._budget = RuntimeBudget(params.get('time_budget'))
+        self.budget_decision = None
+        self._budget_deadline = None
+        self._checkpoint_deadline = None
+        self._kill_deadline = None
+
+        # 检查是否有临时哈希文件
+        self._temp_hash_file_path = params['hash_file'] if params.get('_temp_hash_file') and params.get('hash_file') else None
+
+        # 启动前先取出potfile和John pot文件中已有的破解结果，避免重复破解
+        self._john_only_keys = set()
+        potfile_path = self._get_current_potfile_path()
+        if params.get('hash_file'):
+            self._load_known_results(params['hash_file'], potfile_path)
+
+        # 运行期间只读取potfile中新追加的行，已有的结果在任务结束时通过索引读取
+        self._potfile_tailer = PotfileTailer(potfile_path)
+        self._potfile_tailer.seek_to_end()
+        return True
+
+    def _launch(self, cmd_args):
+        """
+        启动hashcat进程和读取输出的后台线程
+
+        Args:
+            cmd_args (list): 命令行参数，第一个元素是hashcat路径
+
+        Returns:
+            bool: 是否成功启动
+        """
+        self._emit(EVENT_OUTPUT, f"运行命令: {' '.join(cmd_args)}")
+        try:
+            # 设置工作目录为hashcat所在的目录
+            process = subprocess.Popen(cmd_args, cwd=os.path.dirname(self.hashcat_path) or None,
+                                       stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError as e:
+            self._emit(EVENT_ERROR, f"启动Hashcat进程失败: {str(e)}")
+            return False
+
+        self._on_launched(process)
+        readers = [
+            threading.Thread(target=self._read_stream, args=(process.stdout, self._handle_stdout), daemon=True),
+            threading.Thread(target=self._read_stream, args=(process.stderr, self._handle_stderr), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        threading.Thread(target=self._monitor, args=(process, readers), daemon=True).start()
+        return True
+
+    def _on_launched(self, process):
+        """
+        进程启动后开始计时
+
+        Args:
+            process: hashcat进程
+        """
+        self.process = process
+        self.start_time = time.time()
+        self._finished.clear()
+
+        if self._budget.enabled:
+            self._budget.start(self.start_time)
+            self._budget_deadline = self.start_time + self._budget.budget * (1 + OVERRUN_TOLERANCE)
+            self._emit(EVENT_OUTPUT, f"时间预算: {self._budget.budget} 秒")
+
+    def _read_stream(self, stream, handler):
+        """
+        在后台线程中读取进程的输出，按UTF-8解码后交给处理函数
+
+        Args:
+            stream: 进程的标准输出或标准错误
+            handler (callable): 处理解码后文本的函数
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        try:
+            while True:
+                data = stream.read1(READ_CHUNK_SIZE)
+                if not data:
+                    break
+                text = decoder.decode(data)
+                if text:
+                    try:
+                        handler(text)
+                    except Exception as e:
+                        # 继续读取输出，否则hashcat会因为管道写满而阻塞
+                        self._emit(EVENT_ERROR, f"处理Hashcat输出时出错: {str(e)}")
+        except (OSError, ValueError):
+            pass
+        text = decoder.decode(b'', final=True)
+        if text:
+            handler(text)
+
+    def _monitor(self, process, readers):
+        """
+        在后台线程中等待进程结束，期间定时读取新的破解结果并检查超时
+
+        Args:
+            process (subprocess.Popen): hashcat进程
+            readers (list): 读取输出的线程
+        """
+        exit_code = None
+        try:
+            while True:
+                try:
+                    exit_code = process.wait(POLL_INTERVAL)
+                    break
+                except subprocess.TimeoutExpired:
+                    self._poll_results()
+                    self._check_deadlines(process)
+        except Exception as e:
+            # 无法继续监视时终止进程，结束处理仍然执行，否则任务一直处于运行状态
+            self._emit(EVENT_ERROR, f"监视Hashcat进程时出错: {str(e)}")
+            kill_process(process)
+            exit_code = process.wait()
+        finally:
+            # 读取完剩余的输出后再处理进程结束
+            for reader in readers:
+                reader.join()
+            self._handle_finished(exit_code)
+
+    def _check_deadlines(self, process):
+        """检查时间预算、检查点和停止的超时"""
+        now = time.time()
+        with self._lock:
+            if self._budget_deadline is not None and now >= self._budget_deadline:
+                self._budget_deadline = None
+                self._on_budget_timeout()
+            if self._checkpoint_deadline is not None and now >= self._checkpoint_deadline:
+                self._checkpoint_deadline = None
+                self._emit(EVENT_OUTPUT, "等待检查点超时，直接停止任务")
+                self.stop()
+            if self._kill_deadline is not None and now >= self._kill_deadline:
+                self._kill_deadline = None
+                kill_process(process)
+
+    def _handle_stdout(self, data):
+        """处理标准输出"""
+        self._emit(EVENT_OUTPUT, data)
+        for kind, payload in self._status_parser.feed(data):
+            self._dispatch_event(kind, payload)
+
+    def _handle_stderr(self, data):
+        """处理标准错误"""
+        self._emit(EVENT_ERROR, data)
+
+    def _handle_finished(self, exit_code):
+        """
+        处理进程结束
+
+        Args:
+            exit_code (int): 退出代码
+        """
+        try:
+            # 处理输出中剩余的不完整行和状态块
+            for kind, payload in self._status_parser.flush():
+                self._dispatch_event(kind, payload)
+
+            # 记录会话结束，检查点仍然存在时任务可以之后恢复
+            session = None
+            resumable = False
+            if self._session is not None:
+                session = self.last_session = self.session_manager.finish(self._session, exit_code)
+                self._session = None
+                resumable = session.is_resumable
+
+            with self._lock:
+                self._budget_deadline = None
+                self._checkpoint_deadline = None
+                self._kill_deadline = None
+
+            # 读取输出文件中最后写入的破解结果，再通过索引读取potfile中的全部结果
+            self._poll_results()
+            self._emit(EVENT_OUTPUT, "检测到任务已完成或中断，正在从 potfile 文件读取结果...")
+            self._read_results_from_potfile()
+
+            started = time.strftime("%c", time.localtime(self.start_time))
+            stopped = time.strftime("%c", time.localtime())
+            self._emit(EVENT_OUTPUT, f"Started: {started}\nStopped: {stopped}")
+
+            # 任务可以恢复时保留临时哈希文件和任务目录，恢复时还要使用
+            if resumable:
+                self._emit(EVENT_OUTPUT, f"任务已中断，检查点已保存，下次可以从检查点继续（任务 {session.job_id}）")
+                self._temp_hash_file_path = None
+            else:
+                self._cleanup_temp_hash_file()
+                # 输出文件中的结果已经读取，任务目录中只剩下明文密码，不再保留
+                if session is not None:
+                    self.session_manager.discard(session)
+        except Exception as e:
+            self._emit(EVENT_ERROR, f"处理任务结束时出错: {str(e)}")
+        finally:
+            # 结束处理出错时也要结束任务，否则 is_running() 一直为True
+            self.exit_code = exit_code
+            self._emit(EVENT_FINISHED, exit_code)
+            self._finished.set()
+
+    def _cleanup_temp_hash_file(self):
+        """清理临时哈希文件"""
+        temp_file_path = self._temp_hash_file_path
+        self._temp_hash_file_path = None
+        if temp_file_path and os.path.exists(temp_file_path):
+            try:
+                os.remove(temp_file_path)
+                self._emit(EVENT_OUTPUT, f"已清理临时哈希文件: {temp_file_path}")
+            except OSError as e:
+                self._emit(EVENT_ERROR, f"清理临时文件时出错: {str(e)}")
+
+    def _dispatch_event(self, kind, payload):
+        """
+        处理状态解析器产生的一个事件
+
+        Args:
+            kind (str): 事件类型
+            payload: 状态信息或输出行
+        """
+        if kind == PARSER_EVENT_STATUS:
+            self._handle_status(payload)
+        else:
+            self._handle_output_line(payload)
+
+    def _handle_status(self, status_info):
+        """
+        处理一个完整的状态块
+
+        Args:
+            status_info (dict | HashcatStatus): 状态信息，JSON模式下为HashcatStatus
+        """
+        if isinstance(status_info, HashcatStatus):
+            self._emit(EVENT_STATUS_JSON, status_info)
+            status_info = status_info.to_status_info()
+
+        self._emit(EVENT_STATUS, status_info)
+        self._apply_budget(status_info)
+
+        recovered = status_info.get('recovered_count', 0)
+        total = status_info.get('recovered_total', 0)
+        if recovered > 0 and total > 0:
+            self._emit(EVENT_OUTPUT, f"破解进度: {recovered}/{total} ({recovered/total*100:.2f}%)")
+
+    def _handle_output_line(self, line):
+        """
+        处理一行非状态输出
+
+        Args:
+            line (str): 输出行
+        """
+        # 哈希已在potfile中时不需要运行 --show，任务结束时会通过索引读取potfile中的结果
+        if "All hashes found as potfile" in line:
+            self._emit(EVENT_OUTPUT, "检测到哈希已存在于potfile中，任务结束后读取破解结果")
+            return
+
+        # 检测特殊格式的破解结果（例如pkzip）
+        pkzip_match = PKZIP_REGEX.match(line)
+        if pkzip_match:
+            hash_val = pkzip_match.group(1)
+            self._emit(EVENT_OUTPUT, f"检测到PKZIP格式结果: {hash_val}:{pkzip_match.group(2)}")
+            self._emit_cracked([(hash_val, hash_val, pkzip_match.group(2))])
+
+    def _apply_budget(self, status_info):
+        """
+        根据时间预算决定任务是否停止
+
+        Args:
+            status_info (dict): 状态信息
+        """
+        with self._lock:
+            if self.budget_decision is not None:
+                return
+
+            decision = self._budget.decide(status_info)
+            if decision == DECISION_CONTINUE:
+                return
+
+            self.budget_decision = decision
+            self._budget_deadline = None
+            if decision == DECISION_CHECKPOINT:
+                self._emit(EVENT_OUTPUT, f"{self._budget.reason}，将在下一个检查点停止，之后可以从检查点继续")
+                self.checkpoint_and_stop()
+            else:
+                self._emit(EVENT_OUTPUT, f"{self._budget.reason}，提前停止任务")
+                self.stop()
+
+    def _on_budget_timeout(self):
+        """超出时间预算仍然没有做出决策时（例如没有状态输出），在检查点停止"""
+        if self.budget_decision is None:
+            self.budget_decision = DECISION_CHECKPOINT
+            self._emit(EVENT_OUTPUT, "已超出时间预算，将在下一个检查点停止，之后可以从检查点继续")
+            self.checkpoint_and_stop()
+
+    def _poll_results(self):
+        """读取输出文件中新写入的破解结果，没有输出文件时读取potfile中新追加的行"""
+        tailer = self._outfile_tailer or self._potfile_tailer
+        if tailer is None:
+            return
+
+        try:
+            lines = tailer.read_new_lines()
+        except OSError as e:
+            self._emit(EVENT_OUTPUT, f"读取输出文件时出错: {str(e)}")
+            return
+        if not lines:
+            return
+
+        hash_file = self.params.get('hash_file')
+        matcher = self._load_target_hashes(hash_file) if hash_file else None
+
+        matches = []
+        for line in lines:
+            match = matcher.match_line(line) if matcher is not None else None
+            if match is None:
+                # potfile中其他任务的结果不发送
+                if tailer is self._potfile_tailer:
+                    continue
+                # 不属于目标哈希的行按 hash:password 处理
+                entry = parse_potfile_line(line)
+                if not entry:
+                    continue
+                match = (entry[0], entry[0], entry[1])
+            matches.append(match)
+        self._emit_cracked(matches)
+
+    def _load_target_hashes(self, hash_file):
+        """
+        读取当前哈希文件中的所有哈希值，同一个任务中只读取一次
+
+        Args:
+            hash_file (str): 哈希文件路径
+
+        Returns:
+            HashMatcher: 当前哈希文件的匹配器，读取失败时返回None
+        """
+        with self._lock:
+            if self._target_hashes is not None:
+                return self._target_hashes
+
+            matcher = HashMatcher(
+                hash_mode=self.params.get('hash_mode'),
+                username=bool(self.params.get('username'))
+            )
+            try:
+                with open(hash_file, 'r', encoding='utf-8', errors='ignore') as f:
+                    for line in f:
+                        matcher.add(line)
+                self._emit(EVENT_OUTPUT, f"从哈希文件中读取到 {len(matcher)} 个哈希值")
+            except OSError as e:
+                self._emit(EVENT_OUTPUT, f"读取哈希文件时出错: {str(e)}")
+                return None
+
+            self._target_hashes = matcher
+            return matcher
+
+    def _emit_cracked(self, matches):
+        """
+        发送尚未处理过的破解结果
+
+        Args:
+            matches (iterable): 匹配结果，每个元素是 (规范键, 哈希值, 密码)
+
+        Returns:
+            int: 新发送的结果数量
+        """
+        new_matches = []
+        with self._lock:
+            for key, hash_val, password in matches:
+                if key not in self.processed_hashes:
+                    self.processed_hashes.add(key)
+                    new_matches.append((hash_val, password))
+
+        for hash_val, password in new_matches:
+            self._emit(EVENT_CRACKED, hash_val, password)
+        return len(new_matches)
+
+    def _read_results_from_potfile(self):
+        """通过potfile索引读取当前任务的破解结果"""
+        hash_file = self.params.get('hash_file')
+        potfile_path = self._get_current_potfile_path()
+        if not hash_file or not os.path.exists(potfile_path):
+            return
+
+        matcher = self._load_target_hashes(hash_file)
+        if matcher is None:
+            return
+
+        # 索引的数据库连接只能在创建它的线程中使用，每次读取时重新打开
+        try:
+            with CrackedStore(potfile_path, self.john_pot_path) as cracked_store:
+                cracked_store.update()
+                matches = [match[:3] for match in cracked_store.lookup(matcher)]
+            result_count = self._emit_cracked(matches)
+            self._emit(EVENT_OUTPUT, f"从 potfile 文件中读取到 {result_count} 条相关破解结果")
+        except Exception as e:
+            self._emit(EVENT_OUTPUT, f"读取 potfile 文件时出错: {str(e)}")
+
+    def _load_known_results(self, hash_file, potfile_path):
+        """
+        启动前从potfile和John pot文件中取出已破解的结果
+
+        设置了 sync_john 时，只存在于John pot文件中的结果会追加到hashcat的potfile，hashcat启动时就会跳过这些哈希；
+        否则不修改用户的potfile，记录这些哈希，启动时从交给hashcat的哈希列表中去掉。
+        参数中有 _known_results（find_known_results 的结果）时不再查询索引。
+
+        Args:
+            hash_file (str): 哈希文件路径
+            potfile_path (str): hashcat potfile路径
+        """
+        matcher = self._load_target_hashes(hash_file)
+        if matcher is None:
+            return
+
+        try:
+            # 分片执行器已经查询过时直接使用查询结果
+            matches = self.params.get('_known_results')
+            synced = 0
+            if matches is None:
+                matches, synced = self._query_known_results(matcher, potfile_path)
+            if not matches:
+                return
+            if not self.sync_john:
+                self._john_only_keys = {match[0] for match in matches
+                                        if match[3] != CrackedStore.SOURCE_HASHCAT}
+
+            result_count = self._emit_cracked(match[:3] for match in matches)
+            self._emit(EVENT_OUTPUT, f"启动前找到 {result_count} 条已破解的结果")
+            if synced:
+                self._emit(EVENT_OUTPUT, f"已将 {synced} 条 John 破解结果同步到 potfile")
+        except Exception as e:
+            self._emit(EVENT_OUTPUT, f"读取已破解结果时出错: {str(e)}")
+
+    def _query_known_results(self, matcher, potfile_path):
+        """
+        通过potfile和John pot文件的索引查询已破解的结果，设置了 sync_john 时把John的结果追加到potfile
+
+        Args:
+            matcher (HashMatcher): 目标哈希的匹配器
+            potfile_path (str): hashcat potfile路径
+
+        Returns:
+            tuple: (匹配结果列表，每个元素是 (规范键, 哈希值, 密码, 来源), 同步到potfile的结果数量)
+        """
+        with CrackedStore(potfile_path, self.john_pot_path) as cracked_store:
+            cracked_store.update()
+            matches = cracked_store.lookup(matcher)
+            synced = cracked_store.sync_to_potfile(matches) if self.sync_john and matches else 0
+        return matches, synced
+
+    def find_known_results(self, params):
+        """
+        查询哈希文件在potfile和John pot文件中已破解的结果，不启动任务
+
+        分片执行时只查询一次，结果作为 _known_results 参数交给所有分片，分片启动时不再各自更新和查询同一个索引。
+
+        Args:
+            params (dict): 破解参数字典
+
+        Returns:
+            list: 匹配结果列表，每个元素是 (规范键, 哈希值, 密码, 来源)，读取失败时返回None
+        """
+        matcher = HashMatcher(hash_mode=params.get('hash_mode'), username=bool(params.get('username')))
+        potfile_path = params.get('potfile_path') or self._default_potfile_path()
+        try:
+            with open(params['hash_file'], 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    matcher.add(line)
+            matches, synced = self._query_known_results(matcher, potfile_path)
+        except Exception as e:
+            self._emit(EVENT_OUTPUT, f"读取已破解结果时出错: {str(e)}")
+            return None
+
+        if synced:
+            self._emit(EVENT_OUTPUT, f"已将 {synced} 条 John 破解结果同步到 potfile")
+        return matches
+
+    def _write_left_hash_file(self, hash_file):
+        """
+        把哈希文件中没有被John破解的行写入任务目录，交给hashcat破解
+
+        Args:
+            hash_file (str): 哈希文件路径
+
+        Returns:
+            str: 交给hashcat的哈希文件路径，全部已被John破解或写入失败时返回原哈希文件
+        """
+        left_path = self.workspace.path(LEFT_HASH_FILE_NAME)
+        hash_mode = self.params.get('hash_mode')
+        username = bool(self.params.get('username'))
+        left_count = 0
+        try:
+            with open(hash_file, 'rb') as source, open(left_path, 'wb') as target:
+                for raw_line in source:
+                    key = canonical_key(raw_line.decode('utf-8', errors='ignore'), hash_mode, username)
+                    if not key or key in self._john_only_keys:
+                        continue
+                    target.write(raw_line if raw_line.endswith(b'\n') else raw_line + b'\n')
+                    left_count += 1
+        except OSError as e:
+            self._emit(EVENT_OUTPUT, f"写入未破解的哈希列表时出错: {str(e)}")
+            return hash_file
+
+        # hashcat不接受空的哈希文件
+        if not left_count:
+            return hash_file
+        self._emit(EVENT_OUTPUT, f"已从交给hashcat的哈希列表中去掉 {len(self._john_only_keys)} 个John已破解的哈希")
+        return left_path
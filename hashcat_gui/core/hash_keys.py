@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+哈希规范化 - 把哈希文件和potfile中的哈希转换成统一的键，用于直接查找匹配
+"""
+
+import re
+
+
+# 容器格式的哈希，John格式的哈希行中会带有文件名等额外字段
+CONTAINER_PATTERNS = {
+    'pkzip2': re.compile(r'\$pkzip2\$.*?\$/pkzip2\$'),
+    'zip2': re.compile(r'\$zip2\$.*?\$/zip2\$'),
+}
+
+# 哈希模式对应的容器格式
+MODE_CONTAINERS = {
+    13600: 'zip2',
+    17200: 'pkzip2',
+    17210: 'pkzip2',
+    17220: 'pkzip2',
+    17225: 'pkzip2',
+    17230: 'pkzip2',
+}
+
+HEX_REGEX = re.compile(r'^[0-9a-fA-F]+$')
+
+
+def normalize_field(field):
+    """
+    规范化哈希中的一个字段，十六进制字段统一为小写
+
+    Args:
+        field (str): 字段文本
+
+    Returns:
+        str: 规范化后的字段
+    """
+    field = field.strip()
+    if HEX_REGEX.match(field):
+        return field.lower()
+    return field
+
+
+def get_container_patterns(hash_mode=None):
+    """
+    获取哈希模式可能使用的容器格式
+
+    Args:
+        hash_mode (int, optional): 哈希模式，未指定时尝试所有容器格式
+
+    Returns:
+        list: 容器格式的正则表达式列表
+    """
+    if hash_mode is None:
+        return list(CONTAINER_PATTERNS.values())
+    container = MODE_CONTAINERS.get(int(hash_mode))
+    return [CONTAINER_PATTERNS[container]] if container else []
+
+
+def canonical_key(hash_line, hash_mode=None, username=False):
+    """
+    计算哈希文件中一行哈希的规范键
+
+    Args:
+        hash_line (str): 哈希文件中的一行
+        hash_mode (int, optional): 哈希模式
+        username (bool): 哈希行是否带有用户名前缀（hashcat的--username）
+
+    Returns:
+        str: 规范键，空行返回None
+    """
+    line = hash_line.strip()
+    if username and ':' in line:
+        line = line.split(':', 1)[1]
+    if not line:
+        return None
+
+    # 容器格式只取容器本身，忽略文件名等字段
+    for pattern in get_container_patterns(hash_mode):
+        match = pattern.search(line)
+        if match:
+            return match.group(0)
+
+    return ':'.join(normalize_field(field) for field in line.split(':'))
+
+
+def key_head(key):
+    """
+    获取规范键的第一个字段，potfile索引按这个字段查找
+
+    Args:
+        key (str): 规范键
+
+    Returns:
+        str: 第一个字段
+    """
+    return key.split(':', 1)[0]
+
+
+class HashMatcher:
+    """哈希匹配器类，根据目标哈希的规范键，用集合查找的方式匹配potfile中的行"""
+
+    def __init__(self, hash_lines=(), hash_mode=None, username=False):
+        """
+        初始化哈希匹配器
+
+        Args:
+            hash_lines (iterable): 哈希文件中的行
+            hash_mode (int, optional): 哈希模式
+            username (bool): 哈希行是否带有用户名前缀
+        """
+        self.hash_mode = hash_mode
+        self.username = username
+        self.keys = set()
+        self.max_fields = 1
+        self.bloom = None
+        self._containers = get_container_patterns(hash_mode)
+        for line in hash_lines:
+            self.add(line)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def add(self, hash_line):
+        """
+        添加一个目标哈希
+
+        Args:
+            hash_line (str): 哈希文件中的一行
+
+        Returns:
+            str: 规范键，空行返回None
+        """
+        key = canonical_key(hash_line, self.hash_mode, self.username)
+        if key:
+            self.keys.add(key)
+            self.max_fields = max(self.max_fields, key.count(':') + 1)
+        return key
+
+    def prefilter(self, bloom):
+        """
+        创建只包含布隆过滤器的匹配器，用于发送到工作进程中做预筛选
+
+        Args:
+            bloom (BloomFilter): 由本匹配器的规范键构建的布隆过滤器
+
+        Returns:
+            HashMatcher: 不包含规范键集合的匹配器
+        """
+        prefilter = HashMatcher(hash_mode=self.hash_mode, username=self.username)
+        prefilter.max_fields = self.max_fields
+        prefilter.bloom = bloom
+        return prefilter
+
+    def _candidate_keys(self, line):
+        """
+        生成potfile一行中可能的规范键，从长到短排列
+
+        Args:
+            line (str): 去掉首尾空白的potfile行
+
+        Yields:
+            tuple: (规范键, 哈希部分, 密码)
+        """
+        for pattern in self._containers:
+            match = pattern.match(line)
+            if match and line[match.end():match.end() + 1] == ':':
+                key = match.group(0)
+                yield key, key, line[match.end() + 1:]
+
+        fields = line.split(':', self.max_fields)
+        for count in range(min(self.max_fields, len(fields) - 1), 0, -1):
+            key = ':'.join(normalize_field(field) for field in fields[:count])
+            yield key, ':'.join(fields[:count]), ':'.join(fields[count:])
+
+    def is_candidate(self, line):
+        """
+        用布隆过滤器判断potfile中的一行是否可能属于目标哈希
+
+        Args:
+            line (str): potfile中的一行
+
+        Returns:
+            bool: 可能匹配时返回True，一定不匹配时返回False
+        """
+        line = line.strip()
+        if not line or line.startswith('#') or ':' not in line:
+            return False
+
+        members = self.bloom if self.bloom is not None else self.keys
+        return any(key in members for key, _, _ in self._candidate_keys(line))
+
+    def heads(self):
+        """
+        获取所有目标哈希规范键的第一个字段
+
+        Returns:
+            set: 第一个字段的集合
+        """
+        return {key_head(key) for key in self.keys}
+
+    def match_line(self, line):
+        """
+        匹配potfile中的一行
+
+        potfile的格式是 hash[:salt...]:password，密码中也可能包含冒号，
+        因此按目标哈希的最大字段数从长到短尝试，每次都是一次集合查找。
+
+        Args:
+            line (str): potfile中的一行
+
+        Returns:
+            tuple: (规范键, potfile中的哈希部分, 密码)，不匹配时返回None
+        """
+        line = line.strip()
+        if not line or line.startswith('#') or ':' not in line:
+            return None
+
+        for candidate in self._candidate_keys(line):
+            if candidate[0] in self.keys:
+                return candidate
+        return None
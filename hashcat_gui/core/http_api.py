@@ -0,0 +1,429 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+本地HTTP接口 - 通过JSON提交破解任务、查询和取消任务，并以长轮询或SSE的方式增量获取破解结果
+
+接口由守护进程（daemon.py）提供，任务参数与界面的 UIComponents.get_parameters 相同:
+    GET  /status                 正在运行的任务及其最近一次的状态、等待运行的任务数量
+    GET  /jobs                   所有任务
+    GET  /jobs/<任务ID>          任务信息和最近一次的状态
+    POST /jobs                   提交任务 {"params": {...}, "priority": 0, "hashes": ["hash", ...]}
+                                 没有 hash_file 时使用 hashes 中的哈希值，任务结束后删除上传的哈希文件
+    POST /jobs/<任务ID>/cancel   取消任务
+    GET  /cracks?since=1&job=<任务ID>&timeout=30
+                                 长轮询，返回序号不小于 since 的破解结果，没有新结果时最多等待 timeout 秒
+    GET  /cracks/stream?since=1&job=<任务ID>
+                                 以SSE（text/event-stream）推送破解结果，断线重连时使用 Last-Event-ID 继续
+
+破解结果的序号从1开始递增，只保存在内存中，守护进程重启后重新开始。
+
+所有请求都要在 X-LovelyHashcat-Token 头中带上共享密钥（没有指定时启动时自动生成），
+POST 请求的 Content-Type 必须是 application/json。带有 Origin 头的请求来自浏览器中的网页，一律拒绝。
+任务参数只接受 API_PARAM_KEYS 中的参数，输出文件、potfile路径等由守护进程决定；参数类型不正确、
+文件路径和掩码等以 - 开头（会被hashcat当作选项）时返回400。
+"""
+
+import os
+import json
+import time
+import uuid
+import secrets
+import itertools
+import threading
+import collections
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from hashcat_gui.core.app_paths import get_data_dir
+from hashcat_gui.core.work_coordinator import TOKEN_HEADER, JOB_PARAM_KEYS
+
+
+# 内存中保存的破解结果的最大数量，超出后丢弃最早的结果
+MAX_LOG_ENTRIES = 100000
+
+# 一次返回的破解结果的最大数量
+MAX_BATCH = 1000
+
+# 长轮询的最长等待时间（秒）
+MAX_POLL_TIMEOUT = 60
+
+# SSE连接没有新结果时发送保活注释的间隔（秒）
+SSE_KEEPALIVE_SECONDS = 15
+
+# 上传的哈希文件保存的目录
+UPLOAD_DIR_NAME = 'uploads'
+
+# 通过接口提交任务时接受的参数，其余参数（输出文件、potfile路径、会话名称等）会被忽略
+API_PARAM_KEYS = JOB_PARAM_KEYS + ('hash_file', 'devices', 'skip', 'limit', 'time_budget', 'status_json',
+                                   'hwmon_temp_abort')
+
+# 必须是非负整数的参数
+API_INT_KEYS = ('hash_mode', 'attack_mode', 'skip', 'limit', 'time_budget', 'hwmon_temp_abort')
+
+# 必须是字符串的参数，它们作为hashcat的位置参数或选项值传入，不能以 - 开头，否则会被hashcat当作选项
+API_STR_KEYS = ('hash_file', 'dict_file', 'rule_file', 'dict_file1', 'dict_file2', 'mask',
+                'custom_charset1', 'custom_charset2', 'custom_charset3', 'custom_charset4')
+
+# 必须是布尔值的参数
+API_BOOL_KEYS = ('username', 'status_json')
+
+# 支持的攻击模式，与 command_builder.build_attack_mode_args 相同
+API_ATTACK_MODES = (0, 1, 3, 6, 7)
+
+
+class CrackLog:
+    """破解结果日志类，每条结果有递增的序号，客户端通过序号增量读取"""
+
+    def __init__(self, max_entries=MAX_LOG_ENTRIES):
+        """
+        初始化破解结果日志
+
+        Args:
+            max_entries (int): 保存的最大结果数量
+        """
+        self._entries = collections.deque(maxlen=max_entries)
+        self._next_seq = 1
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def append(self, job_id, hash_val, password):
+        """
+        添加一条破解结果，并唤醒等待中的客户端
+
+        Args:
+            job_id (str): 任务ID
+            hash_val (str): 哈希值
+            password (str): 密码
+        """
+        with self._cond:
+            self._entries.append({
+                'seq': self._next_seq,
+                'job_id': job_id,
+                'hash': hash_val,
+                'password': password,
+                'time': time.time(),
+            })
+            self._next_seq += 1
+            self._cond.notify_all()
+
+    def close(self):
+        """唤醒所有等待中的客户端，之后不再等待"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def since(self, seq, job_id=None, timeout=0, limit=MAX_BATCH):
+        """
+        读取序号不小于 seq 的破解结果，没有结果时最多等待 timeout 秒
+
+        Args:
+            seq (int): 起始序号
+            job_id (str, optional): 只读取该任务的结果
+            timeout (float): 最长等待时间（秒）
+            limit (int): 最多返回的数量
+
+        Returns:
+            tuple: (破解结果列表, 下一次读取使用的序号)
+        """
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                entries = self._collect(seq, job_id, limit)
+                remaining = deadline - time.time()
+                if entries or remaining <= 0 or self._closed:
+                    break
+                self._cond.wait(remaining)
+
+            # 返回的数量达到上限时从最后一条继续，否则跳过其他任务的结果
+            if len(entries) >= limit:
+                return entries, entries[-1]['seq'] + 1
+            return entries, max(seq, self._next_seq)
+
+    def _collect(self, seq, job_id, limit):
+        """取出序号不小于 seq 的结果，序号连续，可以直接计算起始位置"""
+        if not self._entries:
+            return []
+        start = max(0, seq - self._entries[0]['seq'])
+        entries = (entry for entry in itertools.islice(self._entries, start, None)
+                   if job_id is None or entry['job_id'] == job_id)
+        return list(itertools.islice(entries, limit))
+
+
+def _is_device_id(value):
+    """设备编号是正整数或只包含数字的字符串"""
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return value > 0
+    return isinstance(value, str) and value.isascii() and value.isdigit()
+
+
+def validate_api_params(params):
+    """
+    检查通过接口提交的任务参数的类型和取值，并把设备列表转换为字符串列表
+
+    Args:
+        params (dict): 白名单过滤后的任务参数
+
+    Returns:
+        str: 错误信息，参数有效时返回None
+    """
+    for key in API_INT_KEYS:
+        value = params.get(key)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+            return f"参数 {key} 必须是非负整数"
+
+    for key in API_STR_KEYS:
+        value = params.get(key)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            return f"参数 {key} 必须是字符串"
+        if value.startswith('-'):
+            return f"参数 {key} 不能以 - 开头"
+
+    for key in API_BOOL_KEYS:
+        if params.get(key) is not None and not isinstance(params[key], bool):
+            return f"参数 {key} 必须是布尔值"
+
+    if params.get('attack_mode') is not None and params['attack_mode'] not in API_ATTACK_MODES:
+        return f"不支持的攻击模式: {params['attack_mode']}"
+
+    devices = params.get('devices')
+    if devices is not None:
+        if not isinstance(devices, list) or not all(_is_device_id(device) for device in devices):
+            return '参数 devices 必须是设备编号列表'
+        params['devices'] = [str(device) for device in devices]
+    return None
+
+
+def save_uploaded_hashes(hashes):
+    """
+    把上传的哈希值保存为哈希文件
+
+    Args:
+        hashes (list): 哈希值列表
+
+    Returns:
+        str: 哈希文件路径
+    """
+    upload_dir = os.path.join(get_data_dir(), UPLOAD_DIR_NAME)
+    os.makedirs(upload_dir, exist_ok=True)
+    path = os.path.join(upload_dir, f"{uuid.uuid4().hex}.txt")
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for hash_line in hashes:
+            hash_line = str(hash_line).strip()
+            if hash_line:
+                f.write(hash_line + '\n')
+    return path
+
+
+class JobApiServer:
+    """本地HTTP接口类，把请求转发给守护进程"""
+
+    def __init__(self, daemon, host='127.0.0.1', port=0, token=None):
+        """
+        初始化HTTP接口
+
+        Args:
+            daemon (CrackingDaemon): 守护进程
+            host (str): 监听地址
+            port (int): 监听端口，0表示自动选择
+            token (str, optional): 共享密钥，请求必须带上该密钥，不指定时自动生成
+        """
+        self.daemon = daemon
+        self.token_generated = not token
+        self.token = token or secrets.token_urlsafe(24)
+        self.cracks = CrackLog()
+        self._stopped = threading.Event()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+        daemon.add_crack_listener(self.cracks.append)
+
+    @property
+    def address(self):
+        """接口的地址，例如 http://127.0.0.1:8766"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """在后台线程中启动HTTP服务"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止HTTP服务，正在等待的长轮询和SSE连接立即返回"""
+        self._stopped.set()
+        self.cracks.close()
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def submit(self, data):
+        """
+        提交任务
+
+        Args:
+            data (dict): 请求内容，包括 params、priority 和可选的 hashes
+
+        Returns:
+            tuple: (HTTP状态码, 响应内容)
+        """
+        params = data.get('params')
+        if not isinstance(params, dict):
+            return 400, {'error': '缺少任务参数 params'}
+
+        # 只接受白名单中的参数，内部参数和输出路径由程序设置
+        params = {key: params[key] for key in API_PARAM_KEYS if params.get(key) is not None}
+        if params.get('hash_mode') is None:
+            return 400, {'error': '缺少哈希模式 hash_mode'}
+        error = validate_api_params(params)
+        if error:
+            return 400, {'error': error}
+
+        hashes = data.get('hashes')
+        if not params.get('hash_file'):
+            if not hashes or not isinstance(hashes, list):
+                return 400, {'error': '缺少哈希文件 hash_file 或哈希值 hashes'}
+            if not all(isinstance(hash_line, str) for hash_line in hashes):
+                return 400, {'error': '哈希值 hashes 必须是字符串列表'}
+            try:
+                params['hash_file'] = save_uploaded_hashes(hashes)
+            except OSError as e:
+                return 500, {'error': f"保存哈希文件失败: {str(e)}"}
+            params['_temp_hash_file'] = True
+        elif not os.path.exists(params['hash_file']):
+            return 400, {'error': f"哈希文件不存在: {params['hash_file']}"}
+
+        try:
+            priority = int(data.get('priority', 0))
+        except (TypeError, ValueError):
+            return 400, {'error': '优先级 priority 必须是整数'}
+
+        job = self.daemon.enqueue(params, priority, data.get('device_group'))
+        return 201, {'job': self.daemon.get_job(job.job_id)}
+
+    def _make_handler(self):
+        """
+        创建HTTP请求处理类
+
+        Returns:
+            type: BaseHTTPRequestHandler的子类
+        """
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, code, body):
+                body = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _authorized(self):
+                # 浏览器中的网页发出的请求会带有Origin头，接口只供本地程序调用
+                if self.headers.get('Origin') is not None:
+                    self._send(403, {'error': '不接受来自浏览器的请求'})
+                    return False
+                token = self.headers.get(TOKEN_HEADER, '').encode('utf-8', errors='ignore')
+                if not secrets.compare_digest(token, api.token.encode('utf-8')):
+                    self._send(403, {'error': '密钥错误'})
+                    return False
+                return True
+
+            def _route(self):
+                url = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                return [part for part in url.path.split('/') if part], query
+
+            def _int_arg(self, query, key, default):
+                try:
+                    return int(query.get(key, default))
+                except ValueError:
+                    return default
+
+            def _poll_cracks(self, query):
+                timeout = min(max(0, self._int_arg(query, 'timeout', 0)), MAX_POLL_TIMEOUT)
+                entries, next_seq = api.cracks.since(self._int_arg(query, 'since', 1), query.get('job'), timeout)
+                self._send(200, {'cracks': entries, 'next': next_seq})
+
+            def _stream_cracks(self, query):
+                seq = self._int_arg(query, 'since', 1)
+                last_event_id = self.headers.get('Last-Event-ID')
+                if last_event_id and last_event_id.isdigit():
+                    seq = int(last_event_id) + 1
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.close_connection = True
+
+                try:
+                    while not api._stopped.is_set():
+                        entries, seq = api.cracks.since(seq, query.get('job'), SSE_KEEPALIVE_SECONDS)
+                        if not entries:
+                            self.wfile.write(b': keepalive\n\n')
+                        for entry in entries:
+                            data = json.dumps(entry, ensure_ascii=False)
+                            self.wfile.write(f"id: {entry['seq']}\nevent: crack\ndata: {data}\n\n".encode('utf-8'))
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def do_GET(self):
+                if not self._authorized():
+                    return
+                parts, query = self._route()
+                if parts == ['status']:
+                    self._send(200, api.daemon.summary())
+                elif parts == ['jobs']:
+                    self._send(200, {'jobs': api.daemon.list_jobs()})
+                elif len(parts) == 2 and parts[0] == 'jobs':
+                    job = api.daemon.get_job(parts[1])
+                    if job is None:
+                        self._send(404, {'error': '任务不存在'})
+                    else:
+                        self._send(200, {'job': job})
+                elif parts == ['cracks']:
+                    self._poll_cracks(query)
+                elif parts == ['cracks', 'stream']:
+                    self._stream_cracks(query)
+                else:
+                    self._send(404, {'error': '未知的接口'})
+
+            def do_POST(self):
+                if not self._authorized():
+                    return
+                if self.headers.get_content_type() != 'application/json':
+                    self._send(415, {'error': 'Content-Type 必须是 application/json'})
+                    return
+                try:
+                    length = int(self.headers.get('Content-Length', 0))
+                    data = json.loads(self.rfile.read(length) or b'{}')
+                except ValueError:
+                    self._send(400, {'error': '请求格式错误'})
+                    return
+                if not isinstance(data, dict):
+                    self._send(400, {'error': '请求格式错误'})
+                    return
+
+                parts, _ = self._route()
+                if parts == ['jobs']:
+                    self._send(*api.submit(data))
+                elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'cancel':
+                    if api.daemon.get_job(parts[1]) is None:
+                        self._send(404, {'error': '任务不存在'})
+                    else:
+                        self._send(200, {'cancelled': bool(api.daemon.cancel(parts[1]))})
+                else:
+                    self._send(404, {'error': '未知的接口'})
+
+        return Handler
@@ -0,0 +1,367 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+任务队列 - 保存等待运行的破解任务，按优先级和设备组的并发限制选出下一个要运行的任务
+"""
+
+import os
+import json
+import time
+
+from hashcat_gui.core.app_paths import get_data_dir
+from hashcat_gui.core.job_workspace import new_job_id
+
+
+# 任务状态
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_FINISHED = 'finished'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+# 已经结束的任务状态
+JOB_DONE_STATES = (JOB_FINISHED, JOB_FAILED, JOB_CANCELLED)
+
+# hashcat表示任务正常结束的退出代码（0: 已全部破解，1: 已穷尽）
+SUCCESS_EXIT_CODES = (0, 1)
+
+# 任务意外中断后自动从检查点恢复的最大次数，避免反复在同一位置失败
+MAX_AUTO_RESUMES = 3
+
+# 没有指定设备时使用的设备组
+DEFAULT_DEVICE_GROUP = 'default'
+
+# 队列文件名称
+QUEUE_FILE_NAME = 'queue.json'
+
+
+def device_group_of(params):
+    """
+    根据破解参数中的设备计算设备组，使用相同设备的任务属于同一个设备组
+
+    Args:
+        params (dict): 破解参数字典
+
+    Returns:
+        str: 设备组名称，例如 default、1,2
+    """
+    devices = params.get('devices')
+    if not devices:
+        return DEFAULT_DEVICE_GROUP
+    return ','.join(sorted(str(device) for device in devices))
+
+
+def finished_job_state(exit_code, cancelled=False, shutting_down=False, budget_stopped=False,
+                       resumable=False, resume_count=0):
+    """
+    根据任务结束的情况决定任务的新状态
+
+    Args:
+        exit_code (int): hashcat退出代码
+        cancelled (bool): 任务是否被取消
+        shutting_down (bool): 是否因为程序退出而停止
+        budget_stopped (bool): 是否因为时间预算而停止
+        resumable (bool): 是否保存了可以恢复的检查点
+        resume_count (int): 任务已经自动恢复的次数
+
+    Returns:
+        str: 任务状态，意外中断后需要从检查点继续时为 JOB_QUEUED
+    """
+    if shutting_down and not cancelled:
+        # 正在运行的任务保留在队列中，下次启动时重新运行
+        return JOB_QUEUED
+    if cancelled:
+        return JOB_CANCELLED
+    if exit_code in SUCCESS_EXIT_CODES:
+        return JOB_FINISHED
+    if budget_stopped:
+        # 达到时间预算后停止，检查点保留，下次启动时可以选择继续
+        return JOB_FINISHED
+    if resumable and resume_count < MAX_AUTO_RESUMES:
+        # 任务意外中断，重新排队后从检查点继续
+        return JOB_QUEUED
+    return JOB_FAILED
+
+
+def parse_group_limits(text):
+    """
+    解析设备组并发限制文本，格式为 设备组=数量，多个设备组用分号分隔
+
+    Args:
+        text (str): 例如 default=1; 1,2=2
+
+    Returns:
+        dict: 设备组到并发数量的映射，格式错误的部分会被忽略
+    """
+    limits = {}
+    for part in (text or '').split(';'):
+        group, sep, value = part.partition('=')
+        if not sep:
+            continue
+        try:
+            limits[group.strip() or DEFAULT_DEVICE_GROUP] = max(1, int(value.strip()))
+        except ValueError:
+            continue
+    return limits
+
+
+def format_group_limits(limits):
+    """
+    把设备组并发限制格式化为文本
+
+    Args:
+        limits (dict): 设备组到并发数量的映射
+
+    Returns:
+        str: 例如 default=1; 1,2=2
+    """
+    return '; '.join(f"{group}={limit}" for group, limit in limits.items())
+
+
+class Job:
+    """破解任务类，保存任务参数、优先级和运行状态"""
+
+    def __init__(self, params, priority=0, device_group=None, job_id=None):
+        """
+        初始化破解任务
+
+        Args:
+            params (dict): 破解参数字典
+            priority (int): 优先级，数值越大越先运行
+            device_group (str, optional): 设备组，默认根据参数中的设备计算
+            job_id (str, optional): 任务ID，默认生成新的ID
+        """
+        self.job_id = job_id or new_job_id()
+        self.params = dict(params)
+        self.priority = int(priority)
+        self.device_group = device_group or device_group_of(params)
+        self.state = JOB_QUEUED
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.exit_code = None
+        self.cracked = 0
+
+    @property
+    def name(self):
+        """任务名称，使用哈希文件名"""
+        return os.path.basename(self.params.get('hash_file') or '') or self.job_id
+
+    def to_dict(self):
+        """
+        转换为可以保存为JSON的字典
+
+        Returns:
+            dict: 任务信息
+        """
+        return {
+            'job_id': self.job_id,
+            'params': self.params,
+            'priority': self.priority,
+            'device_group': self.device_group,
+            'state': self.state,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+            'exit_code': self.exit_code,
+            'cracked': self.cracked,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从字典创建任务
+
+        Args:
+            data (dict): to_dict 返回的任务信息
+
+        Returns:
+            Job: 破解任务
+        """
+        job = cls(data.get('params') or {}, data.get('priority', 0), data.get('device_group'), data.get('job_id'))
+        job.state = data.get('state', JOB_QUEUED)
+        job.created = data.get('created', job.created)
+        job.started = data.get('started')
+        job.finished = data.get('finished')
+        job.exit_code = data.get('exit_code')
+        job.cracked = data.get('cracked', 0)
+        return job
+
+
+class JobQueue:
+    """任务队列类，任务保存在JSON文件中，程序重启后队列不会丢失"""
+
+    def __init__(self, path=None):
+        """
+        初始化任务队列并读取已保存的任务
+
+        Args:
+            path (str, optional): 队列文件路径，默认为应用数据目录下的queue.json
+        """
+        self.path = path or os.path.join(get_data_dir(), QUEUE_FILE_NAME)
+        self.jobs = []
+        self.load()
+
+    def load(self):
+        """读取已保存的任务，上次退出时仍在运行的任务重新排队"""
+        self.jobs = []
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"读取任务队列失败: {e}")
+            return
+
+        for item in data.get('jobs', []):
+            job = Job.from_dict(item)
+            if job.state == JOB_RUNNING:
+                job.state = JOB_QUEUED
+            self.jobs.append(job)
+
+    def save(self):
+        """
+        保存队列，先写入临时文件再替换，避免写入中断时损坏队列文件
+
+        Returns:
+            bool: 是否保存成功
+        """
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'jobs': [job.to_dict() for job in self.jobs]}, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+            return True
+        except (OSError, TypeError) as e:
+            print(f"保存任务队列失败: {e}")
+            return False
+
+    def add(self, params, priority=0, device_group=None):
+        """
+        添加任务
+
+        Args:
+            params (dict): 破解参数字典
+            priority (int): 优先级，数值越大越先运行
+            device_group (str, optional): 设备组
+
+        Returns:
+            Job: 新添加的任务
+        """
+        job = Job(params, priority, device_group)
+        self.jobs.append(job)
+        self.save()
+        return job
+
+    def get(self, job_id):
+        """
+        按ID查找任务
+
+        Args:
+            job_id (str): 任务ID
+
+        Returns:
+            Job: 任务，不存在时返回None
+        """
+        for job in self.jobs:
+            if job.job_id == job_id:
+                return job
+        return None
+
+    def remove(self, job_id):
+        """
+        删除任务
+
+        Args:
+            job_id (str): 任务ID
+
+        Returns:
+            bool: 是否删除了任务
+        """
+        job = self.get(job_id)
+        if job is None:
+            return False
+        self.jobs.remove(job)
+        self.save()
+        return True
+
+    def clear_finished(self):
+        """
+        删除所有已经结束的任务
+
+        Returns:
+            int: 删除的任务数量
+        """
+        count = len(self.jobs)
+        self.jobs = [job for job in self.jobs if job.state not in JOB_DONE_STATES]
+        self.save()
+        return count - len(self.jobs)
+
+    def pending(self):
+        """
+        获取等待运行的任务，按优先级从高到低、添加时间从早到晚排列
+
+        Returns:
+            list: 任务列表
+        """
+        jobs = [job for job in self.jobs if job.state == JOB_QUEUED]
+        jobs.sort(key=lambda job: (-job.priority, job.created))
+        return jobs
+
+    def running(self):
+        """
+        获取正在运行的任务
+
+        Returns:
+            list: 任务列表
+        """
+        return [job for job in self.jobs if job.state == JOB_RUNNING]
+
+    def next_job(self, limits=None, default_limit=1):
+        """
+        选出下一个可以运行的任务，设备组中正在运行的任务数量不能超过并发限制
+
+        Args:
+            limits (dict, optional): 设备组到并发数量的映射
+            default_limit (int): 没有单独设置的设备组的并发数量
+
+        Returns:
+            Job: 下一个任务，没有可以运行的任务时返回None
+        """
+        limits = limits or {}
+        running = {}
+        for job in self.running():
+            running[job.device_group] = running.get(job.device_group, 0) + 1
+
+        for job in self.pending():
+            if running.get(job.device_group, 0) < limits.get(job.device_group, default_limit):
+                return job
+        return None
+
+    def mark_running(self, job):
+        """
+        标记任务开始运行
+
+        Args:
+            job (Job): 任务
+        """
+        job.state = JOB_RUNNING
+        job.started = time.time()
+        self.save()
+
+    def mark_done(self, job, state, exit_code=None):
+        """
+        标记任务结束
+
+        Args:
+            job (Job): 任务
+            state (str): 结束状态
+            exit_code (int, optional): 进程退出代码
+        """
+        job.state = state
+        job.finished = time.time()
+        job.exit_code = exit_code
+        self.save()
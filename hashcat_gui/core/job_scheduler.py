@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+任务调度器 - 按优先级和设备组的并发限制运行队列中的破解任务，每个任务使用独立的执行器
+"""
+
+from PySide6.QtCore import QObject, Signal, QTimer
+
+from hashcat_gui.core.hashcat_runner import HashcatRunner
+from hashcat_gui.core.job_queue import JobQueue, JOB_FAILED, JOB_CANCELLED, JOB_QUEUED, finished_job_state
+
+
+class JobScheduler(QObject):
+    """任务调度器类，管理任务队列和每个正在运行的任务的执行器"""
+
+    # 定义信号
+    queue_changed = Signal()  # 队列变化信号
+    job_started = Signal(str)  # 任务开始信号（任务ID）
+    job_finished = Signal(str, int)  # 任务结束信号（任务ID，退出代码）
+    output_ready = Signal(str)  # 输出信号
+    password_found = Signal(str, str)  # 密码找到信号
+    status_update = Signal(str, dict)  # 状态更新信号（任务ID，状态信息）
+
+    def __init__(self, config_manager, queue=None):
+        """
+        初始化任务调度器
+
+        Args:
+            config_manager: 配置管理器实例
+            queue (JobQueue, optional): 任务队列，默认使用应用数据目录下的队列
+        """
+        super().__init__()
+        self.config_manager = config_manager
+        self.queue = queue or JobQueue()
+        self.runners = {}
+        self._cancelled = set()
+        self._resume_counts = {}
+        self._shutting_down = False
+        # 上次退出时还有未完成的任务时先暂停，由用户决定是否继续
+        self._paused = bool(self.queue.pending())
+
+    def is_paused(self):
+        """
+        队列是否已暂停
+
+        Returns:
+            bool: 是否已暂停
+        """
+        return self._paused
+
+    def is_busy(self):
+        """
+        是否有任务正在运行
+
+        Returns:
+            bool: 是否有任务正在运行
+        """
+        return bool(self.runners)
+
+    def start(self):
+        """开始运行队列中的任务"""
+        self._paused = False
+        self.schedule()
+
+    def pause(self):
+        """暂停队列，正在运行的任务不受影响，之后不再启动新的任务"""
+        self._paused = True
+
+    def enqueue(self, params, priority=0, device_group=None):
+        """
+        把任务加入队列
+
+        Args:
+            params (dict): 破解参数字典
+            priority (int): 优先级，数值越大越先运行
+            device_group (str, optional): 设备组，默认根据参数中的设备计算
+
+        Returns:
+            Job: 新加入的任务
+        """
+        job = self.queue.add(params, priority, device_group)
+        self.output_ready.emit(f"任务 {job.job_id} 已加入队列（{job.name}，优先级 {job.priority}）")
+        self.queue_changed.emit()
+        self.schedule()
+        return job
+
+    def cancel(self, job_id):
+        """
+        取消任务，正在运行的任务会被停止
+
+        Args:
+            job_id (str): 任务ID
+
+        Returns:
+            bool: 是否取消了任务
+        """
+        job = self.queue.get(job_id)
+        if job is None:
+            return False
+
+        runner = self.runners.get(job_id)
+        if runner is not None:
+            self._cancelled.add(job_id)
+            return runner.stop_cracking()
+
+        if job.state == JOB_QUEUED:
+            self.queue.mark_done(job, JOB_CANCELLED)
+            self.queue_changed.emit()
+            return True
+        return False
+
+    def stop_all(self):
+        """暂停队列并停止所有正在运行的任务"""
+        self.pause()
+        for job_id in list(self.runners):
+            self.cancel(job_id)
+
+    def shutdown(self):
+        """程序退出时停止所有任务，正在运行的任务保留在队列中，下次启动时重新运行"""
+        self.pause()
+        self._shutting_down = True
+        for runner in self.runners.values():
+            runner.stop_cracking()
+
+    def clear_finished(self):
+        """删除所有已经结束的任务"""
+        if self.queue.clear_finished():
+            self.queue_changed.emit()
+
+    def get_limits(self):
+        """
+        获取设备组的并发限制
+
+        Returns:
+            tuple: (设备组到并发数量的映射, 默认并发数量)
+        """
+        return self.config_manager.get_scheduler_group_limits(), self.config_manager.get_scheduler_default_limit()
+
+    def schedule(self):
+        """在并发限制允许的范围内启动等待中的任务"""
+        if self._paused:
+            return
+
+        limits, default_limit = self.get_limits()
+        while True:
+            job = self.queue.next_job(limits, default_limit)
+            if job is None:
+                break
+            self._start_job(job)
+
+    def _start_job(self, job):
+        """
+        为任务创建执行器并启动
+
+        Args:
+            job (Job): 任务
+        """
+        job_id = job.job_id
+        runner = HashcatRunner(self.config_manager)
+        runner.output_ready.connect(lambda text: self.output_ready.emit(f"[{job_id}] {text}"))
+        runner.error_occurred.connect(lambda text: self.output_ready.emit(f"[{job_id}] {text}"))
+        runner.password_found.connect(lambda hash_val, password: self._on_password_found(job_id, hash_val, password))
+        runner.status_update.connect(lambda status_info: self.status_update.emit(job_id, status_info))
+        runner.process_finished.connect(lambda exit_code, _: self._on_job_finished(job_id, exit_code))
+
+        params = dict(job.params)
+        # 任务目录使用队列任务的ID，中断后可以找到任务的检查点
+        params['job_id'] = job_id
+        # 同时运行的hashcat进程不能使用相同的会话名称
+        if not params.get('session'):
+            params['session'] = f"job_{job_id}"
+
+        # 有检查点时从检查点继续，不从头开始
+        record = runner.session_manager.get(job_id)
+        if record is not None and record.is_resumable:
+            self.output_ready.emit(f"任务 {job_id} 从检查点继续运行")
+            started = runner.resume_session(job_id)
+        else:
+            started = runner.start_cracking(params)
+
+        if not started:
+            self.queue.mark_done(job, JOB_FAILED)
+            self.output_ready.emit(f"任务 {job_id} 启动失败")
+            runner.deleteLater()
+            self.queue_changed.emit()
+            return
+
+        self.runners[job_id] = runner
+        self.queue.mark_running(job)
+        self.job_started.emit(job_id)
+        self.queue_changed.emit()
+
+    def _on_password_found(self, job_id, hash_val, password):
+        """记录任务破解的数量，并转发破解结果"""
+        job = self.queue.get(job_id)
+        if job is not None:
+            job.cracked += 1
+        self.password_found.emit(hash_val, password)
+
+    def _on_job_finished(self, job_id, exit_code):
+        """
+        处理任务结束，并启动下一个任务
+
+        Args:
+            job_id (str): 任务ID
+            exit_code (int): 退出代码
+        """
+        runner = self.runners.pop(job_id, None)
+        session = runner.last_session if runner is not None else None
+        resumable = session is not None and session.is_resumable
+        budget_stopped = runner is not None and runner.budget_decision is not None
+        if runner is not None:
+            runner.deleteLater()
+
+        job = self.queue.get(job_id)
+        if job is not None:
+            resume_count = self._resume_counts.get(job_id, 0)
+            state = finished_job_state(exit_code, job_id in self._cancelled, self._shutting_down,
+                                       budget_stopped, resumable, resume_count)
+            if state == JOB_QUEUED and not self._shutting_down:
+                # 任务意外中断，重新排队后从检查点继续
+                self._resume_counts[job_id] = resume_count + 1
+                self.output_ready.emit(f"任务 {job_id} 意外中断（退出代码: {exit_code}），将从检查点继续")
+            self.queue.mark_done(job, state, exit_code)
+
+            # 取消的任务不再需要检查点
+            if state == JOB_CANCELLED and resumable:
+                runner.session_manager.discard(session)
+        self._cancelled.discard(job_id)
+
+        self.job_finished.emit(job_id, exit_code)
+        self.queue_changed.emit()
+
+        # 执行器的信号处理结束后再启动下一个任务
+        QTimer.singleShot(0, self.schedule)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+任务工作目录 - 为每个破解任务创建独立的目录，保存输出文件等任务相关的文件
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+
+from hashcat_gui.core.app_paths import get_data_dir
+
+
+# 任务输出文件名称
+OUTFILE_NAME = 'cracked.out'
+
+# 任务参数文件名称
+PARAMS_FILE_NAME = 'job.json'
+
+
+def get_jobs_dir():
+    """
+    获取任务目录，不存在时自动创建
+
+    Returns:
+        str: 任务目录
+    """
+    jobs_dir = os.path.join(get_data_dir(), 'jobs')
+    os.makedirs(jobs_dir, exist_ok=True)
+    return jobs_dir
+
+
+def new_job_id():
+    """
+    生成新的任务ID，按创建时间排序
+
+    Returns:
+        str: 任务ID
+    """
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+class JobWorkspace:
+    """任务工作目录类，每个任务使用独立的目录，并发任务之间不会互相覆盖文件"""
+
+    def __init__(self, job_id=None, jobs_dir=None):
+        """
+        初始化任务工作目录，目录不存在时自动创建
+
+        Args:
+            job_id (str, optional): 任务ID，默认生成新的ID
+            jobs_dir (str, optional): 任务目录，默认为应用数据目录下的jobs
+        """
+        self.job_id = job_id or new_job_id()
+        self.directory = os.path.join(jobs_dir or get_jobs_dir(), self.job_id)
+        os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def outfile_path(self):
+        """任务的输出文件路径，hashcat通过 -o 把破解结果写入这个文件"""
+        return os.path.join(self.directory, OUTFILE_NAME)
+
+    @property
+    def params_path(self):
+        """任务参数文件路径"""
+        return os.path.join(self.directory, PARAMS_FILE_NAME)
+
+    def path(self, name):
+        """
+        获取任务目录中文件的路径
+
+        Args:
+            name (str): 文件名
+
+        Returns:
+            str: 文件路径
+        """
+        return os.path.join(self.directory, name)
+
+    def save_params(self, params):
+        """
+        保存任务参数，以下划线开头的内部参数不保存
+
+        Args:
+            params (dict): 破解参数字典
+
+        Returns:
+            bool: 是否保存成功
+        """
+        data = {key: value for key, value in params.items() if not key.startswith('_')}
+        try:
+            with open(self.params_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            return True
+        except (OSError, TypeError) as e:
+            print(f"保存任务参数失败: {e}")
+            return False
+
+    def remove(self):
+        """删除任务目录及其中的所有文件"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def load_params(self):
+        """
+        读取任务参数
+
+        Returns:
+            dict: 破解参数字典，读取失败时返回空字典
+        """
+        try:
+            with open(self.params_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
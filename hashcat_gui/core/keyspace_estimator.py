@@ -0,0 +1,395 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+密钥空间估算 - 在启动攻击前计算候选密码数量，结合基准测试速度估算所需时间，不依赖Qt
+"""
+
+import os
+import json
+import string
+
+from hashcat_gui.core.app_paths import get_cache_dir
+from hashcat_gui.core.benchmark_db import BenchmarkDB, run_benchmark
+
+
+# 内置字符集
+BUILTIN_CHARSETS = {
+    'l': string.ascii_lowercase,
+    'u': string.ascii_uppercase,
+    'd': string.digits,
+    'h': '0123456789abcdef',
+    'H': '0123456789ABCDEF',
+    's': ' ' + string.punctuation,
+    'a': string.ascii_lowercase + string.ascii_uppercase + string.digits + ' ' + string.punctuation,
+    'b': ''.join(chr(index) for index in range(256)),
+}
+
+# 基准测试结果用于估算速度的有效期（秒）
+SPEED_CACHE_TTL = 7 * 24 * 3600
+
+# 统计文件行数时每次读取的字节数
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def expand_charset(charset, custom_charsets=None):
+    """
+    展开字符集定义，例如 ?l?d 或 abc?u
+
+    Args:
+        charset (str): 字符集定义
+        custom_charsets (dict, optional): 自定义字符集，键为1-4
+
+    Returns:
+        set: 字符集合
+    """
+    chars = set()
+    index = 0
+    while index < len(charset):
+        char = charset[index]
+        if char == '?' and index + 1 < len(charset):
+            name = charset[index + 1]
+            if name in BUILTIN_CHARSETS:
+                chars.update(BUILTIN_CHARSETS[name])
+            elif name in '1234' and custom_charsets and custom_charsets.get(int(name)):
+                chars.update(custom_charsets[int(name)])
+            else:
+                chars.add(name)
+            index += 2
+        else:
+            chars.add(char)
+            index += 1
+    return chars
+
+
+def mask_keyspace(mask, custom_charsets=None):
+    """
+    计算掩码的候选密码数量
+
+    Args:
+        mask (str): 掩码，例如 ?u?l?l?d?d
+        custom_charsets (dict, optional): 自定义字符集定义，键为1-4
+
+    Returns:
+        int: 候选密码数量，空掩码返回0，掩码引用了未定义的自定义字符集时返回None
+    """
+    if not mask:
+        return 0
+
+    expanded = {}
+    for key, value in (custom_charsets or {}).items():
+        if value:
+            expanded[key] = expand_charset(value)
+
+    total = 1
+    index = 0
+    while index < len(mask):
+        if mask[index] == '?' and index + 1 < len(mask):
+            name = mask[index + 1]
+            if name in BUILTIN_CHARSETS:
+                total *= len(BUILTIN_CHARSETS[name])
+            elif name in '1234':
+                if int(name) not in expanded:
+                    return None
+                total *= len(expanded[int(name)])
+            index += 2
+        else:
+            index += 1
+    return total
+
+
+def parse_hcmask_line(line):
+    """
+    解析 .hcmask 文件中的一行，格式为 [字符集1,][字符集2,][字符集3,][字符集4,]掩码，\\, 表示逗号
+
+    Args:
+        line (str): 文件中的一行
+
+    Returns:
+        tuple: (掩码, 自定义字符集字典)，空行和注释返回None
+    """
+    line = line.rstrip('\r\n')
+    if not line or line.startswith('#'):
+        return None
+
+    fields = []
+    current = ''
+    index = 0
+    while index < len(line):
+        if line[index] == '\\' and index + 1 < len(line) and line[index + 1] == ',':
+            current += ','
+            index += 2
+            continue
+        if line[index] == ',':
+            fields.append(current)
+            current = ''
+        else:
+            current += line[index]
+        index += 1
+    fields.append(current)
+
+    mask = fields[-1]
+    charsets = {index + 1: value for index, value in enumerate(fields[:-1][:4])}
+    return mask, charsets
+
+
+def count_mask_candidates(mask, custom_charsets=None):
+    """
+    计算掩码或 .hcmask 文件的候选密码数量
+
+    Args:
+        mask (str): 掩码或 .hcmask 文件路径
+        custom_charsets (dict, optional): 自定义字符集定义
+
+    Returns:
+        int: 候选密码数量，无法计算时返回None
+    """
+    if mask and os.path.isfile(mask):
+        total = 0
+        try:
+            with open(mask, 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    parsed = parse_hcmask_line(line)
+                    if parsed is None:
+                        continue
+                    count = mask_keyspace(*parsed)
+                    if count is None:
+                        return None
+                    total += count
+        except OSError as e:
+            print(f"读取掩码文件失败: {e}")
+            return None
+        return total
+
+    if not mask:
+        return None
+    return mask_keyspace(mask, custom_charsets)
+
+
+class LineCountCache:
+    """文件行数缓存类，按文件路径、大小和修改时间缓存，大字典只需要统计一次"""
+
+    def __init__(self, path=None):
+        """
+        初始化文件行数缓存
+
+        Args:
+            path (str, optional): 缓存文件路径，默认为缓存目录下的 line_counts.json
+        """
+        self.path = path or os.path.join(get_cache_dir(), 'line_counts.json')
+        self._counts = None
+
+    def _load(self):
+        """读取缓存文件"""
+        if self._counts is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._counts = json.load(f)
+            except (OSError, ValueError):
+                self._counts = {}
+        return self._counts
+
+    def _save(self):
+        """保存缓存文件"""
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self._counts, f)
+        except OSError as e:
+            print(f"保存行数缓存失败: {e}")
+
+    def count_lines(self, path):
+        """
+        统计文件行数，目录统计其中所有文件的行数
+
+        Args:
+            path (str): 文件或目录路径
+
+        Returns:
+            int: 行数，文件不存在时返回None
+        """
+        if os.path.isdir(path):
+            total = 0
+            for name in sorted(os.listdir(path)):
+                file_path = os.path.join(path, name)
+                if os.path.isfile(file_path):
+                    total += self.count_lines(file_path) or 0
+            return total
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        counts = self._load()
+        key = os.path.abspath(path)
+        cached = counts.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime:
+            return cached[2]
+
+        count = count_file_lines(path)
+        if count is not None:
+            counts[key] = [stat.st_size, stat.st_mtime, count]
+            self._save()
+        return count
+
+
+def count_file_lines(path):
+    """
+    统计文件行数，最后一行没有换行符时也计算在内
+
+    Args:
+        path (str): 文件路径
+
+    Returns:
+        int: 行数，读取失败时返回None
+    """
+    count = 0
+    last = b'\n'
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                count += chunk.count(b'\n')
+                last = chunk[-1:]
+    except OSError as e:
+        print(f"统计文件行数失败: {e}")
+        return None
+    return count if last == b'\n' else count + 1
+
+
+def count_rules(path):
+    """
+    统计规则文件中的规则数量，忽略空行和注释
+
+    Args:
+        path (str): 规则文件路径
+
+    Returns:
+        int: 规则数量，读取失败时返回None
+    """
+    count = 0
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    count += 1
+    except OSError as e:
+        print(f"读取规则文件失败: {e}")
+        return None
+    return count
+
+
+def get_custom_charsets(params):
+    """
+    获取参数中的自定义字符集
+
+    Args:
+        params (dict): 破解参数字典
+
+    Returns:
+        dict: 键为1-4的自定义字符集
+    """
+    return {index: params[f'custom_charset{index}'] for index in range(1, 5) if params.get(f'custom_charset{index}')}
+
+
+def estimate_candidates(params, line_cache=None):
+    """
+    计算攻击的候选密码数量：字典×规则、两个字典的乘积、掩码空间以及混合攻击的乘积
+
+    Args:
+        params (dict): 破解参数字典
+        line_cache (LineCountCache, optional): 文件行数缓存
+
+    Returns:
+        int: 候选密码数量，无法计算时返回None
+    """
+    line_cache = line_cache or LineCountCache()
+    attack_mode = params.get('attack_mode')
+
+    def lines(key):
+        path = params.get(key)
+        return line_cache.count_lines(path) if path else None
+
+    def mask():
+        return count_mask_candidates(params.get('mask'), get_custom_charsets(params))
+
+    if attack_mode == 0:
+        words = lines('dict_file')
+        if words is None:
+            return None
+        rules = count_rules(params['rule_file']) if params.get('rule_file') else 1
+        # 规则文件读取失败时候选数量未知，不能按没有规则计算
+        if rules is None:
+            return None
+        return words * max(1, rules)
+
+    if attack_mode == 1:
+        left, right = lines('dict_file1'), lines('dict_file2')
+        if left is None or right is None:
+            return None
+        return left * right
+
+    if attack_mode == 3:
+        return mask()
+
+    if attack_mode in (6, 7):
+        words, masks = lines('dict_file'), mask()
+        if words is None or masks is None:
+            return None
+        return words * masks
+
+    return None
+
+
+def get_speed(hashcat_path, hash_mode, devices=None, benchmark_db=None):
+    """
+    获取哈希模式的速度，优先使用基准测试数据库中最近的结果，没有结果时运行基准测试
+
+    Args:
+        hashcat_path (str): hashcat可执行文件路径
+        hash_mode (int): 哈希模式
+        devices (list, optional): 设备ID列表
+        benchmark_db (BenchmarkDB, optional): 基准测试数据库
+
+    Returns:
+        float: 所有设备的总速度（H/s），无法获取时返回None
+    """
+    if benchmark_db is None:
+        with BenchmarkDB() as benchmark_db:
+            return get_speed(hashcat_path, hash_mode, devices, benchmark_db)
+
+    speed = benchmark_db.expected_speed(hash_mode, devices, SPEED_CACHE_TTL)
+    if speed is not None:
+        return speed
+
+    speeds = run_benchmark(hashcat_path, [hash_mode], devices, benchmark_db).get(hash_mode)
+    if not speeds:
+        return None
+    return sum(speeds.values())
+
+
+def estimate_attack(hashcat_path, params, benchmark_db=None, line_cache=None):
+    """
+    估算攻击的候选密码数量、速度和所需时间
+
+    基准测试的速度针对单个哈希，带盐的哈希每个盐值都要计算一次，实际时间会更长。
+
+    Args:
+        hashcat_path (str): hashcat可执行文件路径
+        params (dict): 破解参数字典
+        benchmark_db (BenchmarkDB, optional): 基准测试数据库
+        line_cache (LineCountCache, optional): 文件行数缓存
+
+    Returns:
+        dict: candidates（候选密码数量）、speed（H/s）和 eta（秒），无法计算的项为None
+    """
+    candidates = estimate_candidates(params, line_cache)
+    speed = None
+    if params.get('hash_mode') is not None:
+        speed = get_speed(hashcat_path, params['hash_mode'], params.get('devices'), benchmark_db)
+
+    eta = candidates / speed if candidates is not None and speed else None
+    return {'candidates': candidates, 'speed': speed, 'eta': eta}
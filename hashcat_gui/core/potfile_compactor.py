@@ -0,0 +1,332 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Potfile整理工具 - 使用外部归并排序去除potfile中重复的行，保留每行最后一次出现的位置和原有顺序
+
+用法:
+    python -m hashcat_gui.core.potfile_compactor <potfile> [--memory-mb 64]
+"""
+
+import os
+import sys
+import heapq
+import sqlite3
+import argparse
+import tempfile
+
+from hashcat_gui.core.potfile_index import PotfileIndex
+from hashcat_gui.core.potfile_parser import ParseCache
+
+
+# 默认的内存预算（字节），每个排序段的大小不超过该值
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# 排序段记录中行号的宽度，固定宽度的十进制行号按字节排序即按数值排序
+ORDINAL_WIDTH = 20
+
+
+def _write_run(records, directory, key=None):
+    """
+    把一段记录排序后写入临时文件
+
+    Args:
+        records (iterable): 记录（不含换行符的bytes）
+        directory (str): 临时文件目录
+        key (callable, optional): 排序键
+
+    Returns:
+        str: 临时文件路径
+    """
+    fd, run_path = tempfile.mkstemp(suffix='.run', dir=directory)
+    with os.fdopen(fd, 'wb') as f:
+        for record in sorted(records, key=key):
+            f.write(record + b'\n')
+    return run_path
+
+
+def _remove_runs(run_paths):
+    """删除排序段临时文件"""
+    for path in run_paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _merge_runs(run_paths, key=None):
+    """
+    多路归并排序段，键相同的记录按排序段的顺序输出
+
+    Args:
+        run_paths (list): 排序段临时文件路径
+        key (callable, optional): 排序键
+
+    Yields:
+        bytes: 记录（不含换行符）
+    """
+    run_files = [open(path, 'rb') for path in run_paths]
+    try:
+        # 比较前先去掉换行符，与排序段内的排序方式保持一致
+        runs = [(line[:-1] for line in f) for f in run_files]
+        yield from heapq.merge(*runs, key=key)
+    finally:
+        for f in run_files:
+            f.close()
+
+
+def _line_of(record):
+    """排序段记录中的原始行"""
+    return record[ORDINAL_WIDTH:]
+
+
+def _unique_last_runs(records, memory_budget, directory):
+    """
+    按内存预算把记录切成多个按行排序的段，每段内相同的行只保留最后一次出现的行号
+
+    Args:
+        records (iterable): 记录（不含换行符的bytes）
+        memory_budget (int): 内存预算（字节）
+        directory (str): 临时文件目录
+
+    Returns:
+        tuple: (排序段临时文件路径列表, 输入记录数)
+    """
+    run_paths = []
+    total = 0
+    try:
+        chunk = {}
+        chunk_bytes = 0
+        for record in records:
+            if record not in chunk:
+                # 估算对象开销，避免实际内存占用远超预算
+                chunk_bytes += len(record) + 96
+            chunk[record] = total
+            total += 1
+            if chunk_bytes >= memory_budget:
+                run_paths.append(_write_run(
+                    (b'%0*d' % (ORDINAL_WIDTH, ordinal) + line for line, ordinal in chunk.items()),
+                    directory, _line_of))
+                chunk = {}
+                chunk_bytes = 0
+        if chunk:
+            run_paths.append(_write_run(
+                (b'%0*d' % (ORDINAL_WIDTH, ordinal) + line for line, ordinal in chunk.items()),
+                directory, _line_of))
+    except BaseException:
+        _remove_runs(run_paths)
+        raise
+    return run_paths, total
+
+
+def _iter_last_occurrences(run_paths):
+    """
+    归并按行排序的段，相同的行只输出最后一次出现的记录
+
+    排序段按输入顺序生成，heapq.merge 对相同的键按排序段顺序输出，因此每组中最后一条记录的行号最大。
+
+    Args:
+        run_paths (list): 排序段临时文件路径
+
+    Yields:
+        bytes: 行号 + 原始行
+    """
+    previous = None
+    for record in _merge_runs(run_paths, _line_of):
+        if previous is not None and _line_of(record) != _line_of(previous):
+            yield previous
+        previous = record
+    if previous is not None:
+        yield previous
+
+
+def external_dedupe(records, output_file, memory_budget=DEFAULT_MEMORY_BUDGET, temp_dir=None):
+    """
+    外部归并去重：相同的行只保留最后一次出现，输出保持原有的相对顺序
+
+    先按行排序找出每行最后一次出现的行号，再按行号排序恢复原有顺序，两步都按内存预算分段排序后多路归并。
+    只删除完全相同的行：同一个哈希的每个不同结果中最后出现的那一行保持原有的先后顺序，
+    因此读取potfile时“后出现的条目覆盖先出现的条目”的结果不变。
+
+    Args:
+        records (iterable): 记录（不含换行符的bytes）
+        output_file: 以二进制写方式打开的输出文件
+        memory_budget (int): 内存预算（字节）
+        temp_dir (str, optional): 临时文件目录
+
+    Returns:
+        tuple: (输入记录数, 输出记录数)
+    """
+    line_runs, total = _unique_last_runs(records, memory_budget, temp_dir)
+    order_runs = []
+    written = 0
+    try:
+        chunk = []
+        chunk_bytes = 0
+        for record in _iter_last_occurrences(line_runs):
+            chunk.append(record)
+            chunk_bytes += len(record) + 64
+            if chunk_bytes >= memory_budget:
+                order_runs.append(_write_run(chunk, temp_dir))
+                chunk = []
+                chunk_bytes = 0
+        if chunk:
+            order_runs.append(_write_run(chunk, temp_dir))
+        _remove_runs(line_runs)
+
+        for record in _merge_runs(order_runs):
+            output_file.write(_line_of(record) + b'\n')
+            written += 1
+    finally:
+        _remove_runs(line_runs + order_runs)
+
+    return total, written
+
+
+def _invalidate_caches(potfile_path):
+    """
+    整理后potfile是一个新文件，更新potfile索引并删除对应的解析缓存
+
+    Args:
+        potfile_path (str): potfile路径
+    """
+    index = PotfileIndex(potfile_path)
+    if os.path.exists(index.index_path):
+        try:
+            with index:
+                index.update()
+        except sqlite3.Error as e:
+            print(f"更新potfile索引时出错: {str(e)}")
+    try:
+        ParseCache().invalidate(potfile_path)
+    except OSError as e:
+        print(f"清理解析缓存时出错: {str(e)}")
+
+
+def _complete_lines_end(f, size):
+    """
+    获取文件前size个字节中最后一个完整行的结束位置
+
+    Args:
+        f: 以二进制方式打开的文件
+        size (int): 要检查的字节数
+
+    Returns:
+        int: 最后一个换行符之后的位置，没有换行符时返回0
+    """
+    position = size
+    while position > 0:
+        start = max(0, position - 64 * 1024)
+        f.seek(start)
+        newline = f.read(position - start).rfind(b'\n')
+        if newline >= 0:
+            return start + newline + 1
+        position = start
+    return 0
+
+
+def _copy_appended(source, target, offset):
+    """
+    把源文件offset之后的内容复制到目标文件，重复读取直到源文件不再增长
+
+    Args:
+        source: 以二进制方式打开的源文件
+        target: 以二进制方式打开的目标文件
+        offset (int): 已复制到的位置
+
+    Returns:
+        tuple: (新的复制位置, 复制的行数)
+    """
+    lines = 0
+    while True:
+        source.seek(offset)
+        data = source.read()
+        if not data:
+            return offset, lines
+        target.write(data)
+        offset += len(data)
+        lines += data.count(b'\n')
+
+
+def compact_potfile(potfile_path, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    整理potfile：去除重复的行，原子地替换原文件，并更新potfile索引和解析缓存
+
+    开始整理时已经写完的行参与去重，之后追加的内容（包括当时未写完的行）原样保留在新文件末尾：
+    替换前反复读取直到原文件不再增长，替换后再通过仍然打开的原文件读取最后一次读取之后写入的内容。
+    hashcat运行期间会一直打开potfile，替换后写入的内容会进入旧文件，因此不要在破解任务运行时整理。
+
+    Args:
+        potfile_path (str): potfile路径
+        memory_budget (int): 内存预算（字节）
+
+    Returns:
+        dict: 统计信息 {'lines_before': 整理前行数, 'lines_after': 整理后行数}
+    """
+    directory = os.path.dirname(os.path.abspath(potfile_path))
+
+    with open(potfile_path, 'rb') as source:
+        # 只整理开始整理时已经写完的行
+        complete_end = _complete_lines_end(source, os.fstat(source.fileno()).st_size)
+
+        def records():
+            with open(potfile_path, 'rb') as f:
+                remaining = complete_end
+                for line in f:
+                    remaining -= len(line)
+                    if remaining < 0:
+                        break
+                    line = line.rstrip(b'\r\n')
+                    if line:
+                        yield line
+
+        fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                lines_before, lines_after = external_dedupe(records(), f, memory_budget, directory)
+
+                # 把整理期间新追加的内容接到末尾
+                copied, appended_lines = _copy_appended(source, f, complete_end)
+                lines_after += appended_lines
+
+                f.flush()
+                os.fsync(f.fileno())
+
+            try:
+                os.chmod(temp_path, os.fstat(source.fileno()).st_mode)
+            except OSError:
+                pass
+            os.replace(temp_path, potfile_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        # 最后一次读取到替换之间写入原文件的内容
+        with open(potfile_path, 'ab') as f:
+            copied, appended_lines = _copy_appended(source, f, copied)
+            lines_after += appended_lines
+
+    _invalidate_caches(potfile_path)
+    return {'lines_before': lines_before, 'lines_after': lines_after}
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="整理potfile：去除重复的行")
+    parser.add_argument('potfile', help="potfile路径")
+    parser.add_argument('--memory-mb', type=int, default=DEFAULT_MEMORY_BUDGET // (1024 * 1024),
+                        help="排序时使用的内存预算（MB）")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.potfile):
+        print(f"potfile不存在: {args.potfile}")
+        return 1
+
+    stats = compact_potfile(args.potfile, args.memory_mb * 1024 * 1024)
+    print(f"整理完成: {stats['lines_before']} 行 -> {stats['lines_after']} 行")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
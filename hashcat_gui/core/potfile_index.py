@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Potfile索引 - 在potfile旁维护一个SQLite索引，按哈希的第一个字段查询已破解结果
+"""
+
+import os
+import sqlite3
+
+from hashcat_gui.core.hash_keys import normalize_field
+from hashcat_gui.core.potfile_tailer import PotfileTailer, parse_potfile_line
+
+
+# 索引文件后缀，索引保存在potfile同目录下
+INDEX_SUFFIX = '.lhidx'
+
+# 索引结构版本，结构变化时会自动重建索引
+SCHEMA_VERSION = 3
+
+# 单条SQL语句中最多使用的参数个数（兼容旧版SQLite的999限制）
+LOOKUP_CHUNK_SIZE = 500
+
+
+class PotfileIndex:
+    """Potfile索引类，增量地把potfile内容同步到SQLite中，并提供按哈希查询的接口"""
+
+    def __init__(self, potfile_path, index_path=None, source_format='hashcat', line_converter=None):
+        """
+        初始化Potfile索引
+
+        Args:
+            potfile_path (str): potfile路径
+            index_path (str, optional): 索引文件路径，默认为potfile路径加上INDEX_SUFFIX
+            source_format (str): pot文件格式名称，格式变化时会自动重建索引
+            line_converter (callable, optional): 把pot文件中的一行转换为hashcat格式的函数，
+                无法转换时返回None
+        """
+        self.potfile_path = potfile_path
+        self.index_path = index_path or potfile_path + INDEX_SUFFIX
+        self.source_format = source_format
+        self.line_converter = line_converter
+        self._conn = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def open(self):
+        """打开（必要时创建）索引数据库"""
+        if self._conn is not None:
+            return
+
+        self._conn = sqlite3.connect(self.index_path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        # 结构版本或pot文件格式不一致时丢弃旧数据
+        if (self._get_meta('version') != str(SCHEMA_VERSION)
+                or self._get_meta('format', self.source_format) != self.source_format):
+            self._conn.execute("DROP TABLE IF EXISTS entries")
+            self._conn.execute("DELETE FROM meta")
+            self._set_meta('version', SCHEMA_VERSION)
+        self._set_meta('format', self.source_format)
+
+        # head是规范化后的第一个字段，line是hashcat格式的potfile行
+        # 相同的行只保存一次，rowid对应该行最后一次出现的位置
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (head TEXT NOT NULL, line TEXT NOT NULL UNIQUE)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_head ON entries (head)")
+        self._conn.commit()
+
+    def close(self):
+        """关闭索引数据库"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _get_meta(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def _reset(self):
+        """清空索引内容，下次更新时从头读取potfile"""
+        self._conn.execute("DELETE FROM entries")
+        self._set_meta('offset', 0)
+
+    def update(self):
+        """
+        把potfile中新追加的内容同步到索引中
+
+        如果potfile被替换（inode变化）或被截断（大小小于已索引的位置），会重建整个索引。
+        potfile不存在时不创建索引文件。
+
+        Returns:
+            int: 本次新读取的行数
+        """
+        if not os.path.exists(self.potfile_path):
+            return 0
+
+        self.open()
+
+        inode = self._get_meta('inode')
+        tailer = PotfileTailer(
+            self.potfile_path,
+            int(self._get_meta('offset', 0)),
+            int(inode) if inode else None
+        )
+
+        # 文件被替换或截断时，追踪器会从头读取，索引也要清空重建
+        if tailer.check_rotation():
+            self._reset()
+
+        line_count = 0
+        for lines in tailer.iter_new_blocks():
+            rows = []
+            for line in lines:
+                if self.line_converter is not None:
+                    line = self.line_converter(line.strip())
+                    if not line:
+                        continue
+                entry = parse_potfile_line(line)
+                if entry:
+                    rows.append((normalize_field(entry[0]), line.strip()))
+            # 重新追加的行替换旧记录，获得新的rowid，查询时仍然是后出现的结果覆盖先出现的结果
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (head, line) VALUES (?, ?)", rows
+            )
+            line_count += len(rows)
+
+        self._set_meta('offset', tailer.offset)
+        self._set_meta('inode', tailer.inode)
+        self._conn.commit()
+        return line_count
+
+    def find_lines(self, heads):
+        """
+        查询第一个字段属于指定集合的potfile行
+
+        Args:
+            heads (iterable): 规范化后的第一个字段
+
+        Returns:
+            list: potfile中的行，按写入顺序排列
+        """
+        self.open()
+
+        rows = []
+        heads = list(heads)
+        for start in range(0, len(heads), LOOKUP_CHUNK_SIZE):
+            chunk = heads[start:start + LOOKUP_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            rows.extend(self._conn.execute(
+                f"SELECT rowid, line FROM entries WHERE head IN ({placeholders})", chunk
+            ))
+
+        rows.sort()
+        return [line for _, line in rows]
+
+    def lookup(self, matcher):
+        """
+        查询哈希匹配器中目标哈希的破解结果
+
+        Args:
+            matcher (HashMatcher): 哈希匹配器
+
+        Returns:
+            list: 匹配结果列表，每个元素是 (规范键, potfile中的哈希部分, 密码)
+        """
+        results = []
+        for line in self.find_lines(matcher.heads()):
+            match = matcher.match_line(line)
+            if match:
+                results.append(match)
+        return results
+
+    def iter_entries(self):
+        """
+        遍历索引中的所有条目
+
+        Yields:
+            tuple: (hash_val, password)
+        """
+        self.open()
+        for (line,) in self._conn.execute("SELECT line FROM entries ORDER BY rowid"):
+            yield parse_potfile_line(line)
+
+    def count(self):
+        """
+        获取索引中的条目数量
+
+        Returns:
+            int: 条目数量
+        """
+        self.open()
+        return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
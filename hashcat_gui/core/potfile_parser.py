@@ -7,15 +7,260 @@ Potfile解析器 - 处理potfile的读取和解析
 
 import os
 import re
+import json
+import mmap
+import sqlite3
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 
+from hashcat_gui.core.app_paths import get_cache_dir
+from hashcat_gui.core.bloom_filter import BloomFilter
+from hashcat_gui.core.hash_keys import HashMatcher
+from hashcat_gui.core.potfile_index import PotfileIndex
+from hashcat_gui.core.potfile_tailer import PotfileTailer, parse_potfile_line
 
-def parse_potfile(potfile_path, hash_list=None):
+
+def matches_to_dict_items(matches):
+    """
+    对匹配结果去重，同一个规范键只保留最后一次出现的结果
+
+    Args:
+        matches (iterable): 匹配结果，每个元素是 (规范键, potfile中的哈希部分, 密码)
+
+    Returns:
+        list: 去重后的匹配结果
+    """
+    by_key = {}
+    for match in matches:
+        by_key[match[0]] = match
+    return list(by_key.values())
+
+
+def matches_to_dict(matches):
+    """
+    把匹配结果转换为哈希与密码的映射，同一个规范键只保留最后一次出现的结果
+
+    Args:
+        matches (iterable): 匹配结果，每个元素是 (规范键, potfile中的哈希部分, 密码)
+
+    Returns:
+        dict: 哈希与密码的映射字典 {hash_val: password}
+    """
+    return {hash_val: password for _, hash_val, password in matches_to_dict_items(matches)}
+
+
+def lookup_cracked(potfile_path, matcher):
+    """
+    通过potfile索引查询匹配器中已破解的哈希
+
+    Args:
+        potfile_path (str): potfile的路径
+        matcher (HashMatcher): 目标哈希的匹配器
+
+    Returns:
+        dict: 哈希与密码的映射字典 {hash_val: password}，索引不可用时返回None
+    """
+    try:
+        with PotfileIndex(potfile_path) as index:
+            index.update()
+            return matches_to_dict(index.lookup(matcher))
+    except (sqlite3.Error, OSError) as e:
+        print(f"使用potfile索引时出错，改为逐行解析: {str(e)}")
+        return None
+
+
+# potfile索引不可用、需要扫描整个potfile时，超过该大小才使用多进程解析，小文件启动进程池反而更慢
+PARALLEL_MIN_SIZE = 64 * 1024 * 1024
+
+# 哈希列表布隆过滤器的缓存文件后缀，缓存保存在应用缓存目录下的bloom子目录中
+HASH_FILTER_SUFFIX = '.lhbloom'
+
+# 哈希列表布隆过滤器的默认误判率
+HASH_FILTER_ERROR_RATE = 0.001
+
+# 工作进程中使用的哈希匹配器，由进程池的初始化函数设置
+_worker_matcher = None
+
+
+def load_hash_filter(hash_file_path, matcher, error_rate=HASH_FILTER_ERROR_RATE, cache_dir=None):
+    """
+    加载哈希列表的布隆过滤器，哈希文件没有变化时直接读取缓存，否则重新构建并保存
+
+    Args:
+        hash_file_path (str): 哈希文件路径
+        matcher (HashMatcher): 由该哈希文件构建的匹配器
+        error_rate (float): 误判率
+        cache_dir (str, optional): 缓存目录，默认为应用缓存目录下的bloom子目录
+
+    Returns:
+        BloomFilter: 布隆过滤器
+    """
+    cache_dir = cache_dir or os.path.join(get_cache_dir(), 'bloom')
+    os.makedirs(cache_dir, exist_ok=True)
+    identity = f"{os.path.abspath(hash_file_path)}|{matcher.hash_mode}|{int(matcher.username)}"
+    filter_path = os.path.join(cache_dir, hashlib.sha1(identity.encode('utf-8')).hexdigest() + HASH_FILTER_SUFFIX)
+    stat = os.stat(hash_file_path)
+    tag = f"{stat.st_size}:{stat.st_mtime_ns}:{matcher.hash_mode}:{int(matcher.username)}:{error_rate}"
+
+    if os.path.exists(filter_path):
+        try:
+            bloom, cached_tag = BloomFilter.load(filter_path)
+            if bloom is not None and cached_tag == tag:
+                return bloom
+        except OSError:
+            pass
+
+    bloom = BloomFilter(len(matcher), error_rate)
+    bloom.update(matcher.keys)
+    try:
+        bloom.save(filter_path, tag)
+    except OSError as e:
+        print(f"保存哈希列表过滤器时出错: {str(e)}")
+    return bloom
+
+
+def split_ranges(potfile_path, parts):
+    """
+    把potfile按换行符对齐切分成若干字节区间
+
+    Args:
+        potfile_path (str): potfile的路径
+        parts (int): 期望的区间数量
+
+    Returns:
+        list: 区间列表，每个元素是 (start, end)
+    """
+    size = os.path.getsize(potfile_path)
+    if size == 0:
+        return []
+
+    ranges = []
+    with open(potfile_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            step = max(size // max(parts, 1), 1)
+            start = 0
+            while start < size:
+                end = start + step
+                if end >= size:
+                    end = size
+                else:
+                    # 把区间末尾延伸到下一个换行符之后
+                    newline = mm.find(b'\n', end)
+                    end = size if newline < 0 else newline + 1
+                ranges.append((start, end))
+                start = end
+    return ranges
+
+
+def _init_worker(matcher):
+    """
+    工作进程初始化函数，每个进程只接收一次匹配器
+
+    Args:
+        matcher (HashMatcher): 目标哈希的匹配器，为None时返回所有条目
+    """
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _parse_range(potfile_path, start, end, matcher=None):
+    """
+    解析potfile中的一个字节区间
+
+    Args:
+        potfile_path (str): potfile的路径
+        start (int): 区间起始位置
+        end (int): 区间结束位置
+        matcher (HashMatcher, optional): 目标哈希的匹配器，默认使用工作进程中的匹配器
+
+    Returns:
+        list: 匹配器只有布隆过滤器时为可能匹配的行，有匹配器时为匹配结果列表，
+              否则为 (hash_val, password) 列表
+    """
+    if matcher is None:
+        matcher = _worker_matcher
+    results = []
+    with open(potfile_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = mm[start:end].decode('utf-8', errors='ignore')
+
+    for line in text.splitlines():
+        if matcher is not None and matcher.bloom is not None:
+            match = line if matcher.is_candidate(line) else None
+        elif matcher is not None:
+            match = matcher.match_line(line)
+        else:
+            match = parse_potfile_line(line)
+        if match:
+            results.append(match)
+    return results
+
+
+def parse_potfile_parallel(potfile_path, hash_list=None, workers=None, hash_mode=None, username=False,
+                           hash_filter=None):
+    """
+    使用mmap和多进程并行解析potfile
+
+    这只是potfile索引不可用时（例如索引文件无法创建或SQLite出错）的后备方案：正常情况下查询已破解的哈希
+    都通过potfile索引完成，不会调用这个函数。首次建立索引的时间主要花在写入SQLite上，解析只占一小部分，
+    因此索引的建立没有使用多进程解析。
+
+    potfile被切分成按换行符对齐的区间，每个工作进程解析一个区间并按目标哈希过滤，
+    最后按区间顺序合并结果，后出现的条目覆盖先出现的条目。
+    提供布隆过滤器时，工作进程只接收过滤器并返回可能匹配的行，由主进程做精确匹配。
+
+    Args:
+        potfile_path (str): potfile的路径
+        hash_list (list, optional): 要筛选的哈希列表
+        workers (int, optional): 工作进程数量，默认为CPU核心数
+        hash_mode (int, optional): 哈希模式
+        username (bool): 哈希列表中的行是否带有用户名前缀
+        hash_filter (BloomFilter, optional): 由哈希列表构建的布隆过滤器
+
+    Returns:
+        dict: 哈希与密码的映射字典 {hash_val: password}
+    """
+    if not potfile_path or not os.path.exists(potfile_path):
+        return {}
+
+    workers = workers or os.cpu_count() or 1
+    matcher = HashMatcher(hash_list, hash_mode, username) if hash_list else None
+    ranges = split_ranges(potfile_path, workers * 4)
+
+    worker_matcher = matcher.prefilter(hash_filter) if matcher is not None and hash_filter else matcher
+
+    if workers > 1 and len(ranges) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(worker_matcher,)) as executor:
+            futures = [executor.submit(_parse_range, potfile_path, start, end) for start, end in ranges]
+            partials = [future.result() for future in futures]
+    else:
+        partials = [_parse_range(potfile_path, start, end, worker_matcher) for start, end in ranges]
+
+    if worker_matcher is not matcher:
+        partials = [list(filter(None, map(matcher.match_line, partial))) for partial in partials]
+
+    if matcher is not None:
+        return matches_to_dict(match for partial in partials for match in partial)
+
+    results = {}
+    for partial in partials:
+        results.update(partial)
+    return results
+
+
+def parse_potfile(potfile_path, hash_list=None, use_index=True, hash_mode=None, username=False,
+                  hash_filter=None):
     """
     解析potfile文件，提取哈希和对应的密码
 
     Args:
         potfile_path (str): potfile的路径
         hash_list (list, optional): 要筛选的哈希列表，如果提供，只返回列表中存在的哈希
+        use_index (bool): 提供哈希列表时是否优先通过potfile索引查询
+        hash_mode (int, optional): 哈希模式，用于识别容器格式的哈希
+        username (bool): 哈希列表中的行是否带有用户名前缀
+        hash_filter (BloomFilter, optional): 由哈希列表构建的布隆过滤器，并行解析时用于预筛选
 
     Returns:
         dict: 哈希与密码的映射字典 {hash_val: password}
@@ -23,33 +268,44 @@ def parse_potfile(potfile_path, hash_list=None):
     if not potfile_path or not os.path.exists(potfile_path):
         return {}
 
+    matcher = HashMatcher(hash_list, hash_mode, username) if hash_list else None
+
+    # 只关心部分哈希时，直接查索引，避免每次都扫描整个potfile
+    if matcher is not None and use_index:
+        results = lookup_cracked(potfile_path, matcher)
+        if results is not None:
+            return results
+
+    # 没有使用索引时，大文件使用多进程并行解析
+    if os.path.getsize(potfile_path) >= PARALLEL_MIN_SIZE:
+        try:
+            return parse_potfile_parallel(potfile_path, hash_list, hash_mode=hash_mode, username=username,
+                                          hash_filter=hash_filter)
+        except Exception as e:
+            print(f"并行解析potfile时出错，改为逐行解析: {str(e)}")
+
     results = {}
-    hash_set = set(hash_list) if hash_list else None
+    matches = []
 
     try:
         with open(potfile_path, 'r', encoding='utf-8', errors='ignore') as f:
             for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
+                # 如果有指定哈希列表，则只保留列表中的哈希
+                if matcher is not None:
+                    match = matcher.match_line(line)
+                    if match:
+                        matches.append(match)
                     continue
 
-                # 处理不同格式的potfile条目
-                if ':' in line:
-                    # 标准格式: hash:password
-                    parts = line.split(':', 1)
-                    if len(parts) >= 2:
-                        hash_val = parts[0].strip()
-                        password = parts[1].strip()
-                        
-                        # 如果有指定哈希列表，则只保留列表中的哈希
-                        if not hash_set or hash_val in hash_set:
-                            results[hash_val] = password
-                else:
-                    # 尝试其他可能的格式
-                    continue
+                entry = parse_potfile_line(line)
+                if entry:
+                    hash_val, password = entry
+                    results[hash_val] = password
     except Exception as e:
         print(f"解析potfile时出错: {str(e)}")
 
+    if matcher is not None:
+        return matches_to_dict(matches)
     return results
 
 
@@ -82,13 +338,300 @@ def read_hash_file(hash_file_path):
     return hash_list
 
 
-def load_already_cracked(hash_file_path, potfile_path):
+def _parse_cracked(hash_file_path, hash_list, potfile_path, hash_mode=None, username=False):
+    """
+    从potfile中解析哈希列表中已破解的哈希
+
+    Args:
+        hash_file_path (str): 哈希文件路径
+        hash_list (list): 哈希文件中的哈希列表
+        potfile_path (str): potfile路径
+        hash_mode (int, optional): 哈希模式
+        username (bool): 哈希文件中的行是否带有用户名前缀
+
+    Returns:
+        dict: 哈希与密码的映射字典 {hash_val: password}
+    """
+    if not os.path.exists(potfile_path):
+        return {}
+
+    matcher = HashMatcher(hash_list, hash_mode, username)
+    results = lookup_cracked(potfile_path, matcher)
+    if results is not None:
+        return results
+
+    # 索引不可用时只能扫描整个potfile，大文件并行扫描，工作进程只接收哈希列表的布隆过滤器（读取缓存或重新构建）
+    # 索引查询和逐行扫描都在本进程中用集合匹配，集合查找比布隆过滤器的多次哈希更快，因此不使用过滤器
+    hash_filter = None
+    if os.path.getsize(potfile_path) >= PARALLEL_MIN_SIZE:
+        try:
+            hash_filter = load_hash_filter(hash_file_path, matcher)
+        except OSError as e:
+            print(f"加载哈希列表过滤器时出错: {str(e)}")
+
+    return parse_potfile(potfile_path, hash_list, use_index=False, hash_mode=hash_mode, username=username,
+                         hash_filter=hash_filter)
+
+
+def _file_digest(path, start, length):
+    """
+    计算文件中一段内容的SHA1摘要
+
+    Args:
+        path (str): 文件路径
+        start (int): 起始位置
+        length (int): 长度
+
+    Returns:
+        str: 十六进制摘要
+    """
+    with open(path, 'rb') as f:
+        f.seek(max(start, 0))
+        return hashlib.sha1(f.read(max(length, 0))).hexdigest()
+
+
+class ParseCache:
+    """解析缓存类，把哈希文件在potfile中的破解结果保存到磁盘，文件没有变化时直接复用"""
+
+    # 内容指纹使用的字节数
+    FINGERPRINT_SIZE = 64 * 1024
+
+    # potfile末尾用于确认“只追加”的字节数
+    TAIL_SIZE = 4096
+
+    def __init__(self, cache_dir=None, max_entries=32):
+        """
+        初始化解析缓存
+
+        Args:
+            cache_dir (str, optional): 缓存目录，默认为应用缓存目录下的parse子目录
+            max_entries (int): 最多保留的缓存条目数量，超过后删除最久未使用的条目
+        """
+        self.cache_dir = cache_dir or os.path.join(get_cache_dir(), 'parse')
+        self.max_entries = max_entries
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_path(self, hash_file_path, potfile_path, hash_mode, username):
+        """获取缓存条目的文件路径"""
+        identity = f"{os.path.abspath(hash_file_path)}|{os.path.abspath(potfile_path)}|{hash_mode}|{int(username)}"
+        return os.path.join(self.cache_dir, hashlib.sha1(identity.encode('utf-8')).hexdigest() + '.json')
+
+    def _hash_file_identity(self, path):
+        """获取哈希文件的标识：大小、修改时间和首尾内容的指纹"""
+        stat = os.stat(path)
+        size = self.FINGERPRINT_SIZE
+        return {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'fingerprint': _file_digest(path, 0, size) + _file_digest(path, stat.st_size - size, size),
+        }
+
+    def _potfile_identity(self, path):
+        """获取potfile的标识：大小、修改时间、inode、开头和末尾内容的指纹"""
+        stat = os.stat(path)
+        return {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'inode': stat.st_ino,
+            'head': _file_digest(path, 0, self.FINGERPRINT_SIZE),
+            'tail': _file_digest(path, stat.st_size - self.TAIL_SIZE, min(self.TAIL_SIZE, stat.st_size)),
+        }
+
+    def _is_appended(self, potfile_path, cached, current):
+        """
+        判断potfile相对于缓存时是否只是追加了内容
+
+        Args:
+            potfile_path (str): potfile路径
+            cached (dict): 缓存时的potfile标识
+            current (dict): 当前的potfile标识
+
+        Returns:
+            bool: 是否只追加了内容
+        """
+        if current['inode'] != cached['inode'] or current['size'] <= cached['size']:
+            return False
+        if cached['size'] >= self.FINGERPRINT_SIZE and current['head'] != cached['head']:
+            return False
+
+        old_size = cached['size']
+        tail_size = min(self.TAIL_SIZE, old_size)
+        return _file_digest(potfile_path, old_size - tail_size, tail_size) == cached['tail']
+
+    def _read_entry(self, entry_path):
+        """读取缓存条目，条目不存在或损坏时返回None"""
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_entry(self, entry_path, entry):
+        """原子地写入缓存条目，并清理多余的条目"""
+        temp_path = entry_path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            print(f"写入解析缓存时出错: {str(e)}")
+            return
+        self._prune()
+
+    def _prune(self):
+        """只保留最近使用的max_entries个缓存条目"""
+        entries = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                   if name.endswith('.json')]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[self.max_entries:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def invalidate(self, potfile_path):
+        """
+        删除与指定potfile相关的所有缓存条目和损坏的条目，potfile被改写（例如整理）后调用
+
+        Args:
+            potfile_path (str): potfile路径
+
+        Returns:
+            int: 删除的缓存条目数量
+        """
+        potfile_path = os.path.abspath(potfile_path)
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            entry_path = os.path.join(self.cache_dir, name)
+            entry = self._read_entry(entry_path)
+            if entry is None or entry.get('potfile_path') == potfile_path:
+                try:
+                    os.remove(entry_path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def identify(self, hash_file_path, potfile_path):
+        """
+        获取两个文件当前的标识，在开始解析前调用，解析完成后传给 put
+
+        Args:
+            hash_file_path (str): 哈希文件路径
+            potfile_path (str): potfile路径
+
+        Returns:
+            tuple: (哈希文件标识, potfile标识)
+        """
+        return self._hash_file_identity(hash_file_path), self._potfile_identity(potfile_path)
+
+    def get(self, hash_file_path, potfile_path, hash_mode=None, username=False):
+        """
+        读取缓存的破解结果
+
+        两个文件都没有变化时直接返回缓存的结果；potfile只是追加了内容时，
+        只解析新追加的部分并合并到缓存中。
+
+        Args:
+            hash_file_path (str): 哈希文件路径
+            potfile_path (str): potfile路径
+            hash_mode (int, optional): 哈希模式
+            username (bool): 哈希文件中的行是否带有用户名前缀
+
+        Returns:
+            dict: 哈希与密码的映射字典 {hash_val: password}，没有可用的缓存时返回None
+        """
+        entry_path = self._entry_path(hash_file_path, potfile_path, hash_mode, username)
+        entry = self._read_entry(entry_path)
+        if not entry:
+            return None
+
+        hash_identity, pot_identity = self.identify(hash_file_path, potfile_path)
+        if entry.get('hash_file') != hash_identity:
+            return None
+
+        cached_pot = entry.get('potfile', {})
+        if cached_pot == pot_identity:
+            # 更新修改时间，记录为最近使用
+            os.utime(entry_path)
+            return entry['results']
+
+        if not self._is_appended(potfile_path, cached_pot, pot_identity):
+            return None
+
+        matcher = HashMatcher(read_hash_file(hash_file_path), hash_mode, username)
+        tailer = PotfileTailer(potfile_path, cached_pot['size'], cached_pot['inode'])
+        matches = filter(None, map(matcher.match_line, tailer.read_new_lines()))
+        results = entry['results']
+        results.update(matches_to_dict(matches))
+        # 只记录到已读取的完整行为止，末尾未写完的行留到下次
+        pot_identity = self._potfile_identity(potfile_path)
+        if tailer.offset != pot_identity['size']:
+            pot_identity['size'] = tailer.offset
+            pot_identity['tail'] = _file_digest(
+                potfile_path, tailer.offset - self.TAIL_SIZE, min(self.TAIL_SIZE, tailer.offset))
+        self._write_entry(entry_path, {'hash_file': hash_identity, 'potfile': pot_identity,
+                                       'potfile_path': os.path.abspath(potfile_path), 'results': results})
+        return results
+
+    def put(self, hash_file_path, potfile_path, results, hash_mode=None, username=False, identity=None):
+        """
+        保存完整解析得到的破解结果
+
+        Args:
+            hash_file_path (str): 哈希文件路径
+            potfile_path (str): potfile路径
+            results (dict): 哈希与密码的映射字典 {hash_val: password}
+            hash_mode (int, optional): 哈希模式
+            username (bool): 哈希文件中的行是否带有用户名前缀
+            identity (tuple, optional): 开始解析前 identify 返回的文件标识，默认为当前的标识。
+                使用解析前的标识时，解析期间追加到potfile的内容会在下次读取缓存时补上
+        """
+        hash_identity, pot_identity = identity or self.identify(hash_file_path, potfile_path)
+        entry_path = self._entry_path(hash_file_path, potfile_path, hash_mode, username)
+        self._write_entry(entry_path, {'hash_file': hash_identity, 'potfile': pot_identity,
+                                       'potfile_path': os.path.abspath(potfile_path), 'results': results})
+
+    def load_cracked(self, hash_file_path, potfile_path, hash_mode=None, username=False):
+        """
+        获取哈希文件在potfile中已破解的哈希，优先使用缓存，没有可用的缓存时完整解析一次并更新缓存
+
+        Args:
+            hash_file_path (str): 哈希文件路径
+            potfile_path (str): potfile路径
+            hash_mode (int, optional): 哈希模式
+            username (bool): 哈希文件中的行是否带有用户名前缀
+
+        Returns:
+            dict: 哈希与密码的映射字典 {hash_val: password}
+        """
+        results = self.get(hash_file_path, potfile_path, hash_mode, username)
+        if results is not None:
+            return results
+
+        identity = self.identify(hash_file_path, potfile_path)
+        results = _parse_cracked(hash_file_path, read_hash_file(hash_file_path), potfile_path,
+                                 hash_mode, username)
+        self.put(hash_file_path, potfile_path, results, hash_mode, username, identity)
+        return results
+
+
+def load_already_cracked(hash_file_path, potfile_path, hash_mode=None, username=False, use_cache=True):
     """
     加载已经破解的哈希结果
 
     Args:
         hash_file_path (str): 哈希文件路径
         potfile_path (str): potfile路径
+        hash_mode (int, optional): 哈希模式
+        username (bool): 哈希文件中的行是否带有用户名前缀
+        use_cache (bool): 是否使用磁盘上的解析缓存
 
     Returns:
         list: 破解结果列表，每个元素是一个字典 {'hash_val': hash, 'password': pwd, 'time_str': '', 'note': '从potfile中加载'}
@@ -96,13 +639,25 @@ def load_already_cracked(hash_file_path, potfile_path):
     if not hash_file_path or not potfile_path:
         return []
 
-    # 读取哈希文件中的所有哈希
-    hash_list = read_hash_file(hash_file_path)
-    if not hash_list:
+    if not os.path.exists(hash_file_path) or not os.path.exists(potfile_path):
         return []
 
-    # 解析potfile，获取哈希和密码的映射
-    cracked_dict = parse_potfile(potfile_path, hash_list)
+    cracked_dict = None
+    if use_cache:
+        try:
+            cracked_dict = ParseCache().load_cracked(hash_file_path, potfile_path, hash_mode, username)
+        except OSError as e:
+            print(f"使用解析缓存时出错: {str(e)}")
+
+    if cracked_dict is None:
+        # 读取哈希文件中的所有哈希
+        hash_list = read_hash_file(hash_file_path)
+        if not hash_list:
+            return []
+
+        # 解析potfile，获取哈希和密码的映射
+        cracked_dict = _parse_cracked(hash_file_path, hash_list, potfile_path, hash_mode, username)
+
     if not cracked_dict:
         return []
 
@@ -117,3 +672,197 @@ def load_already_cracked(hash_file_path, potfile_path):
         })
 
     return results
+
+
+def _iter_hash_chunks(hash_file_path, chunk_size):
+    """
+    分块读取哈希文件
+
+    Args:
+        hash_file_path (str): 哈希文件路径
+        chunk_size (int): 每块的行数
+
+    Yields:
+        tuple: (哈希列表, 已读取的字节数)
+    """
+    chunk = []
+    with open(hash_file_path, 'rb') as f:
+        for raw_line in f:
+            line = raw_line.decode('utf-8', errors='ignore').strip()
+            if not line or line.startswith('#'):
+                continue
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield chunk, f.tell()
+                chunk = []
+        if chunk:
+            yield chunk, f.tell()
+
+
+def _iter_cracked_matches(hash_file_path, potfile_path, hash_mode=None, username=False,
+                          chunk_size=50000, progress_callback=None):
+    """
+    分块查询哈希文件中已破解的哈希，每块只在内存中保存一块哈希
+
+    Args:
+        hash_file_path (str): 哈希文件路径
+        potfile_path (str): potfile路径
+        hash_mode (int, optional): 哈希模式
+        username (bool): 哈希文件中的行是否带有用户名前缀
+        chunk_size (int): 每块哈希的行数
+        progress_callback (callable, optional): 进度回调，参数为 (已读取字节数, 总字节数)
+
+    Yields:
+        tuple: 匹配结果 (规范键, potfile中的哈希部分, 密码)，同一个规范键只出现一次
+    """
+    total_bytes = os.path.getsize(hash_file_path)
+    seen_keys = set()
+    with PotfileIndex(potfile_path) as index:
+        index.update()
+        for hash_list, bytes_read in _iter_hash_chunks(hash_file_path, chunk_size):
+            matcher = HashMatcher(hash_list, hash_mode, username)
+            for match in matches_to_dict_items(index.lookup(matcher)):
+                if match[0] not in seen_keys:
+                    seen_keys.add(match[0])
+                    yield match
+            if progress_callback:
+                progress_callback(bytes_read, total_bytes)
+
+
+def _iter_result_batches(cracked_dict, batch_size):
+    """
+    把哈希与密码的映射按固定大小分批转换为结果列表
+
+    Args:
+        cracked_dict (dict): 哈希与密码的映射字典 {hash_val: password}
+        batch_size (int): 每批结果的数量
+
+    Yields:
+        list: 一批破解结果，格式与load_already_cracked的返回值相同
+    """
+    batch = []
+    for hash_val, password in cracked_dict.items():
+        batch.append({
+            'hash_val': hash_val,
+            'password': password,
+            'time_str': '',
+            'note': '从potfile中加载'
+        })
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_already_cracked(hash_file_path, potfile_path, batch_size=1000, hash_mode=None, username=False,
+                         progress_callback=None, use_cache=True):
+    """
+    流式加载已经破解的哈希结果，按固定大小分批返回
+
+    解析缓存可用时直接分批返回缓存的结果；否则哈希文件按块读取并通过potfile索引查询，
+    调用方可以在收到第一批结果后立即开始显示，全部返回后把结果写入解析缓存，
+    下次选择同一个哈希文件时不再查询索引。
+
+    Args:
+        hash_file_path (str): 哈希文件路径
+        potfile_path (str): potfile路径
+        batch_size (int): 每批结果的数量
+        hash_mode (int, optional): 哈希模式
+        username (bool): 哈希文件中的行是否带有用户名前缀
+        progress_callback (callable, optional): 进度回调，参数为 (已读取字节数, 总字节数)
+        use_cache (bool): 是否使用磁盘上的解析缓存
+
+    Yields:
+        list: 一批破解结果，格式与load_already_cracked的返回值相同
+    """
+    if not hash_file_path or not potfile_path:
+        return
+
+    if not os.path.exists(hash_file_path) or not os.path.exists(potfile_path):
+        return
+
+    cache = None
+    identity = None
+    if use_cache:
+        try:
+            cache = ParseCache()
+            cracked_dict = cache.get(hash_file_path, potfile_path, hash_mode, username)
+            if cracked_dict is not None:
+                yield from _iter_result_batches(cracked_dict, batch_size)
+                if progress_callback:
+                    total_bytes = os.path.getsize(hash_file_path)
+                    progress_callback(total_bytes, total_bytes)
+                return
+            identity = cache.identify(hash_file_path, potfile_path)
+        except OSError as e:
+            print(f"使用解析缓存时出错: {str(e)}")
+            cache = None
+
+    yielded = False
+    try:
+        matches = _iter_cracked_matches(hash_file_path, potfile_path, hash_mode, username,
+                                        progress_callback=progress_callback)
+        cracked_dict = {}
+        batch = []
+        for _, hash_val, password in matches:
+            cracked_dict[hash_val] = password
+            batch.append({
+                'hash_val': hash_val,
+                'password': password,
+                'time_str': '',
+                'note': '从potfile中加载'
+            })
+            if len(batch) >= batch_size:
+                yielded = True
+                yield batch
+                batch = []
+        if batch:
+            yielded = True
+            yield batch
+    except (sqlite3.Error, OSError) as e:
+        # 已经返回过结果时不能再一次性加载，否则调用方会收到重复的结果
+        if yielded:
+            raise
+        # 索引不可用时退回到一次性加载
+        print(f"使用potfile索引时出错，改为一次性加载: {str(e)}")
+        results = load_already_cracked(hash_file_path, potfile_path, hash_mode, username, use_cache)
+        for start in range(0, len(results), batch_size):
+            yield results[start:start + batch_size]
+        return
+
+    if cache is not None:
+        try:
+            cache.put(hash_file_path, potfile_path, cracked_dict, hash_mode, username, identity)
+        except OSError as e:
+            print(f"写入解析缓存时出错: {str(e)}")
+
+
+def count_already_cracked(hash_file_path, potfile_path, hash_mode=None, username=False):
+    """
+    统计已经破解的哈希数量，不构建结果列表
+
+    Args:
+        hash_file_path (str): 哈希文件路径
+        potfile_path (str): potfile路径
+        hash_mode (int, optional): 哈希模式
+        username (bool): 哈希文件中的行是否带有用户名前缀
+
+    Returns:
+        int: 已破解的哈希数量
+    """
+    if not hash_file_path or not potfile_path:
+        return 0
+
+    if not os.path.exists(hash_file_path) or not os.path.exists(potfile_path):
+        return 0
+
+    try:
+        return sum(1 for _ in _iter_cracked_matches(hash_file_path, potfile_path, hash_mode, username))
+    except (sqlite3.Error, OSError) as e:
+        # 索引不可用时退回到流式解析potfile，只保存哈希与密码的映射
+        print(f"使用potfile索引时出错，改为解析potfile: {str(e)}")
+        hash_list = read_hash_file(hash_file_path)
+        if not hash_list:
+            return 0
+        return len(_parse_cracked(hash_file_path, hash_list, potfile_path, hash_mode, username))
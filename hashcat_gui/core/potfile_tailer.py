@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Potfile追踪器 - 记录已读取的位置，只解析potfile新追加的行
+"""
+
+import os
+
+
+# 每次读取的字节数
+READ_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+def parse_potfile_line(line):
+    """
+    解析potfile中的一行
+
+    Args:
+        line (str): potfile中的一行文本
+
+    Returns:
+        tuple: (hash_val, password)，无法解析时返回None
+    """
+    line = line.strip()
+    if not line or line.startswith('#') or ':' not in line:
+        return None
+
+    hash_val, password = line.split(':', 1)
+    return hash_val.strip(), password.strip()
+
+
+class PotfileTailer:
+    """Potfile追踪器类，按字节偏移记录读取进度，并通过inode和文件大小检测文件轮换"""
+
+    def __init__(self, path, offset=0, inode=None):
+        """
+        初始化Potfile追踪器
+
+        Args:
+            path (str): 要追踪的文件路径
+            offset (int): 已读取到的字节偏移
+            inode (int, optional): 上次读取时文件的inode，用于检测文件被替换
+        """
+        self.path = path
+        self.offset = offset
+        self.inode = inode
+        self.size = 0
+
+    def check_rotation(self):
+        """
+        检查文件是否被替换或截断，如果是则从头开始读取
+
+        Returns:
+            bool: 文件是否发生了轮换
+        """
+        if not os.path.exists(self.path):
+            return False
+
+        stat = os.stat(self.path)
+        rotated = (self.inode is not None and self.inode != stat.st_ino) or stat.st_size < self.offset
+        if rotated:
+            self.offset = 0
+        self.inode = stat.st_ino
+        self.size = stat.st_size
+        return rotated
+
+    def seek_to_end(self):
+        """跳过文件中已有的内容，之后只读取新追加的行"""
+        if os.path.exists(self.path):
+            stat = os.stat(self.path)
+            self.inode = stat.st_ino
+            self.size = stat.st_size
+            self.offset = stat.st_size
+        else:
+            self.inode = None
+            self.size = 0
+            self.offset = 0
+
+    def iter_new_blocks(self):
+        """
+        分块读取新追加的完整行，每读完一块就推进偏移
+
+        末尾没有换行符的行视为尚未写完，留到下次读取。
+
+        Yields:
+            list: 一块中包含的文本行
+        """
+        if not os.path.exists(self.path):
+            return
+
+        self.check_rotation()
+        if self.size == self.offset:
+            return
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            pending = b''
+            while True:
+                block = f.read(READ_BLOCK_SIZE)
+                if not block:
+                    break
+
+                data = pending + block
+                last_newline = data.rfind(b'\n')
+                if last_newline < 0:
+                    pending = data
+                    continue
+
+                pending = data[last_newline + 1:]
+                self.offset += last_newline + 1
+                yield data[:last_newline].decode('utf-8', errors='ignore').splitlines()
+
+    def read_new_lines(self):
+        """
+        读取新追加的完整行
+
+        Returns:
+            list: 新追加的文本行
+        """
+        lines = []
+        for block in self.iter_new_blocks():
+            lines.extend(block)
+        return lines
+
+    def read_new_entries(self):
+        """
+        读取新追加的potfile条目
+
+        Returns:
+            list: 新条目列表，每个元素是 (hash_val, password)
+        """
+        entries = []
+        for line in self.read_new_lines():
+            entry = parse_potfile_line(line)
+            if entry:
+                entries.append(entry)
+        return entries
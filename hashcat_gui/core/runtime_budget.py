@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+运行时间预算 - 根据状态输出中的速度和进度，决定任务继续运行到结束、在检查点停止还是提前停止，不依赖Qt
+"""
+
+import time
+
+from hashcat_gui.core.command_builder import parse_speed
+
+
+# 预算决策
+DECISION_CONTINUE = 'continue'      # 继续运行
+DECISION_CHECKPOINT = 'checkpoint'  # 在下一个检查点停止，之后可以通过 --restore 继续
+DECISION_STOP = 'stop'              # 立即停止
+
+# 预计很快完成时允许超出预算的比例
+OVERRUN_TOLERANCE = 0.1
+
+# 预计需要的时间超过预算的倍数时提前停止
+HOPELESS_FACTOR = 10
+
+# 速度稳定前不做提前停止的判断（秒）
+WARMUP_SECONDS = 30
+
+
+def format_duration(seconds):
+    """
+    把秒数格式化为便于阅读的文本
+
+    Args:
+        seconds (float): 秒数
+
+    Returns:
+        str: 例如 1天2小时、3小时4分钟、5分钟6秒
+    """
+    seconds = int(max(0, seconds))
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if days:
+        return f"{days}天{hours}小时"
+    if hours:
+        return f"{hours}小时{minutes}分钟"
+    if minutes:
+        return f"{minutes}分钟{seconds}秒" if seconds else f"{minutes}分钟"
+    return f"{seconds}秒"
+
+
+class RuntimeBudget:
+    """运行时间预算类，每次收到状态信息时给出决策"""
+
+    def __init__(self, budget_seconds=0):
+        """
+        初始化运行时间预算
+
+        Args:
+            budget_seconds (int): 时间预算（秒），0表示不限制
+        """
+        self.budget = max(0, int(budget_seconds or 0))
+        self.started = None
+        self.reason = ''
+        self._first_sample = None
+
+    @property
+    def enabled(self):
+        """是否设置了时间预算"""
+        return self.budget > 0
+
+    def start(self, now=None):
+        """
+        开始计时
+
+        Args:
+            now (float, optional): 当前时间，默认使用 time.time()
+        """
+        self.started = now if now is not None else time.time()
+        self.reason = ''
+        self._first_sample = None
+
+    def elapsed(self, now=None):
+        """
+        已经运行的时间
+
+        Args:
+            now (float, optional): 当前时间
+
+        Returns:
+            float: 秒数
+        """
+        if self.started is None:
+            return 0.0
+        return (now if now is not None else time.time()) - self.started
+
+    def estimate_remaining(self, status_info, now=None):
+        """
+        根据进度的增长速度估算剩余时间，进度还没有变化时使用状态中的速度
+
+        Args:
+            status_info (dict): 状态信息
+            now (float, optional): 当前时间
+
+        Returns:
+            float: 剩余秒数，无法估算时返回None
+        """
+        now = now if now is not None else time.time()
+        current = status_info.get('progress_current', 0)
+        total = status_info.get('progress_total', 0)
+        if total <= 0:
+            return None
+        if current >= total:
+            return 0.0
+
+        if self._first_sample is None:
+            self._first_sample = (now, current)
+
+        sample_time, sample_current = self._first_sample
+        if now > sample_time and current > sample_current:
+            rate = (current - sample_current) / (now - sample_time)
+        else:
+            rate = parse_speed(status_info.get('speed'))
+        if rate <= 0:
+            return None
+        return (total - current) / rate
+
+    def decide(self, status_info, now=None):
+        """
+        根据状态信息给出决策，决策原因保存在 reason 中
+
+        Args:
+            status_info (dict): 状态信息，需要 progress_current、progress_total 和 speed
+            now (float, optional): 当前时间
+
+        Returns:
+            str: DECISION_CONTINUE、DECISION_CHECKPOINT 或 DECISION_STOP
+        """
+        if not self.enabled or self.started is None:
+            return DECISION_CONTINUE
+
+        now = now if now is not None else time.time()
+        elapsed = self.elapsed(now)
+        remaining = self.estimate_remaining(status_info, now)
+
+        # 在预算内（包括允许的超出部分）可以完成时继续运行
+        if remaining is not None and elapsed + remaining <= self.budget * (1 + OVERRUN_TOLERANCE):
+            return DECISION_CONTINUE
+
+        if elapsed >= self.budget:
+            self.reason = f"已达到时间预算 {format_duration(self.budget)}"
+            if remaining is not None:
+                self.reason += f"，预计还需要 {format_duration(remaining)}"
+            return DECISION_CHECKPOINT
+
+        # 预计需要的时间远超预算，继续运行也无法完成，提前停止
+        if remaining is not None and elapsed >= WARMUP_SECONDS and elapsed + remaining > self.budget * HOPELESS_FACTOR:
+            self.reason = (f"预计需要 {format_duration(elapsed + remaining)}，"
+                           f"远超时间预算 {format_duration(self.budget)}")
+            return DECISION_STOP
+
+        return DECISION_CONTINUE
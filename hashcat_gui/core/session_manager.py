@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+会话管理 - 为每个任务记录hashcat会话和检查点（.restore文件），中断的任务可以通过 --restore 从检查点继续
+"""
+
+import os
+import json
+import time
+import shutil
+
+from hashcat_gui.core.job_workspace import JobWorkspace, get_jobs_dir
+
+
+# 任务目录中的检查点文件名称，通过 --restore-file-path 指定
+RESTORE_FILE_NAME = 'hashcat.restore'
+
+# 任务目录中的会话记录文件名称
+SESSION_FILE_NAME = 'session.json'
+
+# 会话状态
+SESSION_RUNNING = 'running'
+SESSION_INTERRUPTED = 'interrupted'
+SESSION_FINISHED = 'finished'
+
+
+class SessionRecord:
+    """会话记录类，保存在任务目录中"""
+
+    def __init__(self, job_id, session, directory, state=SESSION_RUNNING, exit_code=None,
+                 temp_hash_file=None, updated=None):
+        """
+        初始化会话记录
+
+        Args:
+            job_id (str): 任务ID
+            session (str): hashcat会话名称
+            directory (str): 任务目录
+            state (str): 会话状态
+            exit_code (int, optional): 上次运行的退出代码
+            temp_hash_file (str, optional): 任务使用的临时哈希文件，会话结束后清理
+            updated (float, optional): 更新时间
+        """
+        self.job_id = job_id
+        self.session = session
+        self.directory = directory
+        self.state = state
+        self.exit_code = exit_code
+        self.temp_hash_file = temp_hash_file
+        self.updated = updated or time.time()
+
+    @property
+    def restore_file(self):
+        """检查点文件路径"""
+        return os.path.join(self.directory, RESTORE_FILE_NAME)
+
+    @property
+    def is_resumable(self):
+        """会话没有正常结束并且检查点文件存在时可以恢复"""
+        return self.state != SESSION_FINISHED and os.path.exists(self.restore_file)
+
+    def restore_args(self):
+        """
+        构建从检查点恢复的参数，恢复时hashcat使用检查点中保存的原始命令行
+
+        Returns:
+            list: 命令行参数（不含hashcat路径）
+        """
+        return ['--session', self.session, '--restore', '--restore-file-path', self.restore_file]
+
+    def to_dict(self):
+        """
+        转换为可以保存为JSON的字典
+
+        Returns:
+            dict: 会话信息
+        """
+        return {
+            'job_id': self.job_id,
+            'session': self.session,
+            'state': self.state,
+            'exit_code': self.exit_code,
+            'temp_hash_file': self.temp_hash_file,
+            'updated': self.updated,
+        }
+
+    @classmethod
+    def from_dict(cls, data, directory):
+        """
+        从字典创建会话记录
+
+        Args:
+            data (dict): 会话信息
+            directory (str): 任务目录
+
+        Returns:
+            SessionRecord: 会话记录
+        """
+        return cls(data['job_id'], data['session'], directory, data.get('state', SESSION_RUNNING),
+                   data.get('exit_code'), data.get('temp_hash_file'), data.get('updated'))
+
+
+def build_session_args(workspace, session):
+    """
+    构建新任务的会话参数，检查点文件保存在任务目录中
+
+    Args:
+        workspace (JobWorkspace): 任务工作目录
+        session (str): hashcat会话名称
+
+    Returns:
+        list: 命令行参数
+    """
+    return ['--session', session, '--restore-file-path', workspace.path(RESTORE_FILE_NAME)]
+
+
+class SessionManager:
+    """会话管理器类，读写任务目录中的会话记录"""
+
+    def __init__(self, jobs_dir=None):
+        """
+        初始化会话管理器
+
+        Args:
+            jobs_dir (str, optional): 任务目录，默认为应用数据目录下的jobs
+        """
+        self.jobs_dir = jobs_dir or get_jobs_dir()
+
+    def _save(self, record):
+        """保存会话记录"""
+        record.updated = time.time()
+        try:
+            with open(os.path.join(record.directory, SESSION_FILE_NAME), 'w', encoding='utf-8') as f:
+                json.dump(record.to_dict(), f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"保存会话记录失败: {e}")
+
+    def begin(self, workspace, session, temp_hash_file=None):
+        """
+        记录任务开始运行
+
+        Args:
+            workspace (JobWorkspace): 任务工作目录
+            session (str): hashcat会话名称
+            temp_hash_file (str, optional): 任务使用的临时哈希文件
+
+        Returns:
+            SessionRecord: 会话记录
+        """
+        record = SessionRecord(workspace.job_id, session, workspace.directory, temp_hash_file=temp_hash_file)
+        self._save(record)
+        return record
+
+    def resume(self, record):
+        """
+        记录任务从检查点恢复运行
+
+        Args:
+            record (SessionRecord): 会话记录
+        """
+        record.state = SESSION_RUNNING
+        self._save(record)
+
+    def finish(self, record, exit_code):
+        """
+        记录任务结束，hashcat正常结束时会删除检查点文件，检查点仍然存在说明任务被中断
+
+        Args:
+            record (SessionRecord): 会话记录
+            exit_code (int): 退出代码
+
+        Returns:
+            SessionRecord: 更新后的会话记录
+        """
+        record.exit_code = exit_code
+        record.state = SESSION_INTERRUPTED if os.path.exists(record.restore_file) else SESSION_FINISHED
+        self._save(record)
+        return record
+
+    def get(self, job_id):
+        """
+        读取任务的会话记录
+
+        Args:
+            job_id (str): 任务ID
+
+        Returns:
+            SessionRecord: 会话记录，不存在时返回None
+        """
+        directory = os.path.join(self.jobs_dir, job_id)
+        try:
+            with open(os.path.join(directory, SESSION_FILE_NAME), 'r', encoding='utf-8') as f:
+                return SessionRecord.from_dict(json.load(f), directory)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def list_resumable(self):
+        """
+        列出所有可以恢复的会话，包括程序崩溃时仍在运行的会话
+
+        Returns:
+            list: 会话记录列表，最近更新的在前
+        """
+        try:
+            job_ids = os.listdir(self.jobs_dir)
+        except OSError:
+            return []
+
+        records = [self.get(job_id) for job_id in job_ids]
+        records = [record for record in records if record is not None and record.is_resumable]
+        records.sort(key=lambda record: record.updated, reverse=True)
+        return records
+
+    def load_params(self, record):
+        """
+        读取会话对应任务的破解参数
+
+        Args:
+            record (SessionRecord): 会话记录
+
+        Returns:
+            dict: 破解参数字典
+        """
+        return JobWorkspace(record.job_id, self.jobs_dir).load_params()
+
+    def discard(self, record):
+        """
+        放弃会话，删除临时哈希文件和整个任务目录（检查点、输出文件和任务参数）
+
+        任务目录中的输出文件包含明文密码，任务结束且不能恢复时就不再保留。
+
+        Args:
+            record (SessionRecord): 会话记录
+        """
+        if record.temp_hash_file and os.path.exists(record.temp_hash_file):
+            try:
+                os.remove(record.temp_hash_file)
+            except OSError as e:
+                print(f"删除文件失败: {e}")
+        shutil.rmtree(record.directory, ignore_errors=True)
+        record.state = SESSION_FINISHED
+
+    def prune(self):
+        """
+        删除已经结束的会话留下的任务目录
+
+        Returns:
+            int: 删除的任务目录数量
+        """
+        try:
+            job_ids = os.listdir(self.jobs_dir)
+        except OSError:
+            return 0
+
+        removed = 0
+        for job_id in job_ids:
+            record = self.get(job_id)
+            if record is not None and record.state == SESSION_FINISHED:
+                shutil.rmtree(record.directory, ignore_errors=True)
+                removed += 1
+        return removed
@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+分片执行器 - 把一次攻击的密钥空间切分成多个分片，在多个本地hashcat进程中并行运行
+"""
+
+import os
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from hashcat_gui.core.engine import HashcatEngine, EVENT_OUTPUT
+from hashcat_gui.core.hashcat_runner import HashcatRunner, START_FAILED_EXIT_CODE
+from hashcat_gui.core.command_builder import parse_speed
+from hashcat_gui.core.sharding import query_keyspace, split_keyspace, assign_devices
+from hashcat_gui.core.status_parser import format_speed
+
+
+# 支持分片的攻击模式
+SHARDABLE_ATTACK_MODES = (0, 1, 3, 6, 7)
+
+
+class KeyspaceSignals(QObject):
+    """密钥空间查询任务的信号，QRunnable本身不能发出信号"""
+
+    output = Signal(str)  # 输出信号
+    finished = Signal(dict, object, object)  # 查询完成信号（破解参数，密钥空间大小，已破解的结果，失败时为None）
+
+
+class KeyspaceWorker(QRunnable):
+    """
+    密钥空间查询任务类，hashcat --keyspace 在大字典和规则下可能需要很长时间，在线程池中运行
+
+    同时通过执行引擎查询一次已破解的结果，所有分片共用查询结果。
+    """
+
+    def __init__(self, hashcat_path, params, engine=None):
+        """
+        初始化密钥空间查询任务
+
+        Args:
+            hashcat_path (str): hashcat可执行文件路径
+            params (dict): 破解参数字典
+            engine (HashcatEngine, optional): 用于查询已破解结果的执行引擎
+        """
+        super().__init__()
+        self.hashcat_path = hashcat_path
+        self.params = params
+        self.engine = engine
+        self.signals = KeyspaceSignals()
+
+    def run(self):
+        """在线程池中查询密钥空间和已破解的结果"""
+        try:
+            keyspace = query_keyspace(self.hashcat_path, self.params)
+        except Exception as e:
+            print(f"查询密钥空间时出错: {str(e)}")
+            keyspace = None
+
+        known_results = None
+        if keyspace and self.engine is not None and self.params.get('hash_file'):
+            self.engine.add_listener(EVENT_OUTPUT, self.signals.output.emit)
+            known_results = self.engine.find_known_results(self.params)
+        self.signals.finished.emit(self.params, keyspace, known_results)
+
+
+class ShardedRunner(QObject):
+    """分片执行器类，信号与HashcatRunner相同，所有分片的状态和破解结果汇总后发出"""
+
+    # 定义信号
+    output_ready = Signal(str)  # 输出信号
+    error_occurred = Signal(str)  # 错误信号
+    process_finished = Signal(int, object)  # 所有分片结束信号
+    password_found = Signal(str, str)  # 密码找到信号
+    status_update = Signal(dict)  # 汇总的状态更新信号
+
+    def __init__(self, config_manager):
+        """
+        初始化分片执行器
+
+        Args:
+            config_manager: 配置管理器实例
+        """
+        super().__init__()
+        self.config_manager = config_manager
+        self.runners = []
+        self._shard_status = {}
+        self._exit_codes = {}
+        self._found_hashes = set()
+        self._temp_hash_file = None
+        self._querying = False                 # 是否正在查询密钥空间
+        self._stop_requested = False           # 查询密钥空间时是否请求了停止
+
+    def is_running(self):
+        """
+        是否正在查询密钥空间或有分片正在运行
+
+        Returns:
+            bool: 是否正在运行
+        """
+        return self._querying or any(runner.is_running() for runner in self.runners)
+
+    def start_cracking(self, params):
+        """
+        在线程池中查询密钥空间，查询完成后切分密钥空间并为每个分片启动一个hashcat进程
+
+        查询失败或没有分片启动时，通过 error_occurred 报告并发出退出代码为 START_FAILED_EXIT_CODE 的
+        process_finished 信号。
+
+        Args:
+            params (dict): 破解参数字典，shards为分片数量，devices为可用的设备
+
+        Returns:
+            bool: 是否已安排启动
+        """
+        if params.get('attack_mode') not in SHARDABLE_ATTACK_MODES:
+            self.error_occurred.emit("当前攻击模式不支持分片")
+            return False
+
+        if self.is_running():
+            self.error_occurred.emit("已有任务正在运行")
+            return False
+
+        self._querying = True
+        self._stop_requested = False
+        self.output_ready.emit("正在查询密钥空间...")
+        worker = KeyspaceWorker(self.config_manager.get_hashcat_path(), params,
+                                HashcatEngine.from_config(self.config_manager))
+        worker.signals.output.connect(self.output_ready)
+        worker.signals.finished.connect(self._start_shards)
+        QThreadPool.globalInstance().start(worker)
+        return True
+
+    def _start_shards(self, params, keyspace, known_results=None):
+        """
+        密钥空间查询完成后，切分密钥空间并启动所有分片
+
+        Args:
+            params (dict): 破解参数字典
+            keyspace (int): 密钥空间大小，查询失败时为None
+            known_results (list, optional): 已破解的结果，交给每个分片，查询失败时为None，由各个分片自己查询
+        """
+        self._querying = False
+        self._temp_hash_file = params['hash_file'] if params.get('_temp_hash_file') else None
+        if self._stop_requested:
+            self.output_ready.emit("已停止，不再启动分片")
+            self._cleanup_temp_hash_file()
+            self.process_finished.emit(START_FAILED_EXIT_CODE, None)
+            return
+
+        if not keyspace:
+            self.error_occurred.emit("查询密钥空间失败，无法分片")
+            self._cleanup_temp_hash_file()
+            self.process_finished.emit(START_FAILED_EXIT_CODE, None)
+            return
+
+        slices = split_keyspace(keyspace, params.get('shards', 1))
+        devices = assign_devices(params.get('devices'), len(slices))
+        self.output_ready.emit(f"密钥空间: {keyspace}，分为 {len(slices)} 个分片")
+
+        self.runners = []
+        self._shard_status = {}
+        self._exit_codes = {}
+        self._found_hashes = set()
+
+        session = params.get('session') or 'lovelyhashcat'
+        for index, (skip, limit) in enumerate(slices):
+            shard_params = dict(params)
+            shard_params.update({
+                'skip': skip,
+                'limit': limit,
+                'devices': devices[index],
+                # 同时运行的hashcat进程不能使用相同的会话名称
+                'session': f"{session}_shard{index + 1}",
+            })
+            # 所有分片共用同一个临时哈希文件，等全部分片结束后再清理
+            shard_params.pop('_temp_hash_file', None)
+            # 每个分片使用独立的任务目录和检查点
+            shard_params.pop('job_id', None)
+            # 已破解的结果只查询一次，分片启动时不再同时更新和查询同一个potfile索引
+            if known_results is not None:
+                shard_params['_known_results'] = known_results
+
+            runner = HashcatRunner(self.config_manager)
+            runner.output_ready.connect(lambda text, i=index: self.output_ready.emit(f"[分片{i + 1}] {text}"))
+            runner.error_occurred.connect(lambda text, i=index: self.error_occurred.emit(f"[分片{i + 1}] {text}"))
+            runner.password_found.connect(self._on_password_found)
+            runner.status_update.connect(lambda status_info, i=index: self._on_shard_status(i, status_info))
+            runner.process_finished.connect(lambda exit_code, _, i=index: self._on_shard_finished(i, exit_code))
+
+            if runner.start_cracking(shard_params):
+                self.runners.append(runner)
+            else:
+                self.error_occurred.emit(f"分片 {index + 1} 启动失败")
+                runner.deleteLater()
+
+        if not self.runners:
+            self._cleanup_temp_hash_file()
+            self.process_finished.emit(START_FAILED_EXIT_CODE, None)
+
+    def stop_cracking(self):
+        """
+        停止所有分片，正在查询密钥空间时查询完成后不再启动分片
+
+        Returns:
+            bool: 是否有需要停止的任务
+        """
+        if self._querying:
+            self._stop_requested = True
+            return True
+
+        stopped = False
+        for runner in self.runners:
+            stopped = runner.stop_cracking() or stopped
+        return stopped
+
+    def _on_password_found(self, hash_val, password):
+        """合并各个分片的破解结果，同一个哈希只发送一次"""
+        if hash_val in self._found_hashes:
+            return
+        self._found_hashes.add(hash_val)
+        self.password_found.emit(hash_val, password)
+
+    def _on_shard_status(self, index, status_info):
+        """
+        记录分片的状态，并发出汇总后的状态
+
+        Args:
+            index (int): 分片序号
+            status_info (dict): 分片的状态信息
+        """
+        self._shard_status[index] = status_info
+        self.status_update.emit(self._aggregate_status())
+
+    def _aggregate_status(self):
+        """
+        汇总所有分片的状态
+
+        Returns:
+            dict: 汇总后的状态信息
+        """
+        statuses = list(self._shard_status.values())
+        current = sum(status.get('progress_current', 0) for status in statuses)
+        total = sum(status.get('progress_total', 0) for status in statuses)
+        speed = sum(parse_speed(status.get('speed')) for status in statuses)
+        recovered_total = max((status.get('recovered_total', 0) for status in statuses), default=0)
+        recovered = max([len(self._found_hashes)] + [status.get('recovered_count', 0) for status in statuses])
+        running = [status for status in statuses if status.get('status', '').startswith('Running')]
+
+        percentage = (current / total) * 100 if total > 0 else 0
+        status_info = {
+            'status': f"Running ({len(running)}/{len(self.runners)} 个分片)" if running
+                      else statuses[-1].get('status', '') if statuses else '',
+            'speed': format_speed(speed),
+            'progress': f"{current}/{total} ({percentage:.2f}%)",
+            'progress_percent': percentage,
+            'progress_current': current,
+            'progress_total': total,
+            'recovered_count': recovered,
+            'recovered_total': recovered_total,
+            'shards': len(self.runners),
+        }
+        if recovered_total:
+            status_info['recovered'] = f"{recovered}/{recovered_total}"
+        return status_info
+
+    def _on_shard_finished(self, index, exit_code):
+        """
+        记录分片结束，所有分片结束后发出结束信号
+
+        Args:
+            index (int): 分片序号
+            exit_code (int): 退出代码
+        """
+        self._exit_codes[index] = exit_code
+        self.output_ready.emit(f"分片 {index + 1} 已结束，退出代码: {exit_code}")
+        if len(self._exit_codes) < len(self.runners):
+            return
+
+        # 任一分片破解了所有哈希则视为已破解，全部穷尽视为已穷尽，否则使用第一个异常的退出代码
+        codes = list(self._exit_codes.values())
+        if 0 in codes:
+            exit_code = 0
+        elif all(code == 1 for code in codes):
+            exit_code = 1
+        else:
+            exit_code = next(code for code in codes if code not in (0, 1))
+        self.process_finished.emit(exit_code, None)
+
+        # 有分片可以从检查点恢复时保留临时哈希文件，恢复时还要使用
+        resumable = [runner.last_session.job_id for runner in self.runners
+                     if runner.last_session is not None and runner.last_session.is_resumable]
+        for runner in self.runners:
+            runner.deleteLater()
+        self.runners = []
+        if resumable:
+            self.output_ready.emit(f"{len(resumable)} 个分片的检查点已保存，下次可以从检查点继续")
+            self._temp_hash_file = None
+        else:
+            self._cleanup_temp_hash_file()
+
+    def _cleanup_temp_hash_file(self):
+        """清理所有分片共用的临时哈希文件"""
+        if self._temp_hash_file and os.path.exists(self._temp_hash_file):
+            try:
+                os.remove(self._temp_hash_file)
+                self.output_ready.emit(f"已清理临时哈希文件: {self._temp_hash_file}")
+            except OSError as e:
+                self.error_occurred.emit(f"清理临时文件时出错: {str(e)}")
+        self._temp_hash_file = None
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+密钥空间分片 - 查询攻击的密钥空间，并把它切分成多个 --skip/--limit 分片，不依赖Qt
+"""
+
+import os
+import subprocess
+
+from hashcat_gui.core.command_builder import build_keyspace_args
+
+
+def query_keyspace(hashcat_path, params, timeout=120):
+    """
+    运行 hashcat --keyspace 查询攻击的密钥空间
+
+    Args:
+        hashcat_path (str): hashcat可执行文件路径
+        params (dict): 破解参数字典
+        timeout (int): 超时时间（秒）
+
+    Returns:
+        int: 密钥空间大小，查询失败时返回None
+    """
+    cmd_args = [hashcat_path] + build_keyspace_args(params)
+    try:
+        result = subprocess.run(
+            cmd_args,
+            cwd=os.path.dirname(hashcat_path) or None,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"查询密钥空间失败: {e}")
+        return None
+
+    # 最后一行是密钥空间，前面可能有警告信息
+    for line in reversed(result.stdout.splitlines()):
+        line = line.strip()
+        if line.isdigit():
+            return int(line)
+    return None
+
+
+def split_keyspace(keyspace, shards):
+    """
+    把密钥空间切分成连续的分片
+
+    Args:
+        keyspace (int): 密钥空间大小
+        shards (int): 分片数量
+
+    Returns:
+        list: 分片列表，每个元素是 (skip, limit)
+    """
+    shards = max(1, min(int(shards), keyspace))
+    size, remainder = divmod(keyspace, shards)
+
+    slices = []
+    skip = 0
+    for index in range(shards):
+        limit = size + (1 if index < remainder else 0)
+        slices.append((skip, limit))
+        skip += limit
+    return slices
+
+
+def assign_devices(devices, shards):
+    """
+    把设备分配给各个分片，设备多于分片时每个分片使用多个设备，少于分片时轮流使用
+
+    Args:
+        devices (list): 设备ID列表，为空时不指定设备
+        shards (int): 分片数量
+
+    Returns:
+        list: 每个分片的设备ID列表
+    """
+    if not devices:
+        return [None] * shards
+
+    if len(devices) >= shards:
+        return [list(devices[index::shards]) for index in range(shards)]
+    return [[devices[index % len(devices)]] for index in range(shards)]
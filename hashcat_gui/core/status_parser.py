@@ -0,0 +1,415 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+状态解析器 - 按行增量解析Hashcat的输出，每个状态块生成一份完整的状态信息
+
+支持普通的文本状态输出，以及 --status-json 输出的JSON状态记录。
+"""
+
+import re
+import json
+import time
+
+
+# 状态行的格式: Name.Sub[.#设备]....: 值
+STATUS_LINE_REGEX = re.compile(
+    r'^(?P<name>[A-Z][A-Za-z]*(?:\.[A-Z][A-Za-z]*)*)(?:\.#(?P<device>\d+|\*))?\.+: ?(?P<value>.*)$'
+)
+
+# 直接保存值的状态字段
+TEXT_FIELDS = {
+    'Session': 'session',
+    'Status': 'status',
+    'Hash.Mode': 'hash_type',
+    'Hash.Type': 'hash_type',
+    'Hash.Target': 'hash_target',
+    'Time.Started': 'time_started',
+    'Time.Estimated': 'time_estimated',
+    'Kernel.Feature': 'kernel_feature',
+    'Guess.Base': 'guess_base',
+    'Guess.Mod': 'guess_mod',
+    'Guess.Queue': 'guess_queue',
+    'Guess.Charset': 'guess_charset',
+    'Guess.Mask': 'guess_mask',
+    'Remaining': 'remaining',
+    'Restore.Point': 'restore_point',
+    'Candidate.Engine': 'candidate_engine',
+}
+
+# 按设备区分的状态字段
+DEVICE_FIELDS = {
+    'Speed': 'speeds',
+    'Candidates': 'candidates',
+    'Hardware.Mon': 'hardware_mon',
+    'Restore.Sub': 'restore_sub',
+}
+
+# 任务已经结束的状态
+FINAL_STATUSES = ('Exhausted', 'Cracked', 'Aborted', 'Quit', 'Bypass', 'Error')
+
+# 解析事件类型
+EVENT_STATUS = 'status'
+EVENT_LINE = 'line'
+
+RATIO_REGEX = re.compile(r'(\d+)/(\d+)')
+
+# --status-json 中的状态代码
+STATUS_CODES = {
+    0: 'Initializing',
+    1: 'Autotuning',
+    2: 'Selftest',
+    3: 'Running',
+    4: 'Paused',
+    5: 'Exhausted',
+    6: 'Cracked',
+    7: 'Aborted',
+    8: 'Quit',
+    9: 'Bypass',
+    10: 'Aborted (Checkpoint)',
+    11: 'Aborted (Runtime)',
+    12: 'Running (Checkpoint Quit)',
+    13: 'Error',
+    14: 'Aborted (Finish)',
+    15: 'Running (Quit after attack)',
+    16: 'Autodetect',
+}
+
+# 未结束的JSON记录最多缓存的字符数，超过后按普通输出处理
+MAX_JSON_RECORD_SIZE = 1024 * 1024
+
+SPEED_UNITS = ('H/s', 'kH/s', 'MH/s', 'GH/s', 'TH/s', 'PH/s')
+
+
+def format_speed(speed):
+    """
+    把每秒哈希数格式化为hashcat的速度格式
+
+    Args:
+        speed (float): 每秒哈希数
+
+    Returns:
+        str: 例如 1234.5 kH/s
+    """
+    unit = 0
+    speed = float(speed)
+    while speed >= 1000 and unit < len(SPEED_UNITS) - 1:
+        speed /= 1000
+        unit += 1
+    return f"{speed:.1f} {SPEED_UNITS[unit]}" if unit else f"{int(speed)} H/s"
+
+
+def is_final_status(status):
+    """
+    判断状态是否表示任务已经结束
+
+    Args:
+        status (str): 状态文本，例如 Running、Exhausted、Aborted (Runtime)
+
+    Returns:
+        bool: 任务已结束时返回True
+    """
+    return bool(status) and status.startswith(FINAL_STATUSES)
+
+
+class StatusParser:
+    """状态解析器类，保存不完整的行，只在收到完整的行时解析一次"""
+
+    def __init__(self):
+        """初始化状态解析器"""
+        self._buffer = ''
+        self._block = {}
+
+    def reset(self):
+        """清空未处理的内容"""
+        self._buffer = ''
+        self._block = {}
+
+    def feed(self, data):
+        """
+        输入一段输出，数据块可以在任意位置截断
+
+        Args:
+            data (str): 进程输出的一段文本
+
+        Returns:
+            list: 解析事件列表，每个元素是 (EVENT_STATUS, 状态信息字典) 或 (EVENT_LINE, 非状态行)
+        """
+        self._buffer += data
+        lines = self._buffer.split('\n')
+        self._buffer = lines.pop()
+
+        events = []
+        for line in lines:
+            self._parse_line(line.rstrip('\r'), events)
+        return events
+
+    def flush(self):
+        """
+        处理剩余的不完整行和未结束的状态块，进程结束时调用
+
+        Returns:
+            list: 解析事件列表
+        """
+        events = []
+        if self._buffer:
+            self._parse_line(self._buffer.rstrip('\r'), events)
+            self._buffer = ''
+        self._finish_block(events)
+        return events
+
+    def _finish_block(self, events):
+        """结束当前状态块，生成一份状态信息"""
+        if self._block:
+            events.append((EVENT_STATUS, self._block))
+            self._block = {}
+
+    def _parse_line(self, line, events):
+        """
+        解析一个完整的行
+
+        Args:
+            line (str): 去掉换行符的行
+            events (list): 解析事件列表
+        """
+        # 状态块以空行结束
+        if not line.strip():
+            self._finish_block(events)
+            return
+
+        match = STATUS_LINE_REGEX.match(line)
+        if not match:
+            events.append((EVENT_LINE, line))
+            return
+
+        name = match.group('name')
+        device = match.group('device')
+        value = match.group('value').strip()
+
+        # 新的状态块以Session开始
+        if name == 'Session':
+            self._finish_block(events)
+
+        if device is not None and name in DEVICE_FIELDS:
+            self._block.setdefault(DEVICE_FIELDS[name], {})[device] = value
+            if name == 'Speed':
+                self._set_speed(device, value)
+        elif name in TEXT_FIELDS:
+            self._block[TEXT_FIELDS[name]] = value
+        elif name == 'Progress':
+            self._set_progress(value)
+        elif name == 'Recovered':
+            self._set_recovered(value)
+        elif name == 'Rejected':
+            ratio = RATIO_REGEX.match(value)
+            if ratio:
+                self._block['rejected'] = int(ratio.group(1))
+        else:
+            events.append((EVENT_LINE, line))
+
+    def _set_speed(self, device, value):
+        """记录速度，有多个设备时优先使用总速度"""
+        speed = value.split(' (', 1)[0].strip()
+        if device == '*' or 'speed' not in self._block:
+            self._block['speed'] = speed
+
+    def _set_progress(self, value):
+        """解析进度: 当前/总数 (百分比)"""
+        ratio = RATIO_REGEX.match(value)
+        if not ratio:
+            return
+        current = int(ratio.group(1))
+        total = int(ratio.group(2))
+        percentage = (current / total) * 100 if total > 0 else 0
+        self._block['progress'] = f"{current}/{total} ({percentage:.2f}%)"
+        self._block['progress_percent'] = percentage
+        self._block['progress_current'] = current
+        self._block['progress_total'] = total
+
+    def _set_recovered(self, value):
+        """解析已恢复数量: 已恢复/总数 (百分比) Digests"""
+        ratio = RATIO_REGEX.match(value)
+        if not ratio:
+            return
+        recovered = int(ratio.group(1))
+        total = int(ratio.group(2))
+        self._block['recovered'] = f"{recovered}/{total}"
+        self._block['recovered_count'] = recovered
+        self._block['recovered_total'] = total
+
+
+class HashcatStatus:
+    """Hashcat状态类，保存一条 --status-json 记录中的状态信息"""
+
+    def __init__(self, data):
+        """
+        初始化Hashcat状态
+
+        Args:
+            data (dict): --status-json 输出的一条JSON记录
+        """
+        progress = data.get('progress') or [0, 0]
+        recovered = data.get('recovered_hashes') or [0, 0]
+        recovered_salts = data.get('recovered_salts') or [0, 0]
+
+        self.session = data.get('session', '')
+        self.status_code = data.get('status')
+        self.status = STATUS_CODES.get(self.status_code, str(self.status_code))
+        self.target = data.get('target', '')
+        self.guess = data.get('guess') or {}
+        self.progress_current, self.progress_total = int(progress[0]), int(progress[1])
+        self.restore_point = data.get('restore_point', 0)
+        self.recovered_count, self.recovered_total = int(recovered[0]), int(recovered[1])
+        self.recovered_salts = (int(recovered_salts[0]), int(recovered_salts[1]))
+        self.rejected = data.get('rejected', 0)
+        self.devices = data.get('devices') or []
+        self.time_start = data.get('time_start')
+        self.estimated_stop = data.get('estimated_stop')
+
+    @property
+    def total_speed(self):
+        """所有设备的总速度（每秒哈希数）"""
+        return sum(device.get('speed', 0) for device in self.devices)
+
+    @property
+    def device_speeds(self):
+        """每个设备的速度，键为设备ID"""
+        return {str(device.get('device_id')): device.get('speed', 0) for device in self.devices}
+
+    @property
+    def progress_percent(self):
+        """进度百分比"""
+        if self.progress_total > 0:
+            return (self.progress_current / self.progress_total) * 100
+        return 0
+
+    def is_final(self):
+        """
+        任务是否已经结束
+
+        Returns:
+            bool: 已结束时返回True
+        """
+        return is_final_status(self.status)
+
+    def to_status_info(self):
+        """
+        转换为与文本状态解析结果相同格式的状态信息字典
+
+        Returns:
+            dict: 状态信息
+        """
+        status_info = {
+            'session': self.session,
+            'status': self.status,
+            'status_code': self.status_code,
+            'hash_target': self.target,
+            'speed': format_speed(self.total_speed),
+            'speeds': {device_id: format_speed(speed) for device_id, speed in self.device_speeds.items()},
+            'recovered': f"{self.recovered_count}/{self.recovered_total}",
+            'recovered_count': self.recovered_count,
+            'recovered_total': self.recovered_total,
+            'progress': f"{self.progress_current}/{self.progress_total} ({self.progress_percent:.2f}%)",
+            'progress_percent': self.progress_percent,
+            'progress_current': self.progress_current,
+            'progress_total': self.progress_total,
+            'rejected': self.rejected,
+        }
+        if self.guess.get('guess_base'):
+            status_info['guess_base'] = self.guess['guess_base']
+        if self.time_start:
+            status_info['time_started'] = time.strftime("%c", time.localtime(self.time_start))
+        if self.estimated_stop:
+            status_info['time_estimated'] = time.strftime("%c", time.localtime(self.estimated_stop))
+        return status_info
+
+
+class StatusJsonParser:
+    """JSON状态解析器类，从 --status-json 的输出中增量解码JSON状态记录"""
+
+    def __init__(self):
+        """初始化JSON状态解析器"""
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._record = ''
+
+    def reset(self):
+        """清空未处理的内容"""
+        self._buffer = ''
+        self._record = ''
+
+    def feed(self, data):
+        """
+        输入一段输出，数据块可以在任意位置截断
+
+        Args:
+            data (str): 进程输出的一段文本
+
+        Returns:
+            list: 解析事件列表，每个元素是 (EVENT_STATUS, HashcatStatus) 或 (EVENT_LINE, 非状态行)
+        """
+        self._buffer += data
+        lines = self._buffer.split('\n')
+        self._buffer = lines.pop()
+
+        events = []
+        for line in lines:
+            self._parse_line(line.rstrip('\r'), events)
+        return events
+
+    def flush(self):
+        """
+        处理剩余的内容，进程结束时调用
+
+        Returns:
+            list: 解析事件列表
+        """
+        events = []
+        if self._buffer:
+            self._parse_line(self._buffer.rstrip('\r'), events)
+            self._buffer = ''
+        if self._record:
+            events.extend((EVENT_LINE, line) for line in self._record.split('\n'))
+            self._record = ''
+        return events
+
+    def _parse_line(self, line, events):
+        """
+        解析一个完整的行，JSON记录可能跨越多行
+
+        Args:
+            line (str): 去掉换行符的行
+            events (list): 解析事件列表
+        """
+        if not self._record:
+            if not line.lstrip().startswith('{'):
+                if line.strip():
+                    events.append((EVENT_LINE, line))
+                return
+            self._record = line
+        else:
+            self._record += '\n' + line
+
+        try:
+            data, end = self._decoder.raw_decode(self._record.lstrip())
+        except json.JSONDecodeError:
+            # 记录还没有结束，继续等待后面的行
+            if len(self._record) > MAX_JSON_RECORD_SIZE:
+                events.extend((EVENT_LINE, text) for text in self._record.split('\n'))
+                self._record = ''
+            return
+
+        record = self._record.lstrip()
+        rest = record[end:].strip()
+        self._record = ''
+        if isinstance(data, dict) and 'status' in data:
+            try:
+                status = HashcatStatus(data)
+                status.to_status_info()
+            except (TypeError, ValueError, IndexError, AttributeError, OverflowError, OSError):
+                # 字段类型不正确的记录按普通输出处理，不能中断读取进程的输出
+                events.extend((EVENT_LINE, text) for text in record[:end].split('\n'))
+            else:
+                events.append((EVENT_STATUS, status))
+        if rest:
+            events.append((EVENT_LINE, rest))
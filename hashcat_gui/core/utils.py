@@ -3,16 +3,17 @@
 
 """
 实用工具函数 - 提供通用的工具函数
+
+消息框函数使用时才导入Qt，只使用其他函数时（例如无界面的守护进程）不需要加载Qt
 """
 
 import os
 import json
 import hashlib
 import datetime
-from PySide6.QtWidgets import QMessageBox
 
 
-def show_message(parent, title, message, icon=QMessageBox.Information):
+def show_message(parent, title, message, icon=None):
     """
     显示消息对话框
     
@@ -20,12 +21,14 @@ def show_message(parent, title, message, icon=QMessageBox.Information):
         parent: 父窗口
         title (str): 标题
         message (str): 消息内容
-        icon (QMessageBox.Icon): 图标类型
+        icon (QMessageBox.Icon, optional): 图标类型，默认为信息图标
     """
+    from PySide6.QtWidgets import QMessageBox
+    
     msg_box = QMessageBox(parent)
     msg_box.setWindowTitle(title)
     msg_box.setText(message)
-    msg_box.setIcon(icon)
+    msg_box.setIcon(QMessageBox.Information if icon is None else icon)
     msg_box.exec()
 
 
@@ -38,6 +41,8 @@ def show_error(parent, title, message):
         title (str): 标题
         message (str): 错误消息
     """
+    from PySide6.QtWidgets import QMessageBox
+    
     show_message(parent, title, message, QMessageBox.Critical)
 
 
@@ -50,6 +55,8 @@ def show_warning(parent, title, message):
         title (str): 标题
         message (str): 警告消息
     """
+    from PySide6.QtWidgets import QMessageBox
+    
     show_message(parent, title, message, QMessageBox.Warning)
 
 
@@ -65,6 +72,8 @@ def confirm(parent, title, message):
     Returns:
         bool: 用户是否确认
     """
+    from PySide6.QtWidgets import QMessageBox
+    
     reply = QMessageBox.question(
         parent,
         title,
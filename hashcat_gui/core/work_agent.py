@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+分布式任务代理 - 从协调器申请工作单元，在本地运行hashcat，并把破解结果提交给协调器
+
+用法:
+    python -m hashcat_gui.core.work_agent --coordinator http://127.0.0.1:8765 --hashcat <hashcat路径>
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import urllib.request
+
+from hashcat_gui.core.command_builder import build_attack_args, build_slice_args
+from hashcat_gui.core.potfile_tailer import PotfileTailer
+from hashcat_gui.core.work_coordinator import TOKEN_HEADER
+
+
+# 没有可用的工作单元时的等待时间（秒）
+WAIT_INTERVAL = 2
+
+# 连续运行失败（包括hashcat无法启动）的工作单元达到该数量时，代理停止运行
+MAX_CONSECUTIVE_FAILURES = 3
+
+
+class WorkAgent:
+    """分布式任务代理类，循环申请工作单元直到协调器的任务结束"""
+
+    def __init__(self, coordinator_url, hashcat_path, agent_id=None, work_dir=None,
+                 devices=None, extra_args=None, token=None):
+        """
+        初始化分布式任务代理
+
+        Args:
+            coordinator_url (str): 协调器地址
+            hashcat_path (str): hashcat可执行文件路径
+            agent_id (str, optional): 代理ID，默认使用主机名和进程ID
+            work_dir (str, optional): 工作目录，存放哈希文件和输出文件
+            devices (list, optional): 使用的设备ID列表
+            extra_args (list, optional): 额外的hashcat参数
+            token (str, optional): 协调器的共享密钥
+        """
+        self.coordinator_url = coordinator_url.rstrip('/')
+        self.hashcat_path = hashcat_path
+        self.agent_id = agent_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix='lovelyhashcat_agent_')
+        self.devices = devices
+        self.extra_args = extra_args or []
+        self.token = token
+        self.process = None
+        self.consecutive_failures = 0
+
+    def _request(self, path, data=None):
+        """
+        向协调器发送请求
+
+        Args:
+            path (str): 接口路径
+            data (dict, optional): POST的JSON数据，为None时发送GET请求
+
+        Returns:
+            bytes: 响应内容
+        """
+        body = json.dumps(data).encode('utf-8') if data is not None else None
+        request = urllib.request.Request(self.coordinator_url + path, data=body)
+        if body is not None:
+            request.add_header('Content-Type', 'application/json')
+        if self.token:
+            request.add_header(TOKEN_HEADER, self.token)
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.read()
+
+    def _post(self, path, data):
+        """发送POST请求并解析JSON响应"""
+        data = dict(data, agent=self.agent_id)
+        return json.loads(self._request(path, data))
+
+    def prepare(self):
+        """
+        下载任务参数和哈希文件
+
+        Returns:
+            dict: 本地运行使用的破解参数
+        """
+        params = json.loads(self._request('/job'))
+        hash_file = os.path.join(self.work_dir, 'hashes.txt')
+        with open(hash_file, 'wb') as f:
+            f.write(self._request('/hashfile'))
+        params['hash_file'] = hash_file
+        return params
+
+    def build_command(self, params, unit, outfile):
+        """
+        构建运行一个工作单元的hashcat命令
+
+        Args:
+            params (dict): 破解参数字典
+            unit (dict): 工作单元信息
+            outfile (str): 输出文件路径
+
+        Returns:
+            list: 命令行参数
+        """
+        cmd_args = [self.hashcat_path] + build_attack_args(params)
+        cmd_args.extend(build_slice_args({'skip': unit['skip'], 'limit': unit['limit']}))
+        cmd_args.extend([
+            '--session', f"agent_{os.getpid()}_{unit['unit_id']}",
+            # 结果统一提交给协调器，本地不使用potfile，避免跳过其他任务破解过的哈希
+            '--potfile-disable',
+            '-o', outfile,
+            '--outfile-format=1,2',
+            '--quiet',
+        ])
+        # 哈希文件中带有用户名前缀
+        if params.get('username'):
+            cmd_args.append('--username')
+        if self.devices:
+            cmd_args.extend(['-d', ','.join(str(device) for device in self.devices)])
+        cmd_args.extend(self.extra_args)
+        return cmd_args
+
+    def run_unit(self, params, unit):
+        """
+        运行一个工作单元，运行期间定时发送心跳
+
+        Args:
+            params (dict): 破解参数字典
+            unit (dict): 工作单元信息
+
+        Returns:
+            tuple: (退出代码, 破解结果列表)，启动失败时退出代码为None
+        """
+        outfile = os.path.join(self.work_dir, f"unit_{unit['unit_id']}.out")
+        if os.path.exists(outfile):
+            os.remove(outfile)
+
+        cmd_args = self.build_command(params, unit, outfile)
+        try:
+            self.process = subprocess.Popen(
+                cmd_args,
+                cwd=os.path.dirname(self.hashcat_path) or None,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError as e:
+            print(f"启动hashcat失败: {e}")
+            return None, []
+
+        # 租约时间的三分之一发送一次心跳
+        stop_heartbeat = threading.Event()
+        interval = max(1, unit.get('lease_timeout', 60) / 3)
+        heartbeat = threading.Thread(target=self._heartbeat_loop, args=(unit['unit_id'], interval, stop_heartbeat),
+                                     daemon=True)
+        heartbeat.start()
+        try:
+            exit_code = self.process.wait()
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+            self.process = None
+
+        cracks = PotfileTailer(outfile).read_new_entries()
+        return exit_code, cracks
+
+    def _heartbeat_loop(self, unit_id, interval, stop_event):
+        """定时发送心跳，租约已失效时停止hashcat"""
+        while not stop_event.wait(interval):
+            try:
+                result = self._post('/heartbeat', {'unit_id': unit_id})
+            except (OSError, ValueError) as e:
+                print(f"发送心跳失败: {e}")
+                continue
+            if not result.get('ok'):
+                print(f"工作单元 {unit_id} 的租约已失效，停止运行")
+                process = self.process
+                if process is not None:
+                    process.terminate()
+                return
+
+    def run(self):
+        """
+        循环申请并运行工作单元，直到协调器的任务结束，
+        连续 MAX_CONSECUTIVE_FAILURES 个工作单元运行失败时停止（本节点的hashcat或参数可能有问题）
+
+        Returns:
+            int: 完成的工作单元数量
+        """
+        params = self.prepare()
+        completed = 0
+        self.consecutive_failures = 0
+        while True:
+            unit = self._post('/lease', {})
+            if unit.get('done'):
+                break
+            if unit.get('wait'):
+                time.sleep(WAIT_INTERVAL)
+                continue
+
+            print(f"开始工作单元 {unit['unit_id']}: skip={unit['skip']} limit={unit['limit']}")
+            exit_code, cracks = self.run_unit(params, unit)
+            if exit_code not in (0, 1):
+                # 已经找到的结果也一起提交，工作单元由协调器重新分发
+                error = "hashcat启动失败" if exit_code is None else f"退出代码: {exit_code}"
+                self._post('/fail', {'unit_id': unit['unit_id'], 'error': error, 'cracks': cracks})
+                self.consecutive_failures += 1
+                if self.consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                    print(f"连续 {self.consecutive_failures} 个工作单元运行失败，代理停止运行")
+                    break
+                time.sleep(WAIT_INTERVAL)
+                continue
+
+            self.consecutive_failures = 0
+            result = self._post('/complete', {'unit_id': unit['unit_id'], 'cracks': cracks, 'exit_code': exit_code})
+            completed += 1
+            print(f"工作单元 {unit['unit_id']} 已完成，提交 {len(cracks)} 个结果（新增 {result.get('new', 0)} 个）")
+        return completed
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="分布式任务代理：从协调器申请工作单元并在本地运行hashcat")
+    parser.add_argument('--coordinator', required=True, help="协调器地址，例如 http://127.0.0.1:8765")
+    parser.add_argument('--hashcat', required=True, help="hashcat可执行文件路径")
+    parser.add_argument('--agent-id', help="代理ID")
+    parser.add_argument('--work-dir', help="工作目录")
+    parser.add_argument('-d', '--devices', help="使用的设备，例如 1,2")
+    parser.add_argument('--token', help="协调器的共享密钥")
+    args, extra_args = parser.parse_known_args(argv)
+
+    devices = [device.strip() for device in args.devices.split(',') if device.strip()] if args.devices else None
+    agent = WorkAgent(args.coordinator, args.hashcat, args.agent_id, args.work_dir, devices, extra_args, args.token)
+    try:
+        completed = agent.run()
+    except (OSError, ValueError) as e:
+        print(f"与协调器通信失败: {e}")
+        return 1
+    except KeyboardInterrupt:
+        return 1
+    print(f"任务结束，共完成 {completed} 个工作单元")
+    return 1 if agent.consecutive_failures >= MAX_CONSECUTIVE_FAILURES else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
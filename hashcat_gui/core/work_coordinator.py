@@ -0,0 +1,561 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+分布式任务协调器 - 把一个任务的密钥空间切分成工作单元，通过HTTP分发给各个节点上的代理进程
+
+代理进程的实现见 work_agent.py。接口（JSON）:
+    GET  /job        任务参数
+    GET  /hashfile   哈希文件内容
+    GET  /status     工作单元统计，包括多次失败后不再分发的单元
+    POST /lease      申请一个工作单元 {"agent": 代理ID}
+    POST /heartbeat  延长租约 {"agent": 代理ID, "unit_id": 单元ID}
+    POST /complete   提交结果 {"agent": 代理ID, "unit_id": 单元ID, "exit_code": 退出代码, "cracks": [[hash, password], ...]}
+    POST /fail       放弃工作单元 {"agent": 代理ID, "unit_id": 单元ID, "error": 错误信息, "cracks": [...]}
+
+用法:
+    python -m hashcat_gui.core.work_coordinator --hashcat <hashcat路径> --hash-file <哈希文件> -m 0 -a 3 --mask ?a?a?a?a --units 16
+"""
+
+import sys
+import json
+import time
+import secrets
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from hashcat_gui.core.sharding import query_keyspace, split_keyspace
+
+
+# 工作单元状态
+UNIT_PENDING = 'pending'
+UNIT_LEASED = 'leased'
+UNIT_DONE = 'done'
+UNIT_FAILED = 'failed'
+
+# 默认租约时间（秒），代理需要在租约到期前发送心跳
+DEFAULT_LEASE_TIMEOUT = 120
+
+# 工作单元默认最多分发的次数，失败或租约到期的次数达到后标记为失败，不再分发
+DEFAULT_MAX_ATTEMPTS = 3
+
+# 请求中的共享密钥头
+TOKEN_HEADER = 'X-LovelyHashcat-Token'
+
+# 不需要共享密钥的监听地址，其他地址必须指定共享密钥
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+# 分发给代理的任务参数，文件路径需要在代理所在的节点上同样有效
+JOB_PARAM_KEYS = ('hash_mode', 'attack_mode', 'dict_file', 'rule_file', 'dict_file1', 'dict_file2', 'mask',
+                  'custom_charset1', 'custom_charset2', 'custom_charset3', 'custom_charset4', 'username')
+
+
+def encode_potfile_password(password):
+    """
+    按hashcat的规则编码写入potfile的密码：包含不可打印字符或非ASCII字符的密码写成 $HEX[...]，
+    已经是 $HEX[...] 形式的密码（hashcat输出文件中编码过的结果）原样返回
+
+    Args:
+        password (str): 密码
+
+    Returns:
+        str: 可以写入potfile一行的密码
+    """
+    if password.startswith('$HEX[') and password.endswith(']'):
+        return password
+    if all(' ' <= char <= '~' for char in password):
+        return password
+    return f"$HEX[{password.encode('utf-8').hex()}]"
+
+
+def parse_cracks(items):
+    """
+    检查代理提交的破解结果
+
+    Args:
+        items: 请求中的 cracks，应为 [[hash, password], ...]
+
+    Returns:
+        list: 破解结果，每个元素是 (hash, password)；格式不正确或哈希包含换行时返回None
+    """
+    if not isinstance(items, list):
+        return None
+    cracks = []
+    for item in items:
+        if not isinstance(item, list) or len(item) != 2 or not all(isinstance(value, str) for value in item):
+            return None
+        hash_val, password = item
+        if not hash_val or '\n' in hash_val or '\r' in hash_val:
+            return None
+        cracks.append((hash_val, password))
+    return cracks
+
+
+class WorkUnit:
+    """工作单元类，表示密钥空间中的一段 --skip/--limit"""
+
+    def __init__(self, unit_id, skip, limit):
+        """
+        初始化工作单元
+
+        Args:
+            unit_id (int): 单元ID
+            skip (int): 起始位置
+            limit (int): 长度
+        """
+        self.unit_id = unit_id
+        self.skip = skip
+        self.limit = limit
+        self.state = UNIT_PENDING
+        self.agent = None
+        self.lease_expires = 0
+        self.attempts = 0
+        self.error = ''
+
+    def to_dict(self):
+        """
+        转换为发送给代理的字典
+
+        Returns:
+            dict: 工作单元信息
+        """
+        return {'unit_id': self.unit_id, 'skip': self.skip, 'limit': self.limit}
+
+    def to_failed_dict(self):
+        """
+        转换为状态中报告的失败单元信息
+
+        Returns:
+            dict: 失败单元信息
+        """
+        return dict(self.to_dict(), attempts=self.attempts, error=self.error)
+
+
+class WorkCoordinator:
+    """分布式任务协调器类，管理工作单元的租约，并把代理提交的破解结果合并到potfile"""
+
+    def __init__(self, params, hash_file, keyspace, units=16, potfile_path=None,
+                 lease_timeout=DEFAULT_LEASE_TIMEOUT, host='127.0.0.1', port=0, token=None, on_crack=None,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        初始化分布式任务协调器
+
+        Args:
+            params (dict): 破解参数字典
+            hash_file (str): 哈希文件路径，代理从协调器下载
+            keyspace (int): 密钥空间大小
+            units (int): 工作单元数量
+            potfile_path (str, optional): 合并破解结果的potfile路径
+            lease_timeout (int): 租约时间（秒）
+            host (str): 监听地址
+            port (int): 监听端口，0表示自动选择
+            token (str, optional): 共享密钥，设置后代理的请求必须带上该密钥；只有监听本机地址时可以不设置
+            on_crack (callable, optional): 收到新的破解结果时调用 on_crack(hash_val, password)
+            max_attempts (int): 工作单元最多分发的次数
+        """
+        if not token and host not in LOOPBACK_HOSTS:
+            raise ValueError(f"监听 {host} 时必须指定共享密钥")
+
+        self.params = {key: params[key] for key in JOB_PARAM_KEYS if params.get(key) is not None}
+        self.hash_file = hash_file
+        self.keyspace = keyspace
+        self.potfile_path = potfile_path
+        self.lease_timeout = lease_timeout
+        self.token = token
+        self.on_crack = on_crack
+        self.max_attempts = max(1, max_attempts)
+        self.units = [WorkUnit(index, skip, limit)
+                      for index, (skip, limit) in enumerate(split_keyspace(keyspace, units))]
+        self.cracked = {}
+        self.all_cracked = False              # 代理报告所有哈希都已破解，剩余的单元不再分发
+        self.finished = threading.Event()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def address(self):
+        """协调器的地址，例如 http://127.0.0.1:8765"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """在后台线程中启动HTTP服务"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止HTTP服务"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def wait(self, timeout=None):
+        """
+        等待所有工作单元完成或失败
+
+        Args:
+            timeout (float, optional): 超时时间（秒）
+
+        Returns:
+            bool: 是否已全部完成
+        """
+        return self.finished.wait(timeout)
+
+    def status(self):
+        """
+        获取工作单元统计
+
+        Returns:
+            dict: 各状态的单元数量、失败的单元和已破解数量
+        """
+        with self._lock:
+            self._expire_leases()
+            counts = {UNIT_PENDING: 0, UNIT_LEASED: 0, UNIT_DONE: 0, UNIT_FAILED: 0}
+            for unit in self.units:
+                counts[unit.state] += 1
+            done = sum(unit.limit for unit in self.units if unit.state == UNIT_DONE)
+            return {
+                'units': len(self.units),
+                'pending': counts[UNIT_PENDING],
+                'leased': counts[UNIT_LEASED],
+                'done': counts[UNIT_DONE],
+                'failed': counts[UNIT_FAILED],
+                'failed_units': [unit.to_failed_dict() for unit in self.units if unit.state == UNIT_FAILED],
+                'keyspace': self.keyspace,
+                'progress_percent': (done / self.keyspace) * 100 if self.keyspace else 100,
+                'cracked': len(self.cracked),
+                'all_cracked': self.all_cracked,
+                'finished': self.finished.is_set(),
+            }
+
+    def _expire_leases(self):
+        """把租约已经到期的工作单元重新放回等待状态，调用时需要持有锁"""
+        now = time.time()
+        for unit in self.units:
+            if unit.state == UNIT_LEASED and unit.lease_expires < now:
+                self._release(unit, f"代理 {unit.agent} 的租约已到期")
+        self._check_finished()
+
+    def _release(self, unit, error):
+        """
+        收回工作单元，分发次数达到上限时标记为失败，否则重新放回等待状态，调用时需要持有锁
+
+        Args:
+            unit (WorkUnit): 工作单元
+            error (str): 失败原因
+        """
+        unit.agent = None
+        unit.error = error
+        if unit.attempts >= self.max_attempts:
+            unit.state = UNIT_FAILED
+            print(f"工作单元 {unit.unit_id} 已失败 {unit.attempts} 次，不再分发: {error}")
+        else:
+            unit.state = UNIT_PENDING
+
+    def _check_finished(self):
+        """所有哈希都已破解，或者所有工作单元都已完成或失败时结束任务，调用时需要持有锁"""
+        if self.all_cracked or all(unit.state in (UNIT_DONE, UNIT_FAILED) for unit in self.units):
+            self.finished.set()
+
+    def lease(self, agent):
+        """
+        为代理分配一个工作单元
+
+        Args:
+            agent (str): 代理ID
+
+        Returns:
+            dict: 工作单元信息，全部完成时返回 {'done': True}，暂时没有单元时返回 {'wait': True}
+        """
+        with self._lock:
+            self._expire_leases()
+            if self.finished.is_set():
+                return {'done': True}
+
+            for unit in self.units:
+                if unit.state == UNIT_PENDING:
+                    unit.state = UNIT_LEASED
+                    unit.agent = agent
+                    unit.attempts += 1
+                    unit.lease_expires = time.time() + self.lease_timeout
+                    result = unit.to_dict()
+                    result['lease_timeout'] = self.lease_timeout
+                    return result
+            return {'wait': True}
+
+    def _get_leased_unit(self, agent, unit_id):
+        """查找代理持有的工作单元，租约已转给其他代理时返回None"""
+        if not isinstance(unit_id, int) or not 0 <= unit_id < len(self.units):
+            return None
+        unit = self.units[unit_id]
+        if unit.state != UNIT_LEASED or unit.agent != agent:
+            return None
+        return unit
+
+    def heartbeat(self, agent, unit_id):
+        """
+        延长工作单元的租约
+
+        Args:
+            agent (str): 代理ID
+            unit_id (int): 单元ID
+
+        Returns:
+            dict: {'ok': 是否仍持有租约}
+        """
+        with self._lock:
+            unit = self._get_leased_unit(agent, unit_id)
+            if unit is None:
+                return {'ok': False}
+            unit.lease_expires = time.time() + self.lease_timeout
+            return {'ok': True}
+
+    def complete(self, agent, unit_id, cracks, exit_code=1):
+        """
+        提交工作单元的结果
+
+        破解结果无论租约是否有效都会合并，但只有仍持有租约时才把该单元标记为完成；
+        持有租约的代理报告exit_code为0表示所有哈希都已破解，任务结束，剩余的单元不再分发。
+
+        Args:
+            agent (str): 代理ID
+            unit_id (int): 单元ID
+            cracks (list): 破解结果，每个元素是 [hash, password]
+            exit_code (int): hashcat退出代码
+
+        Returns:
+            dict: {'ok': 租约是否有效, 'new': 新的破解结果数量}
+        """
+        with self._lock:
+            new_cracks = self._merge_cracks(cracks)
+            unit = self._get_leased_unit(agent, unit_id)
+            if unit is not None:
+                unit.state = UNIT_DONE
+                unit.agent = None
+                if exit_code == 0:
+                    self.all_cracked = True
+            self._check_finished()
+
+        self._notify_cracks(new_cracks)
+        return {'ok': unit is not None, 'new': len(new_cracks)}
+
+    def fail(self, agent, unit_id, error='', cracks=()):
+        """
+        代理放弃工作单元，单元重新放回等待状态（分发次数达到上限时标记为失败），已经找到的破解结果仍然合并
+
+        Args:
+            agent (str): 代理ID
+            unit_id (int): 单元ID
+            error (str): 错误信息
+            cracks (list): 放弃前找到的破解结果
+
+        Returns:
+            dict: {'ok': 是否持有租约, 'new': 新的破解结果数量}
+        """
+        with self._lock:
+            new_cracks = self._merge_cracks(cracks)
+            unit = self._get_leased_unit(agent, unit_id)
+            if unit is not None:
+                self._release(unit, f"代理 {agent}: {error}")
+                self._check_finished()
+
+        print(f"代理 {agent} 放弃了工作单元 {unit_id}: {error}")
+        self._notify_cracks(new_cracks)
+        return {'ok': unit is not None, 'new': len(new_cracks)}
+
+    def _merge_cracks(self, cracks):
+        """
+        记录新的破解结果并追加到potfile，调用时需要持有锁
+
+        Args:
+            cracks (list): 破解结果，每个元素是 (hash, password)
+
+        Returns:
+            list: 之前没有记录过的破解结果
+        """
+        new_cracks = []
+        for hash_val, password in cracks:
+            if hash_val not in self.cracked:
+                self.cracked[hash_val] = password
+                new_cracks.append((hash_val, password))
+        self._append_to_potfile(new_cracks)
+        return new_cracks
+
+    def _notify_cracks(self, cracks):
+        """在锁外调用破解结果回调"""
+        if self.on_crack is not None:
+            for hash_val, password in cracks:
+                self.on_crack(hash_val, password)
+
+    def _append_to_potfile(self, cracks):
+        """把新的破解结果追加到potfile"""
+        if not self.potfile_path or not cracks:
+            return
+        try:
+            with open(self.potfile_path, 'a', encoding='utf-8') as f:
+                for hash_val, password in cracks:
+                    f.write(f"{hash_val}:{encode_potfile_password(password)}\n")
+        except OSError as e:
+            print(f"写入potfile失败: {e}")
+
+    def _read_hash_file(self):
+        """读取哈希文件内容"""
+        with open(self.hash_file, 'rb') as f:
+            return f.read()
+
+    def _make_handler(self):
+        """
+        创建HTTP请求处理类
+
+        Returns:
+            type: BaseHTTPRequestHandler的子类
+        """
+        coordinator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, code, body, content_type='application/json'):
+                if not isinstance(body, bytes):
+                    body = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _authorized(self):
+                if coordinator.token and not secrets.compare_digest(
+                        self.headers.get(TOKEN_HEADER, '').encode('utf-8'), coordinator.token.encode('utf-8')):
+                    self._send(403, {'error': '密钥错误'})
+                    return False
+                return True
+
+            def do_GET(self):
+                if not self._authorized():
+                    return
+                if self.path == '/job':
+                    self._send(200, coordinator.params)
+                elif self.path == '/hashfile':
+                    try:
+                        self._send(200, coordinator._read_hash_file(), 'application/octet-stream')
+                    except OSError as e:
+                        self._send(500, {'error': str(e)})
+                elif self.path == '/status':
+                    self._send(200, coordinator.status())
+                else:
+                    self._send(404, {'error': '未知的接口'})
+
+            def do_POST(self):
+                if not self._authorized():
+                    return
+                try:
+                    length = int(self.headers.get('Content-Length', 0))
+                    data = json.loads(self.rfile.read(length) or b'{}')
+                except ValueError:
+                    self._send(400, {'error': '请求格式错误'})
+                    return
+                if not isinstance(data, dict):
+                    self._send(400, {'error': '请求格式错误'})
+                    return
+
+                cracks = parse_cracks(data.get('cracks', []))
+                if cracks is None:
+                    self._send(400, {'error': '破解结果格式错误'})
+                    return
+
+                agent = str(data.get('agent', ''))
+                if self.path == '/lease':
+                    self._send(200, coordinator.lease(agent))
+                elif self.path == '/heartbeat':
+                    self._send(200, coordinator.heartbeat(agent, data.get('unit_id')))
+                elif self.path == '/complete':
+                    self._send(200, coordinator.complete(agent, data.get('unit_id'), cracks,
+                                                         data.get('exit_code', 1)))
+                elif self.path == '/fail':
+                    self._send(200, coordinator.fail(agent, data.get('unit_id'), data.get('error', ''),
+                                                     cracks))
+                else:
+                    self._send(404, {'error': '未知的接口'})
+
+        return Handler
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="分布式任务协调器：把密钥空间切分成工作单元分发给代理进程")
+    parser.add_argument('--hashcat', help="hashcat路径，用于查询密钥空间（指定--keyspace时不需要）")
+    parser.add_argument('--hash-file', required=True, help="哈希文件路径")
+    parser.add_argument('-m', '--hash-mode', type=int, required=True, help="哈希模式")
+    parser.add_argument('-a', '--attack-mode', type=int, default=3, help="攻击模式")
+    parser.add_argument('--mask', help="掩码")
+    parser.add_argument('--dict-file', help="字典文件（代理节点上的路径）")
+    parser.add_argument('--rule-file', help="规则文件（代理节点上的路径）")
+    parser.add_argument('--username', action='store_true', help="哈希文件中的行带有用户名前缀")
+    parser.add_argument('--keyspace', type=int, help="密钥空间大小，不指定时通过hashcat查询")
+    parser.add_argument('--units', type=int, default=16, help="工作单元数量")
+    parser.add_argument('--potfile', help="合并破解结果的potfile路径")
+    parser.add_argument('--lease-timeout', type=int, default=DEFAULT_LEASE_TIMEOUT, help="租约时间（秒）")
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help="工作单元最多分发的次数，达到后标记为失败")
+    parser.add_argument('--host', default='127.0.0.1', help="监听地址")
+    parser.add_argument('--port', type=int, default=8765, help="监听端口")
+    parser.add_argument('--token', help="共享密钥，监听本机以外的地址时不指定则自动生成")
+    args = parser.parse_args(argv)
+
+    token = args.token
+    if not token and args.host not in LOOPBACK_HOSTS:
+        token = secrets.token_urlsafe(24)
+        print(f"已生成共享密钥，代理需要使用 --token {token}")
+
+    params = {
+        'hash_mode': args.hash_mode,
+        'attack_mode': args.attack_mode,
+        'mask': args.mask,
+        'dict_file': args.dict_file,
+        'rule_file': args.rule_file,
+        'username': args.username,
+    }
+
+    keyspace = args.keyspace
+    if keyspace is None:
+        if not args.hashcat:
+            print("需要指定 --hashcat 或 --keyspace")
+            return 1
+        keyspace = query_keyspace(args.hashcat, params)
+        if not keyspace:
+            print("查询密钥空间失败")
+            return 1
+
+    coordinator = WorkCoordinator(
+        params, args.hash_file, keyspace, args.units, args.potfile, args.lease_timeout,
+        args.host, args.port, token,
+        on_crack=lambda hash_val, password: print(f"{hash_val}:{password}"),
+        max_attempts=args.max_attempts
+    )
+    coordinator.start()
+    print(f"协调器已启动: {coordinator.address}，密钥空间 {keyspace}，{len(coordinator.units)} 个工作单元")
+
+    try:
+        while not coordinator.wait(5):
+            status = coordinator.status()
+            print(f"进度: {status['done']}/{status['units']} 个单元 ({status['progress_percent']:.2f}%)，"
+                  f"已破解 {status['cracked']} 个")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        coordinator.stop()
+
+    print(f"任务结束，已破解 {len(coordinator.cracked)} 个哈希")
+    failed_units = coordinator.status()['failed_units']
+    for unit in failed_units:
+        print(f"工作单元 {unit['unit_id']} (skip={unit['skip']} limit={unit['limit']}) 失败: {unit['error']}")
+    return 1 if failed_units else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+工作负载调优 - 用短时间的基准测试依次尝试工作负载（-w）和内核参数（-n/-u/-T），保存最快的组合，不依赖Qt
+
+用法:
+    python -m hashcat_gui.core.workload_tuner --hashcat <hashcat路径> -m 22000 -d 1,2
+"""
+
+import sys
+import argparse
+
+from hashcat_gui.core.benchmark_db import BenchmarkDB, probe_speed, get_hashcat_version
+from hashcat_gui.core.command_builder import build_tuning_args, TUNING_OPTIONS
+from hashcat_gui.core.job_queue import device_group_of
+
+
+# 依次尝试的参数和候选值，每一步在前面找到的最佳参数的基础上进行
+TUNING_STEPS = (
+    ('workload_profile', (1, 2, 3, 4)),
+    ('kernel_accel', (8, 32, 128, 512)),
+    ('kernel_loops', (8, 64, 256, 1024)),
+    ('kernel_threads', (32, 64, 256, 1024)),
+)
+
+# 至少快这么多才采用新的参数，避免测量误差导致的频繁变化
+MIN_GAIN = 0.02
+
+# 每次测试的超时时间（秒）
+PROBE_TIMEOUT = 120
+
+# 调优参数在破解参数中的名称
+TUNING_KEYS = tuple(key for key, _ in TUNING_OPTIONS)
+
+
+class WorkloadTuner:
+    """工作负载调优类，每一步只调整一个参数，保留比当前最佳结果更快的值"""
+
+    def __init__(self, hashcat_path, hash_mode, devices=None, timeout=PROBE_TIMEOUT, callback=None):
+        """
+        初始化工作负载调优
+
+        Args:
+            hashcat_path (str): hashcat可执行文件路径
+            hash_mode (int): 哈希模式
+            devices (list, optional): 设备ID列表
+            timeout (int): 每次测试的超时时间（秒）
+            callback (callable, optional): 每次测试后调用 callback(settings, speed)，返回True时停止调优
+        """
+        self.hashcat_path = hashcat_path
+        self.hash_mode = hash_mode
+        self.devices = devices
+        self.timeout = timeout
+        self.callback = callback
+        self._stopped = False
+
+    def probe(self, settings):
+        """
+        使用指定的调优参数测试速度
+
+        Args:
+            settings (dict): 调优参数
+
+        Returns:
+            float: 所有设备的总速度（H/s），测试失败（例如参数超出设备限制）时返回0
+        """
+        speeds = probe_speed(self.hashcat_path, self.hash_mode, self.devices, self.timeout,
+                             build_tuning_args(settings))
+        speed = sum(speeds.values())
+        if self.callback is not None and self.callback(dict(settings), speed):
+            self._stopped = True
+        return speed
+
+    def tune(self):
+        """
+        运行调优
+
+        Returns:
+            tuple: (最佳调优参数, 速度)，所有测试都失败时速度为0
+        """
+        self._stopped = False
+        best_settings = {}
+        best_speed = self.probe(best_settings)
+
+        for key, candidates in TUNING_STEPS:
+            for value in candidates:
+                if self._stopped:
+                    return best_settings, best_speed
+                settings = dict(best_settings, **{key: value})
+                speed = self.probe(settings)
+                if speed > best_speed * (1 + MIN_GAIN):
+                    best_settings, best_speed = settings, speed
+        return best_settings, best_speed
+
+
+def tune_and_save(hashcat_path, hash_mode, devices=None, db=None, callback=None):
+    """
+    运行调优并把结果保存到基准测试数据库
+
+    Args:
+        hashcat_path (str): hashcat可执行文件路径
+        hash_mode (int): 哈希模式
+        devices (list, optional): 设备ID列表
+        db (BenchmarkDB, optional): 基准测试数据库
+        callback (callable, optional): 每次测试后调用 callback(settings, speed)，返回True时停止调优
+
+    Returns:
+        tuple: (最佳调优参数, 速度)
+    """
+    if db is None:
+        with BenchmarkDB() as db:
+            return tune_and_save(hashcat_path, hash_mode, devices, db, callback)
+
+    settings, speed = WorkloadTuner(hashcat_path, hash_mode, devices, callback=callback).tune()
+    if speed > 0:
+        db.save_tuning(hash_mode, device_group_of({'devices': devices}), settings, speed,
+                       get_hashcat_version(hashcat_path))
+    return settings, speed
+
+
+def get_tuning_for(params, db=None, use_saved=True):
+    """
+    获取破解参数对应的调优参数，参数中已经指定的调优项优先
+
+    Args:
+        params (dict): 破解参数字典
+        db (BenchmarkDB, optional): 基准测试数据库
+        use_saved (bool): 参数中没有指定调优项时是否使用保存的调优结果
+
+    Returns:
+        dict: 调优参数
+    """
+    explicit = {key: params[key] for key in TUNING_KEYS if params.get(key)}
+    if explicit or not use_saved or params.get('hash_mode') is None:
+        return explicit
+
+    if db is None:
+        with BenchmarkDB() as db:
+            return get_tuning_for(params, db)
+    return db.get_tuning(params['hash_mode'], device_group_of(params)) or {}
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="自动调优hashcat的工作负载和内核参数")
+    parser.add_argument('--hashcat', required=True, help="hashcat可执行文件路径")
+    parser.add_argument('-m', '--hash-mode', type=int, required=True, help="哈希模式")
+    parser.add_argument('-d', '--devices', help="设备，例如 1,2")
+    parser.add_argument('--db', help="数据库路径")
+    args = parser.parse_args(argv)
+
+    devices = [device.strip() for device in args.devices.split(',')] if args.devices else None
+
+    def report(settings, speed):
+        flags = ' '.join(build_tuning_args(settings)) or '默认参数'
+        print(f"{flags}: {speed:.0f} H/s" if speed else f"{flags}: 测试失败")
+
+    with BenchmarkDB(args.db) as db:
+        settings, speed = tune_and_save(args.hashcat, args.hash_mode, devices, db, report)
+    if not speed:
+        print("调优失败")
+        return 1
+    print(f"最佳参数: {' '.join(build_tuning_args(settings)) or '默认参数'}，速度 {speed:.0f} H/s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,426 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+LovelyHashcat 守护进程 - 不加载Qt，在没有显示器的服务器上运行任务队列中的破解任务
+
+用法:
+    python run_daemon.py --hashcat <hashcat路径> [任务参数.json ...] [--api-port 8766]
+
+任务参数文件的格式与任务目录中的 job.json 相同。守护进程使用独立的任务队列，
+设置保存在应用数据目录的 settings.json 中，与图形界面互不影响。
+指定 --api-port 时同时启动本地HTTP接口（见 core/http_api.py）。
+"""
+
+import os
+import sys
+import json
+import signal
+import argparse
+import threading
+
+from hashcat_gui.core.app_paths import get_data_dir
+from hashcat_gui.core.config_manager import ConfigManager, JsonSettings
+from hashcat_gui.core.engine import (HashcatEngine, EVENT_OUTPUT, EVENT_ERROR, EVENT_STATUS, EVENT_CRACKED,
+                                     EVENT_FINISHED)
+from hashcat_gui.core.http_api import JobApiServer
+from hashcat_gui.core.job_queue import JobQueue, JOB_FAILED, JOB_CANCELLED, JOB_QUEUED, finished_job_state
+from hashcat_gui.core.session_manager import SessionManager
+
+
+# 守护进程的任务队列文件
+DAEMON_QUEUE_FILE_NAME = 'daemon_queue.json'
+
+# 主循环检查退出条件的间隔（秒）
+IDLE_CHECK_INTERVAL = 1.0
+
+
+class CrackingDaemon:
+    """破解守护进程类，按优先级和设备组的并发限制运行队列中的任务，每个任务使用独立的执行引擎"""
+
+    def __init__(self, config_manager, hashcat_path=None, queue=None, verbose=False):
+        """
+        初始化守护进程
+
+        Args:
+            config_manager (ConfigManager): 配置管理器实例
+            hashcat_path (str, optional): hashcat可执行文件路径，默认使用设置中的路径
+            queue (JobQueue, optional): 任务队列，默认使用应用数据目录下的守护进程队列
+            verbose (bool): 是否输出hashcat的全部输出
+        """
+        self.config_manager = config_manager
+        self.hashcat_path = hashcat_path or config_manager.get_hashcat_path()
+        self.queue = queue or JobQueue(os.path.join(get_data_dir(), DAEMON_QUEUE_FILE_NAME))
+        self.verbose = verbose
+        self.engines = {}
+        self.statuses = {}                     # 每个任务最近一次的状态信息
+        self._crack_listeners = []
+        self._lock = threading.RLock()
+        self._stop_requested = threading.Event()
+        self._cancelled = set()
+        self._resume_counts = {}
+        self._shutting_down = False
+
+    def log(self, text, job_id=None):
+        """
+        输出一条消息
+
+        Args:
+            text (str): 消息内容，可以有多行
+            job_id (str, optional): 任务ID，作为每行的前缀
+        """
+        prefix = f"[{job_id}] " if job_id else ""
+        for line in text.splitlines():
+            if line.strip():
+                print(f"{prefix}{line}", flush=True)
+
+    def add_crack_listener(self, callback):
+        """
+        注册破解结果回调，回调在执行引擎的后台线程中调用
+
+        Args:
+            callback (callable): callback(job_id, hash_val, password)
+        """
+        self._crack_listeners.append(callback)
+
+    def get_job(self, job_id):
+        """
+        获取任务信息和最近一次的状态
+
+        Args:
+            job_id (str): 任务ID
+
+        Returns:
+            dict: 任务信息，任务不存在时返回None
+        """
+        with self._lock:
+            job = self.queue.get(job_id)
+            if job is None:
+                return None
+            info = job.to_dict()
+            info['status'] = self.statuses.get(job_id)
+            return info
+
+    def list_jobs(self):
+        """
+        获取队列中所有任务的信息
+
+        Returns:
+            list: 任务信息列表
+        """
+        with self._lock:
+            return [self.get_job(job.job_id) for job in self.queue.jobs]
+
+    def summary(self):
+        """
+        获取守护进程的运行概况
+
+        Returns:
+            dict: 正在运行的任务及其状态、等待运行的任务数量
+        """
+        with self._lock:
+            return {
+                'running': [self.get_job(job_id) for job_id in self.engines],
+                'queued': len(self.queue.pending()),
+                'jobs': len(self.queue.jobs),
+            }
+
+    def is_idle(self):
+        """
+        是否没有正在运行和等待运行的任务
+
+        Returns:
+            bool: 是否空闲
+        """
+        with self._lock:
+            return not self.engines and not self.queue.pending()
+
+    def enqueue(self, params, priority=0, device_group=None):
+        """
+        把任务加入队列
+
+        Args:
+            params (dict): 破解参数字典
+            priority (int): 优先级，数值越大越先运行
+            device_group (str, optional): 设备组，默认根据参数中的设备计算
+
+        Returns:
+            Job: 新加入的任务
+        """
+        with self._lock:
+            job = self.queue.add(params, priority, device_group)
+            self.log(f"任务 {job.job_id} 已加入队列（{job.name}，优先级 {job.priority}）")
+        self.schedule()
+        return job
+
+    def cancel(self, job_id):
+        """
+        取消任务，正在运行的任务会被停止
+
+        Args:
+            job_id (str): 任务ID
+
+        Returns:
+            bool: 是否取消了任务
+        """
+        with self._lock:
+            job = self.queue.get(job_id)
+            if job is None:
+                return False
+
+            engine = self.engines.get(job_id)
+            if engine is not None:
+                # 正在启动的任务还没有进程，启动后再停止
+                self._cancelled.add(job_id)
+                engine.stop()
+                return True
+
+            if job.state == JOB_QUEUED:
+                self.queue.mark_done(job, JOB_CANCELLED)
+                # 没有运行过的任务的临时哈希文件不会被执行引擎清理
+                if job.params.get('_temp_hash_file') and job.params.get('hash_file'):
+                    try:
+                        os.remove(job.params['hash_file'])
+                    except OSError:
+                        pass
+                self.log(f"任务 {job_id} 已取消")
+                return True
+            return False
+
+    def schedule(self):
+        """在并发限制允许的范围内启动等待中的任务，不能在持有锁时调用"""
+        while True:
+            with self._lock:
+                if self._shutting_down:
+                    return
+
+                limits = self.config_manager.get_scheduler_group_limits()
+                default_limit = self.config_manager.get_scheduler_default_limit()
+                job = self.queue.next_job(limits, default_limit)
+                if job is None:
+                    return
+                engine = self._create_engine(job)
+            self._start_job(job, engine)
+
+    def _create_engine(self, job):
+        """
+        为任务创建执行引擎，并把任务标记为运行中，调用时需要持有锁
+
+        Args:
+            job (Job): 任务
+
+        Returns:
+            HashcatEngine: 执行引擎
+        """
+        job_id = job.job_id
+        engine = HashcatEngine(self.hashcat_path, self.config_manager.get_john_pot_path() or None,
+                               self.config_manager.get_apply_tuning(),
+                               sync_john=self.config_manager.get_sync_john_to_potfile())
+        if self.verbose:
+            engine.add_listener(EVENT_OUTPUT, lambda text: self.log(text, job_id))
+        engine.add_listener(EVENT_ERROR, lambda text: self.log(text, job_id))
+        engine.add_listener(EVENT_STATUS, lambda status_info: self.statuses.__setitem__(job_id, status_info))
+        engine.add_listener(EVENT_CRACKED, lambda hash_val, password: self._on_cracked(job_id, hash_val, password))
+        engine.add_listener(EVENT_FINISHED, lambda exit_code: self._on_job_finished(job_id, exit_code))
+
+        # 启动前就登记引擎，进程很快结束时结束处理也能找到引擎
+        self.engines[job_id] = engine
+        self.queue.mark_running(job)
+        return engine
+
+    def _start_job(self, job, engine):
+        """
+        启动任务的执行引擎，启动前读取已有的破解结果（首次使用potfile时需要建立索引）可能需要几秒，
+        因此不持有锁，期间其他请求和任务的结束处理不会被阻塞
+
+        Args:
+            job (Job): 任务
+            engine (HashcatEngine): 执行引擎
+        """
+        job_id = job.job_id
+        params = dict(job.params)
+        # 任务目录使用队列任务的ID，中断后可以找到任务的检查点
+        params['job_id'] = job_id
+        # 同时运行的hashcat进程不能使用相同的会话名称
+        if not params.get('session'):
+            params['session'] = f"job_{job_id}"
+
+        self.log(f"任务 {job_id} 开始运行（{job.name}）")
+        # 有检查点时从检查点继续，不从头开始
+        record = engine.session_manager.get(job_id)
+        if record is not None and record.is_resumable:
+            self.log(f"任务 {job_id} 从检查点继续运行")
+            started = engine.resume(job_id)
+        else:
+            started = engine.start(params)
+
+        with self._lock:
+            if not started:
+                self.engines.pop(job_id, None)
+                self.queue.mark_done(job, JOB_FAILED)
+                self.log(f"任务 {job_id} 启动失败")
+                return
+            # 启动期间取消了任务或开始退出时，进程还没有运行，现在停止
+            stop = self._shutting_down or job_id in self._cancelled
+        if stop:
+            engine.stop()
+
+    def _on_cracked(self, job_id, hash_val, password):
+        """记录任务破解的数量，并输出破解结果"""
+        with self._lock:
+            job = self.queue.get(job_id)
+            if job is not None:
+                job.cracked += 1
+        self.log(f"破解: {hash_val}:{password}", job_id)
+        for callback in list(self._crack_listeners):
+            try:
+                callback(job_id, hash_val, password)
+            except Exception as e:
+                print(f"破解结果回调出错: {e}")
+
+    def _on_job_finished(self, job_id, exit_code):
+        """
+        处理任务结束，并启动下一个任务
+
+        Args:
+            job_id (str): 任务ID
+            exit_code (int): 退出代码
+        """
+        with self._lock:
+            engine = self.engines.pop(job_id, None)
+            session = engine.last_session if engine is not None else None
+            resumable = session is not None and session.is_resumable
+            budget_stopped = engine is not None and engine.budget_decision is not None
+
+            job = self.queue.get(job_id)
+            if job is not None:
+                resume_count = self._resume_counts.get(job_id, 0)
+                state = finished_job_state(exit_code, job_id in self._cancelled, self._shutting_down,
+                                           budget_stopped, resumable, resume_count)
+                if state == JOB_QUEUED and not self._shutting_down:
+                    # 任务意外中断，重新排队后从检查点继续
+                    self._resume_counts[job_id] = resume_count + 1
+                    self.log(f"任务 {job_id} 意外中断（退出代码: {exit_code}），将从检查点继续")
+                self.queue.mark_done(job, state, exit_code)
+                self.log(f"任务 {job_id} 结束（{state}，退出代码: {exit_code}，破解 {job.cracked} 个）")
+
+                # 取消的任务不再需要检查点
+                if state == JOB_CANCELLED and resumable:
+                    engine.session_manager.discard(session)
+            self._cancelled.discard(job_id)
+
+        self.schedule()
+
+    def request_stop(self):
+        """请求主循环退出，可以在信号处理函数中调用"""
+        self._stop_requested.set()
+
+    def shutdown(self):
+        """停止所有任务并等待结束，正在运行的任务保留在队列中，下次启动时从检查点继续"""
+        with self._lock:
+            self._shutting_down = True
+            engines = list(self.engines.values())
+        for engine in engines:
+            engine.stop()
+        for engine in engines:
+            engine.wait()
+
+    def run_forever(self, exit_when_idle=False):
+        """
+        运行队列中的任务，直到请求退出
+
+        Args:
+            exit_when_idle (bool): 队列中的任务全部结束后是否退出
+        """
+        # 先清理已经结束的任务留下的目录
+        SessionManager().prune()
+        self.schedule()
+        while not self._stop_requested.wait(IDLE_CHECK_INTERVAL):
+            if exit_when_idle and self.is_idle():
+                break
+        self.shutdown()
+
+
+def load_job_file(path):
+    """
+    读取任务参数文件
+
+    Args:
+        path (str): 任务参数JSON文件路径
+
+    Returns:
+        dict: 破解参数字典，读取失败时返回None
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            params = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"读取任务参数文件 {path} 失败: {e}")
+        return None
+    if not isinstance(params, dict):
+        print(f"任务参数文件 {path} 格式错误")
+        return None
+    return params
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="LovelyHashcat 守护进程，不使用图形界面运行破解任务")
+    parser.add_argument('jobs', nargs='*', help="任务参数JSON文件，启动时加入队列")
+    parser.add_argument('--hashcat', help="hashcat可执行文件路径，默认使用设置中的路径")
+    parser.add_argument('--config', help="设置文件路径，默认为应用数据目录下的 settings.json")
+    parser.add_argument('--queue', help="任务队列文件路径")
+    parser.add_argument('--priority', type=int, default=0, help="加入队列的任务的优先级")
+    parser.add_argument('--once', action='store_true', help="队列中的任务全部结束后退出")
+    parser.add_argument('-v', '--verbose', action='store_true', help="输出hashcat的全部输出")
+    parser.add_argument('--api-port', type=int, help="HTTP接口的监听端口，不指定时不启动HTTP接口")
+    parser.add_argument('--api-host', default='127.0.0.1', help="HTTP接口的监听地址")
+    parser.add_argument('--api-token', help="HTTP接口的共享密钥，不指定时自动生成并在启动时输出")
+    args = parser.parse_args(argv)
+
+    config_manager = ConfigManager(JsonSettings(args.config))
+    queue = JobQueue(args.queue) if args.queue else None
+    daemon = CrackingDaemon(config_manager, args.hashcat, queue, args.verbose)
+    if not daemon.hashcat_path or not os.path.exists(daemon.hashcat_path):
+        print("Hashcat可执行文件路径无效，请使用 --hashcat 指定或在设置文件中配置 hashcat_path")
+        return 1
+
+    job_params = []
+    for path in args.jobs:
+        params = load_job_file(path)
+        if params is None:
+            return 1
+        job_params.append(params)
+
+    # 先启动HTTP接口，启动时加入的任务的破解结果也能通过接口读取
+    api = None
+    if args.api_port is not None:
+        try:
+            api = JobApiServer(daemon, args.api_host, args.api_port, args.api_token)
+        except OSError as e:
+            print(f"启动HTTP接口失败: {e}")
+            return 1
+        api.start()
+        daemon.log(f"HTTP接口已启动: {api.address}")
+        if api.token_generated:
+            daemon.log(f"HTTP接口的密钥: {api.token}")
+
+    for params in job_params:
+        daemon.enqueue(params, args.priority)
+
+    # 收到退出信号后停止所有任务，任务保留在队列中
+    signal.signal(signal.SIGINT, lambda signum, frame: daemon.request_stop())
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.request_stop())
+
+    daemon.log(f"守护进程已启动，任务队列: {daemon.queue.path}")
+    try:
+        daemon.run_forever(exit_when_idle=args.once)
+    finally:
+        if api is not None:
+            api.stop()
+    daemon.log("守护进程已退出")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
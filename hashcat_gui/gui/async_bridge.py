@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+asyncio桥接 - 通过qasync把asyncio事件循环接入Qt事件循环，在界面中使用异步执行引擎
+
+在设置中启用“使用asyncio执行引擎”后，main.py 在启动时安装事件循环，主窗口使用 AsyncRunnerBridge 代替 HashcatRunner。
+qasync是可选依赖（pip install qasync），没有安装时 install_event_loop 返回None，界面继续使用 HashcatRunner。
+"""
+
+import asyncio
+
+from hashcat_gui.core.async_runner import AsyncHashcatEngine
+from hashcat_gui.core.hashcat_runner import HashcatRunner
+
+try:
+    import qasync
+except ImportError:
+    qasync = None
+
+
+def install_event_loop(app):
+    """
+    使用基于Qt事件循环的qasync事件循环作为asyncio的事件循环
+
+    Args:
+        app (QApplication): 应用程序实例
+
+    Returns:
+        asyncio.AbstractEventLoop: 事件循环，没有安装qasync时返回None
+    """
+    if qasync is None:
+        return None
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    return loop
+
+
+class AsyncRunnerBridge(HashcatRunner):
+    """
+    异步执行引擎的Qt适配类，信号和接口与 HashcatRunner 相同
+
+    破解任务在事件循环中启动和监视，不为每个任务创建线程；--show 等辅助命令与 HashcatRunner 一样使用QProcess。
+    """
+
+    engine_class = AsyncHashcatEngine
+
+    def _run_start(self, start, arg):
+        """
+        在事件循环中运行引擎的启动协程
+
+        Args:
+            start (callable): 引擎的 start 或 resume 协程函数
+            arg: 启动方法的参数
+        """
+        asyncio.ensure_future(self._start_async(start, arg))
+
+    async def _start_async(self, start, arg):
+        """
+        等待启动协程结束后发出 _start_done 信号，启动出错时按启动失败处理
+
+        Args:
+            start (callable): 引擎的 start 或 resume 协程函数
+            arg: 启动方法的参数
+        """
+        try:
+            started = await start(arg)
+        except Exception as e:
+            self.error_occurred.emit(f"启动Hashcat进程失败: {str(e)}")
+            started = False
+        self._start_done.emit(started)
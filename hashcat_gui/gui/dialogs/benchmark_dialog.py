@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基准测试对话框 - 运行基准测试，查看每个设备、每个哈希模式的速度和性能下降
+"""
+
+from datetime import datetime
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFormLayout,
+                               QLineEdit, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PySide6.QtCore import QThreadPool
+
+from hashcat_gui.core.benchmark_db import BenchmarkDB, parse_hash_modes
+from hashcat_gui.core.status_parser import format_speed
+from hashcat_gui.gui.workers.benchmark_worker import BenchmarkWorker
+
+
+class BenchmarkDialog(QDialog):
+    """基准测试对话框，测试结果保存在基准测试数据库中"""
+
+    def __init__(self, config_manager, hash_mode=None, parent=None):
+        """
+        初始化基准测试对话框
+
+        Args:
+            config_manager: 配置管理器实例
+            hash_mode (int, optional): 默认测试的哈希模式
+            parent: 父窗口
+        """
+        super().__init__(parent)
+        self.config_manager = config_manager
+        self._worker = None
+
+        self.setWindowTitle("基准测试")
+        self.setMinimumWidth(640)
+        self.setMinimumHeight(480)
+
+        self._init_ui()
+        if hash_mode is not None:
+            self.modes_input.setText(str(hash_mode))
+
+        # 连接信号
+        self.run_button.clicked.connect(self._toggle_benchmark)
+        self.close_button.clicked.connect(self.close)
+
+        self.refresh()
+
+    def _init_ui(self):
+        """初始化UI"""
+        main_layout = QVBoxLayout(self)
+
+        form_layout = QFormLayout()
+        self.modes_input = QLineEdit()
+        self.modes_input.setPlaceholderText("哈希模式，用逗号分隔，例如 0,100,1000")
+        form_layout.addRow("哈希模式:", self.modes_input)
+
+        self.devices_input = QLineEdit()
+        self.devices_input.setPlaceholderText("设备ID，用逗号分隔，例如 1,2（可选）")
+        form_layout.addRow("设备:", self.devices_input)
+        main_layout.addLayout(form_layout)
+
+        # 最近一次的测试结果
+        self.table = QTableWidget()
+        self.table.setColumnCount(5)
+        self.table.setHorizontalHeaderLabels(["哈希模式", "设备", "速度", "Hashcat版本", "测试时间"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        main_layout.addWidget(self.table)
+
+        # 性能下降提示
+        self.regression_label = QLabel()
+        self.regression_label.setWordWrap(True)
+        self.regression_label.setStyleSheet("color: #d9534f;")
+        main_layout.addWidget(self.regression_label)
+
+        self.status_label = QLabel()
+        main_layout.addWidget(self.status_label)
+
+        button_layout = QHBoxLayout()
+        self.run_button = QPushButton("开始测试")
+        self.close_button = QPushButton("关闭")
+        button_layout.addStretch()
+        button_layout.addWidget(self.run_button)
+        button_layout.addWidget(self.close_button)
+        main_layout.addLayout(button_layout)
+
+    def refresh(self):
+        """重新读取最近一次的测试结果和性能下降"""
+        with BenchmarkDB() as db:
+            rows = db.latest()
+            regressions = db.find_regressions()
+
+        self.table.setRowCount(len(rows))
+        for row_index, row in enumerate(rows):
+            values = [
+                str(row['hash_mode']),
+                f"#{row['device']}",
+                format_speed(row['speed']),
+                row['hashcat_version'],
+                datetime.fromtimestamp(row['timestamp']).strftime("%Y-%m-%d %H:%M"),
+            ]
+            for column, value in enumerate(values):
+                self.table.setItem(row_index, column, QTableWidgetItem(value))
+
+        if regressions:
+            lines = [f"-m {item['hash_mode']} 设备 #{item['device']}: {format_speed(item['speed'])}，"
+                     f"之前最好 {format_speed(item['best_speed'])}（{item['best_version']}），下降 {-item['change']:.1%}"
+                     for item in regressions]
+            self.regression_label.setText("发现性能下降:\n" + "\n".join(lines))
+        else:
+            self.regression_label.setText("")
+
+    def _toggle_benchmark(self):
+        """开始或停止测试"""
+        if self._worker is not None:
+            self._worker.cancel()
+            self.run_button.setEnabled(False)
+            self.status_label.setText("正在停止，当前的哈希模式测试完成后停止...")
+            return
+
+        hash_modes = parse_hash_modes(self.modes_input.text())
+        if not hash_modes:
+            self.status_label.setText("请输入要测试的哈希模式")
+            return
+
+        devices = [device.strip() for device in self.devices_input.text().split(',') if device.strip()]
+        worker = BenchmarkWorker(self.config_manager.get_hashcat_path(), hash_modes, devices or None)
+        worker.signals.mode_finished.connect(self._on_mode_finished)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.error.connect(self._on_error)
+
+        self._worker = worker
+        self.run_button.setText("停止测试")
+        self.status_label.setText(f"正在测试 {len(hash_modes)} 个哈希模式...")
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_mode_finished(self, hash_mode, speeds):
+        """一个哈希模式测试完成"""
+        if speeds:
+            self.status_label.setText(f"-m {hash_mode}: {format_speed(sum(speeds.values()))}")
+        else:
+            self.status_label.setText(f"-m {hash_mode}: 测试失败")
+        self.refresh()
+
+    def _on_finished(self):
+        """全部测试完成"""
+        self._worker = None
+        self.run_button.setText("开始测试")
+        self.run_button.setEnabled(True)
+        self.status_label.setText(self.status_label.text() + "，测试结束")
+
+    def _on_error(self, message):
+        """测试出错"""
+        self._on_finished()
+        self.status_label.setText(message)
+
+    def closeEvent(self, event):
+        """关闭时停止测试"""
+        if self._worker is not None:
+            self._worker.cancel()
+        super().closeEvent(event)
@@ -6,10 +6,11 @@
 """
 
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-                               QGroupBox, QFormLayout, QSpinBox, QCheckBox, QComboBox)
+                               QGroupBox, QFormLayout, QSpinBox, QCheckBox, QComboBox, QLineEdit)
 from PySide6.QtCore import Qt
 
 from hashcat_gui.gui.widgets.file_input_widget import FileInputWidget
+from hashcat_gui.core.job_queue import parse_group_limits, format_group_limits
 
 
 class SettingsDialog(QDialog):
@@ -126,6 +127,11 @@ class SettingsDialog(QDialog):
         )
         john_layout.addRow("John规则文件:", self.john_rules_path_input)
         
+        # 同步John破解结果
+        self.sync_john_check = QCheckBox("启动前把只在John pot文件中的破解结果追加到hashcat potfile")
+        self.sync_john_check.setToolTip("不勾选时不修改potfile，John已破解的哈希在启动时从交给hashcat的哈希列表中去掉")
+        john_layout.addRow("", self.sync_john_check)
+        
         # 设置John组的布局
         john_group.setLayout(john_layout)
         
@@ -147,6 +153,14 @@ class SettingsDialog(QDialog):
         self.font_size_spin.setSuffix(" pt")
         ui_layout.addRow("字体大小:", self.font_size_spin)
         
+        # 界面刷新频率
+        self.ui_refresh_fps_spin = QSpinBox()
+        self.ui_refresh_fps_spin.setRange(1, 60)
+        self.ui_refresh_fps_spin.setValue(10)
+        self.ui_refresh_fps_spin.setSuffix(" 次/秒")
+        self.ui_refresh_fps_spin.setToolTip("运行时的输出、状态和破解结果合并后按该频率刷新到界面")
+        ui_layout.addRow("刷新频率:", self.ui_refresh_fps_spin)
+        
         # 保存输出
         self.save_output_check = QCheckBox("保存输出到文件")
         ui_layout.addRow("", self.save_output_check)
@@ -163,6 +177,53 @@ class SettingsDialog(QDialog):
         # 设置组的布局
         ui_group.setLayout(ui_layout)
         
+        # 创建任务队列配置组
+        queue_group = QGroupBox("任务队列")
+        queue_layout = QFormLayout()
+        
+        # 每个设备组默认同时运行的任务数
+        self.default_limit_spin = QSpinBox()
+        self.default_limit_spin.setRange(1, 64)
+        queue_layout.addRow("默认并发任务数:", self.default_limit_spin)
+        
+        # 单独设置的设备组并发数
+        self.group_limits_input = QLineEdit()
+        self.group_limits_input.setPlaceholderText("设备组=任务数，用分号分隔，例如 1,2=2; 3=1")
+        queue_layout.addRow("设备组并发数:", self.group_limits_input)
+        
+        queue_group.setLayout(queue_layout)
+        
+        # 创建攻击估算配置组
+        estimate_group = QGroupBox("攻击估算")
+        estimate_layout = QFormLayout()
+        
+        # 启动前估算
+        self.estimate_check = QCheckBox("启动攻击前估算候选密码数量和所需时间")
+        estimate_layout.addRow("", self.estimate_check)
+        
+        # 需要确认的预计时间
+        self.eta_warning_spin = QSpinBox()
+        self.eta_warning_spin.setRange(1, 100000)
+        self.eta_warning_spin.setSuffix(" 小时")
+        estimate_layout.addRow("超过该时间时确认:", self.eta_warning_spin)
+        
+        estimate_group.setLayout(estimate_layout)
+        
+        # 创建性能调优配置组
+        tuning_group = QGroupBox("性能调优")
+        tuning_layout = QFormLayout()
+        
+        # 自动使用调优结果
+        self.apply_tuning_check = QCheckBox("自动使用「工具 - 自动调优」找到的 -w/-n/-u/-T 参数")
+        tuning_layout.addRow("", self.apply_tuning_check)
+        
+        # 使用asyncio执行引擎
+        self.use_async_runner_check = QCheckBox("使用asyncio执行引擎（需要安装qasync，重启后生效）")
+        self.use_async_runner_check.setToolTip("没有安装qasync时继续使用默认的执行引擎")
+        tuning_layout.addRow("", self.use_async_runner_check)
+        
+        tuning_group.setLayout(tuning_layout)
+        
         # 创建按钮布局
         button_layout = QHBoxLayout()
         
@@ -181,6 +242,9 @@ class SettingsDialog(QDialog):
         main_layout.addWidget(hashcat_group)
         main_layout.addWidget(john_group)
         main_layout.addWidget(ui_group)
+        main_layout.addWidget(queue_group)
+        main_layout.addWidget(estimate_group)
+        main_layout.addWidget(tuning_group)
         main_layout.addStretch()
         main_layout.addLayout(button_layout)
         
@@ -207,6 +271,7 @@ class SettingsDialog(QDialog):
         self.john_pot_path_input.set_path(self.config_manager.get_john_pot_path())
         self.john_wordlist_path_input.set_path(self.config_manager.get_john_wordlist_path())
         self.john_rules_path_input.set_path(self.config_manager.get_john_rules_path())
+        self.sync_john_check.setChecked(self.config_manager.get_sync_john_to_potfile())
         
         # 加载界面配置
         theme = self.config_manager.get_theme()
@@ -215,12 +280,25 @@ class SettingsDialog(QDialog):
             self.theme_combo.setCurrentIndex(index)
         
         self.font_size_spin.setValue(self.config_manager.get_font_size())
+        self.ui_refresh_fps_spin.setValue(self.config_manager.get_ui_refresh_fps())
         
         save_output = self.config_manager.get_save_output()
         self.save_output_check.setChecked(save_output)
         
         self.output_dir_input.set_path(self.config_manager.get_output_dir())
         self.output_dir_input.setEnabled(save_output)
+        
+        # 加载任务队列配置
+        self.default_limit_spin.setValue(self.config_manager.get_scheduler_default_limit())
+        self.group_limits_input.setText(format_group_limits(self.config_manager.get_scheduler_group_limits()))
+        
+        # 加载攻击估算配置
+        self.estimate_check.setChecked(self.config_manager.get_estimate_before_start())
+        self.eta_warning_spin.setValue(self.config_manager.get_eta_warning_hours())
+        
+        # 加载性能调优配置
+        self.apply_tuning_check.setChecked(self.config_manager.get_apply_tuning())
+        self.use_async_runner_check.setChecked(self.config_manager.get_use_async_runner())
     
     def _save_settings(self):
         """保存设置"""
@@ -235,13 +313,27 @@ class SettingsDialog(QDialog):
         self.config_manager.set_john_pot_path(self.john_pot_path_input.get_path())
         self.config_manager.set_john_wordlist_path(self.john_wordlist_path_input.get_path())
         self.config_manager.set_john_rules_path(self.john_rules_path_input.get_path())
+        self.config_manager.set_sync_john_to_potfile(self.sync_john_check.isChecked())
         
         # 保存界面配置
         self.config_manager.set_theme(self.theme_combo.currentData())
         self.config_manager.set_font_size(self.font_size_spin.value())
+        self.config_manager.set_ui_refresh_fps(self.ui_refresh_fps_spin.value())
         self.config_manager.set_save_output(self.save_output_check.isChecked())
         self.config_manager.set_output_dir(self.output_dir_input.get_path())
         
+        # 保存任务队列配置
+        self.config_manager.set_scheduler_default_limit(self.default_limit_spin.value())
+        self.config_manager.set_scheduler_group_limits(parse_group_limits(self.group_limits_input.text()))
+        
+        # 保存攻击估算配置
+        self.config_manager.set_estimate_before_start(self.estimate_check.isChecked())
+        self.config_manager.set_eta_warning_hours(self.eta_warning_spin.value())
+        
+        # 保存性能调优配置
+        self.config_manager.set_apply_tuning(self.apply_tuning_check.isChecked())
+        self.config_manager.set_use_async_runner(self.use_async_runner_check.isChecked())
+        
         # 接受对话框
         self.accept()
     
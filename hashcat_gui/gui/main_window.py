@@ -7,12 +7,13 @@
 
 import os
 import json
+import sqlite3
 from PySide6.QtWidgets import (QMainWindow, QApplication, QVBoxLayout, QHBoxLayout, 
                               QWidget, QLabel, QComboBox, QPushButton, QGroupBox, 
                               QFormLayout, QGridLayout, QTabWidget, QMenuBar, QMenu, 
                               QStatusBar, QMessageBox, QFileDialog, QSpacerItem,
-                              QSizePolicy, QFrame)
-from PySide6.QtCore import Qt, QSize, QTimer, QDateTime, Slot, Signal, QPoint
+                              QSizePolicy, QFrame, QInputDialog)
+from PySide6.QtCore import Qt, QSize, QTimer, QDateTime, Slot, Signal, QPoint, QThreadPool
 from PySide6.QtGui import QIcon, QAction, QFont, QColor, QPalette
 
 from hashcat_gui.gui.widgets.title_bar import TitleBar
@@ -20,25 +21,57 @@ from hashcat_gui.gui.widgets.title_bar import TitleBar
 from hashcat_gui.gui.style_loader import StyleLoader
 from hashcat_gui.core.config_manager import ConfigManager
 from hashcat_gui.core.hashcat_runner import HashcatRunner
+from hashcat_gui.core.job_scheduler import JobScheduler
+from hashcat_gui.core.job_queue import JOB_DONE_STATES
+from hashcat_gui.core.sharded_runner import ShardedRunner
+from hashcat_gui.core.runtime_budget import format_duration
+from hashcat_gui.core.benchmark_db import BenchmarkDB
+from hashcat_gui.core.command_builder import build_tuning_args
+from hashcat_gui.core.status_parser import format_speed
 from hashcat_gui.core.utils import (show_message, show_error, show_warning, 
                                    confirm, load_hash_modes, get_current_timestamp)
 from hashcat_gui.gui.dialogs.settings_dialog import SettingsDialog
 from hashcat_gui.gui.dialogs.about_dialog import AboutDialog
+from hashcat_gui.gui.dialogs.benchmark_dialog import BenchmarkDialog
 from hashcat_gui.gui.ui_components import UIComponents
+from hashcat_gui.gui.signal_coalescer import SignalCoalescer
+from hashcat_gui.gui.async_bridge import AsyncRunnerBridge
+from hashcat_gui.gui.workers.estimate_worker import EstimateWorker
+from hashcat_gui.gui.workers.tune_worker import TuneWorker
 
 
 class MainWindow(QMainWindow):
     """主窗口类，应用程序的主界面"""
     
-    def __init__(self):
-        """初始化主窗口"""
+    def __init__(self, use_async_runner=False):
+        """
+        初始化主窗口
+        
+        Args:
+            use_async_runner (bool): 是否使用asyncio执行引擎，需要已经安装qasync事件循环
+        """
         super().__init__()
         
         # 初始化配置管理器
         self.config_manager = ConfigManager()
         
-        # 初始化Hashcat运行器
-        self.hashcat_runner = HashcatRunner(self.config_manager)
+        # 初始化Hashcat运行器，启用asyncio执行引擎时使用异步执行引擎的Qt适配
+        if use_async_runner:
+            self.hashcat_runner = AsyncRunnerBridge(self.config_manager)
+        else:
+            self.hashcat_runner = HashcatRunner(self.config_manager)
+        
+        # 初始化分片执行器，分片数大于1时使用
+        self.sharded_runner = ShardedRunner(self.config_manager)
+        
+        # 初始化任务调度器
+        self.job_scheduler = JobScheduler(self.config_manager)
+        
+        # 初始化信号合并器，运行时的输出、状态和破解结果合并后按帧刷新到界面
+        self.signal_coalescer = SignalCoalescer(self.config_manager.get_ui_refresh_fps(), self)
+        
+        # 每个哈希模式的预计速度，第一次使用时从基准测试数据库读取
+        self._expected_speeds = None
         
         # 创建UI组件管理器
         self.ui_components = UIComponents(self)
@@ -65,8 +98,16 @@ class MainWindow(QMainWindow):
         # 加载哈希模式
         self.load_hash_modes()
         
+        # 提示上次退出时未完成的队列任务
+        pending = len(self.job_scheduler.queue.pending())
+        if pending:
+            self.ui_components.update_output(f"任务队列中有 {pending} 个未完成的任务，可在「任务队列」中点击「开始队列」继续运行，中断的任务会从检查点继续")
+        
         # 检查Hashcat路径
         self.check_hashcat_path()
+        
+        # 窗口显示后提示恢复上次中断的任务
+        QTimer.singleShot(0, self.offer_resume_sessions)
     
     def init_ui(self):
         """初始化UI"""
@@ -193,6 +234,16 @@ class MainWindow(QMainWindow):
         device_info_action.triggered.connect(self.get_device_info)
         tools_menu.addAction(device_info_action)
         
+        # 基准测试动作
+        benchmark_action = QAction("基准测试", self)
+        benchmark_action.triggered.connect(self.open_benchmark)
+        tools_menu.addAction(benchmark_action)
+        
+        # 自动调优动作
+        self.tune_action = QAction("自动调优", self)
+        self.tune_action.triggered.connect(self.auto_tune)
+        tools_menu.addAction(self.tune_action)
+        
         # 帮助菜单
         help_menu = menu_bar.addMenu("帮助")
         
@@ -235,16 +286,31 @@ class MainWindow(QMainWindow):
     
     def connect_signals(self):
         """连接信号与槽"""
+        # 执行器的输出、错误、状态和破解结果经过信号合并器发送到界面，
+        # 合并器需要先于结束信号的处理函数连接，结束时先刷新缓存的内容
+        self.signal_coalescer.output_ready.connect(self.ui_components.update_outputs)
+        self.signal_coalescer.error_occurred.connect(self.handle_errors)
+        self.signal_coalescer.passwords_found.connect(self.ui_components.add_results)
+        self.signal_coalescer.status_update.connect(self.update_status)
+        
         # 连接Hashcat运行器的信号
-        self.hashcat_runner.output_ready.connect(self.ui_components.update_output)
-        self.hashcat_runner.error_occurred.connect(self.handle_error)
+        self.signal_coalescer.attach(self.hashcat_runner)
         self.hashcat_runner.process_finished.connect(self.handle_process_finished)
-        self.hashcat_runner.password_found.connect(self.ui_components.add_result)
-        self.hashcat_runner.status_update.connect(self.update_status)
+        self.hashcat_runner.command_finished.connect(self.handle_command_finished)
+        
+        # 连接分片执行器的信号
+        self.signal_coalescer.attach(self.sharded_runner)
+        self.sharded_runner.process_finished.connect(self.handle_process_finished)
+        
+        # 连接任务调度器的信号
+        self.job_scheduler.output_ready.connect(self.signal_coalescer.add_output)
+        self.job_scheduler.password_found.connect(self.signal_coalescer.add_password)
+        self.job_scheduler.job_finished.connect(self.signal_coalescer.flush)
         
         # 连接UI组件的信号
         self.ui_components.start_button.clicked.connect(self.start_cracking)
         self.ui_components.stop_button.clicked.connect(self.stop_cracking)
+        self.ui_components.enqueue_button.clicked.connect(self.enqueue_job)
         self.ui_components.attack_mode_combo.currentIndexChanged.connect(self.ui_components.update_attack_mode_panel)
         self.ui_components.hash_mode_combo.currentIndexChanged.connect(self.update_hash_mode_description)
     
@@ -286,7 +352,38 @@ class MainWindow(QMainWindow):
         if current_index >= 0:
             hash_mode_id = self.ui_components.hash_mode_combo.itemData(current_index)
             hash_mode_name = self.ui_components.hash_mode_combo.currentText()
-            self.status_label.setText(f"哈希类型: {hash_mode_id} - {hash_mode_name}")
+            text = f"哈希类型: {hash_mode_id} - {hash_mode_name}"
+            
+            # 显示基准测试数据库中的预计速度
+            if hash_mode_id is not None:
+                speed = self.get_expected_speed(hash_mode_id)
+                if speed:
+                    text += f"，预计速度: {format_speed(speed)}"
+            self.status_label.setText(text)
+    
+    def get_expected_speed(self, hash_mode):
+        """
+        获取哈希模式的预计速度，基准测试结果只在第一次使用时和基准测试结束后读取
+        
+        Args:
+            hash_mode (int): 哈希模式
+        
+        Returns:
+            float: 所有设备的总速度（H/s），没有测试结果或读取失败时返回None
+        """
+        if self._expected_speeds is None:
+            self._expected_speeds = {}
+            try:
+                with BenchmarkDB() as db:
+                    for row in db.latest():
+                        self._expected_speeds[row['hash_mode']] = \
+                            self._expected_speeds.get(row['hash_mode'], 0) + row['speed']
+            except (sqlite3.Error, OSError) as e:
+                self.ui_components.update_output(f"读取基准测试结果失败: {str(e)}")
+        try:
+            return self._expected_speeds.get(int(hash_mode))
+        except (TypeError, ValueError):
+            return None
     
     def update_status(self, status_info):
         """更新状态信息"""
@@ -303,49 +400,197 @@ class MainWindow(QMainWindow):
         
         # 获取参数
         params = self.ui_components.get_parameters()
+        if not self.validate_parameters(params):
+            return
+        
+        # 启动前估算候选密码数量和所需时间，明显无法完成的任务先确认
+        if self.config_manager.get_estimate_before_start():
+            self.start_estimate(hashcat_path, params)
+            return
         
+        self.launch_cracking(params)
+    
+    def start_estimate(self, hashcat_path, params):
+        """
+        在线程池中估算攻击，完成后决定是否启动
+        
+        Args:
+            hashcat_path (str): hashcat可执行文件路径
+            params (dict): 破解参数字典
+        """
+        worker = EstimateWorker(hashcat_path, params)
+        worker.signals.finished.connect(self.handle_estimate_finished)
+        worker.signals.error.connect(self.handle_estimate_error)
+        
+        self.ui_components.start_button.setEnabled(False)
+        self.status_label.setText("正在估算攻击所需时间（首次使用某个哈希模式时需要运行基准测试）...")
+        QThreadPool.globalInstance().start(worker)
+    
+    def handle_estimate_finished(self, params, estimate):
+        """
+        显示估算结果，预计时间超过设置的时间时需要确认
+        
+        Args:
+            params (dict): 破解参数字典
+            estimate (dict): 估算结果
+        """
+        self.ui_components.start_button.setEnabled(True)
+        candidates, speed, eta = estimate.get('candidates'), estimate.get('speed'), estimate.get('eta')
+        
+        lines = [
+            f"候选密码数量: {candidates:,}" if candidates is not None else "候选密码数量: 未知（无法统计字典、规则或掩码）",
+            f"基准速度: {format_speed(speed)}" if speed else "基准速度: 无法获取",
+        ]
+        if eta is not None:
+            lines.append(f"预计所需时间: {format_duration(eta)}（带盐的哈希按盐值数量成倍增加）")
+        self.ui_components.update_output("\n".join(lines))
+        
+        if eta is not None:
+            warnings = []
+            if eta > self.config_manager.get_eta_warning_hours() * 3600:
+                warnings.append(f"预计需要 {format_duration(eta)}，可能无法在合理的时间内完成。")
+            if params.get('time_budget') and eta > params['time_budget']:
+                warnings.append(f"预计时间超出时间预算 {format_duration(params['time_budget'])}，将在预算用完时停止。")
+            if warnings and not confirm(self, "确认启动", "\n".join(warnings) + "\n\n确定要启动这个攻击吗？"):
+                self.status_label.setText("已取消启动")
+                return
+        
+        self.launch_cracking(params)
+    
+    def handle_estimate_error(self, params, error_message):
+        """估算失败时直接启动"""
+        self.ui_components.start_button.setEnabled(True)
+        self.ui_components.update_output(error_message, error=True)
+        self.launch_cracking(params)
+    
+    def launch_cracking(self, params):
+        """
+        启动破解
+        
+        Args:
+            params (dict): 破解参数字典
+        """
+        # 分片数大于1时拆分密钥空间，在多个hashcat进程中并行运行
+        runner = self.sharded_runner if params.get('shards', 1) > 1 else self.hashcat_runner
+        
+        # 启动破解
+        if runner.start_cracking(params):
+            self.status_label.setText("破解进行中...")
+            self.ui_components.set_cracking_state(True)
+        else:
+            show_error(self, "错误", "启动Hashcat进程失败")
+    
+    def offer_resume_sessions(self):
+        """提示恢复上次中断的任务，队列中等待运行的任务由任务调度器恢复"""
+        # 先清理已经结束的任务留下的目录
+        self.hashcat_runner.session_manager.prune()
+        
+        records = []
+        for record in self.hashcat_runner.session_manager.list_resumable():
+            job = self.job_scheduler.queue.get(record.job_id)
+            if job is None or job.state in JOB_DONE_STATES:
+                records.append(record)
+        if not records:
+            return
+        
+        items = []
+        for record in records:
+            params = self.hashcat_runner.session_manager.load_params(record)
+            name = os.path.basename(params.get('hash_file') or '') or record.job_id
+            updated = QDateTime.fromSecsSinceEpoch(int(record.updated)).toString("yyyy-MM-dd hh:mm:ss")
+            items.append(f"{record.job_id}  {name}  (模式 {params.get('hash_mode', '?')}，{updated})")
+        
+        item, ok = QInputDialog.getItem(
+            self, "恢复任务", f"发现 {len(records)} 个中断的任务，选择要从检查点继续的任务：", items, 0, False)
+        if not ok:
+            self.ui_components.update_output(f"有 {len(records)} 个中断的任务可以从检查点继续，下次启动时会再次提示")
+            return
+        
+        self.resume_session(records[items.index(item)].job_id)
+    
+    def resume_session(self, job_id):
+        """
+        从检查点恢复中断的任务
+        
+        Args:
+            job_id (str): 任务ID
+        """
+        if self.hashcat_runner.is_running():
+            show_warning(self, "警告", "已有任务正在运行")
+            return
+        
+        if self.hashcat_runner.resume_session(job_id):
+            self.status_label.setText("破解进行中（从检查点恢复）...")
+            self.ui_components.set_cracking_state(True)
+        else:
+            show_error(self, "错误", "从检查点恢复任务失败")
+    
+    def validate_parameters(self, params):
+        """
+        验证破解参数，参数缺失时显示错误提示
+        
+        Args:
+            params (dict): 破解参数字典
+            
+        Returns:
+            bool: 参数是否有效
+        """
         # 验证必需参数
         if not params.get('hash_file'):
             show_error(self, "错误", "请选择哈希文件")
-            return
+            return False
         
         if params.get('hash_mode') is None:
             show_error(self, "错误", "请选择哈希类型")
-            return
+            return False
         
         # 根据攻击模式验证参数
         attack_mode = params.get('attack_mode')
         if attack_mode == 0:  # 字典攻击
             if not params.get('dict_file'):
                 show_error(self, "错误", "请选择字典文件")
-                return
+                return False
         elif attack_mode == 1:  # 组合攻击
             if not params.get('dict_file1') or not params.get('dict_file2'):
                 show_error(self, "错误", "请选择两个字典文件")
-                return
+                return False
         elif attack_mode == 3:  # 掩码攻击
             if not params.get('mask'):
                 show_error(self, "错误", "请输入掩码")
-                return
+                return False
         elif attack_mode == 6:  # 混合攻击(字典+掩码)
             if not params.get('dict_file') or not params.get('mask'):
                 show_error(self, "错误", "请选择字典文件和输入掩码")
-                return
+                return False
         elif attack_mode == 7:  # 混合攻击(掩码+字典)
             if not params.get('dict_file') or not params.get('mask'):
                 show_error(self, "错误", "请选择字典文件和输入掩码")
-                return
+                return False
         
-        # 启动破解
-        if self.hashcat_runner.start_cracking(params):
-            self.status_label.setText("破解进行中...")
-            self.ui_components.set_cracking_state(True)
-        else:
-            show_error(self, "错误", "启动Hashcat进程失败")
+        return True
+    
+    def enqueue_job(self):
+        """把当前参数作为任务加入队列"""
+        # 检查Hashcat路径
+        hashcat_path = self.config_manager.get_hashcat_path()
+        if not hashcat_path or not os.path.exists(hashcat_path):
+            show_error(self, "错误", "Hashcat可执行文件路径无效，请在设置中配置")
+            self.open_settings()
+            return
+        
+        params = self.ui_components.get_parameters()
+        if not self.validate_parameters(params):
+            return
+        
+        job = self.job_scheduler.enqueue(params, self.ui_components.priority_spin.value())
+        pending = len(self.job_scheduler.queue.pending())
+        self.status_label.setText(f"任务 {job.job_id} 已加入队列，等待中的任务: {pending}")
     
     def stop_cracking(self):
         """停止破解进程"""
-        if self.hashcat_runner.stop_cracking():
+        stopped = self.hashcat_runner.stop_cracking()
+        stopped = self.sharded_runner.stop_cracking() or stopped
+        if stopped:
             self.status_label.setText("破解已停止")
             self.ui_components.set_cracking_state(False)
     
@@ -409,6 +654,9 @@ class MainWindow(QMainWindow):
             self.hashcat_runner.update_hashcat_path()
             self.update_hashcat_path_label()
             
+            # 更新界面刷新频率
+            self.signal_coalescer.set_fps(self.config_manager.get_ui_refresh_fps())
+            
             # 应用主题
             theme = self.config_manager.get_theme()
             if theme == "pink":
@@ -418,6 +666,57 @@ class MainWindow(QMainWindow):
             else:
                 StyleLoader.apply_style("default.qss")
     
+    def open_benchmark(self):
+        """打开基准测试对话框"""
+        index = self.ui_components.hash_mode_combo.currentIndex()
+        hash_mode = self.ui_components.hash_mode_combo.itemData(index) if index >= 0 else None
+        dialog = BenchmarkDialog(self.config_manager, hash_mode, self)
+        dialog.exec()
+        # 基准测试可能保存了新的结果，重新读取预计速度
+        self._expected_speeds = None
+        self.update_hash_mode_description()
+    
+    def auto_tune(self):
+        """对当前的哈希模式和设备运行自动调优，找到的参数在之后的任务中自动使用"""
+        hashcat_path = self.config_manager.get_hashcat_path()
+        if not hashcat_path or not os.path.exists(hashcat_path):
+            show_error(self, "错误", "Hashcat可执行文件路径无效，请在设置中配置")
+            return
+        
+        params = self.ui_components.get_parameters()
+        if params.get('hash_mode') is None:
+            show_warning(self, "警告", "请选择哈希类型")
+            return
+        
+        if not confirm(self, "自动调优",
+                       f"将对哈希模式 {params['hash_mode']} 运行多次短时间的基准测试，期间显卡会满负荷运行，确定要开始吗？"):
+            return
+        
+        worker = TuneWorker(hashcat_path, params['hash_mode'], params.get('devices'))
+        worker.signals.probe_finished.connect(self.handle_tune_probe)
+        worker.signals.finished.connect(self.handle_tune_finished)
+        worker.signals.error.connect(self.handle_error)
+        worker.signals.error.connect(lambda _: self.tune_action.setEnabled(True))
+        
+        self.tune_action.setEnabled(False)
+        self.status_label.setText("正在自动调优...")
+        QThreadPool.globalInstance().start(worker)
+    
+    def handle_tune_probe(self, settings, speed):
+        """显示一次调优测试的结果"""
+        flags = ' '.join(build_tuning_args(settings)) or "默认参数"
+        self.ui_components.update_output(f"调优 {flags}: {format_speed(speed)}" if speed else f"调优 {flags}: 测试失败")
+    
+    def handle_tune_finished(self, settings, speed):
+        """显示调优结果"""
+        self.tune_action.setEnabled(True)
+        if not speed:
+            self.status_label.setText("自动调优失败")
+            return
+        flags = ' '.join(build_tuning_args(settings)) or "默认参数"
+        self.ui_components.update_output(f"自动调优完成，最佳参数: {flags}（{format_speed(speed)}）")
+        self.status_label.setText(f"自动调优完成: {flags}")
+    
     def show_about(self):
         """显示关于对话框"""
         dialog = AboutDialog(self)
@@ -428,6 +727,16 @@ class MainWindow(QMainWindow):
         self.ui_components.update_output(error_message, error=True)
         self.status_label.setText("错误")
     
+    def handle_errors(self, error_messages):
+        """处理合并后的多条错误"""
+        self.ui_components.update_outputs(error_messages, error=True)
+        self.status_label.setText("错误")
+    
+    def handle_command_finished(self, exit_code):
+        """处理辅助命令结束"""
+        if not self.hashcat_runner.is_running():
+            self.status_label.setText("命令已完成" if exit_code == 0 else f"命令结束，退出代码: {exit_code}")
+    
     def handle_process_finished(self, exit_code, exit_status):
         """处理进程结束"""
         if exit_code == 0:
@@ -440,7 +749,7 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """处理窗口关闭事件"""
         # 如果进程正在运行，询问是否确定退出
-        if self.hashcat_runner.process and self.hashcat_runner.process.state() != 0:
+        if self.hashcat_runner.is_running() or self.sharded_runner.is_running() or self.job_scheduler.is_busy():
             if not confirm(
                 self,
                 "确认退出",
@@ -449,8 +758,10 @@ class MainWindow(QMainWindow):
                 event.ignore()
                 return
             
-            # 停止进程
+            # 停止进程，队列中正在运行的任务下次启动时会重新排队
             self.hashcat_runner.stop_cracking()
+            self.sharded_runner.stop_cracking()
+            self.job_scheduler.shutdown()
         
         # 调用父类方法
         super().closeEvent(event)
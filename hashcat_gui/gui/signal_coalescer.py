@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+信号合并器 - 把执行器的输出、状态和破解结果合并后按固定频率发送给界面
+
+hashcat运行时每秒会产生大量的输出片段和破解结果，逐条刷新控制台和结果表格会占满界面线程。
+合并器在两次刷新之间缓存这些信号：输出文本按顺序合并，状态只保留最近一次，破解结果合并成列表，
+然后以设置的频率（默认每秒10次）统一发送。
+"""
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+
+# 默认每秒刷新次数
+DEFAULT_FPS = 10
+
+
+class SignalCoalescer(QObject):
+    """信号合并器类，缓存执行器的信号并按帧发送"""
+
+    # 定义信号
+    output_ready = Signal(list)  # 合并的输出文本列表
+    error_occurred = Signal(list)  # 合并的错误文本列表
+    status_update = Signal(dict)  # 最近一次的状态
+    passwords_found = Signal(list)  # 合并的破解结果列表 [(哈希值, 密码), ...]
+
+    def __init__(self, fps=DEFAULT_FPS, parent=None):
+        """
+        初始化信号合并器
+
+        Args:
+            fps (int): 每秒刷新次数
+            parent: 父对象
+        """
+        super().__init__(parent)
+        # 输出和错误按到达顺序保存为 [是否错误, 文本列表]，相邻的同类文本合并在一起
+        self._segments = []
+        self._status = None
+        self._passwords = []
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self.set_fps(fps)
+
+    def set_fps(self, fps):
+        """
+        设置每秒刷新次数
+
+        Args:
+            fps (int): 每秒刷新次数，小于1时按1处理
+        """
+        self._timer.setInterval(max(1, 1000 // max(1, int(fps))))
+
+    def attach(self, runner):
+        """
+        接收执行器的输出、错误、状态和破解结果信号，执行器结束时先发送缓存的内容
+
+        需要在连接执行器的 process_finished 等结束信号之前调用，保证界面先收到全部输出再处理结束。
+
+        Args:
+            runner: 提供 output_ready、error_occurred、password_found、status_update 信号的执行器
+        """
+        runner.output_ready.connect(self.add_output)
+        runner.error_occurred.connect(self.add_error)
+        runner.password_found.connect(self.add_password)
+        runner.status_update.connect(self.add_status)
+        for name in ("process_finished", "command_finished"):
+            if hasattr(runner, name):
+                getattr(runner, name).connect(self.flush)
+
+    def add_output(self, text):
+        """
+        缓存输出文本
+
+        Args:
+            text (str): 输出文本
+        """
+        self._add_text(False, text)
+
+    def add_error(self, text):
+        """
+        缓存错误文本
+
+        Args:
+            text (str): 错误文本
+        """
+        self._add_text(True, text)
+
+    def add_status(self, status_info):
+        """
+        缓存状态，只保留最近一次
+
+        Args:
+            status_info (dict): 状态信息
+        """
+        self._status = status_info
+        self._schedule()
+
+    def add_password(self, hash_val, password):
+        """
+        缓存破解结果
+
+        Args:
+            hash_val (str): 哈希值
+            password (str): 密码
+        """
+        self._passwords.append((hash_val, password))
+        self._schedule()
+
+    def flush(self):
+        """立即发送缓存的全部内容"""
+        self._timer.stop()
+        segments, self._segments = self._segments, []
+        status, self._status = self._status, None
+        passwords, self._passwords = self._passwords, []
+
+        for error, texts in segments:
+            if error:
+                self.error_occurred.emit(texts)
+            else:
+                self.output_ready.emit(texts)
+        if passwords:
+            self.passwords_found.emit(passwords)
+        if status is not None:
+            self.status_update.emit(status)
+
+    def _add_text(self, error, text):
+        """把文本加入缓存，与上一段同类时合并"""
+        if self._segments and self._segments[-1][0] == error:
+            self._segments[-1][1].append(text)
+        else:
+            self._segments.append([error, [text]])
+        self._schedule()
+
+    def _schedule(self):
+        """没有等待中的刷新时安排一次刷新，保证第一条信号最多延迟一帧"""
+        if not self._timer.isActive():
+            self._timer.start()
@@ -10,8 +10,8 @@ from datetime import datetime
 from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton, 
                               QGroupBox, QFormLayout, QGridLayout, QTabWidget, QFileDialog,
                               QSpacerItem, QSizePolicy, QProgressBar, QStackedWidget, QWidget,
-                              QPlainTextEdit,QRadioButton,QLineEdit)
-from PySide6.QtCore import Qt, QDateTime, Slot
+                              QPlainTextEdit,QRadioButton,QLineEdit,QCheckBox,QSpinBox)
+from PySide6.QtCore import Qt, QDateTime, Slot, QThreadPool
 from PySide6.QtGui import QFont
 
 from hashcat_gui.gui.widgets.file_input_widget import FileInputWidget
@@ -19,7 +19,8 @@ from hashcat_gui.gui.widgets.attack_mode_panel import AttackModePanel
 from hashcat_gui.gui.widgets.output_console import OutputConsole
 from hashcat_gui.gui.widgets.results_table import ResultsTable
 from hashcat_gui.gui.widgets.searchable_results_table import SearchableResultsTable
-from hashcat_gui.core.potfile_parser import load_already_cracked
+from hashcat_gui.gui.widgets.job_queue_widget import JobQueueWidget
+from hashcat_gui.gui.workers.potfile_load_worker import PotfileLoadWorker
 
 
 class UIComponents:
@@ -34,6 +35,7 @@ class UIComponents:
         """
         self.main_window = main_window
         self.config_manager = main_window.config_manager
+        self._potfile_loader = None  # 正在进行的 potfile 加载任务
     
     def init_components(self, main_layout):
         """
@@ -143,6 +145,11 @@ class UIComponents:
         # 添加到主布局
         group_layout.addRow("直接输入:", text_input_container)
         
+        # 哈希行带有用户名前缀（--username）
+        self.username_check = QCheckBox("哈希文件中的行带有用户名 (--username)")
+        self.username_check.toggled.connect(self._reload_already_cracked)
+        group_layout.addRow("用户名:", self.username_check)
+        
         # 初始化状态
         self._update_hash_input_state()
         
@@ -170,6 +177,8 @@ class UIComponents:
         self.hash_mode_combo.setEditable(True)
         self.hash_mode_combo.setInsertPolicy(QComboBox.NoInsert)
         self.hash_mode_combo.lineEdit().setPlaceholderText("选择或搜索哈希类型")
+        # 用户选择了新的哈希模式时，按新的模式重新匹配已破解的结果
+        self.hash_mode_combo.activated.connect(self._reload_already_cracked)
         
         # 攻击模式选择已移动到攻击模式配置区
         
@@ -259,6 +268,23 @@ class UIComponents:
         )
         button_layout.addWidget(self.stop_button)
         
+        # 加入队列按钮
+        self.enqueue_button = QPushButton("加入队列")
+        self.enqueue_button.setMinimumHeight(40)
+        self.enqueue_button.setStyleSheet(
+            "QPushButton { background-color: #FFCCE5; color: #7D6B7D; }"
+            "QPushButton:hover { background-color: #FFD9EC; }"
+            "QPushButton:pressed { background-color: #FFC0CB; }"
+        )
+        button_layout.addWidget(self.enqueue_button)
+        
+        # 队列任务的优先级
+        self.priority_spin = QSpinBox()
+        self.priority_spin.setRange(-100, 100)
+        self.priority_spin.setPrefix("优先级: ")
+        self.priority_spin.setMinimumHeight(40)
+        button_layout.addWidget(self.priority_spin)
+        
         # 添加按钮布局到分组框布局
         group_layout.addLayout(button_layout)
         
@@ -562,6 +588,29 @@ class UIComponents:
         )
         group_layout.addRow("会话名称:", self.session_input)
         
+        # 设备
+        self.devices_input = QLineEdit()
+        self.devices_input.setPlaceholderText("设备ID，用逗号分隔，例如 1,2（可选）")
+        group_layout.addRow("设备:", self.devices_input)
+        
+        # 分片数量
+        self.shards_spin = QSpinBox()
+        self.shards_spin.setRange(1, 64)
+        self.shards_spin.setToolTip("大于1时先查询密钥空间，再拆分成多个hashcat进程并行运行")
+        group_layout.addRow("分片数:", self.shards_spin)
+        
+        # 时间预算
+        self.time_budget_spin = QSpinBox()
+        self.time_budget_spin.setRange(0, 100000)
+        self.time_budget_spin.setSuffix(" 分钟")
+        self.time_budget_spin.setSpecialValueText("不限制")
+        self.time_budget_spin.setToolTip("根据速度和进度判断：预算内可以完成时继续运行，否则在检查点停止，之后可以从检查点继续")
+        group_layout.addRow("时间预算:", self.time_budget_spin)
+        
+        # JSON状态输出
+        self.status_json_check = QCheckBox("使用 --status-json 输出机器可读的状态")
+        group_layout.addRow("状态格式:", self.status_json_check)
+        
         # 设置分组框布局
         group_box.setLayout(group_layout)
         parent_layout.addWidget(group_box)
@@ -585,6 +634,10 @@ class UIComponents:
         self.results_table = self.searchable_results_table.results_table  # 保留对原始表格的引用，保持兼容性
         tab_widget.addTab(self.searchable_results_table, "结果")
         
+        # 任务队列
+        self.job_queue_widget = JobQueueWidget(self.main_window.job_scheduler, self.main_window)
+        tab_widget.addTab(self.job_queue_widget, "任务队列")
+        
         # 添加标签页控件到父布局
         parent_layout.addWidget(tab_widget, 1)  # 1表示拉伸因子，这样输出区会占据大部分空间
     
@@ -695,6 +748,7 @@ class UIComponents:
         # 启用/禁用重要输入控件
         self.attack_mode_combo.setEnabled(not is_cracking)
         self.hash_mode_combo.setEnabled(not is_cracking)
+        self.username_check.setEnabled(not is_cracking)
         self.file_radio.setEnabled(not is_cracking)
         self.text_radio.setEnabled(not is_cracking)
         
@@ -725,6 +779,18 @@ class UIComponents:
         """
         if self.output_console:
             self.output_console.append_text(text, error, success)
+    
+    def update_outputs(self, texts, error=False, success=False):
+        """
+        批量更新输出控制台
+        
+        Args:
+            texts (list): 输出文本列表
+            error (bool): 是否为错误信息
+            success (bool): 是否为成功信息
+        """
+        if self.output_console:
+            self.output_console.append_texts(texts, error, success)
             
     def _on_hash_file_changed(self, path):
         """
@@ -733,6 +799,9 @@ class UIComponents:
         Args:
             path (str): 新选择的哈希文件路径
         """
+        # 之前的文件还在加载时先取消
+        self.cancel_potfile_loading()
+        
         if path and os.path.exists(path):
             # 获取potfile路径
             potfile_path = self.config_manager.get_potfile_path()
@@ -743,26 +812,97 @@ class UIComponents:
                 # 加载已破解的结果
                 self.load_already_cracked_hashes(path, potfile_path)
                 
+    def _reload_already_cracked(self, *args):
+        """哈希模式或用户名选项改变后，按新的设置重新加载当前哈希文件的已破解结果"""
+        if self.file_radio.isChecked():
+            self._on_hash_file_changed(self.hash_file_input.get_path())
+                
     def load_already_cracked_hashes(self, hash_file_path, potfile_path):
         """
-        从 potfile 中加载已破解的哈希结果
+        在后台线程中从 potfile 加载已破解的哈希结果，结果分批添加到结果表格
         
         Args:
             hash_file_path (str): 哈希文件路径
             potfile_path (str): potfile路径
         """
+        # 选择了新的文件时，取消正在进行的加载
+        self.cancel_potfile_loading()
+        
         if not hash_file_path or not potfile_path or not os.path.exists(hash_file_path) or not os.path.exists(potfile_path):
             return
             
-        # 加载已破解的结果
-        results = load_already_cracked(hash_file_path, potfile_path)
+        # 容器格式的哈希和带用户名的哈希行需要按哈希模式和用户名选项匹配
+        worker = PotfileLoadWorker(hash_file_path, potfile_path, self.get_selected_hash_mode(),
+                                   self.username_check.isChecked())
+        worker.signals.progress.connect(lambda percent, message, w=worker: self._on_potfile_load_progress(w, percent, message))
+        worker.signals.batch_ready.connect(lambda batch, w=worker: self._on_potfile_batch_ready(w, batch))
+        worker.signals.finished.connect(lambda total, w=worker: self._on_potfile_load_finished(w, total))
+        worker.signals.error.connect(lambda message, w=worker: self._on_potfile_load_error(w, message))
+        
+        self._potfile_loader = worker
+        QThreadPool.globalInstance().start(worker)
+    
+    def cancel_potfile_loading(self):
+        """取消正在进行的 potfile 加载"""
+        if self._potfile_loader is not None:
+            self._potfile_loader.cancel()
+            self._potfile_loader = None
+    
+    def _on_potfile_load_progress(self, worker, percent, message):
+        """
+        potfile 加载进度更新
         
-        if results:
+        Args:
+            worker (PotfileLoadWorker): 发出信号的加载任务
+            percent (int): 进度百分比
+            message (str): 进度说明
+        """
+        if worker is not self._potfile_loader:
+            return
+        self.main_window.status_label.setText(f"{message} ({percent}%)")
+    
+    def _on_potfile_batch_ready(self, worker, batch):
+        """
+        收到一批已破解的结果
+        
+        Args:
+            worker (PotfileLoadWorker): 发出信号的加载任务
+            batch (list): 结果列表
+        """
+        # 已取消的任务可能还有排队中的信号，直接丢弃
+        if worker is not self._potfile_loader:
+            return
+        self.searchable_results_table.add_results(batch)
+    
+    def _on_potfile_load_finished(self, worker, total):
+        """
+        potfile 加载完成
+        
+        Args:
+            worker (PotfileLoadWorker): 发出信号的加载任务
+            total (int): 结果总数
+        """
+        if worker is not self._potfile_loader:
+            return
+        self._potfile_loader = None
+        self.main_window.status_label.setText("就绪")
+        if total:
             # 更新输出信息
-            self.update_output(f"从 potfile 中加载了 {len(results)} 个已破解的哈希结果", success=True)
-            
-            # 添加到结果表格
-            self.results_table.add_results(results)
+            self.update_output(f"从 potfile 中加载了 {total} 个已破解的哈希结果", success=True)
+    
+    def _on_potfile_load_error(self, worker, message):
+        """
+        potfile 加载出错
+        
+        Args:
+            worker (PotfileLoadWorker): 发出信号的加载任务
+            message (str): 错误信息
+        """
+        if worker is not self._potfile_loader:
+            return
+        self._potfile_loader = None
+        self.main_window.status_label.setText("就绪")
+        self.update_output(message, error=True)
     
     def update_status_info(self, status_info):
         """
@@ -804,6 +944,23 @@ class UIComponents:
             # 兼容性处理
             self.results_table.add_result(hash_val, password, now)
     
+    def add_results(self, results):
+        """
+        批量添加破解结果
+        
+        Args:
+            results (list): 破解结果列表 [(哈希值, 密码), ...]
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = [{'hash_val': hash_val, 'password': password, 'time_str': now, 'note': ""}
+                for hash_val, password in results]
+        
+        if hasattr(self, 'searchable_results_table'):
+            self.searchable_results_table.add_results(rows)
+        else:
+            # 兼容性处理
+            self.results_table.add_results(rows)
+    
     def clear_results(self):
         """清空结果表格"""
         # 使用可搜索结果表格清除结果
@@ -813,6 +970,26 @@ class UIComponents:
             # 兼容性处理
             self.results_table.clear_results()
     
+    def get_selected_hash_mode(self):
+        """
+        获取当前选择的哈希模式
+        
+        Returns:
+            int: 哈希模式，没有选择时返回None
+        """
+        hash_mode_index = self.hash_mode_combo.currentIndex()
+        if hash_mode_index < 0:
+            return None
+        
+        hash_mode = self.hash_mode_combo.itemData(hash_mode_index)
+        if hash_mode is None:
+            # 格式应该是 "123 - 哈希名称"
+            try:
+                hash_mode = int(self.hash_mode_combo.currentText().split(' - ')[0])
+            except (ValueError, IndexError):
+                return None
+        return int(hash_mode)
+    
     def get_parameters(self):
         """
         获取所有参数
@@ -893,11 +1070,18 @@ class UIComponents:
         params['output_file'] = self.output_file_input.get_path()
         params['potfile_path'] = self.potfile_input.get_path()
         params['session'] = self.session_input.get_path()
+        devices = [device.strip() for device in self.devices_input.text().split(',') if device.strip()]
+        if devices:
+            params['devices'] = devices
+        params['shards'] = self.shards_spin.value()
+        params['time_budget'] = self.time_budget_spin.value() * 60
         
         # 添加默认选项
         params['force'] = True
         params['status'] = True
         params['status_timer'] = 1
+        params['status_json'] = self.status_json_check.isChecked()
+        params['username'] = self.username_check.isChecked()
         
         return params
     
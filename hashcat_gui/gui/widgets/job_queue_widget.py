@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+任务队列组件 - 显示队列中的破解任务，并提供开始、暂停和取消操作
+"""
+
+from datetime import datetime
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
+                               QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PySide6.QtCore import Qt
+
+from hashcat_gui.core.job_queue import (JOB_QUEUED, JOB_RUNNING, JOB_FINISHED, JOB_FAILED,
+                                        JOB_CANCELLED)
+
+
+# 任务状态的显示名称
+JOB_STATE_NAMES = {
+    JOB_QUEUED: "等待中",
+    JOB_RUNNING: "运行中",
+    JOB_FINISHED: "已完成",
+    JOB_FAILED: "失败",
+    JOB_CANCELLED: "已取消",
+}
+
+
+class JobQueueWidget(QWidget):
+    """任务队列组件，显示任务调度器中的任务"""
+
+    def __init__(self, job_scheduler, parent=None):
+        """
+        初始化任务队列组件
+
+        Args:
+            job_scheduler (JobScheduler): 任务调度器
+            parent: 父窗口
+        """
+        super().__init__(parent)
+        self.job_scheduler = job_scheduler
+
+        self._init_ui()
+
+        # 连接信号
+        self.job_scheduler.queue_changed.connect(self.refresh)
+        self.start_button.clicked.connect(self._toggle_paused)
+        self.cancel_button.clicked.connect(self._cancel_selected)
+        self.clear_button.clicked.connect(self.job_scheduler.clear_finished)
+
+        self.refresh()
+
+    def _init_ui(self):
+        """初始化UI"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+
+        # 任务表格
+        self.table = QTableWidget()
+        self.table.setColumnCount(7)
+        self.table.setHorizontalHeaderLabels(["任务ID", "哈希文件", "优先级", "设备组", "状态", "已破解", "添加时间"])
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)  # 哈希文件列自适应宽度
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)  # 不可编辑
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)  # 选择整行
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)  # 单选
+        self.table.setAlternatingRowColors(True)  # 交替行颜色
+        self.table.verticalHeader().setVisible(False)
+        main_layout.addWidget(self.table, 1)
+
+        # 按钮
+        button_layout = QHBoxLayout()
+        self.start_button = QPushButton("开始队列")
+        self.cancel_button = QPushButton("取消任务")
+        self.clear_button = QPushButton("清除已结束的任务")
+        button_layout.addWidget(self.start_button)
+        button_layout.addWidget(self.cancel_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.clear_button)
+        main_layout.addLayout(button_layout)
+
+    def refresh(self):
+        """根据任务队列刷新表格"""
+        jobs = self.job_scheduler.queue.jobs
+        self.table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            values = [
+                job.job_id,
+                job.name,
+                str(job.priority),
+                job.device_group,
+                JOB_STATE_NAMES.get(job.state, job.state),
+                str(job.cracked),
+                datetime.fromtimestamp(job.created).strftime("%Y-%m-%d %H:%M:%S"),
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setData(Qt.UserRole, job.job_id)
+                self.table.setItem(row, column, item)
+
+        self.start_button.setText("开始队列" if self.job_scheduler.is_paused() else "暂停队列")
+
+    def _toggle_paused(self):
+        """开始或暂停队列"""
+        if self.job_scheduler.is_paused():
+            self.job_scheduler.start()
+        else:
+            self.job_scheduler.pause()
+        self.refresh()
+
+    def _cancel_selected(self):
+        """取消选中的任务"""
+        item = self.table.item(self.table.currentRow(), 0)
+        if item is not None:
+            self.job_scheduler.cancel(item.data(Qt.UserRole))
@@ -76,6 +76,48 @@ class OutputConsole(QPlainTextEdit):
         if self.line_count > self.max_lines * 0.8:
             self.cleanup_old_lines()
     
+    def append_texts(self, texts, error=False, success=False):
+        """
+        一次添加多段文本到控制台，只移动光标、滚动和检查清理一次
+        
+        Args:
+            texts (list): 要添加的文本列表，每段文本与 append_text 一样单独成行
+            error (bool): 是否为错误信息
+            success (bool): 是否为成功信息
+        """
+        if not texts:
+            return
+        if len(texts) == 1:
+            self.append_text(texts[0], error, success)
+            return
+        
+        # 选择颜色
+        if error:
+            color = self.error_color
+        elif success:
+            color = self.success_color
+        else:
+            color = self.normal_color
+        
+        # 将光标移到末尾
+        cursor = self.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        self.setTextCursor(cursor)
+        
+        # 每段文本用换行分隔后一次插入
+        html_text = f'<span style="color: {color.name()};">{"<br>".join(texts)}</span>'
+        self.appendHtml(html_text)
+        
+        # 滚动到最后
+        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        
+        # 更新行数
+        self.line_count += sum(text.count('\n') for text in texts) + len(texts) - 1
+        
+        # 如果超过最大行数的80%，触发清理
+        if self.line_count > self.max_lines * 0.8:
+            self.cleanup_old_lines()
+    
     def cleanup_old_lines(self):
         """清理旧行，保持在最大行数以内"""
         if self.line_count > self.max_lines:
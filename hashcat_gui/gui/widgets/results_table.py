@@ -21,6 +21,9 @@ class ResultsTable(QTableWidget):
         """初始化结果表格"""
         super().__init__(parent)
         
+        # 哈希值到所在单元格项的映射，用于快速查找已存在的结果
+        self._hash_items = {}
+        
         # 设置表格属性
         self._init_ui()
         
@@ -61,19 +64,38 @@ class ResultsTable(QTableWidget):
             time_str (str): 破解时间
             note (str): 备注
         """
+        hash_item = self._add_row(hash_val, password, time_str, note)
+        
+        # 滚动到新行
+        self.scrollToItem(hash_item)
+    
+    def _add_row(self, hash_val, password, time_str, note):
+        """
+        添加或更新一行结果
+        
+        Args:
+            hash_val (str): 哈希值
+            password (str): 破解得到的密码
+            time_str (str): 破解时间
+            note (str): 备注
+            
+        Returns:
+            QTableWidgetItem: 哈希值所在的单元格项
+        """
         # 检查是否已存在相同的哈希值
-        for row in range(self.rowCount()):
-            if self.item(row, 0) and self.item(row, 0).text() == hash_val:
-                # 更新现有行
-                self.item(row, 1).setText(password)
-                self.item(row, 2).setText(time_str)
-                self.item(row, 3).setText(note)
-                
-                # 设置行颜色为粉色，表示更新
-                for col in range(self.columnCount()):
-                    if self.item(row, col):
-                        self.item(row, col).setBackground(QColor("#FFCCE5"))
-                return
+        hash_item = self._hash_items.get(hash_val)
+        if hash_item is not None:
+            # 更新现有行
+            row = hash_item.row()
+            self.item(row, 1).setText(password)
+            self.item(row, 2).setText(time_str)
+            self.item(row, 3).setText(note)
+            
+            # 设置行颜色为粉色，表示更新
+            for col in range(self.columnCount()):
+                if self.item(row, col):
+                    self.item(row, col).setBackground(QColor("#FFCCE5"))
+            return hash_item
         
         # 添加新行
         row_position = self.rowCount()
@@ -85,19 +107,18 @@ class ResultsTable(QTableWidget):
         time_item = QTableWidgetItem(time_str)
         note_item = QTableWidgetItem(note)
         
+        # 设置新行的背景颜色为浅蓝色，表示新添加
+        for item in (hash_item, password_item, time_item, note_item):
+            item.setBackground(QColor("#D6EEFF"))
+        
         # 设置单元格项
         self.setItem(row_position, 0, hash_item)
         self.setItem(row_position, 1, password_item)
         self.setItem(row_position, 2, time_item)
         self.setItem(row_position, 3, note_item)
         
-        # 设置新行的背景颜色为浅蓝色，表示新添加
-        for col in range(self.columnCount()):
-            if self.item(row_position, col):
-                self.item(row_position, col).setBackground(QColor("#D6EEFF"))
-        
-        # 滚动到新行
-        self.scrollToItem(hash_item)
+        self._hash_items[hash_val] = hash_item
+        return hash_item
     
     def add_results(self, results):
         """
@@ -106,17 +127,45 @@ class ResultsTable(QTableWidget):
         Args:
             results (list): 结果列表，每个元素是一个字典，包含hash_val, password, time_str, note
         """
-        for result in results:
-            self.add_result(
-                result.get('hash_val', ''),
-                result.get('password', ''),
-                result.get('time_str', ''),
-                result.get('note', '')
-            )
+        if not results:
+            return
+        
+        # 批量添加时暂停排序和重绘，全部添加完后再统一刷新
+        sorting_enabled = self.isSortingEnabled()
+        self.setSortingEnabled(False)
+        self.setUpdatesEnabled(False)
+        try:
+            hash_item = None
+            for result in results:
+                hash_item = self._add_row(
+                    result.get('hash_val', ''),
+                    result.get('password', ''),
+                    result.get('time_str', ''),
+                    result.get('note', '')
+                )
+        finally:
+            self.setSortingEnabled(sorting_enabled)
+            self.setUpdatesEnabled(True)
+        
+        if hash_item is not None:
+            self.scrollToItem(hash_item)
+    
+    def remove_result_row(self, row):
+        """
+        删除一行结果
+        
+        Args:
+            row (int): 行索引
+        """
+        hash_item = self.item(row, 0)
+        if hash_item is not None:
+            self._hash_items.pop(hash_item.text(), None)
+        self.removeRow(row)
     
     def clear_results(self):
         """清空所有结果"""
         self.setRowCount(0)
+        self._hash_items = {}
     
     def export_results(self, file_path, delimiter=":"):
         """
@@ -171,7 +220,7 @@ class ResultsTable(QTableWidget):
             
             # 添加删除选项
             delete_action = QAction("删除此行", self)
-            delete_action.triggered.connect(lambda: self.removeRow(row))
+            delete_action.triggered.connect(lambda: self.remove_result_row(row))
             menu.addAction(delete_action)
             
             # 显示菜单
@@ -0,0 +1,3 @@
+"""
+后台任务模块 - 包含在线程池中运行的后台任务
+"""
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基准测试任务 - 在线程池中依次测试多个哈希模式，避免阻塞界面
+"""
+
+import threading
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from hashcat_gui.core.benchmark_db import BenchmarkDB, run_benchmark
+
+
+class BenchmarkSignals(QObject):
+    """基准测试任务的信号，QRunnable本身不能发出信号"""
+
+    mode_finished = Signal(int, object)  # 一个哈希模式测试完成信号（哈希模式，{设备ID: 速度}）
+    finished = Signal()  # 全部测试完成信号
+    error = Signal(str)  # 错误信号
+
+
+class BenchmarkWorker(QRunnable):
+    """基准测试任务类，每测试完一个哈希模式就保存结果并通知界面"""
+
+    def __init__(self, hashcat_path, hash_modes, devices=None):
+        """
+        初始化基准测试任务
+
+        Args:
+            hashcat_path (str): hashcat可执行文件路径
+            hash_modes (list): 哈希模式列表
+            devices (list, optional): 设备ID列表
+        """
+        super().__init__()
+        self.hashcat_path = hashcat_path
+        self.hash_modes = hash_modes
+        self.devices = devices
+        self.signals = BenchmarkSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """取消测试，正在测试的哈希模式完成后停止"""
+        self._cancelled.set()
+
+    def _on_mode_finished(self, hash_mode, speeds):
+        """报告一个哈希模式的结果，已取消时返回True停止测试"""
+        self.signals.mode_finished.emit(hash_mode, speeds)
+        return self._cancelled.is_set()
+
+    def run(self):
+        """在线程池中执行测试"""
+        try:
+            with BenchmarkDB() as db:
+                run_benchmark(self.hashcat_path, self.hash_modes, self.devices, db, self._on_mode_finished)
+            self.signals.finished.emit()
+        except Exception as e:
+            self.signals.error.emit(f"基准测试时出错: {str(e)}")
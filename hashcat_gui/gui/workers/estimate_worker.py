@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+攻击估算任务 - 在线程池中统计候选密码数量并运行基准测试，避免阻塞界面
+"""
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from hashcat_gui.core.keyspace_estimator import estimate_attack
+
+
+class EstimateSignals(QObject):
+    """攻击估算任务的信号，QRunnable本身不能发出信号"""
+
+    finished = Signal(dict, dict)  # 估算完成信号（破解参数，估算结果）
+    error = Signal(dict, str)  # 错误信号（破解参数，错误信息）
+
+
+class EstimateWorker(QRunnable):
+    """攻击估算任务类，估算完成后把破解参数和估算结果一起发回界面"""
+
+    def __init__(self, hashcat_path, params):
+        """
+        初始化攻击估算任务
+
+        Args:
+            hashcat_path (str): hashcat可执行文件路径
+            params (dict): 破解参数字典
+        """
+        super().__init__()
+        self.hashcat_path = hashcat_path
+        self.params = params
+        self.signals = EstimateSignals()
+
+    def run(self):
+        """在线程池中执行估算"""
+        try:
+            estimate = estimate_attack(self.hashcat_path, self.params)
+            self.signals.finished.emit(self.params, estimate)
+        except Exception as e:
+            self.signals.error.emit(self.params, f"估算攻击时出错: {str(e)}")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Potfile加载任务 - 在线程池中加载已破解的哈希结果，避免阻塞界面
+"""
+
+import threading
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from hashcat_gui.core.potfile_parser import iter_already_cracked
+
+
+class PotfileLoadSignals(QObject):
+    """Potfile加载任务的信号，QRunnable本身不能发出信号"""
+
+    progress = Signal(int, str)  # 进度信号（百分比，说明）
+    batch_ready = Signal(list)  # 一批结果信号
+    finished = Signal(int)  # 加载完成信号（结果总数）
+    error = Signal(str)  # 错误信号
+
+
+class PotfileLoadWorker(QRunnable):
+    """Potfile加载任务类，在后台线程中加载结果，并分批发送到界面"""
+
+    def __init__(self, hash_file_path, potfile_path, hash_mode=None, username=False, batch_size=500):
+        """
+        初始化Potfile加载任务
+
+        Args:
+            hash_file_path (str): 哈希文件路径
+            potfile_path (str): potfile路径
+            hash_mode (int, optional): 哈希模式
+            username (bool): 哈希文件中的行是否带有用户名前缀
+            batch_size (int): 每批发送的结果数量
+        """
+        super().__init__()
+        self.hash_file_path = hash_file_path
+        self.potfile_path = potfile_path
+        self.hash_mode = hash_mode
+        self.username = username
+        self.batch_size = batch_size
+        self.signals = PotfileLoadSignals()
+        self._cancelled = threading.Event()
+        self._loaded = 0
+
+    def cancel(self):
+        """取消加载，已经发出的批次不受影响"""
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        """
+        是否已取消
+
+        Returns:
+            bool: 是否已取消
+        """
+        return self._cancelled.is_set()
+
+    def _report_progress(self, bytes_read, total_bytes):
+        """
+        报告哈希文件的读取进度
+
+        Args:
+            bytes_read (int): 已读取的字节数
+            total_bytes (int): 总字节数
+        """
+        percent = int(bytes_read * 100 / total_bytes) if total_bytes else 100
+        self.signals.progress.emit(percent, f"已加载 {self._loaded} 个结果")
+
+    def run(self):
+        """在线程池中执行加载，每得到一批结果就发送一批"""
+        try:
+            self._loaded = 0
+            self.signals.progress.emit(0, "正在从 potfile 中查找已破解的哈希...")
+            batches = iter_already_cracked(self.hash_file_path, self.potfile_path, self.batch_size,
+                                           self.hash_mode, self.username,
+                                           progress_callback=self._report_progress)
+            for batch in batches:
+                if self.is_cancelled():
+                    batches.close()
+                    return
+                self._loaded += len(batch)
+                self.signals.batch_ready.emit(batch)
+
+            if not self.is_cancelled():
+                self.signals.finished.emit(self._loaded)
+        except Exception as e:
+            if not self.is_cancelled():
+                self.signals.error.emit(f"加载 potfile 结果时出错: {str(e)}")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+自动调优任务 - 在线程池中运行工作负载调优，避免阻塞界面
+"""
+
+import threading
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from hashcat_gui.core.workload_tuner import tune_and_save
+
+
+class TuneSignals(QObject):
+    """自动调优任务的信号，QRunnable本身不能发出信号"""
+
+    probe_finished = Signal(object, float)  # 一次测试完成信号（调优参数，速度）
+    finished = Signal(object, float)  # 调优完成信号（最佳调优参数，速度）
+    error = Signal(str)  # 错误信号
+
+
+class TuneWorker(QRunnable):
+    """自动调优任务类，每次测试后通知界面，结果保存在基准测试数据库中"""
+
+    def __init__(self, hashcat_path, hash_mode, devices=None):
+        """
+        初始化自动调优任务
+
+        Args:
+            hashcat_path (str): hashcat可执行文件路径
+            hash_mode (int): 哈希模式
+            devices (list, optional): 设备ID列表
+        """
+        super().__init__()
+        self.hashcat_path = hashcat_path
+        self.hash_mode = hash_mode
+        self.devices = devices
+        self.signals = TuneSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """取消调优，正在进行的测试完成后停止"""
+        self._cancelled.set()
+
+    def _on_probe_finished(self, settings, speed):
+        """报告一次测试的结果，已取消时返回True停止调优"""
+        self.signals.probe_finished.emit(settings, speed)
+        return self._cancelled.is_set()
+
+    def run(self):
+        """在线程池中执行调优"""
+        try:
+            settings, speed = tune_and_save(self.hashcat_path, self.hash_mode, self.devices,
+                                            callback=self._on_probe_finished)
+            self.signals.finished.emit(settings, speed)
+        except Exception as e:
+            self.signals.error.emit(f"自动调优时出错: {str(e)}")
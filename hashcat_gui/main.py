@@ -9,7 +9,9 @@ import sys
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QTranslator, QLocale
 
+from hashcat_gui.core.config_manager import ConfigManager
 from hashcat_gui.gui.main_window import MainWindow
+from hashcat_gui.gui.async_bridge import install_event_loop
 
 
 def main():
@@ -26,11 +28,21 @@ def main():
     if translator.load(f":/translations/lovelyhashcat_{locale}"):
         app.installTranslator(translator)
     
+    # 启用asyncio执行引擎时把asyncio事件循环接入Qt事件循环
+    loop = None
+    if ConfigManager().get_use_async_runner():
+        loop = install_event_loop(app)
+        if loop is None:
+            print("没有安装qasync，使用默认的执行引擎")
+    
     # 创建并显示主窗口
-    main_window = MainWindow()
+    main_window = MainWindow(use_async_runner=loop is not None)
     main_window.show()
     
     # 进入事件循环
+    if loop is not None:
+        with loop:
+            sys.exit(loop.run_forever())
     sys.exit(app.exec())
 
 
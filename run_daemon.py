@@ -0,0 +1,18 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+LovelyHashcat 守护进程启动脚本 - 不加载Qt，在没有显示器的服务器上运行破解任务
+"""
+
+import os
+import sys
+
+# 将当前目录添加到Python路径中，这样可以导入hashcat_gui包
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+# 导入守护进程的主函数
+from hashcat_gui.daemon import main
+
+if __name__ == "__main__":
+    sys.exit(main())
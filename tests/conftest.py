@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+测试配置 - 把项目根目录加入模块搜索路径，直接运行 pytest 时也能导入 hashcat_gui；提供模拟的hashcat脚本
+"""
+
+import os
+import sys
+
+import pytest
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# 模拟的hashcat：把哈希文件（第一个参数）中的 h<编号> 破解为 pw<编号>，结果写入 -o 指定的文件并追加到
+# 最后一个 --potfile-path 指定的potfile；FAKE_HASHCAT_SLEEP 环境变量指定写入结果前等待的秒数。
+# 哈希全部破解时退出代码为0，否则为1（与hashcat相同）
+FAKE_HASHCAT = '''#!{python}
+import os
+import sys
+import time
+
+args = sys.argv[1:]
+
+
+def option(name):
+    values = [args[index + 1] for index in range(len(args) - 1) if args[index] == name]
+    return values[-1] if values else None
+
+
+with open(args[0]) as f:
+    hashes = [line.strip() for line in f if line.strip()]
+print('fake hashcat started', flush=True)
+time.sleep(float(os.environ.get('FAKE_HASHCAT_SLEEP', '0')))
+
+found = [h for h in hashes if h[:1] == 'h' and h[1:].isdigit()]
+lines = ''.join(h + ':pw' + h[1:] + '\\n' for h in found)
+for path in (option('-o'), None if '--potfile-disable' in args else option('--potfile-path')):
+    if path:
+        with open(path, 'a') as f:
+            f.write(lines)
+sys.exit(0 if len(found) == len(hashes) else 1)
+'''
+
+
+@pytest.fixture
+def fake_hashcat(tmp_path):
+    """在单独的目录中创建模拟的hashcat，默认potfile为该目录下的 hashcat.potfile"""
+    hashcat_dir = tmp_path / 'hashcat'
+    hashcat_dir.mkdir()
+    path = hashcat_dir / 'hashcat'
+    path.write_text(FAKE_HASHCAT.format(python=sys.executable))
+    os.chmod(str(path), 0o755)
+    return str(path)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+asyncio桥接测试 - 需要PySide6和qasync，没有安装时跳过
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip('PySide6')
+qasync = pytest.importorskip('qasync')
+
+from PySide6.QtCore import QCoreApplication
+
+from hashcat_gui.core.config_manager import ConfigManager, JsonSettings
+from hashcat_gui.core.hashcat_runner import START_FAILED_EXIT_CODE
+from hashcat_gui.gui.async_bridge import AsyncRunnerBridge
+
+
+@pytest.fixture
+def loop():
+    app = QCoreApplication.instance() or QCoreApplication([])
+    event_loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(event_loop)
+    yield event_loop
+    event_loop.close()
+    asyncio.set_event_loop(None)
+
+
+@pytest.fixture
+def make_bridge(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+
+    def make(hashcat_path):
+        config_manager = ConfigManager(JsonSettings(str(tmp_path / 'settings.json')))
+        config_manager.set_hashcat_path(hashcat_path)
+        config_manager.set_apply_tuning(False)
+        return AsyncRunnerBridge(config_manager)
+
+    return make
+
+
+def _run_until_finished(loop, bridge, params):
+    """启动任务并运行事件循环直到 process_finished 信号"""
+    finished = loop.create_future()
+    found = {}
+    bridge.password_found.connect(lambda hash_val, password: found.__setitem__(hash_val, password))
+    bridge.process_finished.connect(
+        lambda exit_code, _: finished.done() or finished.set_result(exit_code))
+    assert bridge.start_cracking(params)
+    assert bridge.is_running()
+    exit_code = loop.run_until_complete(asyncio.wait_for(finished, 30))
+    return exit_code, found
+
+
+def _params(tmp_path, hashes):
+    hash_file = tmp_path / 'hashes.txt'
+    hash_file.write_text(''.join(f"{hash_val}\n" for hash_val in hashes))
+    return {'hash_file': str(hash_file), 'hash_mode': 0, 'attack_mode': 3, 'mask': '?d?d'}
+
+
+def test_bridge_runs_job(loop, make_bridge, fake_hashcat, tmp_path):
+    bridge = make_bridge(fake_hashcat)
+    exit_code, found = _run_until_finished(loop, bridge, _params(tmp_path, ['h1', 'h2']))
+    assert exit_code == 0
+    assert found == {'h1': 'pw1', 'h2': 'pw2'}
+    assert not bridge.is_running()
+
+
+def test_bridge_reports_failed_start(loop, make_bridge, tmp_path):
+    """hashcat无法执行时与 HashcatRunner 一样发出 START_FAILED_EXIT_CODE"""
+    hashcat_path = tmp_path / 'hashcat'
+    hashcat_path.write_text('')
+    bridge = make_bridge(str(hashcat_path))
+    errors = []
+    bridge.error_occurred.connect(errors.append)
+
+    exit_code, found = _run_until_finished(loop, bridge, _params(tmp_path, ['h1']))
+    assert exit_code == START_FAILED_EXIT_CODE
+    assert found == {}
+    assert errors
+    assert not bridge.is_running()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+异步执行引擎测试 - 使用模拟的hashcat脚本（见 conftest.py）
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from hashcat_gui.core.async_runner import AsyncHashcatEngine
+from hashcat_gui.core.engine import EVENT_OUTPUT, EVENT_ERROR, EVENT_CRACKED, EVENT_FINISHED
+
+
+class RecordingEngine(AsyncHashcatEngine):
+    """记录读取potfile的步骤在哪个线程中执行"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.potfile_threads = []
+
+    def _load_known_results(self, hash_file, potfile_path):
+        self.potfile_threads.append(threading.get_ident())
+        super()._load_known_results(hash_file, potfile_path)
+
+    def _read_results_from_potfile(self):
+        self.potfile_threads.append(threading.get_ident())
+        super()._read_results_from_potfile()
+
+
+@pytest.fixture
+def make_engine(tmp_path, monkeypatch):
+    """创建异步执行引擎，记录每个事件及调用回调的线程"""
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+
+    def make(hashcat_path):
+        engine = RecordingEngine(hashcat_path, apply_tuning=False, jobs_dir=str(tmp_path / 'jobs'))
+        engine.events = []
+        for event in (EVENT_OUTPUT, EVENT_ERROR, EVENT_CRACKED, EVENT_FINISHED):
+            engine.add_listener(event, lambda *args, event=event: engine.events.append(
+                (event, args, threading.get_ident())))
+        return engine
+
+    return make
+
+
+def _params(tmp_path, hashes):
+    hash_file = tmp_path / 'hashes.txt'
+    hash_file.write_text(''.join(f"{hash_val}\n" for hash_val in hashes))
+    return {'hash_file': str(hash_file), 'hash_mode': 0, 'attack_mode': 3, 'mask': '?d?d'}
+
+
+def _cracked(engine):
+    return {args[0]: args[1] for event, args, _ in engine.events if event == EVENT_CRACKED}
+
+
+def test_run_reports_results_on_loop_thread(make_engine, fake_hashcat, tmp_path):
+    """破解结果在事件循环所在的线程中报告，读取potfile在线程池中执行"""
+    # 启动前potfile中已经有 h1 的结果
+    with open(tmp_path / 'hashcat' / 'hashcat.potfile', 'w') as f:
+        f.write('h1:pw1\n')
+    engine = make_engine(fake_hashcat)
+
+    assert asyncio.run(engine.run(_params(tmp_path, ['h1', 'h2', 'h3']))) == 0
+    assert _cracked(engine) == {'h1': 'pw1', 'h2': 'pw2', 'h3': 'pw3'}
+    assert [args for event, args, _ in engine.events if event == EVENT_FINISHED] == [(0,)]
+    assert not engine.is_running()
+
+    loop_thread = threading.get_ident()
+    assert {thread for _, _, thread in engine.events} == {loop_thread}
+    assert len(engine.potfile_threads) == 2
+    assert loop_thread not in engine.potfile_threads
+
+
+def test_failed_launch(make_engine, tmp_path):
+    """hashcat无法执行时启动失败并报告错误"""
+    hashcat_path = tmp_path / 'hashcat'
+    hashcat_path.write_text('')
+    engine = make_engine(str(hashcat_path))
+
+    assert asyncio.run(engine.run(_params(tmp_path, ['h1']))) is None
+    assert any(event == EVENT_ERROR for event, _, _ in engine.events)
+    assert not engine.is_running()
+    assert not (tmp_path / 'jobs').exists() or not list((tmp_path / 'jobs').iterdir())
+
+
+def test_stop_running_process(make_engine, fake_hashcat, tmp_path, monkeypatch):
+    """等待超时后停止进程，结束处理仍然执行"""
+    monkeypatch.setenv('FAKE_HASHCAT_SLEEP', '30')
+    engine = make_engine(fake_hashcat)
+
+    async def run():
+        assert await engine.start(_params(tmp_path, ['h1']))
+        assert await engine.wait(0.5) is None
+        assert engine.is_running()
+        assert engine.stop()
+        return await engine.wait(10)
+
+    assert asyncio.run(run()) not in (None, 0)
+    assert not engine.is_running()
+    assert _cracked(engine) == {}
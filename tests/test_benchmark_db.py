@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基准测试数据库测试
+"""
+
+import pytest
+
+from hashcat_gui.core.benchmark_db import BenchmarkDB, parse_benchmark_output, parse_hash_modes
+
+
+@pytest.fixture
+def db(tmp_path):
+    with BenchmarkDB(str(tmp_path / 'benchmarks.db')) as benchmark_db:
+        yield benchmark_db
+
+
+def test_parse_benchmark_output():
+    text = ('1:0:1800:5000:12.5:1000000\n'
+            '2:0:1800:5000:12.5:2500000.5\n'
+            'Started: now\n'
+            'x:0:0:0:0:1\n')
+    assert parse_benchmark_output(text) == {(1, 0): 1000000.0, (2, 0): 2500000.5}
+    assert parse_hash_modes('0, 100,x,0,1000') == [0, 100, 1000]
+
+
+def test_latest_and_expected_speed(db):
+    db.record(0, {1: 100.0, 2: 200.0}, 'v6.2.5', timestamp=1)
+    db.record(0, {1: 150.0}, 'v6.2.6', timestamp=2)
+    db.record(100, {1: 50.0}, 'v6.2.6', timestamp=2)
+
+    assert [(row['hash_mode'], row['device'], row['speed']) for row in db.latest()] == \
+        [(0, 1, 150.0), (0, 2, 200.0), (100, 1, 50.0)]
+    assert db.expected_speed(0) == 350.0
+    assert db.expected_speed(0, ['2']) == 200.0
+    assert db.expected_speed(0, [3]) is None
+    assert db.expected_speed(1000) is None
+    assert db.expected_speed(0, max_age=60) is None
+
+
+def test_find_regressions(db):
+    db.record(0, {1: 100.0}, 'v6.2.5', timestamp=1)
+    db.record(0, {1: 85.0}, 'v6.2.6', timestamp=2)
+    db.record(100, {1: 100.0}, 'v6.2.5', timestamp=1)
+    db.record(100, {1: 95.0}, 'v6.2.6', timestamp=2)
+
+    regressions = db.find_regressions()
+    assert [(item['hash_mode'], item['best_version'], item['hashcat_version']) for item in regressions] == \
+        [(0, 'v6.2.5', 'v6.2.6')]
+    assert regressions[0]['change'] == pytest.approx(-0.15)
+
+
+def test_tuning_replaced(db):
+    assert db.get_tuning(0, 'default') is None
+    db.save_tuning(0, 'default', {'-n': 8}, 100.0)
+    db.save_tuning(0, 'default', {'-n': 16}, 120.0)
+    assert db.get_tuning(0, 'default') == {'-n': 16}
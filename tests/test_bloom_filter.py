@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+布隆过滤器测试
+"""
+
+from hashcat_gui.core.bloom_filter import BloomFilter
+
+
+def _items(prefix, count):
+    return [f"{prefix}{index:08x}" for index in range(count)]
+
+
+def test_no_false_negatives():
+    """添加过的元素一定能查到"""
+    bloom = BloomFilter(1000, 0.01)
+    items = _items('in', 1000)
+    bloom.update(items)
+    assert len(bloom) == 1000
+    assert all(item in bloom for item in items)
+
+
+def test_false_positive_rate():
+    """误判率接近设置的值"""
+    bloom = BloomFilter(2000, 0.01)
+    bloom.update(_items('in', 2000))
+    false_positives = sum(item in bloom for item in _items('out', 20000))
+    assert false_positives / 20000 < 0.03
+
+
+def test_serialization_roundtrip(tmp_path):
+    """保存后加载得到相同的过滤器和标签"""
+    bloom = BloomFilter(100, 0.001)
+    bloom.update(_items('in', 100))
+
+    restored, tag = BloomFilter.from_bytes(bloom.to_bytes('size:mtime'))
+    assert tag == 'size:mtime'
+    assert restored.bits == bloom.bits
+    assert len(restored) == 100
+    assert all(item in restored for item in _items('in', 100))
+
+    path = tmp_path / 'hashes.lhbloom'
+    bloom.save(str(path), '标签')
+    restored, tag = BloomFilter.load(str(path))
+    assert tag == '标签'
+    assert restored.bits == bloom.bits
+
+
+def test_invalid_data():
+    """魔数错误或数据被截断时返回 (None, None)"""
+    data = BloomFilter(100).to_bytes('tag')
+    assert BloomFilter.from_bytes(b'') == (None, None)
+    assert BloomFilter.from_bytes(b'XXXX' + data[4:]) == (None, None)
+    assert BloomFilter.from_bytes(data[:-1]) == (None, None)
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+John pot文件格式转换测试
+"""
+
+from hashcat_gui.core.cracked_store import convert_john_line
+
+
+def test_tagged_hashes():
+    """带标签的哈希去掉标签，第一个冒号之后都是密码"""
+    assert convert_john_line('$NT$8846f7eaee8fb117ad06bdd830b7586c:password') == \
+        '8846f7eaee8fb117ad06bdd830b7586c:password'
+    assert convert_john_line('$LM$aad3b435b51404ee:pa:ss') == 'aad3b435b51404ee:pa:ss'
+
+
+def test_dynamic_hashes():
+    """dynamic格式转换为 hash[:salt]，HEX$ 形式的盐值会解码"""
+    assert convert_john_line('$dynamic_0$5f4dcc3b5aa765d61d8327deb882cf99:password') == \
+        '5f4dcc3b5aa765d61d8327deb882cf99:password'
+    assert convert_john_line('$dynamic_1$abcdef$salt:pw') == 'abcdef:salt:pw'
+    assert convert_john_line('$dynamic_1$abcdef$HEX$73616c74:pw') == 'abcdef:salt:pw'
+
+
+def test_unconvertible_hashes():
+    """无法还原的哈希返回None"""
+    assert convert_john_line('$SOURCE_HASH$0123456789abcdef:pw') is None
+    assert convert_john_line('$dynamic_9$not-hex:pw') is None
+    assert convert_john_line('$dynamic_1$abcdef$HEX$zz:pw') is None
+
+
+def test_same_format_and_invalid_lines():
+    """两边格式相同的行原样返回，空行和没有冒号的行返回None"""
+    bcrypt = '$2a$05$LhayLxezLhK1LhWvKxCyLOj0j1u.Kj0jZ0pEmm134uzrQlFvQJLF6'
+    assert convert_john_line(f'{bcrypt}:secret') == f'{bcrypt}:secret'
+    assert convert_john_line('5f4dcc3b5aa765d61d8327deb882cf99:password') == \
+        '5f4dcc3b5aa765d61d8327deb882cf99:password'
+    assert convert_john_line('') is None
+    assert convert_john_line('no-colon') is None
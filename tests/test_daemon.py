@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+守护进程测试 - 使用模拟的hashcat脚本（见 conftest.py）
+"""
+
+import time
+import threading
+
+import pytest
+
+from hashcat_gui.core.config_manager import ConfigManager, JsonSettings
+from hashcat_gui.core.engine import HashcatEngine
+from hashcat_gui.core.job_queue import JobQueue, JOB_FINISHED, JOB_CANCELLED, JOB_RUNNING
+from hashcat_gui.daemon import CrackingDaemon
+
+
+@pytest.fixture
+def daemon(tmp_path, fake_hashcat, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    config_manager = ConfigManager(JsonSettings(str(tmp_path / 'settings.json')))
+    config_manager.set_apply_tuning(False)
+    cracking_daemon = CrackingDaemon(config_manager, fake_hashcat, JobQueue(str(tmp_path / 'queue.json')))
+    yield cracking_daemon
+    cracking_daemon.shutdown()
+
+
+def _params(tmp_path, hashes):
+    hash_file = tmp_path / 'hashes.txt'
+    hash_file.write_text(''.join(f"{hash_val}\n" for hash_val in hashes))
+    return {'hash_file': str(hash_file), 'hash_mode': 0, 'attack_mode': 3, 'mask': '?d?d'}
+
+
+def _wait_idle(daemon, timeout=30):
+    deadline = time.time() + timeout
+    while not daemon.is_idle():
+        assert time.time() < deadline, "任务没有在限定时间内结束"
+        time.sleep(0.05)
+
+
+def test_runs_queued_job(daemon, tmp_path):
+    cracks = []
+    daemon.add_crack_listener(lambda job_id, hash_val, password: cracks.append((hash_val, password)))
+    job = daemon.enqueue(_params(tmp_path, ['h1', 'h2']))
+    _wait_idle(daemon)
+
+    info = daemon.get_job(job.job_id)
+    assert info['state'] == JOB_FINISHED
+    assert info['cracked'] == 2
+    assert sorted(cracks) == [('h1', 'pw1'), ('h2', 'pw2')]
+
+
+@pytest.fixture
+def blocked_start(monkeypatch):
+    """让启动前读取已有破解结果的步骤一直等待，直到测试放行"""
+    entered = threading.Event()
+    release = threading.Event()
+    load_known_results = HashcatEngine._load_known_results
+
+    def slow_load(engine, hash_file, potfile_path):
+        entered.set()
+        release.wait(30)
+        load_known_results(engine, hash_file, potfile_path)
+
+    monkeypatch.setattr(HashcatEngine, '_load_known_results', slow_load)
+    yield entered, release
+    release.set()
+
+
+def test_start_does_not_hold_lock(daemon, tmp_path, blocked_start, monkeypatch):
+    """启动任务期间可以查询和取消任务，取消的任务在启动后立即停止"""
+    monkeypatch.setenv('FAKE_HASHCAT_SLEEP', '30')
+    entered, release = blocked_start
+    jobs = []
+    enqueue = threading.Thread(target=lambda: jobs.append(daemon.enqueue(_params(tmp_path, ['h1']))),
+                               daemon=True)
+    enqueue.start()
+    assert entered.wait(10)
+
+    # 启动还没有结束，其他线程仍然可以获取锁
+    results = []
+    query = threading.Thread(target=lambda: results.append(daemon.summary()), daemon=True)
+    query.start()
+    query.join(5)
+    assert not query.is_alive()
+    assert len(results[0]['running']) == 1
+    job_id = results[0]['running'][0]['job_id']
+    assert results[0]['running'][0]['state'] == JOB_RUNNING
+
+    assert daemon.cancel(job_id)
+    release.set()
+    enqueue.join(10)
+    assert not enqueue.is_alive()
+    _wait_idle(daemon)
+    assert daemon.get_job(job_id)['state'] == JOB_CANCELLED
@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+分布式任务测试 - 协调器和多个代理配合一个模拟的hashcat脚本运行
+
+模拟的hashcat把候选密码编号当作密码：哈希文件中的 h<编号> 在 --skip/--limit 覆盖该编号时被破解，
+结果写入 -o 指定的文件；哈希全部破解时退出代码为0，否则为1（与hashcat相同）。
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from hashcat_gui.core import work_agent
+from hashcat_gui.core.work_agent import WorkAgent, MAX_CONSECUTIVE_FAILURES
+from hashcat_gui.core.work_coordinator import WorkCoordinator, encode_potfile_password, UNIT_FAILED, UNIT_LEASED
+
+
+STUB_HASHCAT = '''#!{python}
+import sys
+
+args = sys.argv[1:]
+
+
+def option(name, default=0):
+    return args[args.index(name) + 1] if name in args else default
+
+
+with open(args[0]) as f:
+    hashes = [line.strip() for line in f if line.strip()]
+skip, limit = int(option('-s')), int(option('-l'))
+found = [h for h in hashes if h[1:].isdigit() and skip <= int(h[1:]) < skip + limit]
+with open(option('-o'), 'w') as f:
+    for h in found:
+        f.write(h + ':pw' + h[1:] + '\\n')
+sys.exit(0 if len(found) == len(hashes) else 1)
+'''
+
+BROKEN_HASHCAT = '''#!{python}
+import sys
+sys.exit(255)
+'''
+
+PARAMS = {'hash_mode': 0, 'attack_mode': 3, 'mask': '?d?d'}
+
+
+@pytest.fixture(autouse=True)
+def fast_wait(monkeypatch):
+    """缩短代理没有可用单元时的等待时间"""
+    monkeypatch.setattr(work_agent, 'WAIT_INTERVAL', 0.05)
+
+
+def _write_script(path, template):
+    path.write_text(template.format(python=sys.executable))
+    os.chmod(str(path), 0o755)
+    return str(path)
+
+
+@pytest.fixture
+def stub_hashcat(tmp_path):
+    return _write_script(tmp_path / 'hashcat', STUB_HASHCAT)
+
+
+@pytest.fixture
+def broken_hashcat(tmp_path):
+    return _write_script(tmp_path / 'broken_hashcat', BROKEN_HASHCAT)
+
+
+@pytest.fixture
+def make_coordinator(tmp_path):
+    """创建并启动协调器，测试结束时停止"""
+    coordinators = []
+
+    def make(hashes, keyspace=100, units=10, **kwargs):
+        hash_file = tmp_path / 'hashes.txt'
+        hash_file.write_text(''.join(f"{hash_val}\n" for hash_val in hashes))
+        coordinator = WorkCoordinator(PARAMS, str(hash_file), keyspace, units,
+                                      potfile_path=str(tmp_path / 'merged.potfile'), **kwargs)
+        coordinator.start()
+        coordinators.append(coordinator)
+        return coordinator
+
+    yield make
+    for coordinator in coordinators:
+        coordinator.stop()
+
+
+def _run_agents(coordinator, hashcat_paths, tmp_path, name='agent', timeout=60):
+    """
+    在线程中运行代理，每个hashcat路径一个代理
+
+    Returns:
+        tuple: (代理列表, 每个代理完成的单元数量)
+    """
+    agents = []
+    for index, hashcat_path in enumerate(hashcat_paths):
+        agent_id = f"{name}{index}"
+        work_dir = tmp_path / agent_id
+        work_dir.mkdir()
+        agents.append(WorkAgent(coordinator.address, hashcat_path, agent_id, str(work_dir)))
+
+    completed = [None] * len(agents)
+
+    def run(index):
+        completed[index] = agents[index].run()
+
+    threads = [threading.Thread(target=run, args=(index,), daemon=True) for index in range(len(agents))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout)
+        assert not thread.is_alive(), "代理没有在限定时间内结束"
+    return agents, completed
+
+
+def test_agents_share_units(make_coordinator, stub_hashcat, tmp_path):
+    """多个代理分完所有工作单元，破解结果合并到协调器的potfile"""
+    # hX 无法破解，所有单元都运行到结束
+    coordinator = make_coordinator(['h7', 'h55', 'h93', 'hX'])
+    _, completed = _run_agents(coordinator, [stub_hashcat] * 3, tmp_path)
+
+    assert coordinator.wait(5)
+    assert sum(completed) == 10
+    assert coordinator.cracked == {'h7': 'pw7', 'h55': 'pw55', 'h93': 'pw93'}
+    status = coordinator.status()
+    assert status['done'] == 10
+    assert status['failed'] == 0
+    assert status['progress_percent'] == 100
+
+    with open(tmp_path / 'merged.potfile') as f:
+        assert sorted(f.read().splitlines()) == ['h55:pw55', 'h7:pw7', 'h93:pw93']
+
+
+def test_expired_lease_is_reissued(make_coordinator, stub_hashcat, tmp_path):
+    """没有发送心跳的代理的租约到期后，工作单元重新分发给其他代理"""
+    coordinator = make_coordinator(['h5', 'hX'], units=4, lease_timeout=1)
+    lost = coordinator.lease('lost-agent')
+    assert lost['unit_id'] == 0
+    assert coordinator.status()['leased'] == 1
+
+    time.sleep(1.2)
+    _, completed = _run_agents(coordinator, [stub_hashcat, stub_hashcat], tmp_path)
+
+    assert coordinator.wait(5)
+    assert sum(completed) == 4
+    assert coordinator.units[0].attempts == 2
+    assert coordinator.cracked == {'h5': 'pw5'}
+    # 租约已经转给其他代理，原来的代理不能再提交
+    assert coordinator.complete('lost-agent', 0, [])['ok'] is False
+
+
+def test_failing_unit_is_capped(make_coordinator, stub_hashcat, broken_hashcat, tmp_path):
+    """总是失败的工作单元达到最多分发次数后标记为失败，连续失败的代理停止运行"""
+    coordinator = make_coordinator(['h10', 'hX'], keyspace=20, units=2, max_attempts=2)
+
+    agents, completed = _run_agents(coordinator, [broken_hashcat], tmp_path, name='broken')
+    assert completed == [0]
+    assert agents[0].consecutive_failures == MAX_CONSECUTIVE_FAILURES
+
+    status = coordinator.status()
+    assert status['failed'] == 1
+    assert status['failed_units'][0]['unit_id'] == 0
+    assert status['failed_units'][0]['attempts'] == 2
+    assert '255' in status['failed_units'][0]['error']
+    assert not status['finished']
+
+    # 剩下的单元由正常的代理完成，失败的单元不再分发
+    _, completed = _run_agents(coordinator, [stub_hashcat], tmp_path)
+    assert completed == [1]
+    assert coordinator.wait(5)
+    status = coordinator.status()
+    assert (status['done'], status['failed']) == (1, 1)
+    assert coordinator.cracked == {'h10': 'pw10'}
+
+
+def test_agent_stops_when_hashcat_cannot_start(make_coordinator, tmp_path):
+    """hashcat无法启动时代理在连续失败后停止，不会一直重试"""
+    coordinator = make_coordinator(['h1'], units=5, max_attempts=10)
+    agents, completed = _run_agents(coordinator, [str(tmp_path / 'missing' / 'hashcat')], tmp_path)
+    assert completed == [0]
+    assert agents[0].consecutive_failures == MAX_CONSECUTIVE_FAILURES
+    status = coordinator.status()
+    assert (status['pending'], status['failed']) == (5, 0)
+    assert coordinator.units[0].attempts == MAX_CONSECUTIVE_FAILURES
+
+
+def test_exit_code_zero_finishes_early(make_coordinator, stub_hashcat, tmp_path):
+    """hashcat退出代码为0（全部破解）时剩余的工作单元不再分发"""
+    coordinator = make_coordinator(['h3', 'h4'], units=10)
+    _, completed = _run_agents(coordinator, [stub_hashcat], tmp_path)
+
+    assert completed == [1]
+    assert coordinator.wait(5)
+    status = coordinator.status()
+    assert (status['done'], status['pending']) == (1, 9)
+    assert status['all_cracked']
+    assert coordinator.cracked == {'h3': 'pw3', 'h4': 'pw4'}
+
+
+def test_exit_code_zero_only_completes_own_unit(make_coordinator):
+    """exit_code为0时只完成提交者自己的单元，失败的单元和其他代理的租约不受影响"""
+    coordinator = make_coordinator(['h1'], units=3, max_attempts=1)
+    unit0 = coordinator.lease('a')['unit_id']
+    coordinator.fail('a', unit0, 'broken')
+    unit1 = coordinator.lease('b')['unit_id']
+    unit2 = coordinator.lease('c')['unit_id']
+
+    # 租约无效时exit_code为0不结束任务
+    assert coordinator.complete('a', unit1, [], exit_code=0)['ok'] is False
+    assert not coordinator.finished.is_set()
+
+    assert coordinator.complete('c', unit2, [['h1', 'pw1']], exit_code=0)['ok'] is True
+    assert coordinator.finished.is_set()
+    assert coordinator.units[unit0].state == UNIT_FAILED
+    assert coordinator.units[unit1].state == UNIT_LEASED
+    assert coordinator.lease('d') == {'done': True}
+
+
+def test_potfile_passwords_are_encoded(make_coordinator, tmp_path):
+    """不可打印或非ASCII的密码以 $HEX[...] 写入potfile"""
+    coordinator = make_coordinator(['h1'])
+    coordinator.complete('a', 0, [('h1', 'a:b c'), ('h2', 'line\nbreak'), ('h3', 'pässword'),
+                                  ('h4', '$HEX[6869]')])
+    with open(tmp_path / 'merged.potfile', encoding='utf-8') as f:
+        assert f.read().splitlines() == ['h1:a:b c', 'h2:$HEX[6c696e650a627265616b]',
+                                         'h3:$HEX[70c3a47373776f7264]', 'h4:$HEX[6869]']
+    assert encode_potfile_password('\x01') == '$HEX[01]'
+
+
+def _post(coordinator, path, data):
+    request = urllib.request.Request(coordinator.address + path, json.dumps(data).encode('utf-8'),
+                                     {'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_invalid_cracks_are_rejected(make_coordinator):
+    """格式不正确或哈希包含换行的破解结果返回400，不会合并"""
+    coordinator = make_coordinator(['h1'])
+    unit_id = coordinator.lease('a')['unit_id']
+    for cracks in ([1, 2], [['h1']], [['h1', 5]], [['h1\nh2', 'pw']], 'h1:pw'):
+        code, _ = _post(coordinator, '/complete', {'agent': 'a', 'unit_id': unit_id, 'cracks': cracks})
+        assert code == 400
+    assert coordinator.cracked == {}
+    assert coordinator.units[unit_id].state == UNIT_LEASED
+
+    code, body = _post(coordinator, '/complete', {'agent': 'a', 'unit_id': unit_id, 'cracks': [['h1', 'pw1']]})
+    assert (code, body) == (200, {'ok': True, 'new': 1})
+
+
+def test_token_required_on_network(tmp_path):
+    """监听本机以外的地址时必须指定共享密钥"""
+    hash_file = tmp_path / 'hashes.txt'
+    hash_file.write_text('h1\n')
+    with pytest.raises(ValueError):
+        WorkCoordinator(PARAMS, str(hash_file), 100, host='0.0.0.0')
+
+
+def test_agent_passes_username(stub_hashcat, tmp_path):
+    agent = WorkAgent('http://127.0.0.1:1', stub_hashcat, 'agent', str(tmp_path))
+    unit = {'unit_id': 0, 'skip': 0, 'limit': 10}
+    assert '--username' in agent.build_command(dict(PARAMS, username=True), unit, 'out')
+    assert '--username' not in agent.build_command(PARAMS, unit, 'out')
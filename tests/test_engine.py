@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+执行引擎测试 - 使用模拟的hashcat脚本（见 conftest.py）
+"""
+
+import pytest
+
+from hashcat_gui.core.command_builder import build_crack_args
+from hashcat_gui.core.engine import HashcatEngine, EVENT_ERROR, EVENT_CRACKED, EVENT_FINISHED
+from hashcat_gui.core.status_parser import StatusJsonParser, EVENT_LINE, EVENT_STATUS
+
+
+@pytest.fixture
+def make_engine(tmp_path, monkeypatch):
+    """创建执行引擎，记录每个事件"""
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+
+    def make(hashcat_path, **kwargs):
+        engine = HashcatEngine(hashcat_path, apply_tuning=False, jobs_dir=str(tmp_path / 'jobs'), **kwargs)
+        engine.events = []
+        for event in (EVENT_ERROR, EVENT_CRACKED, EVENT_FINISHED):
+            engine.add_listener(event, lambda *args, event=event: engine.events.append((event, args)))
+        return engine
+
+    return make
+
+
+def _params(tmp_path, hashes, **extra):
+    hash_file = tmp_path / 'hashes.txt'
+    hash_file.write_text(''.join(f"{hash_val}\n" for hash_val in hashes))
+    return dict({'hash_file': str(hash_file), 'hash_mode': 0, 'attack_mode': 3, 'mask': '?d?d'}, **extra)
+
+
+def _cracked(engine):
+    return {args[0]: args[1] for event, args in engine.events if event == EVENT_CRACKED}
+
+
+def test_run_reports_results(make_engine, fake_hashcat, tmp_path):
+    """破解结果只报告一次，任务结束后potfile中有新的结果，任务目录被清理"""
+    with open(tmp_path / 'hashcat' / 'hashcat.potfile', 'w') as f:
+        f.write('h1:pw1\n')
+    engine = make_engine(fake_hashcat)
+
+    assert engine.run(_params(tmp_path, ['h1', 'h2', 'x'])) == 1
+    assert _cracked(engine) == {'h1': 'pw1', 'h2': 'pw2'}
+    assert len([event for event, _ in engine.events if event == EVENT_CRACKED]) == 2
+    assert [args for event, args in engine.events if event == EVENT_FINISHED] == [(1,)]
+    assert not engine.is_running()
+    with open(tmp_path / 'hashcat' / 'hashcat.potfile') as f:
+        assert 'h2:pw2' in f.read().splitlines()
+    assert engine.last_session is not None
+    assert not list((tmp_path / 'jobs').iterdir())
+
+
+def test_john_results_not_passed_to_hashcat(make_engine, fake_hashcat, tmp_path):
+    """John已破解的哈希不交给hashcat，也不写入potfile，结果仍然报告"""
+    john_pot = tmp_path / 'john.pot'
+    john_pot.write_text('h2:pw2\n')
+    engine = make_engine(fake_hashcat, john_pot_path=str(john_pot))
+
+    assert engine.run(_params(tmp_path, ['h1', 'h2', 'h3'])) == 0
+    assert _cracked(engine) == {'h1': 'pw1', 'h2': 'pw2', 'h3': 'pw3'}
+    with open(tmp_path / 'hashcat' / 'hashcat.potfile') as f:
+        assert sorted(f.read().splitlines()) == ['h1:pw1', 'h3:pw3']
+
+
+def test_shared_known_results(make_engine, fake_hashcat, tmp_path):
+    """使用 find_known_results 的结果启动时不再查询索引，John的结果仍然不交给hashcat"""
+    with open(tmp_path / 'hashcat' / 'hashcat.potfile', 'w') as f:
+        f.write('h1:pw1\n')
+    john_pot = tmp_path / 'john.pot'
+    john_pot.write_text('h2:pw2\n')
+    params = _params(tmp_path, ['h1', 'h2', 'h3'])
+    known_results = make_engine(fake_hashcat, john_pot_path=str(john_pot)).find_known_results(params)
+    assert sorted(match[1:] for match in known_results) == [('h1', 'pw1', 'hashcat'), ('h2', 'pw2', 'john')]
+
+    engine = make_engine(fake_hashcat, john_pot_path=str(john_pot))
+    queries = []
+    engine._query_known_results = lambda *args: queries.append(args)
+    assert engine.run(dict(params, _known_results=known_results)) == 0
+    assert queries == []
+    assert _cracked(engine) == {'h1': 'pw1', 'h2': 'pw2', 'h3': 'pw3'}
+    with open(tmp_path / 'hashcat' / 'hashcat.potfile') as f:
+        assert 'h2:pw2' not in f.read().splitlines()
+
+
+def test_missing_hashcat(make_engine, tmp_path):
+    engine = make_engine(str(tmp_path / 'missing'))
+    assert engine.run(_params(tmp_path, ['h1'])) is None
+    assert any(event == EVENT_ERROR for event, _ in engine.events)
+    assert not engine.is_running()
+
+
+def test_finish_handler_error_still_finishes(make_engine, fake_hashcat, tmp_path):
+    """结束处理出错时任务仍然结束，is_running() 不会一直为True"""
+    engine = make_engine(fake_hashcat)
+
+    def broken():
+        raise RuntimeError('读取结果失败')
+
+    engine._read_results_from_potfile = broken
+    assert engine.start(_params(tmp_path, ['h1']))
+    assert engine.wait(30) == 0
+    assert not engine.is_running()
+    assert [args for event, args in engine.events if event == EVENT_FINISHED] == [(0,)]
+    assert any('读取结果失败' in args[0] for event, args in engine.events if event == EVENT_ERROR)
+
+
+def test_potfile_args():
+    """potfile参数只出现一次，禁用potfile时不指定potfile路径"""
+    params = {'hash_file': 'hashes.txt', 'hash_mode': 0, 'attack_mode': 3, 'mask': '?d'}
+    args = build_crack_args(dict(params, potfile_path='custom.potfile'), default_potfile='default.potfile')
+    assert args.count('--potfile-path') == 1
+    assert args[args.index('--potfile-path') + 1] == 'custom.potfile'
+
+    args = build_crack_args(params, default_potfile='default.potfile')
+    assert args[args.index('--potfile-path') + 1] == 'default.potfile'
+
+    args = build_crack_args(dict(params, potfile_path='custom.potfile', potfile_disable=True),
+                            default_potfile='default.potfile')
+    assert '--potfile-path' not in args
+    assert '--potfile-disable' in args
+
+
+def test_malformed_json_status_is_output_line():
+    """字段类型不正确的JSON状态记录按普通输出处理，后面的记录仍然可以解析"""
+    parser = StatusJsonParser()
+    events = parser.feed('{"status": 3, "progress": [null, 1]}\n'
+                         '{"status": 3, "devices": ["gpu"]}\n'
+                         '{"status": 3, "progress": [5, 10], "recovered_hashes": [1, 2]}\n')
+    assert [kind for kind, _ in events] == [EVENT_LINE, EVENT_LINE, EVENT_STATUS]
+    assert events[0][1] == '{"status": 3, "progress": [null, 1]}'
+    assert events[2][1].progress_current == 5
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+哈希规范化和哈希匹配器测试
+"""
+
+from hashcat_gui.core.hash_keys import HashMatcher, canonical_key
+
+
+PKZIP_HASH = '$pkzip2$1*2*2*0*1c*1a*7a2b1e9c*0*42*0*1c*7a2b*a1b2*$/pkzip2$'
+
+
+def test_hex_hash_is_case_insensitive():
+    """十六进制哈希不区分大小写，返回potfile中原样的哈希部分"""
+    matcher = HashMatcher(['8743B52063CD84097A65D1633F5C74F5'])
+    assert matcher.match_line('8743b52063cd84097a65d1633f5c74f5:hashcat\n') == (
+        '8743b52063cd84097a65d1633f5c74f5', '8743b52063cd84097a65d1633f5c74f5', 'hashcat')
+
+
+def test_salted_hash_and_password_with_colons():
+    """带盐的哈希按目标哈希的字段数匹配，密码中的冒号保留"""
+    matcher = HashMatcher(['aabbccdd:salt'])
+    assert matcher.match_line('aabbccdd:salt:pa:ss') == ('aabbccdd:salt', 'aabbccdd:salt', 'pa:ss')
+    assert matcher.match_line('aabbccdd:other:pw') is None
+
+
+def test_username_prefix():
+    """带用户名的哈希行去掉用户名后匹配"""
+    matcher = HashMatcher(['alice:aabbccdd'], username=True)
+    assert 'aabbccdd' in matcher
+    assert matcher.match_line('aabbccdd:secret')[2] == 'secret'
+    assert HashMatcher(['alice:aabbccdd']).match_line('aabbccdd:secret') is None
+
+
+def test_container_hash_ignores_extra_fields():
+    """容器格式的哈希只按容器本身匹配，忽略John格式中的文件名字段"""
+    line = f"archive.zip/file.txt:{PKZIP_HASH}:file.txt:archive.zip::archive.zip"
+    assert canonical_key(line, 17200) == PKZIP_HASH
+
+    matcher = HashMatcher([line], hash_mode=17200)
+    assert matcher.match_line(f"{PKZIP_HASH}:secret") == (PKZIP_HASH, PKZIP_HASH, 'secret')
+
+
+def test_ignored_lines():
+    """空行、注释和没有密码的行不匹配"""
+    matcher = HashMatcher(['aabbccdd'])
+    for line in ('', '\n', '# aabbccdd:pw', 'aabbccdd'):
+        assert matcher.match_line(line) is None
+
+
+def test_heads():
+    """索引按规范键的第一个字段查询"""
+    matcher = HashMatcher(['AABB:salt', 'ccdd', ''])
+    assert len(matcher) == 2
+    assert matcher.heads() == {'aabb', 'ccdd'}
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HTTP接口测试 - 破解结果日志和任务提交参数检查
+"""
+
+import time
+import threading
+
+import pytest
+
+from hashcat_gui.core.http_api import CrackLog, JobApiServer, validate_api_params
+
+
+def _fill(log, count, job_id='job'):
+    for index in range(count):
+        log.append(job_id, f"hash{index}", f"pw{index}")
+
+
+def test_since_returns_entries_in_order():
+    log = CrackLog()
+    _fill(log, 3)
+    entries, next_seq = log.since(1)
+    assert [entry['seq'] for entry in entries] == [1, 2, 3]
+    assert [entry['hash'] for entry in entries] == ['hash0', 'hash1', 'hash2']
+    assert next_seq == 4
+
+    entries, next_seq = log.since(3)
+    assert [entry['seq'] for entry in entries] == [3]
+    assert log.since(next_seq) == ([], 4)
+
+
+def test_limit_continues_from_last_entry():
+    log = CrackLog()
+    _fill(log, 5)
+    entries, next_seq = log.since(1, limit=2)
+    assert [entry['seq'] for entry in entries] == [1, 2]
+    assert next_seq == 3
+
+
+def test_job_filter_skips_other_jobs():
+    log = CrackLog()
+    log.append('a', 'h1', 'p1')
+    log.append('b', 'h2', 'p2')
+    log.append('a', 'h3', 'p3')
+    entries, next_seq = log.since(1, job_id='a')
+    assert [entry['hash'] for entry in entries] == ['h1', 'h3']
+    assert next_seq == 4
+    assert log.since(1, job_id='c') == ([], 4)
+
+
+def test_old_entries_are_dropped():
+    """超过保存数量时丢弃最早的结果，序号不变"""
+    log = CrackLog(max_entries=3)
+    _fill(log, 5)
+    entries, next_seq = log.since(1)
+    assert [entry['seq'] for entry in entries] == [3, 4, 5]
+    assert next_seq == 6
+
+
+def test_long_poll_wakes_on_append():
+    log = CrackLog()
+    timer = threading.Timer(0.2, log.append, ('job', 'late', 'pw'))
+    timer.start()
+    started = time.time()
+    entries, next_seq = log.since(1, timeout=10)
+    timer.join()
+    assert [entry['hash'] for entry in entries] == ['late']
+    assert next_seq == 2
+    assert time.time() - started < 5
+
+
+def test_close_wakes_waiters():
+    log = CrackLog()
+    timer = threading.Timer(0.2, log.close)
+    timer.start()
+    started = time.time()
+    assert log.since(1, timeout=10) == ([], 1)
+    timer.join()
+    assert time.time() - started < 5
+
+
+class RecordingDaemon:
+    """记录提交的任务，代替守护进程"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def add_crack_listener(self, callback):
+        pass
+
+    def enqueue(self, params, priority=0, device_group=None):
+        self.jobs.append(params)
+        job = type('Job', (), {})()
+        job.job_id = str(len(self.jobs))
+        return job
+
+    def get_job(self, job_id):
+        return {'job_id': job_id}
+
+
+@pytest.fixture(scope='module')
+def api_server(tmp_path_factory):
+    """整个模块共用一个接口，停止服务需要等待服务线程的轮询间隔"""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv('HOME', str(tmp_path_factory.mktemp('home')))
+        server = JobApiServer(RecordingDaemon(), token='secret')
+        server.start()
+        yield server
+        server.stop()
+
+
+@pytest.fixture
+def api(api_server):
+    api_server.daemon.jobs.clear()
+    return api_server
+
+
+def test_submit_valid_params(api, tmp_path):
+    hash_file = tmp_path / 'hashes.txt'
+    hash_file.write_text('h1\n')
+    params = {'hash_file': str(hash_file), 'hash_mode': 0, 'attack_mode': 3, 'mask': '?d?d',
+              'devices': [1, '2'], 'username': True, 'output_file': '/tmp/ignored'}
+    code, body = api.submit({'params': params})
+    assert code == 201
+    assert api.daemon.jobs == [{'hash_file': str(hash_file), 'hash_mode': 0, 'attack_mode': 3, 'mask': '?d?d',
+                                'devices': ['1', '2'], 'username': True}]
+
+
+@pytest.mark.parametrize('params', [
+    {'hash_mode': 0, 'attack_mode': '3', 'mask': '?d'},
+    {'hash_mode': '0', 'attack_mode': 3, 'mask': '?d'},
+    {'hash_mode': 0, 'attack_mode': 3, 'mask': '?d', 'skip': -1},
+    {'hash_mode': 0, 'attack_mode': 3, 'mask': '?d', 'limit': True},
+    {'hash_mode': 0, 'attack_mode': 9, 'mask': '?d'},
+    {'hash_mode': 0, 'attack_mode': 3, 'mask': 5},
+    {'hash_mode': 0, 'attack_mode': 3, 'mask': '--stdout'},
+    {'hash_mode': 0, 'attack_mode': 0, 'dict_file': '-o/tmp/x'},
+    {'hash_mode': 0, 'attack_mode': 0, 'dict_file': 'words.txt', 'rule_file': '--potfile-disable'},
+    {'hash_mode': 0, 'attack_mode': 3, 'mask': '?1', 'custom_charset1': '-x'},
+    {'hash_mode': 0, 'attack_mode': 3, 'mask': '?d', 'devices': 1},
+    {'hash_mode': 0, 'attack_mode': 3, 'mask': '?d', 'devices': [1, '2,3']},
+    {'hash_mode': 0, 'attack_mode': 3, 'mask': '?d', 'username': 'yes'},
+])
+def test_submit_rejects_invalid_params(api, params):
+    """类型不正确或以 - 开头的参数返回400，不会提交任务"""
+    code, body = api.submit({'params': params, 'hashes': ['h1']})
+    assert code == 400
+    assert body['error']
+    assert api.daemon.jobs == []
+
+
+def test_submit_rejects_non_string_hashes(api):
+    code, _ = api.submit({'params': {'hash_mode': 0, 'attack_mode': 3, 'mask': '?d'}, 'hashes': [['h1']]})
+    assert code == 400
+    assert api.daemon.jobs == []
+
+
+def test_validate_leaves_valid_params():
+    params = {'hash_mode': 1000, 'attack_mode': 6, 'dict_file': 'words.txt', 'mask': '?d?d'}
+    assert validate_api_params(params) is None
+    assert params == {'hash_mode': 1000, 'attack_mode': 6, 'dict_file': 'words.txt', 'mask': '?d?d'}
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+任务队列测试
+"""
+
+from hashcat_gui.core.job_queue import (
+    JobQueue, JOB_QUEUED, JOB_FINISHED, JOB_FAILED, JOB_CANCELLED,
+    MAX_AUTO_RESUMES, finished_job_state, parse_group_limits, format_group_limits,
+)
+
+
+def test_persistence_and_running_jobs_requeued(tmp_path):
+    """队列保存到文件，重新读取时上次仍在运行的任务重新排队"""
+    path = str(tmp_path / 'queue.json')
+    queue = JobQueue(path)
+    first = queue.add({'hash_file': '/data/a.txt'}, priority=1)
+    second = queue.add({'hash_file': '/data/b.txt', 'devices': [2, 1]})
+    queue.mark_running(first)
+    queue.mark_done(second, JOB_FINISHED, 0)
+
+    reloaded = JobQueue(path)
+    assert [job.job_id for job in reloaded.jobs] == [first.job_id, second.job_id]
+    assert reloaded.get(first.job_id).state == JOB_QUEUED
+    assert reloaded.get(first.job_id).name == 'a.txt'
+    assert reloaded.get(second.job_id).state == JOB_FINISHED
+    assert reloaded.get(second.job_id).device_group == '1,2'
+
+    assert reloaded.clear_finished() == 1
+    assert JobQueue(path).get(second.job_id) is None
+
+
+def test_corrupt_queue_file(tmp_path):
+    path = tmp_path / 'queue.json'
+    path.write_text('{not json')
+    assert JobQueue(str(path)).jobs == []
+
+
+def test_next_job_order_and_group_limits(tmp_path):
+    queue = JobQueue(str(tmp_path / 'queue.json'))
+    low = queue.add({}, priority=0)
+    high = queue.add({}, priority=5)
+    other = queue.add({'devices': [2]})
+    assert queue.next_job() is high
+
+    # 默认设备组已满时选择其他设备组的任务
+    queue.mark_running(high)
+    assert queue.next_job() is other
+    assert queue.next_job({'default': 2}) is low
+
+
+def test_finished_job_state():
+    assert finished_job_state(0) == JOB_FINISHED
+    assert finished_job_state(1) == JOB_FINISHED
+    assert finished_job_state(-1, cancelled=True) == JOB_CANCELLED
+    assert finished_job_state(-1, shutting_down=True) == JOB_QUEUED
+    assert finished_job_state(-1, resumable=True) == JOB_QUEUED
+    assert finished_job_state(-1, resumable=True, resume_count=MAX_AUTO_RESUMES) == JOB_FAILED
+    assert finished_job_state(-1) == JOB_FAILED
+
+
+def test_group_limits_text():
+    limits = parse_group_limits('default=1; 1,2=3; bad; gpu=x')
+    assert limits == {'default': 1, '1,2': 3}
+    assert parse_group_limits(format_group_limits(limits)) == limits
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+任务工作目录测试
+"""
+
+import os
+
+from hashcat_gui.core.job_workspace import JobWorkspace, OUTFILE_NAME
+
+
+def test_jobs_use_separate_directories(tmp_path):
+    first = JobWorkspace(jobs_dir=str(tmp_path))
+    second = JobWorkspace(jobs_dir=str(tmp_path))
+    assert first.job_id != second.job_id
+    assert first.outfile_path != second.outfile_path
+    assert os.path.dirname(first.outfile_path) == first.directory
+    assert os.path.basename(first.outfile_path) == OUTFILE_NAME
+    assert os.path.isdir(first.directory) and os.path.isdir(second.directory)
+
+
+def test_params_round_trip(tmp_path):
+    """内部参数不保存，用同一个ID重新打开时可以读回参数"""
+    workspace = JobWorkspace('job1', str(tmp_path))
+    assert workspace.save_params({'hash_file': 'hashes.txt', 'hash_mode': 0, '_internal': object()})
+    assert JobWorkspace('job1', str(tmp_path)).load_params() == {'hash_file': 'hashes.txt', 'hash_mode': 0}
+    assert JobWorkspace('job2', str(tmp_path)).load_params() == {}
+
+
+def test_remove(tmp_path):
+    workspace = JobWorkspace('job1', str(tmp_path))
+    with open(workspace.path('restore'), 'w') as f:
+        f.write('checkpoint')
+    workspace.remove()
+    assert not os.path.exists(workspace.directory)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+掩码密钥空间计算测试
+"""
+
+from hashcat_gui.core.keyspace_estimator import (
+    LineCountCache, count_mask_candidates, estimate_candidates, mask_keyspace,
+)
+
+
+def test_builtin_charsets():
+    assert mask_keyspace('?l') == 26
+    assert mask_keyspace('?u?l?l?d?d') == 26 ** 3 * 100
+    assert mask_keyspace('?a') == 95
+    assert mask_keyspace('?h?H') == 256
+    assert mask_keyspace('?b') == 256
+
+
+def test_literal_characters():
+    """掩码中的普通字符只有一种取值"""
+    assert mask_keyspace('abc?d') == 10
+    assert mask_keyspace('password') == 1
+
+
+def test_empty_mask():
+    """空掩码没有候选密码"""
+    assert mask_keyspace('') == 0
+    assert mask_keyspace(None) == 0
+    assert count_mask_candidates('') is None
+
+
+def test_custom_charsets():
+    """自定义字符集按展开后的不同字符计数"""
+    assert mask_keyspace('?1?1', {1: '?l?d'}) == 36 ** 2
+    assert mask_keyspace('?1?2', {1: 'abc', 2: 'aab'}) == 3 * 2
+    assert mask_keyspace('?1?d', {1: '?d?d'}) == 100
+
+
+def test_undefined_custom_charset():
+    assert mask_keyspace('?1') is None
+    assert mask_keyspace('?2', {1: 'abc'}) is None
+
+
+def test_unreadable_rule_file(tmp_path):
+    """规则文件读取失败时候选数量未知，而不是按没有规则计算"""
+    dict_file = tmp_path / 'words.txt'
+    dict_file.write_text('a\nb\nc\n')
+    rule_file = tmp_path / 'best.rule'
+    rule_file.write_text(':\n# 注释\nc\nu\n')
+    line_cache = LineCountCache(str(tmp_path / 'line_counts.json'))
+    params = {'attack_mode': 0, 'dict_file': str(dict_file), 'rule_file': str(rule_file)}
+    assert estimate_candidates(params, line_cache) == 9
+    assert estimate_candidates(dict(params, rule_file=str(tmp_path / 'missing.rule')), line_cache) is None
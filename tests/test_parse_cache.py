@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+解析缓存测试
+"""
+
+import os
+
+import pytest
+
+from hashcat_gui.core import potfile_parser
+from hashcat_gui.core.potfile_parser import ParseCache
+
+
+@pytest.fixture
+def files(tmp_path):
+    hash_file = tmp_path / 'hashes.txt'
+    hash_file.write_text('h1\nh2\nh3\n')
+    potfile = tmp_path / 'hashcat.potfile'
+    potfile.write_text('h1:pw1\nx:other\n')
+    return hash_file, potfile
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    """记录完整解析potfile的次数"""
+    calls = []
+    parse_cracked = potfile_parser._parse_cracked
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return parse_cracked(*args, **kwargs)
+
+    monkeypatch.setattr(potfile_parser, '_parse_cracked', counting)
+    return calls
+
+
+def test_hit_and_append(files, tmp_path, parse_calls):
+    """文件没有变化时直接命中缓存，potfile只追加内容时只解析新追加的部分"""
+    hash_file, potfile = files
+    cache = ParseCache(str(tmp_path / 'cache'))
+    assert cache.load_cracked(str(hash_file), str(potfile)) == {'h1': 'pw1'}
+    assert cache.load_cracked(str(hash_file), str(potfile)) == {'h1': 'pw1'}
+    assert len(parse_calls) == 1
+
+    with open(potfile, 'a') as f:
+        f.write('h2:pw2\n')
+    assert cache.load_cracked(str(hash_file), str(potfile)) == {'h1': 'pw1', 'h2': 'pw2'}
+    assert len(parse_calls) == 1
+
+
+def test_invalidated_by_size_and_mtime(files, tmp_path, parse_calls):
+    hash_file, potfile = files
+    cache = ParseCache(str(tmp_path / 'cache'))
+    cache.load_cracked(str(hash_file), str(potfile))
+
+    # potfile被改写（大小变小）后重新解析
+    potfile.write_text('h3:pw3\n')
+    assert cache.load_cracked(str(hash_file), str(potfile)) == {'h3': 'pw3'}
+    assert len(parse_calls) == 2
+
+    # 哈希文件大小相同但修改时间变化后重新解析
+    stat = os.stat(hash_file)
+    os.utime(hash_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert cache.get(str(hash_file), str(potfile)) is None
+    assert cache.load_cracked(str(hash_file), str(potfile)) == {'h3': 'pw3'}
+    assert len(parse_calls) == 3
+
+
+def test_bounded_entries(tmp_path):
+    """超过 max_entries 后删除最久未使用的条目"""
+    potfile = tmp_path / 'hashcat.potfile'
+    potfile.write_text('h0:pw0\n')
+    cache = ParseCache(str(tmp_path / 'cache'), max_entries=2)
+    hash_files = []
+    for index in range(3):
+        hash_file = tmp_path / f'hashes{index}.txt'
+        hash_file.write_text(f'h{index}\n')
+        hash_files.append(str(hash_file))
+        cache.put(str(hash_file), str(potfile), {})
+        entry_path = cache._entry_path(str(hash_file), str(potfile), None, False)
+        os.utime(entry_path, (index, index))
+
+    assert len(os.listdir(cache.cache_dir)) == 2
+    assert cache.get(hash_files[0], str(potfile)) is None
+    assert cache.get(hash_files[2], str(potfile)) == {}
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Potfile整理工具测试
+"""
+
+import os
+import random
+
+import pytest
+
+from hashcat_gui.core.potfile_compactor import compact_potfile, external_dedupe
+from hashcat_gui.core.potfile_index import PotfileIndex
+from hashcat_gui.core.potfile_parser import ParseCache, load_already_cracked, parse_potfile
+
+
+def _keep_last(lines):
+    """在内存中去重，只保留每行最后一次出现"""
+    last = {line: index for index, line in enumerate(lines)}
+    return [line for index, line in enumerate(lines) if last[line] == index]
+
+
+@pytest.fixture
+def potfile(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    return tmp_path / 'hashcat.potfile'
+
+
+def test_keeps_last_occurrence_in_order(potfile):
+    lines = ['a:1', 'b:2', 'a:1', 'c:3', 'b:2', 'b:9']
+    potfile.write_text(''.join(f"{line}\n" for line in lines))
+
+    stats = compact_potfile(str(potfile))
+    assert potfile.read_text().splitlines() == ['a:1', 'c:3', 'b:2', 'b:9']
+    assert stats == {'lines_before': 6, 'lines_after': 4}
+
+
+def test_small_memory_budget_matches_in_memory(tmp_path):
+    """内存预算很小、排序段很多时，结果与内存中去重相同"""
+    rng = random.Random(1)
+    lines = [f"{rng.randrange(50):x}:{rng.randrange(3)}".encode() for _ in range(500)]
+    output = tmp_path / 'out'
+    with open(output, 'wb') as f:
+        assert external_dedupe(iter(lines), f, memory_budget=200, temp_dir=str(tmp_path)) == \
+            (500, len(set(lines)))
+    assert output.read_bytes().splitlines() == _keep_last(lines)
+    assert sorted(os.listdir(tmp_path)) == ['out']
+
+
+def test_later_line_still_wins(potfile):
+    """同一个哈希有多个结果时，整理前后读取到的结果相同"""
+    potfile.write_text('h1:old\nh2:pw2\nh1:new\nh1:old\n')
+    before = parse_potfile(str(potfile), use_index=False)
+    compact_potfile(str(potfile))
+    assert potfile.read_text().splitlines() == ['h2:pw2', 'h1:new', 'h1:old']
+    assert parse_potfile(str(potfile), use_index=False) == before == {'h1': 'old', 'h2': 'pw2'}
+
+
+def test_updates_index_and_parse_cache(potfile, tmp_path):
+    """整理后potfile索引指向新文件，相关的解析缓存被删除"""
+    potfile.write_text('h1:pw1\nh1:pw1\nh2:pw2\n')
+    hash_file = tmp_path / 'hashes.txt'
+    hash_file.write_text('h1\nh2\n')
+    with PotfileIndex(str(potfile)) as index:
+        index.update()
+    load_already_cracked(str(hash_file), str(potfile))
+    cache = ParseCache()
+    assert os.listdir(cache.cache_dir)
+
+    compact_potfile(str(potfile))
+    assert not os.listdir(cache.cache_dir)
+    with PotfileIndex(str(potfile)) as index:
+        assert index._get_meta('inode') == str(os.stat(potfile).st_ino)
+        assert index.count() == 2
+    assert {result['hash_val'] for result in load_already_cracked(str(hash_file), str(potfile))} == {'h1', 'h2'}
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Potfile索引测试
+"""
+
+import os
+
+import pytest
+
+from hashcat_gui.core.cracked_store import CrackedStore
+from hashcat_gui.core.hash_keys import HashMatcher
+from hashcat_gui.core.potfile_index import PotfileIndex, INDEX_SUFFIX
+from hashcat_gui.core.potfile_parser import matches_to_dict
+
+
+@pytest.fixture
+def potfile(tmp_path):
+    return tmp_path / 'hashcat.potfile'
+
+
+def _lookup(potfile, hashes):
+    with PotfileIndex(str(potfile)) as index:
+        index.update()
+        return matches_to_dict(index.lookup(HashMatcher(hashes)))
+
+
+def test_build_and_incremental_update(potfile):
+    potfile.write_text('h1:pw1\nh2:pw2\n')
+    with PotfileIndex(str(potfile)) as index:
+        assert index.update() == 2
+        assert index.update() == 0
+
+    with open(potfile, 'a') as f:
+        f.write('h3:pw3\n')
+    with PotfileIndex(str(potfile)) as index:
+        assert index.update() == 1
+        assert index.count() == 3
+    assert _lookup(potfile, ['h1', 'h3', 'x']) == {'h1': 'pw1', 'h3': 'pw3'}
+
+
+def test_reappended_line_wins(potfile):
+    """重新追加的旧结果覆盖中间出现的结果，与逐行解析的结果相同"""
+    potfile.write_text('h1:old\nh1:new\n')
+    assert _lookup(potfile, ['h1']) == {'h1': 'new'}
+
+    with open(potfile, 'a') as f:
+        f.write('h1:old\n')
+    assert _lookup(potfile, ['h1']) == {'h1': 'old'}
+    with PotfileIndex(str(potfile)) as index:
+        assert index.count() == 2
+
+
+def test_truncation_and_rotation_rebuild(potfile, tmp_path):
+    potfile.write_text('h1:pw1\nh2:pw2\n')
+    assert _lookup(potfile, ['h1', 'h2']) == {'h1': 'pw1', 'h2': 'pw2'}
+
+    # 截断后重建
+    potfile.write_text('h3:pw3\n')
+    assert _lookup(potfile, ['h1', 'h2', 'h3']) == {'h3': 'pw3'}
+
+    # 替换成新文件（inode变化）后重建，即使新文件更大
+    rotated = tmp_path / 'rotated.potfile'
+    rotated.write_text('h4:pw4\nh5:pw5\nh6:pw6\n')
+    os.replace(rotated, potfile)
+    assert _lookup(potfile, ['h3', 'h4', 'h6']) == {'h4': 'pw4', 'h6': 'pw6'}
+
+
+def test_missing_potfile_creates_no_index(potfile, tmp_path):
+    index = PotfileIndex(str(potfile))
+    assert index.update() == 0
+    index.close()
+    john_pot = tmp_path / 'john.pot'
+    with CrackedStore(str(potfile), str(john_pot)) as store:
+        assert store.update() == 0
+        assert store.lookup(HashMatcher(['h1'])) == []
+    assert not os.path.exists(str(potfile) + INDEX_SUFFIX)
+    assert not os.path.exists(str(john_pot) + INDEX_SUFFIX)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+流式加载和统计已破解哈希的测试
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+from hashcat_gui.core import potfile_parser
+from hashcat_gui.core.potfile_parser import iter_already_cracked, count_already_cracked, load_already_cracked
+
+
+HASHES = [f"{index:032x}" for index in range(10)]
+
+
+@pytest.fixture
+def files(tmp_path, monkeypatch):
+    """哈希文件包含10个哈希，potfile中有其中偶数编号的6个结果和一个无关的结果"""
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    hash_file = tmp_path / 'hashes.txt'
+    hash_file.write_text(''.join(f"{hash_val}\n" for hash_val in HASHES))
+    potfile = tmp_path / 'hashcat.potfile'
+    lines = [f"{HASHES[index]}:pw{index}\n" for index in range(0, 10, 2)]
+    lines.append(f"{'f' * 32}:other\n")
+    lines.append(f"{HASHES[8]}:pw8\n")
+    potfile.write_text(''.join(lines))
+    return str(hash_file), str(potfile)
+
+
+def _flatten(batches):
+    return {result['hash_val']: result['password'] for batch in batches for result in batch}
+
+
+def test_batches_match_full_load(files):
+    hash_file, potfile = files
+    batches = list(iter_already_cracked(hash_file, potfile, batch_size=2, use_cache=False))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    expected = {HASHES[index]: f"pw{index}" for index in range(0, 10, 2)}
+    assert _flatten(batches) == expected
+    assert _flatten([load_already_cracked(hash_file, potfile, use_cache=False)]) == expected
+
+
+def test_count_without_results(files):
+    hash_file, potfile = files
+    assert count_already_cracked(hash_file, potfile) == 5
+    assert count_already_cracked(hash_file, potfile + '.missing') == 0
+
+
+def test_count_falls_back_when_index_fails(files, monkeypatch):
+    def broken(*args, **kwargs):
+        raise sqlite3.Error('索引损坏')
+        yield
+
+    monkeypatch.setattr(potfile_parser, '_iter_cracked_matches', broken)
+    hash_file, potfile = files
+    assert count_already_cracked(hash_file, potfile) == 5
+
+
+def test_fallback_before_first_batch(files, monkeypatch):
+    """还没有返回结果时索引出错，改为一次性加载"""
+    def broken(*args, **kwargs):
+        raise sqlite3.Error('索引损坏')
+        yield
+
+    monkeypatch.setattr(potfile_parser, '_iter_cracked_matches', broken)
+    hash_file, potfile = files
+    batches = list(iter_already_cracked(hash_file, potfile, batch_size=2, use_cache=False))
+    assert len(_flatten(batches)) == 5
+
+
+def test_error_after_batch_is_raised(files, monkeypatch):
+    """已经返回过结果后索引出错时抛出异常，不会重复返回结果"""
+    def fail_midway(*args, **kwargs):
+        yield HASHES[0], HASHES[0], 'pw0'
+        yield HASHES[2], HASHES[2], 'pw2'
+        raise sqlite3.Error('索引损坏')
+
+    monkeypatch.setattr(potfile_parser, '_iter_cracked_matches', fail_midway)
+    hash_file, potfile = files
+    batches = iter_already_cracked(hash_file, potfile, batch_size=2, use_cache=False)
+    assert len(next(batches)) == 2
+    with pytest.raises(sqlite3.Error):
+        next(batches)
+
+
+def test_scan_without_index_uses_hash_filter(files, monkeypatch):
+    """索引不可用时按大文件处理：构建哈希列表的布隆过滤器并缓存，并行扫描的结果与索引查询相同"""
+    monkeypatch.setattr(potfile_parser, 'PARALLEL_MIN_SIZE', 1)
+    monkeypatch.setattr(potfile_parser, 'lookup_cracked', lambda potfile_path, matcher: None)
+    filters = []
+    load_hash_filter = potfile_parser.load_hash_filter
+
+    def recording_load(*args, **kwargs):
+        filters.append(load_hash_filter(*args, **kwargs))
+        return filters[-1]
+
+    monkeypatch.setattr(potfile_parser, 'load_hash_filter', recording_load)
+    hash_file, potfile = files
+    expected = {HASHES[index]: f"pw{index}" for index in range(0, 10, 2)}
+    assert _flatten([load_already_cracked(hash_file, potfile, use_cache=False)]) == expected
+
+    assert len(filters) == 1 and len(filters[0]) == len(HASHES)
+    assert all(hash_val in filters[0] for hash_val in HASHES)
+    cache_dir = os.path.join(potfile_parser.get_cache_dir(), 'bloom')
+    assert any(name.endswith(potfile_parser.HASH_FILTER_SUFFIX) for name in os.listdir(cache_dir))
+
+    # 第二次加载读取缓存的过滤器，不重新构建
+    monkeypatch.setattr(potfile_parser.BloomFilter, 'update', lambda self, items: pytest.fail('重新构建了过滤器'))
+    assert _flatten([load_already_cracked(hash_file, potfile, use_cache=False)]) == expected
+    assert len(filters) == 2 and all(hash_val in filters[1] for hash_val in HASHES)
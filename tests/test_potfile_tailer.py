@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Potfile追踪器测试
+"""
+
+import os
+
+from hashcat_gui.core.potfile_tailer import PotfileTailer
+
+
+def test_reads_only_appended_lines(tmp_path):
+    potfile = tmp_path / 'hashcat.potfile'
+    potfile.write_text('h1:pw1\n')
+    tailer = PotfileTailer(str(potfile))
+    tailer.seek_to_end()
+    assert tailer.read_new_entries() == []
+
+    with open(potfile, 'a') as f:
+        f.write('h2:pw2\nh3:p')
+    assert tailer.read_new_entries() == [('h2', 'pw2')]
+    assert tailer.offset == len('h1:pw1\nh2:pw2\n')
+
+    # 没写完的行在写完后读取
+    with open(potfile, 'a') as f:
+        f.write('w3\n')
+    assert tailer.read_new_entries() == [('h3', 'pw3')]
+
+
+def test_resume_from_offset(tmp_path):
+    potfile = tmp_path / 'hashcat.potfile'
+    potfile.write_text('h1:pw1\nh2:pw2\n')
+    tailer = PotfileTailer(str(potfile), len('h1:pw1\n'), os.stat(potfile).st_ino)
+    assert tailer.read_new_lines() == ['h2:pw2']
+
+
+def test_truncation_and_replacement(tmp_path):
+    """文件被截断或替换后从头读取"""
+    potfile = tmp_path / 'hashcat.potfile'
+    potfile.write_text('h1:pw1\nh2:pw2\n')
+    tailer = PotfileTailer(str(potfile))
+    assert len(tailer.read_new_lines()) == 2
+
+    potfile.write_text('h3:pw3\n')
+    assert tailer.read_new_lines() == ['h3:pw3']
+
+    replacement = tmp_path / 'new.potfile'
+    replacement.write_text('h4:pw4\nh5:pw5\n')
+    os.replace(replacement, potfile)
+    assert tailer.check_rotation()
+    assert tailer.read_new_lines() == ['h4:pw4', 'h5:pw5']
+    assert not tailer.check_rotation()
+
+
+def test_missing_file(tmp_path):
+    tailer = PotfileTailer(str(tmp_path / 'missing.potfile'))
+    tailer.seek_to_end()
+    assert tailer.offset == 0
+    assert tailer.read_new_lines() == []
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+运行时间预算测试
+"""
+
+from hashcat_gui.core.runtime_budget import (RuntimeBudget, DECISION_CONTINUE, DECISION_CHECKPOINT, DECISION_STOP,
+                                             WARMUP_SECONDS, format_duration)
+
+
+def _status(current, total, speed):
+    return {'progress_current': current, 'progress_total': total, 'speed': speed}
+
+
+def test_disabled_budget_always_continues():
+    budget = RuntimeBudget(0)
+    budget.start(now=0)
+    assert not budget.enabled
+    assert budget.decide(_status(1, 10 ** 12, '1 H/s'), now=10 ** 6) == DECISION_CONTINUE
+
+
+def test_finishes_within_budget():
+    """预计在预算内完成时继续运行"""
+    budget = RuntimeBudget(100)
+    budget.start(now=0)
+    assert budget.decide(_status(50, 100, '10 H/s'), now=10) == DECISION_CONTINUE
+    assert budget.estimate_remaining(_status(50, 100, '10 H/s'), now=10) == 5
+
+
+def test_rate_from_progress_samples():
+    """进度变化后按实际的增长速度估算剩余时间"""
+    budget = RuntimeBudget(100)
+    budget.start(now=0)
+    budget.estimate_remaining(_status(0, 1000, '1 kH/s'), now=0)
+    assert budget.estimate_remaining(_status(100, 1000, '1 kH/s'), now=10) == 90
+
+
+def test_checkpoint_when_budget_used_up():
+    """达到预算且无法很快完成时在检查点停止"""
+    budget = RuntimeBudget(60)
+    budget.start(now=0)
+    assert budget.decide(_status(10, 1000, '1 H/s'), now=61) == DECISION_CHECKPOINT
+    assert '时间预算' in budget.reason
+
+
+def test_small_overrun_is_tolerated():
+    """预计只超出一点时继续运行"""
+    budget = RuntimeBudget(100)
+    budget.start(now=0)
+    assert budget.decide(_status(95, 100, '1 H/s'), now=100) == DECISION_CONTINUE
+
+
+def test_hopeless_job_stops_after_warmup():
+    """预计时间远超预算时，速度稳定后提前停止"""
+    budget = RuntimeBudget(60)
+    budget.start(now=0)
+    status = _status(1, 10 ** 6, '1 H/s')
+    assert budget.decide(status, now=WARMUP_SECONDS - 1) == DECISION_CONTINUE
+    assert budget.decide(status, now=WARMUP_SECONDS) == DECISION_STOP
+    assert '远超' in budget.reason
+
+
+def test_format_duration():
+    assert format_duration(5) == '5秒'
+    assert format_duration(120) == '2分钟'
+    assert format_duration(125) == '2分钟5秒'
+    assert format_duration(3 * 3600 + 4 * 60) == '3小时4分钟'
+    assert format_duration(26 * 3600) == '1天2小时'
+    assert format_duration(-1) == '0秒'
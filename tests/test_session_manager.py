@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+会话管理器测试
+"""
+
+import os
+
+import pytest
+
+from hashcat_gui.core.job_workspace import JobWorkspace
+from hashcat_gui.core.session_manager import (
+    SessionManager, SESSION_FINISHED, SESSION_INTERRUPTED, SESSION_RUNNING,
+)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return SessionManager(str(tmp_path / 'jobs'))
+
+
+def _begin(manager, job_id, params=None, temp_hash_file=None):
+    workspace = JobWorkspace(job_id, manager.jobs_dir)
+    workspace.save_params(params or {'hash_file': 'hashes.txt'})
+    return manager.begin(workspace, f"job_{job_id}", temp_hash_file)
+
+
+def _write_restore(record):
+    with open(record.restore_file, 'wb') as f:
+        f.write(b'checkpoint')
+
+
+def test_interrupted_session_restore(manager):
+    """检查点仍然存在时任务被中断，可以恢复；崩溃时仍在运行的会话也可以恢复"""
+    interrupted = _begin(manager, 'job1', {'hash_file': 'a.txt', 'hash_mode': 0})
+    _write_restore(interrupted)
+    assert manager.finish(interrupted, -1).state == SESSION_INTERRUPTED
+    crashed = _begin(manager, 'job2')
+    _write_restore(crashed)
+    finished = _begin(manager, 'job3')
+    assert manager.finish(finished, 0).state == SESSION_FINISHED
+
+    records = manager.list_resumable()
+    assert {record.job_id for record in records} == {'job1', 'job2'}
+    record = manager.get('job1')
+    assert record.exit_code == -1
+    assert manager.load_params(record) == {'hash_file': 'a.txt', 'hash_mode': 0}
+    assert record.restore_args() == ['--session', 'job_job1', '--restore',
+                                     '--restore-file-path', record.restore_file]
+
+    manager.resume(record)
+    assert manager.get('job1').state == SESSION_RUNNING
+
+
+def test_discard_removes_directory_and_temp_hash_file(manager, tmp_path):
+    temp_hash_file = tmp_path / 'merged.hash'
+    temp_hash_file.write_text('h1\n')
+    record = _begin(manager, 'job1', temp_hash_file=str(temp_hash_file))
+    _write_restore(record)
+
+    manager.discard(record)
+    assert record.state == SESSION_FINISHED
+    assert not os.path.exists(record.directory)
+    assert not temp_hash_file.exists()
+    assert manager.list_resumable() == []
+
+
+def test_prune_only_finished(manager):
+    finished = _begin(manager, 'job1')
+    manager.finish(finished, 0)
+    interrupted = _begin(manager, 'job2')
+    _write_restore(interrupted)
+    manager.finish(interrupted, -1)
+    os.makedirs(os.path.join(manager.jobs_dir, 'no-session'))
+
+    assert manager.prune() == 1
+    assert sorted(os.listdir(manager.jobs_dir)) == ['job2', 'no-session']
+    assert manager.get('missing') is None
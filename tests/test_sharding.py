@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+密钥空间分片测试
+"""
+
+from hashcat_gui.core.sharding import split_keyspace, assign_devices
+
+
+def test_split_is_contiguous_and_balanced():
+    """分片首尾相接，覆盖整个密钥空间，大小最多相差1"""
+    for keyspace in (1, 10, 97, 1000003):
+        for shards in (1, 2, 3, 8, 16):
+            slices = split_keyspace(keyspace, shards)
+            assert slices[0][0] == 0
+            for (skip, limit), (next_skip, _) in zip(slices, slices[1:]):
+                assert skip + limit == next_skip
+            assert sum(limit for _, limit in slices) == keyspace
+            sizes = {limit for _, limit in slices}
+            assert max(sizes) - min(sizes) <= 1
+
+
+def test_split_examples():
+    assert split_keyspace(10, 3) == [(0, 4), (4, 3), (7, 3)]
+    # 分片数超过密钥空间时每个分片至少有一个候选密码
+    assert split_keyspace(2, 5) == [(0, 1), (1, 1)]
+    assert split_keyspace(5, 0) == [(0, 5)]
+
+
+def test_assign_devices():
+    assert assign_devices(None, 3) == [None, None, None]
+    # 设备多于分片时每个分片使用多个设备
+    assert assign_devices([1, 2, 3, 4], 2) == [[1, 3], [2, 4]]
+    # 设备少于分片时轮流使用
+    assert assign_devices([1, 2], 3) == [[1], [2], [1]]
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+信号合并器测试 - 需要PySide6，没有安装时跳过
+"""
+
+import time
+
+import pytest
+
+pytest.importorskip('PySide6')
+
+from PySide6.QtCore import QCoreApplication, QObject, Signal
+
+from hashcat_gui.gui.signal_coalescer import SignalCoalescer
+
+
+class FakeRunner(QObject):
+    """提供与执行器相同信号的对象"""
+
+    output_ready = Signal(str)
+    error_occurred = Signal(str)
+    status_update = Signal(dict)
+    password_found = Signal(str, str)
+    process_finished = Signal(int, int)
+
+
+@pytest.fixture
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def coalescer(app):
+    coalescer = SignalCoalescer(fps=1000)
+    coalescer.received = []
+    coalescer.output_ready.connect(lambda texts: coalescer.received.append(('output', texts)))
+    coalescer.error_occurred.connect(lambda texts: coalescer.received.append(('error', texts)))
+    coalescer.status_update.connect(lambda status: coalescer.received.append(('status', status)))
+    coalescer.passwords_found.connect(lambda passwords: coalescer.received.append(('passwords', passwords)))
+    return coalescer
+
+
+def test_flush_merges_in_order(coalescer):
+    """相邻的同类文本合并，状态只保留最近一次"""
+    coalescer.add_output('a')
+    coalescer.add_output('b')
+    coalescer.add_error('e')
+    coalescer.add_output('c')
+    coalescer.add_status({'progress': 1})
+    coalescer.add_status({'progress': 2})
+    coalescer.add_password('h1', 'pw1')
+    coalescer.add_password('h2', 'pw2')
+    coalescer.flush()
+
+    assert coalescer.received == [
+        ('output', ['a', 'b']), ('error', ['e']), ('output', ['c']),
+        ('passwords', [('h1', 'pw1'), ('h2', 'pw2')]), ('status', {'progress': 2}),
+    ]
+    coalescer.flush()
+    assert len(coalescer.received) == 5
+
+
+def test_timer_flushes(app, coalescer):
+    coalescer.add_output('a')
+    deadline = time.time() + 5
+    while not coalescer.received and time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    assert coalescer.received == [('output', ['a'])]
+
+
+def test_attach_flushes_before_finish(coalescer):
+    """执行器结束时先发送缓存的内容，再处理结束信号"""
+    runner = FakeRunner()
+    coalescer.attach(runner)
+    runner.process_finished.connect(lambda exit_code, status: coalescer.received.append(('finished', exit_code)))
+
+    runner.output_ready.emit('line')
+    runner.password_found.emit('h1', 'pw1')
+    runner.process_finished.emit(0, 0)
+    assert coalescer.received == [('output', ['line']), ('passwords', [('h1', 'pw1')]), ('finished', 0)]
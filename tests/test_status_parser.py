@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+状态解析器测试
+"""
+
+from hashcat_gui.core.status_parser import StatusParser, EVENT_STATUS, EVENT_LINE, is_final_status
+
+
+STATUS_BLOCK = (
+    "Session..........: hashcat\n"
+    "Status...........: Running\n"
+    "Hash.Mode........: 0 (MD5)\n"
+    "Hash.Target......: 8743b52063cd84097a65d1633f5c74f5\n"
+    "Guess.Mask.......: ?a?a?a?a?a [5]\n"
+    "Speed.#1.........:  1234.5 kH/s (10.00ms) @ Accel:64 Loops:1 Thr:1 Vec:8\n"
+    "Speed.#2.........:  1000.0 kH/s (10.00ms) @ Accel:64 Loops:1 Thr:1 Vec:8\n"
+    "Speed.#*.........:  2234.5 kH/s\n"
+    "Recovered........: 1/3 (33.33%) Digests\n"
+    "Progress.........: 500/2000 (25.00%)\n"
+    "Rejected.........: 7/500 (1.40%)\n"
+    "Candidates.#1....: abc -> xyz\n"
+    "\n"
+)
+
+
+def _statuses(events):
+    return [payload for kind, payload in events if kind == EVENT_STATUS]
+
+
+def test_status_block_fields():
+    """完整的状态块解析为一份状态信息"""
+    statuses = _statuses(StatusParser().feed(STATUS_BLOCK))
+    assert len(statuses) == 1
+    status = statuses[0]
+    assert status['session'] == 'hashcat'
+    assert status['status'] == 'Running'
+    assert status['hash_type'] == '0 (MD5)'
+    assert status['guess_mask'] == '?a?a?a?a?a [5]'
+    # 有多个设备时使用总速度
+    assert status['speed'] == '2234.5 kH/s'
+    assert set(status['speeds']) == {'1', '2', '*'}
+    assert status['candidates'] == {'1': 'abc -> xyz'}
+    assert status['progress_current'] == 500
+    assert status['progress_total'] == 2000
+    assert status['progress_percent'] == 25.0
+    assert status['recovered_count'] == 1
+    assert status['recovered_total'] == 3
+    assert status['rejected'] == 7
+
+
+def test_chunks_split_anywhere():
+    """输出在任意位置截断时结果与一次输入相同"""
+    expected = _statuses(StatusParser().feed(STATUS_BLOCK))
+    for size in (1, 3, 7, 64):
+        parser = StatusParser()
+        events = []
+        for start in range(0, len(STATUS_BLOCK), size):
+            events.extend(parser.feed(STATUS_BLOCK[start:start + size]))
+        assert _statuses(events) == expected
+
+
+def test_other_lines_and_crlf():
+    """非状态行原样返回，Windows换行符被去掉"""
+    events = StatusParser().feed("hashcat (v6.2.6) starting\r\n8743b52063cd84097a65d1633f5c74f5:hashcat\r\n")
+    assert events == [
+        (EVENT_LINE, "hashcat (v6.2.6) starting"),
+        (EVENT_LINE, "8743b52063cd84097a65d1633f5c74f5:hashcat"),
+    ]
+
+
+def test_session_starts_new_block():
+    """没有空行分隔时，新的Session行结束上一个状态块"""
+    parser = StatusParser()
+    events = parser.feed("Session..........: a\nStatus...........: Running\n"
+                         "Session..........: b\nStatus...........: Exhausted\n")
+    assert [status['session'] for status in _statuses(events)] == ['a']
+
+    statuses = _statuses(parser.flush())
+    assert statuses == [{'session': 'b', 'status': 'Exhausted'}]
+
+
+def test_flush_incomplete_line():
+    """进程结束时处理没有换行符的最后一行"""
+    parser = StatusParser()
+    assert parser.feed("Status...........: Cracked") == []
+    assert _statuses(parser.flush()) == [{'status': 'Cracked'}]
+    assert parser.flush() == []
+
+
+def test_is_final_status():
+    assert is_final_status('Exhausted')
+    assert is_final_status('Aborted (Runtime)')
+    assert not is_final_status('Running')
+    assert not is_final_status('')
+    assert not is_final_status(None)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+工作负载调优测试 - 用模拟的速度代替 hashcat -b
+"""
+
+import pytest
+
+from hashcat_gui.core import workload_tuner
+from hashcat_gui.core.benchmark_db import BenchmarkDB
+from hashcat_gui.core.workload_tuner import WorkloadTuner, get_tuning_for, tune_and_save
+
+
+def _fake_speed(settings):
+    """-w 3 和 -n 128 最快，-u 1024 超出设备限制"""
+    if settings.get('kernel_loops') == 1024:
+        return 0.0
+    speed = 100.0
+    speed += {3: 50, 4: 51}.get(settings.get('workload_profile'), 0)
+    speed += {32: 10, 128: 40}.get(settings.get('kernel_accel'), 0)
+    return speed
+
+
+@pytest.fixture
+def fake_probe(monkeypatch):
+    probes = []
+
+    def probe_speed(hashcat_path, hash_mode, devices=None, timeout=300, extra_args=None):
+        settings = {}
+        args = list(extra_args or [])
+        for key, flag in workload_tuner.TUNING_OPTIONS:
+            if flag in args:
+                settings[key] = int(args[args.index(flag) + 1])
+        probes.append(settings)
+        return {1: _fake_speed(settings)}
+
+    monkeypatch.setattr(workload_tuner, 'probe_speed', probe_speed)
+    monkeypatch.setattr(workload_tuner, 'get_hashcat_version', lambda hashcat_path: 'v6.2.6')
+    return probes
+
+
+@pytest.fixture
+def db(tmp_path):
+    with BenchmarkDB(str(tmp_path / 'benchmarks.db')) as benchmark_db:
+        yield benchmark_db
+
+
+def test_keeps_fastest_settings(fake_probe):
+    settings, speed = WorkloadTuner('hashcat', 0).tune()
+    # -w 4 只比 -w 3 快不到 MIN_GAIN，不采用
+    assert settings == {'workload_profile': 3, 'kernel_accel': 128}
+    assert speed == 190.0
+    assert len(fake_probe) == 1 + sum(len(candidates) for _, candidates in workload_tuner.TUNING_STEPS)
+
+
+def test_callback_stops_tuning(fake_probe):
+    settings, speed = WorkloadTuner('hashcat', 0, callback=lambda settings, speed: len(fake_probe) >= 3).tune()
+    assert fake_probe == [{}, {'workload_profile': 1}, {'workload_profile': 2}]
+    assert (settings, speed) == ({}, 100.0)
+
+
+def test_saved_tuning_used_unless_explicit(fake_probe, db):
+    tune_and_save('hashcat', 0, [2, 1], db)
+    params = {'hash_mode': 0, 'devices': [1, 2]}
+    assert get_tuning_for(params, db) == {'workload_profile': 3, 'kernel_accel': 128}
+    assert get_tuning_for(dict(params, workload_profile=2), db) == {'workload_profile': 2}
+    assert get_tuning_for(params, db, use_saved=False) == {}
+    assert get_tuning_for({'hash_mode': 0, 'devices': [3]}, db) == {}